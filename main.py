@@ -1,15 +1,12 @@
 import threading
 import time
-import csv
 import json
-import xml.etree.ElementTree as ET
 import uuid
 import webbrowser
 import argparse
 import secrets
 import string
 import os
-from io import StringIO
 from datetime import datetime, timedelta
 import sys
 from dotenv import load_dotenv
@@ -25,10 +22,11 @@ try:
 except Exception as e:
     print(f"Failed to set recursion limit: {e}")
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, Response, stream_with_context
 from flask_compress import Compress
 from functools import wraps
 from src.crawler import WebCrawler
+from src.export_stream import stream_export, exclude_issues, apply_link_statuses, encode_chunks, MIMETYPES
 from src.settings_manager import SettingsManager
 from src.auth_db import init_db, create_user, authenticate_user, get_user_by_id, log_guest_crawl, get_guest_crawls_last_24h, verify_user, set_user_tier, create_verification_token, verify_token, get_user_by_email
 from src.email_service import send_verification_email, send_welcome_email
@@ -43,16 +41,43 @@ parser.add_argument('--local', '-l', action='store_true',
                     help='Run in local mode (all users get admin tier, no rate limits)')
 parser.add_argument('--disable-register', '-dr', action='store_true',
                     help='Disable new user registrations')
+parser.add_argument('--job-queue', '-jq', action='store_true',
+                    help='Queue crawls for the worker pool (python -m src.crawl_worker) instead of running them in the web process')
+parser.add_argument('--host', default=os.getenv('HOST', '0.0.0.0'),
+                    help='Address to listen on (default: $HOST or 0.0.0.0)')
+parser.add_argument('--port', type=int, default=int(os.getenv('PORT', 5000)),
+                    help='Port to listen on (default: $PORT or 5000)')
+parser.add_argument('--threads', type=int, default=int(os.getenv('WEB_THREADS', 8)),
+                    help='Request threads per server process (default: $WEB_THREADS or 8)')
+parser.add_argument('--processes', type=int, default=int(os.getenv('WEB_PROCESSES', 1)),
+                    help='Server processes sharing the port (default: $WEB_PROCESSES or 1); more than one implies --job-queue')
+parser.add_argument('--listen-fd', type=int, help=argparse.SUPPRESS)  # set by the process pool supervisor
 args = parser.parse_args()
 
 LOCAL_MODE = args.local
 DISABLE_REGISTER = args.disable_register
+JOB_QUEUE_MODE = args.job_queue
+SERVER_PROCESSES = max(1, args.processes)
+if LOCAL_MODE and SERVER_PROCESSES > 1:
+    # Local-mode guests get the admin tier but have no user row, so their saved
+    # settings exist only in the memory of the process that saved them
+    parser.error('--local runs a single server process; drop --processes / $WEB_PROCESSES')
+
+# With several server processes a session's requests can land on any of them, so
+# nothing a request needs may live only in one process: crawls go to the job queue
+# and per-session state is re-read from the session cookie and the database
+SHARED_STATE = SERVER_PROCESSES > 1
+if SHARED_STATE and not JOB_QUEUE_MODE:
+    JOB_QUEUE_MODE = True
+    if args.listen_fd is None:
+        print("Multiple server processes: crawls run in the job queue (start python -m src.crawl_worker)")
 
 app = Flask(__name__, template_folder='web/templates', static_folder='web/static')
 app.secret_key = os.getenv('FLASK_SECRET_KEY') or 'librecrawl-secret-key-change-in-production' 
 if app.secret_key == 'librecrawl-secret-key-change-in-production':
     print("WARNING: Using insecure default SECRET_KEY. Please set FLASK_SECRET_KEY in .env.")
 app.config['SESSION_COOKIE_NAME'] = 'librecrawl_session'  # Rename cookie to avoid collision with Next.js
+app.config['LOCAL_MODE'] = LOCAL_MODE  # Read by blueprints that cannot import main
 
 # Enable compression for all responses
 Compress(app)
@@ -61,6 +86,8 @@ Compress(app)
 init_db()
 from src.crawl_db import init_crawl_tables
 init_crawl_tables()
+from src.crawl_jobs import init_crawl_job_tables
+init_crawl_job_tables()
 from src.keyword.keyword_db import init_keyword_tables
 init_keyword_tables()
 
@@ -237,7 +264,52 @@ def get_or_create_crawler():
             # Update last accessed time
             crawler_instances[session_id]['last_accessed'] = datetime.now()
 
-        return crawler_instances[session_id]['crawler']
+        crawler = crawler_instances[session_id]['crawler']
+
+    if JOB_QUEUE_MODE:
+        # Queued crawls never run in this crawler, so the session cookie says what it shows
+        sync_loaded_crawl(crawler)
+    return crawler
+
+def attach_crawl_view(crawler, crawl):
+    """Serve a saved crawl through the session crawler (a lazy, page-cached view instead of every row)"""
+    from src.crawl_view import LazyCrawlView
+    view = LazyCrawlView(crawl)
+
+    # Drop whatever the session crawler held before
+    crawler._reset_state()
+    with crawler.results_lock:
+        crawler.loaded_view = view
+        crawler.crawl_id = crawl['id']
+        crawler.stats['crawled'] = view.counts['urls']
+        crawler.stats['discovered'] = view.counts['urls']
+        crawler.base_url = crawl['base_url']
+        crawler.base_domain = crawl['base_domain']
+
+        # [NEW] Restore Robots.txt and PageSpeed data
+        if crawl.get('robots_data'):
+            crawler.robots_data = crawl['robots_data']
+
+        if crawl.get('pagespeed_results'):
+            crawler.stats['pagespeed_results'] = crawl['pagespeed_results']
+    return view
+
+def sync_loaded_crawl(crawler):
+    """Match this process's session crawler to the crawl the session has loaded (it may have been loaded by another process)"""
+    crawl_id = session.get('loaded_crawl_id')
+    view = crawler.loaded_view
+    if crawler.is_running or (view.crawl_id if view else None) == crawl_id:
+        return
+    if not crawl_id:
+        crawler._reset_state()
+        crawler.crawl_id = None
+        return
+    from src.crawl_db import get_crawl_by_id
+    crawl = get_crawl_by_id(crawl_id)
+    if crawl:
+        attach_crawl_view(crawler, crawl)
+    else:
+        session.pop('loaded_crawl_id', None)
 
 def get_session_settings():
     """Get the settings manager for the current session"""
@@ -262,7 +334,12 @@ def get_session_settings():
             # Update last accessed time
             crawler_instances[session_id]['last_accessed'] = datetime.now()
 
-        return crawler_instances[session_id]['settings']
+        settings_manager = crawler_instances[session_id]['settings']
+
+    if SHARED_STATE:
+        # Another server process may have saved newer settings
+        settings_manager.reload()
+    return settings_manager
 
 def cleanup_old_instances():
     """Remove crawler instances that haven't been accessed in 1 hour"""
@@ -303,184 +380,37 @@ def start_cleanup_thread():
 
 def generate_csv_export(urls, fields):
     """Generate CSV export content"""
-    output = StringIO()
-    writer = csv.DictWriter(output, fieldnames=fields)
-    writer.writeheader()
-
-    for url_data in urls:
-        row = {}
-        for field in fields:
-            value = url_data.get(field, '')
-
-            # Handle complex data types for CSV
-            if field == 'analytics' and isinstance(value, dict):
-                analytics_list = []
-                if value.get('gtag') or value.get('ga4_id'): analytics_list.append('GA4')
-                if value.get('google_analytics'): analytics_list.append('GA')
-                if value.get('gtm_id'): analytics_list.append('GTM')
-                if value.get('facebook_pixel'): analytics_list.append('FB')
-                if value.get('hotjar'): analytics_list.append('HJ')
-                if value.get('mixpanel'): analytics_list.append('MP')
-                row[field] = ', '.join(analytics_list)
-            elif field == 'og_tags' and isinstance(value, dict):
-                row[field] = f"{len(value)} tags" if value else ''
-            elif field == 'twitter_tags' and isinstance(value, dict):
-                row[field] = f"{len(value)} tags" if value else ''
-            elif field == 'json_ld' and isinstance(value, list):
-                row[field] = f"{len(value)} scripts" if value else ''
-            elif field == 'images' and isinstance(value, list):
-                row[field] = f"{len(value)} images" if value else ''
-            elif field == 'internal_links' and isinstance(value, (int, float)):
-                row[field] = f"{int(value)} internal links" if value else '0 internal links'
-            elif field == 'external_links' and isinstance(value, (int, float)):
-                row[field] = f"{int(value)} external links" if value else '0 external links'
-            elif field == 'h2' and isinstance(value, list):
-                row[field] = ', '.join(value[:3]) + ('...' if len(value) > 3 else '')
-            elif field == 'h3' and isinstance(value, list):
-                row[field] = ', '.join(value[:3]) + ('...' if len(value) > 3 else '')
-            elif isinstance(value, (dict, list)):
-                row[field] = str(value)
-            else:
-                row[field] = value
-
-        writer.writerow(row)
-
-    return output.getvalue()
+    return ''.join(stream_export('urls', 'csv', urls, fields))
 
 def generate_json_export(urls, fields):
     """Generate JSON export content"""
-    filtered_urls = []
-    for url_data in urls:
-        filtered_data = {}
-        for field in fields:
-            value = url_data.get(field, '')
-            # Keep complex data structures intact in JSON
-            filtered_data[field] = value
-        filtered_urls.append(filtered_data)
-
-    return json.dumps({
-        'export_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-        'total_urls': len(filtered_urls),
-        'fields': fields,
-        'data': filtered_urls
-    }, indent=2, default=str)
+    return ''.join(stream_export('urls', 'json', urls, fields))
 
 def generate_xml_export(urls, fields):
     """Generate XML export content"""
-    root = ET.Element('librecrawl_export')
-    root.set('export_date', time.strftime('%Y-%m-%d %H:%M:%S'))
-    root.set('total_urls', str(len(urls)))
-
-    urls_element = ET.SubElement(root, 'urls')
-
-    for url_data in urls:
-        url_element = ET.SubElement(urls_element, 'url')
-        for field in fields:
-            field_element = ET.SubElement(url_element, field)
-            field_element.text = str(url_data.get(field, ''))
-
-    return ET.tostring(root, encoding='unicode')
+    return ''.join(stream_export('urls', 'xml', urls, fields))
 
 def generate_links_csv_export(links):
     """Generate CSV export for links data"""
-    output = StringIO()
-    fieldnames = ['source_url', 'target_url', 'anchor_text', 'is_internal', 'target_domain', 'target_status', 'placement']
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-
-    for link in links:
-        row = {
-            'source_url': link.get('source_url', ''),
-            'target_url': link.get('target_url', ''),
-            'anchor_text': link.get('anchor_text', ''),
-            'is_internal': 'Yes' if link.get('is_internal') else 'No',
-            'target_domain': link.get('target_domain', ''),
-            'target_status': link.get('target_status', 'Not crawled'),
-            'placement': link.get('placement', 'body')
-        }
-        writer.writerow(row)
-
-    return output.getvalue()
+    return ''.join(stream_export('links', 'csv', links))
 
 def generate_links_json_export(links):
     """Generate JSON export for links data"""
-    return json.dumps(links, indent=2)
+    return ''.join(stream_export('links', 'json', links))
 
 def filter_issues_by_exclusion_patterns(issues, exclusion_patterns):
     """Filter issues based on exclusion patterns (applies current settings to loaded crawls)"""
-    from fnmatch import fnmatch
-    from urllib.parse import urlparse
-
     if not exclusion_patterns:
         return issues
-
-    filtered_issues = []
-
-    for issue in issues:
-        url = issue.get('url', '')
-        parsed = urlparse(url)
-        path = parsed.path
-
-        # Check if URL matches any exclusion pattern
-        should_exclude = False
-        for pattern in exclusion_patterns:
-            if not pattern.strip() or pattern.strip().startswith('#'):
-                continue
-
-            if '*' in pattern:
-                if fnmatch(path, pattern):
-                    should_exclude = True
-                    break
-            elif path == pattern or path.startswith(pattern.rstrip('*')):
-                should_exclude = True
-                break
-
-        if not should_exclude:
-            filtered_issues.append(issue)
-
-    return filtered_issues
+    return list(exclude_issues(issues, exclusion_patterns))
 
 def generate_issues_csv_export(issues):
     """Generate CSV export for issues data"""
-    output = StringIO()
-    fieldnames = ['url', 'type', 'category', 'issue', 'details']
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-
-    for issue in issues:
-        row = {
-            'url': issue.get('url', ''),
-            'type': issue.get('type', ''),
-            'category': issue.get('category', ''),
-            'issue': issue.get('issue', ''),
-            'details': issue.get('details', '')
-        }
-        writer.writerow(row)
-
-    return output.getvalue()
+    return ''.join(stream_export('issues', 'csv', issues))
 
 def generate_issues_json_export(issues):
     """Generate JSON export for issues data"""
-    # Group issues by URL for better organization
-    issues_by_url = {}
-    for issue in issues:
-        url = issue.get('url', '')
-        if url not in issues_by_url:
-            issues_by_url[url] = []
-        issues_by_url[url].append({
-            'type': issue.get('type', ''),
-            'category': issue.get('category', ''),
-            'issue': issue.get('issue', ''),
-            'details': issue.get('details', '')
-        })
-
-    return json.dumps({
-        'export_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-        'total_issues': len(issues),
-        'total_urls_with_issues': len(issues_by_url),
-        'issues_by_url': issues_by_url,
-        'all_issues': issues
-    }, indent=2)
+    return ''.join(stream_export('issues', 'json', issues))
 
 @app.route('/login')
 def login_page():
@@ -742,6 +672,24 @@ def start_crawl():
         print(f"Applying settings from request: {data['settings']}")
         settings_manager.save_settings(data['settings'])
 
+    if JOB_QUEUE_MODE:
+        # Hand the crawl to the worker pool; this process only reads its state
+        from src.crawl_jobs import submit_crawl_job
+        crawler_config = crawler.config.copy()
+        try:
+            crawler_config.update(settings_manager.get_crawler_config())
+        except Exception as e:
+            print(f"Warning: Could not apply settings: {e}")
+
+        crawl_id, job_id = submit_crawl_job(url, crawler_config, user_id=user_id, session_id=session_id, client_id=client_id)
+        if not job_id:
+            return jsonify({'success': False, 'error': 'Could not queue crawl', 'crawl_id': crawl_id})
+
+        session['current_crawl_id'] = crawl_id
+        session.pop('loaded_crawl_id', None)
+        log_crawl_start(user_id, url)
+        return jsonify({'success': True, 'message': 'Crawl queued', 'crawl_id': crawl_id})
+
     # Apply current settings to crawler before starting
     try:
         crawler_config = settings_manager.get_crawler_config()
@@ -755,6 +703,7 @@ def start_crawl():
     # Store crawl_id in session
     if success and crawler.crawl_id:
         session['current_crawl_id'] = crawler.crawl_id
+        session.pop('loaded_crawl_id', None)
         # Also log to old crawl_history for compatibility
         log_crawl_start(user_id, url)
 
@@ -931,6 +880,8 @@ def generate_llms_txt():
 @app.route('/api/stop_crawl', methods=['POST'])
 @login_required
 def stop_crawl():
+    if JOB_QUEUE_MODE:
+        return jsonify(queued_crawl_control('stop'))
     crawler = get_or_create_crawler()
     success, message = crawler.stop_crawl()
     return jsonify({'success': success, 'message': message})
@@ -946,27 +897,53 @@ def crawl_status():
     link_since = request.args.get('link_since', type=int)
     issue_since = request.args.get('issue_since', type=int)
 
-    # Get full status data
-    status_data = crawler.get_status()
-
-    # Ensure baseUrl is in stats (needed for UI to work correctly)
-    if crawler.base_url and 'stats' in status_data:
-        status_data['stats']['baseUrl'] = crawler.base_url
-
     # Check if we need to force a full refresh (after loading from DB)
     force_full = session.pop('force_full_refresh', False)
 
+    # A historical crawl loaded into this session is served by its lazy view
+    loaded_view = crawler.loaded_view if not crawler.is_running else None
+
+    queued_crawl_id = session.get('current_crawl_id') if JOB_QUEUE_MODE and not crawler.is_running and not loaded_view else None
+    status_data = None
+    if queued_crawl_id:
+        # Crawl runs in a worker process - read its progress from the database
+        from src.crawl_jobs import get_queued_crawl_status
+        if force_full:
+            url_since = link_since = issue_since = 0
+        status_data = get_queued_crawl_status(queued_crawl_id, url_since, link_since, issue_since)
+
+    if loaded_view:
+        # Historical crawl - pages come from the lazy view (status_data['next_since'] drives paging);
+        # rows=0 returns stats and counts only, the tables page through /api/crawls/<id>/<dataset>
+        if force_full:
+            url_since = link_since = issue_since = 0
+        include_rows = request.args.get('rows', 1, type=int) != 0
+        status_data = loaded_view.status_payload(url_since, link_since, issue_since, include_rows)
+
+    if status_data is None:
+        queued_crawl_id = None
+
+        # Get full status data (issues come from the store's sequence, not a slice)
+        status_data = crawler.get_status(issue_since=None if force_full else issue_since)
+
+        # Ensure baseUrl is in stats (needed for UI to work correctly)
+        if crawler.base_url and 'stats' in status_data:
+            status_data['stats']['baseUrl'] = crawler.base_url
+
     # If incremental parameters provided AND not forcing full refresh, slice the arrays
-    if not force_full:
+    # (queued crawls are already paged by the database)
+    if not force_full and not queued_crawl_id and not loaded_view:
         if url_since is not None:
             status_data['urls'] = status_data.get('urls', [])[url_since:]
         if link_since is not None:
             status_data['links'] = status_data.get('links', [])[link_since:]
-        if issue_since is not None:
-            status_data['issues'] = status_data.get('issues', [])[issue_since:]
 
-    # Apply current issue exclusion patterns to displayed issues
+    # Sequence the UI asks for next; exclusions below must not shift it
     issues = status_data.get('issues', [])
+    if 'issue_seq' not in status_data:
+        status_data['issue_seq'] = (0 if force_full else issue_since or 0) + len(issues)
+
+    # Apply current issue exclusion patterns to the new issues only
     if issues:
         current_settings = settings_manager.get_settings()
         exclusion_patterns_text = current_settings.get('issueExclusionPatterns', '')
@@ -987,87 +964,38 @@ def crawl_status():
 @app.route('/api/visualization_data')
 @login_required
 def visualization_data():
-    """Get graph data for site structure visualization"""
+    """
+    Graph data for the site structure visualization, laid out server-side.
+    Small sites get every page; larger ones get directory super-nodes that the
+    UI expands with ?cluster=<key>, or the pages inside ?viewport=x1,y1,x2,y2.
+    """
     try:
         crawler = get_or_create_crawler()
-        status_data = crawler.get_status()
-
-        # Get URLs from the status data
-        crawled_pages = status_data.get('urls', [])
-        all_links = status_data.get('links', [])
-
-        # Build nodes and edges for the graph
-        nodes = []
-        edges = []
-        url_to_id = {}
-
-        # Create nodes from crawled pages (limit to prevent lag)
-        max_nodes = 500  # Optimization: limit nodes for performance
-        pages_to_visualize = crawled_pages[:max_nodes]
-
-        for idx, page in enumerate(pages_to_visualize):
-            url = page.get('url', '')
-            status_code = page.get('status_code', 0)
-
-            # Assign color based on status code
-            if 200 <= status_code < 300:
-                color = '#10b981'  # Green for 2xx
-            elif 300 <= status_code < 400:
-                color = '#3b82f6'  # Blue for 3xx
-            elif 400 <= status_code < 500:
-                color = '#f59e0b'  # Orange for 4xx
-            elif 500 <= status_code < 600:
-                color = '#ef4444'  # Red for 5xx
-            else:
-                color = '#6b7280'  # Gray for other
-
-            # Create node
-            node = {
-                'data': {
-                    'id': f'node-{idx}',
-                    'label': url.split('/')[-1] or url.split('//')[-1],  # Use last path segment or domain
-                    'url': url,
-                    'status_code': status_code,
-                    'title': page.get('title', ''),
-                    'color': color,
-                    'size': 30 if idx == 0 else 20  # Make root node larger
-                }
-            }
-            nodes.append(node)
-            url_to_id[url] = f'node-{idx}'
-
-        # Create edges from links data
-        # Links are stored as: {'source_url': url, 'target_url': url, 'is_internal': bool, ...}
-        edges_set = set()  # Use set to avoid duplicate edges
-        for link in all_links:
-            if link.get('is_internal'):  # Only use internal links
-                source_url = link.get('source_url', '')
-                target_url = link.get('target_url', '')
-
-                source_id = url_to_id.get(source_url)
-                target_id = url_to_id.get(target_url)
-
-                if source_id and target_id and source_id != target_id:
-                    edge_key = f'{source_id}-{target_id}'
-                    if edge_key not in edges_set:
-                        edges_set.add(edge_key)
-                        edge = {
-                            'data': {
-                                'id': f'edge-{edge_key}',
-                                'source': source_id,
-                                'target': target_id
-                            }
-                        }
-                        edges.append(edge)
+        view = crawler.loaded_view
+        layout = view.graph_layout() if view else crawler.get_graph_layout()
+        if layout is None or not layout.page_count:
+            return jsonify({'success': True, 'nodes': [], 'edges': [], 'total_pages': 0,
+                            'visualized_pages': 0, 'truncated': False})
+
+        from src.core.graph_layout import MAX_NODES
+        max_nodes = max(1, min(request.args.get('max_nodes', MAX_NODES, type=int), 2000))
+
+        viewport = request.args.get('viewport')
+        cluster = request.args.get('cluster')
+        if viewport:
+            try:
+                x1, y1, x2, y2 = (float(value) for value in viewport.split(','))
+            except ValueError:
+                return jsonify({'success': False, 'error': 'viewport must be x1,y1,x2,y2'}), 400
+            data = layout.viewport_view(x1, y1, x2, y2, max_nodes)
+        elif cluster is not None:
+            data = layout.cluster_view(cluster, max_nodes)
+            if data is None:
+                return jsonify({'success': False, 'error': 'Cluster not found'}), 404
+        else:
+            data = layout.overview(max_nodes)
 
-        return jsonify({
-            'success': True,
-            'nodes': nodes,
-            'edges': edges,
-            'total_pages': len(crawled_pages),
-            'visualized_pages': len(nodes),
-            'truncated': len(crawled_pages) > max_nodes
-        })
+        return jsonify(data)
 
     except Exception as e:
         print(f"Error generating visualization data: {e}")
@@ -1080,12 +1008,31 @@ def visualization_data():
             'edges': []
         })
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint: stage latency histograms, queue depth, in-flight
+    requests and browser pool use over every crawler in this process.
+    Scrapers authenticate with METRICS_TOKEN as a bearer token; without it set,
+    a logged-in session is required.
+    """
+    from src.core.metrics import render_prometheus, CONTENT_TYPE
+
+    token = os.getenv('METRICS_TOKEN')
+    if token:
+        if request.headers.get('Authorization', '') != f'Bearer {token}':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    elif not LOCAL_MODE and 'user_id' not in session:
+        return Response('Authentication required\n', status=401, mimetype='text/plain')
+
+    with instances_lock:
+        crawlers = [instance_data['crawler'] for instance_data in crawler_instances.values()]
+    return Response(render_prometheus([crawler.get_metrics() for crawler in crawlers]), content_type=CONTENT_TYPE)
+
 @app.route('/api/debug/memory')
 @login_required
 def debug_memory():
     """Debug endpoint showing memory stats for all active crawler instances"""
-    from src.core.memory_profiler import MemoryProfiler
-
     with instances_lock:
         memory_stats = {
             'total_instances': len(crawler_instances),
@@ -1096,11 +1043,9 @@ def debug_memory():
             crawler = instance_data['crawler']
             stats = crawler.memory_monitor.get_stats()
 
-            # Get accurate data sizes
-            data_sizes = MemoryProfiler.get_crawler_data_size(
-                crawler.crawl_results,
-                crawler.link_manager.all_links if crawler.link_manager else [],
-                crawler.issue_detector.detected_issues if crawler.issue_detector else []
+            # Running estimates kept by the crawler (no walk over the crawl data)
+            data_sizes = crawler.data_size.report(
+                crawler.issue_detector.detected_issues if crawler.issue_detector else None
             )
 
             memory_stats['instances'].append({
@@ -1116,37 +1061,85 @@ def debug_memory():
 @app.route('/api/debug/memory/profile')
 @login_required
 def debug_memory_profile():
-    """Detailed memory profiling - what's actually using the RAM"""
+    """
+    Detailed memory profiling - what's actually using the RAM. Data sizes are
+    the crawlers' running estimates; ?deep=1 measures them exactly and
+    ?objects=1 adds a breakdown by object type (both walk the whole heap, so
+    they stall the server on a large crawl). For allocation sites use
+    /api/debug/memory/tracemalloc.
+    """
     from src.core.memory_profiler import MemoryProfiler
 
+    deep = request.args.get('deep') == '1'
     with instances_lock:
-        profiles = []
-
-        for session_id, instance_data in crawler_instances.items():
-            crawler = instance_data['crawler']
-
-            # Get object breakdown
-            breakdown = MemoryProfiler.get_object_memory_breakdown()
+        crawlers = [(session_id, instance_data['crawler']) for session_id, instance_data in crawler_instances.items()]
 
-            # Get crawler-specific data sizes
+    profiles = []
+    for session_id, crawler in crawlers:
+        issues = crawler.issue_detector.detected_issues if crawler.issue_detector else None
+        if deep:
             data_sizes = MemoryProfiler.get_crawler_data_size(
                 crawler.crawl_results,
                 crawler.link_manager.all_links if crawler.link_manager else [],
-                crawler.issue_detector.detected_issues if crawler.issue_detector else []
+                issues.to_list() if issues is not None else []
             )
+        else:
+            data_sizes = crawler.data_size.report(issues)
 
-            profiles.append({
-                'session_id': session_id[:8] + '...',
-                'urls_crawled': len(crawler.crawl_results),
-                'object_breakdown': breakdown,
-                'data_sizes': data_sizes
-            })
-
-        return jsonify({
-            'total_instances': len(crawler_instances),
-            'profiles': profiles
+        profiles.append({
+            'session_id': session_id[:8] + '...',
+            'urls_crawled': len(crawler.crawl_results),
+            'data_sizes': data_sizes
         })
 
+    response = {
+        'total_instances': len(crawlers),
+        'profiles': profiles
+    }
+    if request.args.get('objects') == '1':
+        # Process-wide, so once rather than per instance
+        response['object_breakdown'] = MemoryProfiler.get_object_memory_breakdown()
+    return jsonify(response)
+
+@app.route('/api/debug/memory/tracemalloc', methods=['GET', 'POST'])
+@login_required
+def debug_memory_tracemalloc():
+    """
+    Allocation profiling with tracemalloc (off until started).
+    POST {"action": "start", "frames": 1} starts tracing and takes the baseline,
+    {"action": "baseline"} re-takes it, {"action": "stop"} stops tracing.
+    GET ?limit=25&group=lineno|filename|traceback returns the top allocation
+    changes since the baseline.
+    """
+    from src.core.memory_profiler import TracemallocSession
+
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        action = data.get('action')
+        if action == 'start':
+            try:
+                frames = int(data.get('frames', 1))
+            except (TypeError, ValueError):
+                frames = 1
+            return jsonify({'success': True, **TracemallocSession.start(frames)})
+        if action == 'baseline':
+            status = TracemallocSession.baseline()
+            if status is None:
+                return jsonify({'success': False, 'error': 'Tracing is not running'}), 400
+            return jsonify({'success': True, **status})
+        if action == 'stop':
+            return jsonify({'success': True, **TracemallocSession.stop()})
+        return jsonify({'success': False, 'error': 'action must be start, baseline or stop'}), 400
+
+    try:
+        limit = int(request.args.get('limit', 25))
+    except ValueError:
+        limit = 25
+    diff = TracemallocSession.diff(limit=limit, key_type=request.args.get('group', 'lineno'))
+    if diff is None:
+        return jsonify({'success': False, 'error': 'Tracing is not running', **TracemallocSession.status()})
+    return jsonify({'success': True, **diff})
+
 @app.route('/api/filter_issues', methods=['POST'])
 @login_required
 def filter_issues():
@@ -1215,6 +1208,8 @@ def update_crawler_settings():
 @login_required
 def pause_crawl():
     try:
+        if JOB_QUEUE_MODE:
+            return jsonify(queued_crawl_control('pause'))
         crawler = get_or_create_crawler()
         success, message = crawler.pause_crawl()
         return jsonify({'success': success, 'message': message})
@@ -1225,6 +1220,8 @@ def pause_crawl():
 @login_required
 def resume_crawl():
     try:
+        if JOB_QUEUE_MODE:
+            return jsonify(queued_crawl_control('resume'))
         crawler = get_or_create_crawler()
         success, message = crawler.resume_crawl()
         return jsonify({'success': success, 'message': message})
@@ -1284,7 +1281,6 @@ def list_crawls():
 def get_crawl(crawl_id):
     """Get complete crawl data by ID"""
     try:
-        user_id = session.get('user_id')
         from src.crawl_db import get_crawl_by_id, load_crawled_urls, load_crawl_links, load_crawl_issues
 
         # Get crawl metadata
@@ -1293,28 +1289,23 @@ def get_crawl(crawl_id):
             return jsonify({'success': False, 'error': 'Crawl not found'}), 404
 
         # Check permission (Admin OR Linked Client)
-        client_id_param = request.args.get('client_id')
-        has_access = False
-        
-        # 1. Admin / Owner Access
-        if user_id: 
-            if crawl.get('user_id') == user_id:
-                has_access = True
-            elif LOCAL_MODE: # Local mode allow all
-                has_access = True
-        
-        # 2. Client Access
-        if not has_access:
-            if crawl.get('show_to_client'):
-                 # Strict check: client_id matches
-                 # crawl dict from get_crawl_by_id might need client_id field if not present
-                 # Assuming it is present (it selects * usually or we should verify)
-                 if str(crawl.get('client_id')) == str(client_id_param):
-                     has_access = True
-
-        if not has_access:
+        if not can_access_crawl(crawl, request.args.get('client_id')):
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
+        # summary=1: metadata, row counts and the first page of each table instead of everything
+        if request.args.get('summary') in ('1', 'true'):
+            from src.crawl_db import count_crawl_rows, query_crawl_rows
+            page_size = request.args.get('limit', 100, type=int)
+            return jsonify({
+                'success': True,
+                'crawl': crawl,
+                'counts': count_crawl_rows(crawl_id),
+                'urls': query_crawl_rows(crawl_id, 'urls', limit=page_size),
+                'links': query_crawl_rows(crawl_id, 'links', limit=page_size),
+                'issues': query_crawl_rows(crawl_id, 'issues', limit=page_size),
+                'robots_data': crawl.get('robots_data', {'content': None, 'issues': []})
+            })
+
         # Load all data (Optimized: Use summary=True to exclude heavy JSON body/schema/images)
         urls = load_crawled_urls(crawl_id, summary=True)
         # TODO: Optimize links loading too if needed (it can be huge)
@@ -1340,13 +1331,249 @@ def get_crawl(crawl_id):
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/crawls/<int:crawl_id>/<any(urls, links, issues):dataset>')
+@login_required
+def get_crawl_rows(crawl_id, dataset):
+    """
+    One page of a crawl table, filtered and sorted in the database.
+    Query: limit, cursor (next_cursor of the previous page), sort, dir (asc/desc),
+    q (search), status_class (urls, links: 2-5), content_class (urls: html, css,
+    js, images) and exact-match column filters such as status_code=404,
+    is_internal=1, type=error or category=SEO. Issue pages have the session's
+    exclusion patterns applied, so a page may come back short.
+    """
+    try:
+        from src.crawl_db import get_crawl_by_id, query_crawl_rows, TABLE_QUERY_SPECS
+
+        crawl = get_crawl_by_id(crawl_id)
+        if not crawl:
+            return jsonify({'success': False, 'error': 'Crawl not found'}), 404
+        if not can_access_crawl(crawl, request.args.get('client_id')):
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+        filters = {name: request.args.get(name) for name in TABLE_QUERY_SPECS[dataset]['filters']
+                   if request.args.get(name) not in (None, '')}
+
+        try:
+            page = query_crawl_rows(
+                crawl_id, dataset,
+                filters=filters,
+                sort=request.args.get('sort', 'id'),
+                direction=request.args.get('dir', 'asc'),
+                search=request.args.get('q', '').strip() or None,
+                cursor=request.args.get('cursor') or None,
+                limit=request.args.get('limit', 100, type=int),
+                status_class=request.args.get('status_class', type=int),
+                content_class=request.args.get('content_class') or None
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+
+        if dataset == 'issues':
+            exclusion_patterns = get_export_exclusion_patterns()
+            if exclusion_patterns:
+                page['rows'] = filter_issues_by_exclusion_patterns(page['rows'], exclusion_patterns)
+
+        return jsonify({'success': True, **page})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/crawls/<int:crawl_id>/url_facets')
+@login_required
+def get_crawl_url_facets(crawl_id):
+    """
+    URL counts per status code, internal/external and content class for a saved
+    crawl - the filter badges and status code table of a lazily loaded crawl.
+    """
+    try:
+        from src.crawl_db import get_crawl_by_id, load_url_facets
+
+        crawl = get_crawl_by_id(crawl_id)
+        if not crawl:
+            return jsonify({'success': False, 'error': 'Crawl not found'}), 404
+        if not can_access_crawl(crawl, request.args.get('client_id')):
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+        return jsonify({'success': True, 'facets': load_url_facets(crawl_id)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/crawls/<int:crawl_id>/url_detail')
+@login_required
+def get_crawl_url_detail(crawl_id):
+    """Full data for one URL of a saved crawl (details panel of a lazily loaded crawl)"""
+    try:
+        url = request.args.get('url')
+        if not url:
+            return jsonify({'success': False, 'error': 'url is required'}), 400
+
+        crawler = get_or_create_crawler()
+        view = crawler.loaded_view
+        if view and view.crawl_id == crawl_id:
+            row = view.url_detail(url)
+        else:
+            from src.crawl_db import get_crawl_by_id, load_url_detail
+            crawl = get_crawl_by_id(crawl_id)
+            if not crawl:
+                return jsonify({'success': False, 'error': 'Crawl not found'}), 404
+            if not can_access_crawl(crawl, request.args.get('client_id')):
+                return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+            row = load_url_detail(crawl_id, url)
+
+        if not row:
+            return jsonify({'success': False, 'error': 'URL not found'}), 404
+        return jsonify({'success': True, 'url': row})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/url_detail')
+@login_required
+def get_url_detail():
+    """Full data for one URL of the crawl in this session, linked_from included"""
+    try:
+        url = request.args.get('url')
+        if not url:
+            return jsonify({'success': False, 'error': 'url is required'}), 400
+
+        crawler = get_or_create_crawler()
+        view = crawler.loaded_view
+        row = view.url_detail(url) if view else crawler.get_url_detail(url)
+        if not row:
+            return jsonify({'success': False, 'error': 'URL not found'}), 404
+        return jsonify({'success': True, 'url': row})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def _link_graph_response(analysis):
+    """Summary of a link graph analysis, or one URL's metrics when ?url= is given"""
+    url = request.args.get('url')
+    if url:
+        return jsonify({'success': True, 'url': url, 'metrics': analysis.metrics(url)})
+    limit = min(request.args.get('limit', 50, type=int), 1000)
+    return jsonify({'success': True, 'graph': analysis.summary(limit)})
+
+@app.route('/api/link_graph')
+@login_required
+def get_link_graph():
+    """Internal PageRank, inlinks, click depth and orphans for the crawl in this session"""
+    try:
+        crawler = get_or_create_crawler()
+        view = crawler.loaded_view
+        analysis = view.link_graph_analysis() if view else crawler.get_link_graph_analysis()
+        if analysis is None:
+            return jsonify({'success': False, 'error': 'No crawl data'}), 404
+        return _link_graph_response(analysis)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/issues/summary')
+@login_required
+def get_issue_summary():
+    """
+    Issue counts by severity, category and issue for the crawl in this session,
+    with the current exclusion patterns applied. issue_seq in crawl_status and
+    next_seq here are the same sequence, so the UI can fetch only newer issues.
+    """
+    try:
+        crawler = get_or_create_crawler()
+        settings_manager = get_session_settings()
+        exclusion_patterns_text = settings_manager.get_settings().get('issueExclusionPatterns', '')
+        exclusion_patterns = [p.strip() for p in exclusion_patterns_text.split('\n') if p.strip()]
+        top = request.args.get('top', type=int)
+
+        view = crawler.loaded_view if not crawler.is_running else None
+        if view:
+            summary = view.issue_summary(exclusion_patterns, top)
+        elif crawler.issue_detector:
+            summary = crawler.issue_detector.get_issue_summary(exclusion_patterns, top)
+        else:
+            # No crawl started or loaded in this session yet
+            summary = {'total': 0, 'by_type': {}, 'by_category': {}, 'by_issue': [], 'next_seq': 0}
+        return jsonify({'success': True, 'summary': summary})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/issues/rules', methods=['GET', 'POST'])
+@login_required
+def issue_rules():
+    """
+    Per-rule timing for the crawl in this session (calls, total_ms, avg_us,
+    issues, share of detection time). POST {"rule": id, "enabled": bool}
+    switches a rule for the current crawl; disabledIssueRules sets the default.
+    Crawls running in a worker are switched through their job and report the
+    stats the worker saved on its last heartbeat.
+    """
+    try:
+        crawler = get_or_create_crawler()
+        queued_crawl_id = session.get('current_crawl_id') if JOB_QUEUE_MODE and not crawler.is_running and not crawler.loaded_view else None
+        if queued_crawl_id:
+            return _queued_issue_rules(queued_crawl_id)
+
+        detector = crawler.issue_detector
+        if detector is None:
+            if request.method == 'POST':
+                return jsonify({'success': False, 'error': 'No crawl in this session. '
+                                'Use the disabledIssueRules setting to change the default rules.'}), 409
+            from src.core.issue_detector import IssueDetector
+            detector = IssueDetector(disabled_rules=crawler.config.get('disabled_issue_rules', []))
+
+        if request.method == 'POST':
+            data = request.get_json() or {}
+            if not detector.set_rule_enabled(data.get('rule'), bool(data.get('enabled', True))):
+                return jsonify({'success': False, 'error': 'Unknown rule'}), 400
+
+        return jsonify({'success': True, 'rules': detector.get_rule_stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def _queued_issue_rules(crawl_id):
+    """issue_rules for a crawl that runs in the worker pool"""
+    from src.core.issue_detector import IssueDetector, RULES
+    from src.crawl_jobs import get_job_for_crawl, set_job_issue_rule
+
+    job = get_job_for_crawl(crawl_id)
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        rule_id = data.get('rule')
+        if rule_id not in {known_id for known_id, _ in RULES}:
+            return jsonify({'success': False, 'error': 'Unknown rule'}), 400
+        if not set_job_issue_rule(crawl_id, rule_id, bool(data.get('enabled', True))):
+            return jsonify({'success': False, 'error': 'This crawl is no longer running'}), 409
+        job = get_job_for_crawl(crawl_id)
+
+    config = json.loads(job['config_snapshot']) if job and job.get('config_snapshot') else {}
+    detector = IssueDetector(disabled_rules=config.get('disabled_issue_rules', []))
+    if job and job.get('rule_stats'):
+        detector.load_rule_stats(json.loads(job['rule_stats']))
+    return jsonify({'success': True, 'rules': detector.get_rule_stats()})
+
+@app.route('/api/crawls/<int:crawl_id>/link_graph')
+@login_required
+def get_crawl_link_graph(crawl_id):
+    """Link graph metrics for a saved crawl, rebuilt from its links"""
+    try:
+        crawler = get_or_create_crawler()
+        view = crawler.loaded_view
+        if not (view and view.crawl_id == crawl_id):
+            from src.crawl_db import get_crawl_by_id
+            from src.crawl_view import LazyCrawlView
+            crawl = get_crawl_by_id(crawl_id)
+            if not crawl:
+                return jsonify({'success': False, 'error': 'Crawl not found'}), 404
+            if not can_access_crawl(crawl, request.args.get('client_id')):
+                return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+            view = LazyCrawlView(crawl)
+        return _link_graph_response(view.link_graph_analysis())
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/crawls/<int:crawl_id>/load', methods=['POST'])
 @login_required
 def load_crawl_into_session(crawl_id):
     """Load a historical crawl into the current session"""
     try:
         user_id = session.get('user_id')
-        from src.crawl_db import get_crawl_by_id, load_crawled_urls, load_crawl_links, load_crawl_issues
+        from src.crawl_db import get_crawl_by_id
 
         # Get crawl metadata
         crawl = get_crawl_by_id(crawl_id)
@@ -1364,56 +1591,27 @@ def load_crawl_into_session(crawl_id):
         if crawler.is_running:
             crawler.stop_crawl()
 
-        # Load all data from database
-        urls = load_crawled_urls(crawl_id)
-        links = load_crawl_links(crawl_id)
-        issues = load_crawl_issues(crawl_id)
+        # Serve the crawl through a lazy, page-cached view instead of loading every row
+        from src.crawl_snapshot import write_snapshot_async
+        view = attach_crawl_view(crawler, crawl)
 
-        # Inject into current crawler instance
-        with crawler.results_lock:
-            crawler.crawl_results = urls
-            crawler.stats['crawled'] = len(urls)
-            crawler.stats['discovered'] = len(urls)
-            crawler.base_url = crawl['base_url']
-            crawler.base_domain = crawl['base_domain']
-            
-            # [NEW] Restore Robots.txt and PageSpeed data
-            if crawl.get('robots_data'):
-                crawler.robots_data = crawl['robots_data']
-            
-            if crawl.get('pagespeed_results'):
-                crawler.stats['pagespeed_results'] = crawl['pagespeed_results']
+        # Completed crawls get a memory-mapped snapshot for the next load
+        if crawl.get('status') == 'completed' and not view.use_snapshot:
+            write_snapshot_async(crawl_id)
 
-        # Initialize link_manager if not exists
-        if not crawler.link_manager:
-            from src.core.link_manager import LinkManager
-            crawler.link_manager = LinkManager(crawl['base_domain'], trap_threshold=100)
-
-        # Load links into link manager
-        crawler.link_manager.all_links = links
-        # Rebuild links_set
-        crawler.link_manager.links_set.clear()
-        for link in links:
-            link_key = f"{link['source_url']}|{link['target_url']}"
-            crawler.link_manager.links_set.add(link_key)
-
-        # Initialize issue_detector if not exists
-        if not crawler.issue_detector:
-            from src.core.issue_detector import IssueDetector
-            crawler.issue_detector = IssueDetector(crawler.config.get('issue_exclusion_patterns', []))
-
-        # Load issues into issue detector
-        crawler.issue_detector.detected_issues = issues
+        session['current_crawl_id'] = crawl_id
+        session['loaded_crawl_id'] = crawl_id
 
         # Set Flask session flag for force full refresh
         session['force_full_refresh'] = True
 
+        counts = view.counts
         return jsonify({
             'success': True,
-            'message': f'Loaded {len(urls)} URLs, {len(links)} links, {len(issues)} issues',
-            'urls_count': len(urls),
-            'links_count': len(links),
-            'issues_count': len(issues),
+            'message': f"Loaded {counts['urls']} URLs, {counts['links']} links, {counts['issues']} issues",
+            'urls_count': counts['urls'],
+            'links_count': counts['links'],
+            'issues_count': counts['issues'],
             'should_refresh_ui': True
         })
 
@@ -1430,6 +1628,13 @@ def resume_crawl_endpoint(crawl_id):
         user_id = session.get('user_id')
         session_id = session.get('session_id')
 
+        if JOB_QUEUE_MODE:
+            success, message = queue_crawl_resume(crawl_id, user_id)
+            if success:
+                session['current_crawl_id'] = crawl_id
+                session.pop('loaded_crawl_id', None)
+            return jsonify({'success': success, 'message': message})
+
         # Get crawler for this session
         crawler = get_or_create_crawler()
 
@@ -1438,6 +1643,7 @@ def resume_crawl_endpoint(crawl_id):
 
         if success:
             session['current_crawl_id'] = crawl_id
+            session.pop('loaded_crawl_id', None)
 
         return jsonify({'success': success, 'message': message})
     except Exception as e:
@@ -1462,6 +1668,9 @@ def delete_crawl_endpoint(crawl_id):
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         success = delete_crawl(crawl_id)
+        if success:
+            from src.crawl_snapshot import delete_snapshot
+            delete_snapshot(crawl_id)
         return jsonify({'success': success, 'message': 'Crawl deleted successfully' if success else 'Failed to delete crawl'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -1521,24 +1730,30 @@ def crawl_stats():
 @app.route('/api/export_data', methods=['POST'])
 @login_required
 def export_data():
+    """
+    Format crawl data sent by the browser (a crawl opened from a file).
+    Crawls the server holds - live, loaded or saved - are streamed by /api/export/<dataset>.
+    """
     try:
         data = request.get_json()
         export_format = data.get('format', 'csv')
         export_fields = data.get('fields', ['url', 'status_code', 'title'])
         local_data = data.get('localData', {})
 
-        # Use local data if provided (from loaded crawl), otherwise get from crawler
-        if local_data and local_data.get('urls'):
-            urls = local_data.get('urls', [])
-            links = local_data.get('links', [])
-            issues = local_data.get('issues', [])
-        else:
-            # Get current crawl results
+        if not (local_data and local_data.get('urls')):
             crawler = get_or_create_crawler()
-            crawl_data = crawler.get_status()
-            urls = crawl_data.get('urls', [])
-            links = crawl_data.get('links', [])
-            issues = crawl_data.get('issues', [])
+            crawl_id = data.get('crawl_id') or (crawler.loaded_view.crawl_id if crawler.loaded_view else None)
+            if crawl_id or crawler.crawl_results:
+                query = f'?crawl_id={crawl_id}' if crawl_id else ''
+                return jsonify({
+                    'success': False,
+                    'error': f'This crawl is exported from /api/export/<dataset>{query}'
+                }), 400
+            return jsonify({'success': False, 'error': 'No data to export'})
+
+        urls = local_data.get('urls', [])
+        links = local_data.get('links', [])
+        issues = local_data.get('issues', [])
 
         if not urls:
             return jsonify({'success': False, 'error': 'No data to export'})
@@ -1558,7 +1773,6 @@ def export_data():
             exclusion_patterns_text = current_settings.get('issueExclusionPatterns', '')
             exclusion_patterns = [p.strip() for p in exclusion_patterns_text.split('\n') if p.strip()]
             issues = filter_issues_by_exclusion_patterns(issues, exclusion_patterns)
-            print(f"DEBUG: After exclusion filter, {len(issues)} issues remain")
 
         # Collect files to export based on special field selections
         files_to_export = []
@@ -1570,15 +1784,6 @@ def export_data():
         # Remove special fields from regular export fields
         regular_fields = [f for f in export_fields if f not in ['issues_detected', 'links_detailed']]
 
-        # Debug logging
-        print(f"DEBUG: export_fields = {export_fields}")
-        print(f"DEBUG: has_issues_export = {has_issues_export}")
-        print(f"DEBUG: has_links_export = {has_links_export}")
-        print(f"DEBUG: regular_fields = {regular_fields}")
-        print(f"DEBUG: len(urls) = {len(urls)}")
-        print(f"DEBUG: len(links) = {len(links)}")
-        print(f"DEBUG: len(issues) = {len(issues)}")
-
         # Generate issues export if requested
         if has_issues_export:
             if export_format == 'csv':
@@ -1674,6 +1879,128 @@ def export_data():
         return jsonify({'success': False, 'error': str(e)})
 
 
+def can_access_crawl(crawl, client_id_param=None):
+    """Owner (or anyone in local mode), or the linked client when the crawl is shared"""
+    user_id = session.get('user_id')
+    if user_id and (crawl.get('user_id') == user_id or LOCAL_MODE):
+        return True
+    if crawl.get('show_to_client') and str(crawl.get('client_id')) == str(client_id_param):
+        return True
+    return False
+
+def get_export_exclusion_patterns():
+    """Current issue exclusion patterns for this session"""
+    current_settings = get_session_settings().get_settings()
+    exclusion_patterns_text = current_settings.get('issueExclusionPatterns', '')
+    return [p.strip() for p in exclusion_patterns_text.split('\n') if p.strip()]
+
+def _live_export_rows(crawler, dataset):
+    """
+    Rows from the crawler in this session, or None if it holds no data.
+    Only the row lists are copied (references, not the row dicts).
+    """
+    with crawler.results_lock:
+        urls = list(crawler.crawl_results)
+    if not urls:
+        return None
+
+    if dataset == 'urls':
+        # Rows keep only the linked_from count; the pages come from the inlink index
+        return (crawler.with_linked_from(url_data) for url_data in urls)
+    if dataset == 'links':
+        if not crawler.link_manager:
+            return []
+        with crawler.link_manager.links_lock:
+            links = list(crawler.link_manager.all_links)
+        status_lookup = {url_data['url']: url_data.get('status_code') for url_data in urls}
+        return apply_link_statuses(links, status_lookup)
+    return crawler.issue_detector.get_issues() if crawler.issue_detector else []
+
+def _saved_export_rows(crawl_id, dataset):
+    """Rows read from the crawl DB page by page"""
+    from src.crawl_db import iter_crawled_urls, iter_crawl_links, iter_crawl_issues, load_url_statuses
+
+    if dataset == 'urls':
+        return iter_crawled_urls(crawl_id)
+    if dataset == 'links':
+        return apply_link_statuses(iter_crawl_links(crawl_id), load_url_statuses(crawl_id))
+    return iter_crawl_issues(crawl_id)
+
+@app.route('/api/export/<dataset>')
+@login_required
+def export_stream(dataset):
+    """
+    Stream an export as a file download.
+    dataset: urls | links | issues
+    Query: format (csv/json/xml/parquet/arrow), fields (comma separated, urls only),
+    crawl_id (export a saved crawl), client_id, gzip=1
+    """
+    try:
+        from src.crawl_snapshot import COLUMNAR_FORMATS, PYARROW_AVAILABLE, stream_columnar
+
+        if dataset not in ('urls', 'links', 'issues'):
+            return jsonify({'success': False, 'error': 'Unknown export dataset'}), 404
+
+        export_format = request.args.get('format', 'csv')
+        columnar = export_format in COLUMNAR_FORMATS
+        if dataset != 'urls' and export_format not in ('csv', 'json') and not columnar:
+            export_format = 'csv'  # Links and issues fall back to CSV, same as /api/export_data
+        if columnar and not PYARROW_AVAILABLE:
+            return jsonify({'success': False, 'error': 'Parquet/Arrow exports need pyarrow installed on the server'}), 501
+        if export_format not in MIMETYPES and not columnar:
+            return jsonify({'success': False, 'error': 'Unsupported export format'}), 400
+
+        fields = [f for f in request.args.get('fields', 'url,status_code,title').split(',') if f]
+        compress = request.args.get('gzip') in ('1', 'true')
+        crawl_id = request.args.get('crawl_id', type=int)
+
+        rows = None
+        if not crawl_id:
+            rows = _live_export_rows(get_or_create_crawler(), dataset)
+            if rows is None:
+                crawl_id = session.get('current_crawl_id')
+
+        if rows is None:
+            if not crawl_id:
+                return jsonify({'success': False, 'error': 'No data to export'}), 404
+
+            from src.crawl_db import get_crawl_by_id
+            crawl = get_crawl_by_id(crawl_id)
+            if not crawl:
+                return jsonify({'success': False, 'error': 'Crawl not found'}), 404
+            if not can_access_crawl(crawl, request.args.get('client_id')):
+                return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+            rows = _saved_export_rows(crawl_id, dataset)
+
+        if dataset == 'issues':
+            rows = exclude_issues(rows, get_export_exclusion_patterns())
+
+        name = {'urls': 'export', 'links': 'links', 'issues': 'issues'}[dataset]
+        filename = f'librecrawl_{name}_{crawl_id or "current"}_{int(time.time())}.{export_format}'
+        if columnar:
+            mimetype = COLUMNAR_FORMATS[export_format]
+        elif compress:
+            filename += '.gz'
+            mimetype = 'application/gzip'
+        else:
+            mimetype = MIMETYPES[export_format]
+
+        if request.method == 'HEAD':
+            # Download preflight: the checks above passed, nothing is streamed
+            response = Response(mimetype=mimetype)
+        elif columnar:
+            # Every column is exported; Parquet is already compressed
+            response = Response(stream_with_context(stream_columnar(dataset, export_format, rows)), mimetype=mimetype)
+        else:
+            body = encode_chunks(stream_export(dataset, export_format, rows, fields), compress=compress)
+            response = Response(stream_with_context(body), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # =============================================================================
 # CLIENT DATA MANAGEMENT API
 # =============================================================================
@@ -2409,6 +2736,51 @@ def get_client_dashboard_data():
 
 
 
+def queued_crawl_control(action):
+    """Forward pause/resume/stop for the session's queued crawl to its worker"""
+    from src.crawl_jobs import request_job_control
+
+    crawl_id = session.get('current_crawl_id')
+    if not crawl_id:
+        return {'success': False, 'message': 'No crawl in progress'}
+
+    if not request_job_control(crawl_id, action):
+        return {'success': False, 'message': 'No crawl in progress'}
+
+    messages = {'pause': 'Crawl pause requested', 'resume': 'Crawl resume requested', 'stop': 'Crawl stop requested'}
+    return {'success': True, 'message': messages.get(action, 'Request sent')}
+
+def queue_crawl_resume(crawl_id, user_id):
+    """Queue a saved crawl for the worker pool; the worker restores it from its checkpoint"""
+    from src.crawl_db import get_resume_data
+    from src.crawl_jobs import enqueue_crawl_job, get_active_job_crawl_ids
+
+    crawl_data = get_resume_data(crawl_id)
+    if not crawl_data:
+        return False, "Cannot resume this crawl - not found"
+
+    if crawl_data['status'] not in ['paused', 'failed', 'running']:
+        return False, f"Cannot resume crawl with status: {crawl_data['status']}"
+
+    if user_id and crawl_data.get('user_id') != user_id:
+        return False, "Unauthorized - you don't own this crawl"
+
+    if crawl_id in get_active_job_crawl_ids():
+        return False, "Crawl is already queued or running"
+
+    job_id = enqueue_crawl_job(
+        crawl_id,
+        crawl_data['base_url'],
+        crawl_data.get('config_snapshot') or {},
+        user_id=crawl_data.get('user_id'),
+        session_id=crawl_data.get('session_id'),
+        client_id=crawl_data.get('client_id')
+    )
+    if not job_id:
+        return False, "Could not queue crawl"
+
+    return True, "Crawl queued for resume"
+
 def recover_crashed_crawls():
     """Check for and recover any crashed crawls on startup"""
     try:
@@ -2416,6 +2788,12 @@ def recover_crashed_crawls():
 
         crashed = get_crashed_crawls()
 
+        if JOB_QUEUE_MODE:
+            # Crawls owned by the worker pool survive web restarts
+            from src.crawl_jobs import get_active_job_crawl_ids
+            active = get_active_job_crawl_ids()
+            crashed = [crawl for crawl in crashed if crawl['id'] not in active]
+
         if crashed:
             print("\n" + "=" * 60)
             print("CRASH RECOVERY")
@@ -2460,15 +2838,41 @@ def graceful_shutdown(signum, frame):
 
 
 
+def print_banner():
+    print("=" * 60)
+    print("LibreCrawl - SEO Spider")
+    print("=" * 60)
+    print(f"\n[*] Server starting on http://{args.host}:{args.port}")
+    print(f"[*] Access from browser: http://localhost:{args.port}")
+    print(f"[*] Access from network: http://<your-ip>:{args.port}")
+    print(f"\n[+] Multi-tenancy enabled - each browser session is isolated")
+    if JOB_QUEUE_MODE:
+        print(f"[+] Job queue mode - crawls run in the worker pool (python -m src.crawl_worker)")
+    print(f"[+] {SERVER_PROCESSES} server process(es) x {args.threads} threads")
+    print(f"[+] Settings stored in browser localStorage")
+    print(f"\nPress Ctrl+C to stop the server\n")
+    print("=" * 60 + "\n")
+
 def main():
-    # [FIX] Initialize Playwright globally before signal handlers
-    # This prevents Playwright's lazy loading from overwriting our signal handlers later
-    try:
-        from src.gmb_core.crawler.geo_driver import get_playwright_manager
-        print("Initializing Global Playwright Manager...")
-        get_playwright_manager()
-    except Exception as e:
-        print(f"Warning: Failed to pre-initialize Playwright: {e}")
+    if SERVER_PROCESSES > 1 and args.listen_fd is None:
+        # Supervisor: bind the port and keep the server processes running
+        from src.web_pool import run_pool
+        recover_crashed_crawls()
+        print_banner()
+        run_pool(os.path.abspath(__file__), sys.argv[1:], args.host, args.port, SERVER_PROCESSES)
+        return
+
+    # Playwright starts on the first GMB crawl. Set PREWARM_PLAYWRIGHT=1 to pay the
+    # startup cost here instead; it has to run before the signal handlers are
+    # installed. Started later from a request thread it cannot touch them
+    # (signal handlers can only be set from the main thread).
+    if os.getenv('PREWARM_PLAYWRIGHT', '').lower() in ('1', 'true', 'yes'):
+        try:
+            from src.gmb_core.crawler.geo_driver import get_playwright_manager
+            print("Initializing Global Playwright Manager...")
+            get_playwright_manager()
+        except Exception as e:
+            print(f"Warning: Failed to pre-initialize Playwright: {e}")
 
 
     import signal
@@ -2477,28 +2881,26 @@ def main():
     signal.signal(signal.SIGINT, graceful_shutdown)
     signal.signal(signal.SIGTERM, graceful_shutdown)
 
-    # Recover any crashed crawls from previous session
-    recover_crashed_crawls()
-
     # Start cleanup thread for old crawler instances
     start_cleanup_thread()
 
-    print("=" * 60)
-    print("LibreCrawl - SEO Spider")
-    print("=" * 60)
-    print(f"\n[*] Server starting on http://0.0.0.0:5000")
-    print(f"[*] Access from browser: http://localhost:5000")
-    print(f"[*] Access from network: http://<your-ip>:5000")
-    print(f"\n[+] Multi-tenancy enabled - each browser session is isolated")
-    print(f"[+] Settings stored in browser localStorage")
-    print(f"\nPress Ctrl+C to stop the server\n")
-    print("=" * 60 + "\n")
+    threads = max(1, args.threads)
+    if args.listen_fd is not None:
+        # One of the supervisor's server processes (crash recovery ran there)
+        from src.web_pool import serve_inherited
+        serve_inherited(app, args.listen_fd, threads)
+        return
+
+    # Recover any crashed crawls from previous session
+    recover_crashed_crawls()
+
+    print_banner()
 
     # Run Flask server with Waitress (production-grade WSGI server)
     from waitress import serve
-    print("Starting LibreCrawl on http://localhost:5000")
+    print(f"Starting LibreCrawl on http://localhost:{args.port}")
     print("Using Waitress WSGI server with multi-threading support")
-    serve(app, host='0.0.0.0', port=5000, threads=1)
+    serve(app, host=args.host, port=args.port, threads=threads)
 
 if __name__ == '__main__':
     main()
@@ -1,4 +1,5 @@
 
+import importlib.util
 import os
 import json
 import logging
@@ -8,17 +9,42 @@ from typing import Optional, List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
-# Try to import google.generativeai
-GEMINI_AVAILABLE = False
-genai = None
-
+# Check for google.generativeai without importing it - calls go through the REST API,
+# and importing the SDK (grpc, protobuf types) takes half a second at startup
 try:
-    import google.generativeai as _genai
-    genai = _genai
-    GEMINI_AVAILABLE = True
-except ImportError:
+    GEMINI_AVAILABLE = importlib.util.find_spec('google.generativeai') is not None
+except (ImportError, ValueError):
+    GEMINI_AVAILABLE = False
+if not GEMINI_AVAILABLE:
     logger.warning("google-generativeai not installed. Run: pip install google-generativeai")
 
+_session = None
+
+
+def _http_session():
+    """Shared HTTP session, so repeated prompts reuse the TLS connection to the API"""
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+
+def _page_statistics(summary: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in summary.get('pages', {}).items() if key != 'first'}
+
+
+def _prompt_context(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of an audit summary worth sending to the model"""
+    return {
+        'stats': summary.get('stats', {}),
+        'pages': _page_statistics(summary),
+        'issues': summary.get('issues', {}),
+        'representative_pages': summary.get('samples', []),
+        'slowest_pages': summary.get('slowest', [])
+    }
+
+
 class AuditAIService:
     """
     AI Service for chatting with Audit Data using Google Gemini.
@@ -40,9 +66,8 @@ class AuditAIService:
         if not self.is_available():
             return "AI service is not available. Please check API key."
 
-        import requests
-        
         loop = asyncio.get_event_loop()
+        session = _http_session()
         
         # Retry configuration
         max_retries = 5
@@ -55,7 +80,7 @@ class AuditAIService:
                 headers = {'Content-Type': 'application/json'}
                 data = {"contents": [{"parts": [{"text": prompt}]}]}
                 
-                func = functools.partial(requests.post, url, headers=headers, json=data, timeout=60)
+                func = functools.partial(session.post, url, headers=headers, json=data, timeout=60)
                 response = await loop.run_in_executor(None, func)
                 
                 if response.status_code == 200:
@@ -67,6 +92,9 @@ class AuditAIService:
                 elif response.status_code in [429, 503]:
                     # Rate limited or Overloaded - Retry
                     wait_time = base_delay * (2 ** attempt)
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit():
+                        wait_time = max(wait_time, int(retry_after))
                     logger.warning(f"Gemini API {response.status_code}. Retrying in {wait_time}s...")
                     await asyncio.sleep(wait_time)
                     continue
@@ -83,54 +111,21 @@ class AuditAIService:
         
         return "Error: Maximum retries exceeded for AI service."
 
-    async def chat_with_audit(self, question: str, audit_data: Dict[str, Any]) -> str:
+    async def chat_with_audit(self, question: str, summary: Dict[str, Any]) -> str:
         """
-        Chat with the audit data.
-        
+        Answer a question about a crawl.
+
         Args:
             question: User's question
-            audit_data: Dictionary containing crawl results (urls, issues, stats, etc.)
+            summary: Audit summary of the crawl (see src/audit/summary.py)
         """
         if not self.is_available():
             return "AI service is not available."
 
-        # Prepare context from audit data
-        # We need to serialize this efficiently.
-        # Focus on Issues, Stats, and a summary of URLs.
-        
-        stats = audit_data.get('stats', {})
-        issues = audit_data.get('issues', [])
-        urls = audit_data.get('urls', [])
-        
-        # Summarize Issues
-        issue_summary = {}
-        for issue in issues:
-            cat = issue.get('category', 'other')
-            if cat not in issue_summary:
-                issue_summary[cat] = []
-            issue_summary[cat].append(f"{issue.get('issue')}: {issue.get('url')}")
-            
-        # Summarize URLs (just stats)
-        url_status_counts = {}
-        for url in urls:
-            status = url.get('status', 'unknown')
-            url_status_counts[status] = url_status_counts.get(status, 0) + 1
-
-        context = f"""
-Audit Statistics:
-{json.dumps(stats, indent=2)}
-
-URL Status Counts:
-{json.dumps(url_status_counts, indent=2)}
-
-Detected Issues (Grouped by Category):
-{json.dumps(issue_summary, indent=2)}
-
-Total URLs Crawled: {len(urls)}
-Total Issues Found: {len(issues)}
-"""
+        context = json.dumps(_prompt_context(summary), indent=1)
 
-        prompt = f"""You are an expert SEO Audit Assistant. You have access to the crawl data of a website.
+        prompt = f"""You are an expert SEO Audit Assistant. You have access to a summary of the crawl data of a website:
+aggregate page statistics, issue counts with example URLs, and one representative page per URL template.
 Use the following context to answer the user's question.
 
 FORMATTING INSTRUCTIONS:
@@ -149,17 +144,19 @@ User Question: "{question}"
 
 Answer:"""
 
-    def _validate_audit_data(self, audit_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await self._generate_content(prompt)
+
+    def _validate_audit_data(self, summary: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Validate audit data before sending to AI.
+        Validate the audit summary before sending to AI.
         Returns error dict if validation fails, None if valid.
         """
-        stats = audit_data.get('stats', {})
-        issues = audit_data.get('issues', [])
-        urls = audit_data.get('urls', [])
+        pages = summary.get('pages', {})
+        total = pages.get('total', 0)
+        issue_total = summary.get('issues', {}).get('total', 0)
         
         # Check 1: Empty crawl (no URLs)
-        if not urls:
+        if not total:
             return {
                 "error": True,
                 "error_code": "NO_DATA",
@@ -169,18 +166,18 @@ Answer:"""
             }
         
         # Check 2: All URLs are 4xx/5xx errors
-        error_count = sum(1 for u in urls if u.get('status_code', 0) >= 400 or u.get('status_code', 0) == 0)
-        if error_count == len(urls):
+        status_classes = pages.get('status_classes', {})
+        if not status_classes.get('2xx') and not status_classes.get('3xx'):
             return {
                 "error": True,
                 "error_code": "ALL_ERRORS",
-                "error_message": f"All {len(urls)} crawled pages returned errors (4xx/5xx). The site may be down or blocked.",
+                "error_message": f"All {total} crawled pages returned errors (4xx/5xx). The site may be down or blocked.",
                 "executive_summary": "Analysis failed: All pages returned HTTP errors.",
                 "site_goal": "Unknown"
             }
 
         # Check 3: Check if homepage is a non-HTML file (pdf, image, etc.)
-        first_url = urls[0] if urls else {}
+        first_url = pages.get('first') or {}
         content_type = first_url.get('content_type', '').lower() if first_url.get('content_type') else 'text/html'
         
         non_html_types = ['application/pdf', 'image/', 'text/plain', 'application/json', 'application/xml']
@@ -197,7 +194,7 @@ Answer:"""
         
         # Check 4: Plain HTML placeholder
         # If we have 0 issues and minimal content, warn about potential plain HTML file
-        if len(issues) == 0 and len(urls) == 1:
+        if issue_total == 0 and total == 1:
             word_count = first_url.get('word_count', 0)
             if word_count is None or word_count < 20:
                 return {
@@ -210,36 +207,21 @@ Answer:"""
         
         return None  # Validation passed
 
-    async def generate_insights(self, audit_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_insights(self, summary: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Generate strategic insights from audit data.
+        Generate strategic insights from the audit summary of a crawl.
         Returns a structured JSON object.
         """
         if not self.is_available():
             return {"error": True, "error_code": "AI_UNAVAILABLE", "error_message": "AI service not available. Please check your API key configuration."}
 
         # Pre-validation
-        validation_error = self._validate_audit_data(audit_data)
+        validation_error = self._validate_audit_data(summary)
         if validation_error:
             return validation_error
 
-        stats = audit_data.get('stats', {})
-        issues = audit_data.get('issues', [])
-        urls = audit_data.get('urls', [])
-
-        # Calculate high-level metrics for context
-        total_urls = len(urls)
-        total_issues = len(issues)
-        critical_issues = len([i for i in issues if i.get('severity') == 'high' or 'critical' in i.get('severity', '').lower()])
-
-        # Group issues by severity
-        errors = [i for i in issues if i.get('type') == 'error']
-        warnings = [i for i in issues if i.get('type') == 'warning']
-        infos = [i for i in issues if i.get('type') == 'info']
-
-        # Construct prioritized issue list for AI (limit to maintain context)
-        # Prioritize showing Errors, then Warnings, then Infos
-        prioritized_issues = errors[:25] + warnings[:20] + infos[:10]
+        stats = summary.get('stats', {})
+        by_type = summary.get('issues', {}).get('by_type', {})
 
         # Define JSON structure separately to avoid f-string nesting depth errors
         json_template = """
@@ -292,19 +274,21 @@ Answer:"""
         You are a World-Class SEO Consultant & Growth Hacker. Analyze the technical audit data below to create a high-impact strategic roadmap.
         
         **Website Context:**
-        - URL: {audit_data['stats'].get('base_url')}
-        - Pages Crawled: {audit_data['stats'].get('crawled')}
-        - Score: {audit_data['stats'].get('score')}
+        - URL: {stats.get('base_url')}
+        - Pages Crawled: {stats.get('crawled')}
+        
+        **Page Statistics:**
+        {json.dumps(_page_statistics(summary), indent=1)}
         
         **Issue Summary:**
-        - Critical Errors: {len(errors)} 
-        - Warnings: {len(warnings)}
+        - Critical Errors: {by_type.get('error', 0)}
+        - Warnings: {by_type.get('warning', 0)}
         
-        **Top Issues (Prioritized):**
-        {json.dumps(prioritized_issues, indent=2)}
+        **Top Issues (Prioritized, with counts and example URLs):**
+        {json.dumps(summary.get('issues', {}).get('top', []), indent=1)}
         
-        **Top URLs:**
-        {json.dumps(audit_data['urls'][:10], indent=2)}
+        **Representative Pages (one per URL template):**
+        {json.dumps(summary.get('samples', [])[:10], indent=1)}
         
         ---
         **YOUR TASK:**
@@ -354,7 +338,7 @@ Answer:"""
         try:
             result = json.loads(cleaned_text)
             # Inject URL for frontend use (e.g., Keyword Density)
-            result['url'] = audit_data['stats'].get('base_url')
+            result['url'] = stats.get('base_url')
             return result
         except json.JSONDecodeError:
             logger.error(f"Failed to parse AI insights JSON: {cleaned_text[:100]}...")
@@ -363,49 +347,9 @@ Answer:"""
                 "site_goal": "Unknown",
                 "focus_scores": [],
                 "roadmap": [],
-                "url": audit_data['stats'].get('base_url') # Ensure URL is returned even on error
+                "url": stats.get('base_url') # Ensure URL is returned even on error
             }
 
-    async def chat_with_audit(self, question, audit_data):
-        """
-        Chat with the audit data to answer user questions.
-        """
-        if not self.model:
-             return {"answer": "AI service is not initialized.", "status": "error"}
-
-        # Construct a condensed context to fit in prompt
-        stats = audit_data.get('stats', {})
-        issues = audit_data.get('issues', [])
-        
-        # Summarize top issues
-        top_issues = [i for i in issues if i.get('severity') == 'high'][:10]
-        issue_summary = "\n".join([f"- {i.get('title')}: {i.get('description')}" for i in top_issues])
-        
-        prompt = f"""
-        You are an SEO Expert Assistant. You are analyzing a website audit for {stats.get('base_url', 'this site')}.
-        
-        **Audit Context:**
-        - Total Pages: {stats.get('crawled')}
-        - Score: {stats.get('score')}
-        
-        **Critical Issues Found:**
-        {issue_summary}
-        
-        **User Question:**
-        "{question}"
-        
-        **Your Answer:**
-        Provide a helpful, data-backed answer based on the context above. Use bullet points if listing items. Keep it concise (under 150 words).
-        If the question is about specific pages, admit if you don't have that granular detail but offer general advice.
-        """
-        
-        try:
-            response = await self._generate_content(prompt)
-            return {"answer": response, "status": "success"}
-        except Exception as e:
-            logger.error(f"Chat error: {str(e)}")
-            return {"answer": "I'm having trouble analyzing that right now.", "status": "error"}
-
     async def generate_llms_txt(self, base_url: str, sitemap_urls: List[str]) -> str:
         """
         Generate an llms.txt file based on sitemap URLs.
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, current_app
 import asyncio
 import logging
 import threading
@@ -7,7 +7,8 @@ from typing import Dict, Any
 
 from .ai_service import AuditAIService
 from src.keyword.keyword_analyzer import KeywordDensityAnalyzer
-from src.crawl_db import get_crawl_by_id, load_crawled_urls, load_crawl_issues, load_crawl_links, get_audit_insights, save_audit_insights
+from .summary import get_or_build_summary
+from src.crawl_db import get_crawl_by_id, get_audit_insights, save_audit_insights
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,22 @@ def run_async(coro):
             pass
         loop.close()
 
+def access_error(crawl, client_id=None):
+    """
+    401/403 response unless this session may read the crawl: same rule as
+    main.can_access_crawl (the logged-in owner, any logged-in user in local
+    mode, or the linked client of a shared crawl). None when access is allowed.
+    """
+    local_mode = current_app.config.get('LOCAL_MODE', False)
+    user_id = session.get('user_id')
+    if user_id and (crawl.get('user_id') == user_id or local_mode):
+        return None
+    if crawl.get('show_to_client') and str(crawl.get('client_id')) == str(client_id):
+        return None
+    if not user_id:
+        return jsonify({'success': False, 'error': 'Authentication required'}), 401
+    return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
 # Shared AI service instance
 _ai_service = None
 
@@ -71,29 +88,16 @@ def chat_with_audit():
         crawl = get_crawl_by_id(crawl_id)
         if not crawl:
             return jsonify({'success': False, 'error': 'Crawl not found'}), 404
+        denied = access_error(crawl, data.get('client_id'))
+        if denied:
+            return denied
 
-        # Prepare Audit Data
-        stats = {
-            'crawled': crawl['urls_crawled'],
-            'discovered': crawl['urls_discovered'],
-            'base_url': crawl['base_url']
-        }
-
-        issues = load_crawl_issues(crawl_id)
-        issues_list = [serialize_row(i) for i in issues] if issues else []
-
-        urls = load_crawled_urls(crawl_id, limit=100)
-        urls_list = [serialize_row(u) for u in urls] if urls else []
-
-        audit_data = {
-            'stats': stats,
-            'issues': issues_list,
-            'urls': urls_list
-        }
+        # Compact summary of the crawl, built once and reused until the crawl changes
+        summary = get_or_build_summary(crawl_id, crawl)
 
         ai_service = get_ai_service()
         # Use run_async helper for async call in sync route
-        answer = run_async(ai_service.chat_with_audit(question, audit_data))
+        answer = run_async(ai_service.chat_with_audit(question, summary))
         return jsonify({'success': True, 'answer': answer})
 
     except Exception as e:
@@ -101,6 +105,31 @@ def chat_with_audit():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@audit_bp.route('/summary', methods=['GET'])
+def audit_summary():
+    """
+    Audit summary the AI prompts are built from (aggregates, top issues, sample pages).
+    """
+    try:
+        crawl_id = request.args.get('crawl_id', type=int) or session.get('current_crawl_id')
+        if not crawl_id:
+            return jsonify({'success': False, 'error': 'No crawl ID provided'}), 400
+
+        crawl = get_crawl_by_id(crawl_id)
+        if not crawl:
+            return jsonify({'success': False, 'error': 'Crawl not found'}), 404
+        denied = access_error(crawl, request.args.get('client_id'))
+        if denied:
+            return denied
+
+        summary = get_or_build_summary(crawl_id, crawl, rebuild=request.args.get('rebuild') == '1')
+        return jsonify({'success': True, 'summary': summary})
+
+    except Exception as e:
+        logger.error(f"Error building audit summary: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @audit_bp.route('/insights', methods=['POST'])
 def generate_audit_insights():
     """
@@ -117,6 +146,9 @@ def generate_audit_insights():
         crawl = get_crawl_by_id(crawl_id)
         if not crawl:
             return jsonify({'success': False, 'error': 'Crawl not found'}), 404
+        denied = access_error(crawl, data.get('client_id'))
+        if denied:
+            return denied
 
         # Check for existing insights (unless regenerating)
         if not regenerate:
@@ -125,27 +157,11 @@ def generate_audit_insights():
                 return jsonify({'success': True, 'insights': stored_insights, 'source': 'database'})
 
         # Prepare Data
-        stats = {
-            'crawled': crawl['urls_crawled'],
-            'discovered': crawl['urls_discovered'],
-            'base_url': crawl['base_url']
-        }
-        
-        issues = load_crawl_issues(crawl_id)
-        issues_list = [serialize_row(i) for i in issues] if issues else []
-        
-        urls = load_crawled_urls(crawl_id, limit=200)
-        urls_list = [serialize_row(u) for u in urls] if urls else []
-
-        audit_data = {
-            'stats': stats,
-            'issues': issues_list,
-            'urls': urls_list
-        }
+        summary = get_or_build_summary(crawl_id, crawl, rebuild=regenerate)
         
         ai_service = get_ai_service()
         
-        insights = run_async(ai_service.generate_insights(audit_data))
+        insights = run_async(ai_service.generate_insights(summary))
         
         # Integrate Keyword Data
         try:
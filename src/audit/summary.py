@@ -0,0 +1,228 @@
+"""
+Audit summary
+A compact digest of a crawl for the AI audit: page aggregates, issue counts
+with the most important issue kinds, and one representative page per URL
+template. It is built in one streaming pass over the crawl's rows, stored in
+audit_summaries and rebuilt only when the crawl has changed since, so chat
+and insight prompts stay small no matter how large the crawl is.
+"""
+import heapq
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from src.core.pagespeed_runner import template_signature
+from src.crawl_db import get_crawl_by_id, iter_audit_rows, iter_issue_codes, get_audit_summary, save_audit_summary
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_VERSION = 1
+
+TOP_ISSUES = 25
+ISSUE_SAMPLE_URLS = 3
+SAMPLE_PAGES = 12
+SLOWEST_PAGES = 5
+# Templates tracked for sampling; later ones on trap-heavy sites are ignored
+MAX_TEMPLATES = 5000
+THIN_CONTENT_WORDS = 200
+
+TYPE_RANK = {'error': 0, 'warning': 1, 'info': 2}
+
+
+def _fingerprint(crawl: Dict[str, Any]) -> Dict[str, Any]:
+    """What a stored summary was built from; any change means it is stale"""
+    return {
+        'status': crawl.get('status'),
+        'urls_crawled': crawl.get('urls_crawled'),
+        'last_saved_at': str(crawl.get('last_saved_at'))
+    }
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _compact_page(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'url': row.get('url'),
+        'status_code': row.get('status_code'),
+        'title': (row.get('title') or '')[:120],
+        'meta_description': (row.get('meta_description') or '')[:160],
+        'h1': (row.get('h1') or '')[:120],
+        'word_count': row.get('word_count'),
+        'response_time': row.get('response_time')
+    }
+
+
+def build_audit_summary(crawl: Dict[str, Any]) -> Dict[str, Any]:
+    """Aggregate a stored crawl into an audit summary"""
+    crawl_id = crawl['id']
+    started = time.time()
+
+    total = internal = html = 0
+    status_classes = {}
+    status_codes = {}
+    content_types = {}
+    depths = {}
+    missing = {'title': 0, 'meta_description': 0, 'h1': 0}
+    thin = noindex = canonicalised = 0
+    response_times = []
+    word_counts = []
+    templates = {}  # signature -> [count, compact page]
+    slowest = []  # min-heap of (response_time, row id, compact page)
+    first_page = None
+    start_signature = None
+
+    for row in iter_audit_rows(crawl_id):
+        total += 1
+        status = row.get('status_code') or 0
+        content_type = (row.get('content_type') or '').split(';')[0].strip().lower()
+        if first_page is None:
+            first_page = {'url': row.get('url'), 'status_code': status,
+                          'content_type': content_type, 'word_count': row.get('word_count')}
+
+        status_class = f'{status // 100}xx' if status else 'failed'
+        status_classes[status_class] = status_classes.get(status_class, 0) + 1
+        status_codes[status] = status_codes.get(status, 0) + 1
+        content_types[content_type or 'unknown'] = content_types.get(content_type or 'unknown', 0) + 1
+        depth = row.get('depth') or 0
+        depths[depth] = depths.get(depth, 0) + 1
+
+        if row.get('response_time') is not None:
+            response_times.append(row['response_time'])
+
+        if not row.get('is_internal'):
+            continue
+        internal += 1
+        if status != 200 or (content_type and 'html' not in content_type):
+            continue
+        html += 1
+
+        for field in missing:
+            if not row.get(field):
+                missing[field] += 1
+        words = row.get('word_count') or 0
+        word_counts.append(words)
+        if words < THIN_CONTENT_WORDS:
+            thin += 1
+        if row.get('response_time') is not None:
+            entry = (row['response_time'], row['id'], _compact_page(row))
+            if len(slowest) < SLOWEST_PAGES:
+                heapq.heappush(slowest, entry)
+            elif entry[0] > slowest[0][0]:
+                heapq.heapreplace(slowest, entry)
+        if 'noindex' in (row.get('robots') or '').lower():
+            noindex += 1
+        canonical = row.get('canonical_url')
+        if canonical and canonical.rstrip('/') != (row.get('url') or '').rstrip('/'):
+            canonicalised += 1
+
+        signature = template_signature(row['url'])
+        if start_signature is None:
+            start_signature = signature
+        template = templates.get(signature)
+        if template is not None:
+            template[0] += 1
+        elif len(templates) < MAX_TEMPLATES:
+            templates[signature] = [1, _compact_page(row)]
+
+    response_times.sort()
+    word_counts.sort()
+
+    # Issues: counts per kind, with a few example URLs each
+    issue_total = 0
+    by_type = {}
+    by_category = {}
+    kinds = {}  # (type, category, issue) -> [count, sample urls]
+    for row in iter_issue_codes(crawl_id):
+        issue_total += 1
+        issue_type = row.get('type') or 'info'
+        category = row.get('category') or 'other'
+        by_type[issue_type] = by_type.get(issue_type, 0) + 1
+        by_category[category] = by_category.get(category, 0) + 1
+        kind = kinds.setdefault((issue_type, category, row.get('issue')), [0, []])
+        kind[0] += 1
+        if len(kind[1]) < ISSUE_SAMPLE_URLS:
+            kind[1].append(row.get('url'))
+
+    ranked = sorted(kinds.items(), key=lambda item: (TYPE_RANK.get(item[0][0], 3), -item[1][0]))
+    top_issues = [
+        {'issue': issue, 'type': issue_type, 'category': category, 'count': count, 'sample_urls': urls}
+        for (issue_type, category, issue), (count, urls) in ranked[:TOP_ISSUES]
+    ]
+
+    # Start page, then the most common templates; the first page seen represents each
+    ranked_templates = sorted(templates.items(), key=lambda item: (item[0] != start_signature, -item[1][0]))
+    samples = [page for _, (_, page) in ranked_templates[:SAMPLE_PAGES]]
+
+    summary = {
+        'version': SUMMARY_VERSION,
+        'fingerprint': _fingerprint(crawl),
+        'built_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'stats': {
+            'base_url': crawl.get('base_url'),
+            'crawled': crawl.get('urls_crawled'),
+            'discovered': crawl.get('urls_discovered'),
+            'max_depth': crawl.get('max_depth_reached'),
+            'status': crawl.get('status')
+        },
+        'pages': {
+            'total': total,
+            'internal': internal,
+            'html_ok': html,
+            'first': first_page,
+            'status_classes': status_classes,
+            'top_status_codes': {str(code): count for code, count in sorted(status_codes.items(), key=lambda item: -item[1])[:8]},
+            'content_types': dict(sorted(content_types.items(), key=lambda item: -item[1])[:6]),
+            'depth': {str(depth): count for depth, count in sorted(depths.items())},
+            'missing_title': missing['title'],
+            'missing_meta_description': missing['meta_description'],
+            'missing_h1': missing['h1'],
+            'thin_content': thin,
+            'noindex': noindex,
+            'canonicalised_elsewhere': canonicalised,
+            'templates': len(templates),
+            'word_count': {
+                'avg': round(sum(word_counts) / len(word_counts)) if word_counts else None,
+                'median': _percentile(word_counts, 0.5)
+            },
+            'response_time': {
+                'avg': round(sum(response_times) / len(response_times), 3) if response_times else None,
+                'p50': _percentile(response_times, 0.5),
+                'p90': _percentile(response_times, 0.9),
+                'max': response_times[-1] if response_times else None
+            }
+        },
+        'issues': {
+            'total': issue_total,
+            'by_type': by_type,
+            'by_category': dict(sorted(by_category.items(), key=lambda item: -item[1])),
+            'kinds': len(kinds),
+            'top': top_issues
+        },
+        'samples': samples,
+        'slowest': [page for _, _, page in sorted(slowest, reverse=True)]
+    }
+
+    logger.info(f"Built audit summary for crawl {crawl_id}: {total} pages, {issue_total} issues "
+                f"in {time.time() - started:.2f}s")
+    return summary
+
+
+def get_or_build_summary(crawl_id, crawl: Optional[Dict[str, Any]] = None,
+                         rebuild: bool = False) -> Optional[Dict[str, Any]]:
+    """Stored summary for a crawl, rebuilt (and stored) when missing or stale"""
+    crawl = crawl or get_crawl_by_id(crawl_id)
+    if not crawl:
+        return None
+
+    if not rebuild:
+        stored = get_audit_summary(crawl['id'])
+        if stored and stored.get('version') == SUMMARY_VERSION and stored.get('fingerprint') == _fingerprint(crawl):
+            return stored
+
+    summary = build_audit_summary(crawl)
+    save_audit_summary(crawl['id'], summary)
+    return summary
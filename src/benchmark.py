@@ -0,0 +1,548 @@
+"""
+Crawl benchmark
+Generates a synthetic site, serves it from a local HTTP server and crawls it
+end-to-end with WebCrawler, so throughput can be compared between releases:
+
+    python -m src.benchmark --pages 2000 --fanout 12 --latency-ms 5
+    python -m src.benchmark --pages 2000 --json before.json
+    python -m src.benchmark --pages 2000 --compare before.json --tolerance 0.15
+
+Pages are rendered on request from a seed, so nothing is written to disk and
+the same options always produce the same site. The report has pages/sec, CPU
+and wall time per crawl stage (fetch, parse, extract, issues, persistence,
+duplication), peak RSS and database write time. With --compare the run fails
+(exit code 1) when pages/sec drops or a stage's CPU per page grows by more
+than the tolerance.
+
+    python -m src.benchmark --canonicalizer --iterations 2000
+
+times link canonicalisation alone: the urljoin/urlparse path link discovery
+and link reporting used before UrlCanonicalizer, against
+UrlCanonicalizer.canonicalize, over the same fixed href corpus.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin, urlparse
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+LANGUAGES = ('en', 'fr', 'de')
+WORDS = ('crawl', 'index', 'page', 'link', 'search', 'content', 'site', 'render', 'audit', 'title',
+         'meta', 'schema', 'canonical', 'redirect', 'sitemap', 'mobile', 'speed', 'image', 'anchor', 'query')
+
+# Canonicaliser corpus: (page URL, href) pairs covering what real pages link to
+CANONICALIZER_BASE = 'example.com'
+CANONICALIZER_CORPUS = (
+    ('https://www.example.com/blog/post/', 'next/'),
+    ('https://www.example.com/blog/post/', '../archive/2024/'),
+    ('https://www.example.com/blog/post/', './comments?page=2'),
+    ('https://www.example.com/blog/post/', '/products/shoes?color=red&size=42'),
+    ('https://www.example.com/blog/post/', '/products/shoes?utm_source=news&utm_medium=email&color=red'),
+    ('https://www.example.com/blog/post/', '/search?q=caf%c3%a9&fbclid=abc123'),
+    ('https://www.example.com/blog/post/', '/docs/%7Euser/guide#install'),
+    ('https://www.example.com/blog/post/', '#top'),
+    ('https://www.example.com/blog/post/', 'mailto:team@example.com'),
+    ('https://www.example.com/blog/post/', 'tel:+15550100'),
+    ('https://www.example.com/blog/post/', 'javascript:void(0)'),
+    ('https://www.example.com/blog/post/', 'HTTPS://WWW.Example.COM:443/About/'),
+    ('https://www.example.com/blog/post/', 'http://example.com:80/contact'),
+    ('https://www.example.com/blog/post/', 'https://blog.example.com/feed/'),
+    ('https://www.example.com/blog/post/', '//cdn.example.com/assets/app.js?v=3'),
+    ('https://www.example.com/blog/post/', 'https://www.other-site.org/page?ref=example'),
+    ('https://www.example.com/blog/post/', 'https://twitter.com/share?url=https%3A%2F%2Fexample.com%2F'),
+    ('https://www.example.com/', ' /pricing '),
+    ('https://www.example.com/', 'category/a/b/c/../../d/'),
+    ('https://www.example.com/', '?sort=price&gclid=xyz'),
+)
+
+
+class FixtureSite:
+    """Deterministic synthetic site: every page is rendered from (seed, page number)"""
+
+    def __init__(self, pages=500, fanout=10, page_kb=20, traps=0, redirect_every=25,
+                 broken_every=50, sitemap=True, hreflang=False, seed=1):
+        self.pages = max(1, int(pages))
+        self.fanout = max(1, int(fanout))
+        self.page_kb = max(1, int(page_kb))
+        self.traps = max(0, int(traps))
+        self.redirect_every = int(redirect_every)
+        self.broken_every = int(broken_every)
+        self.sitemap = sitemap
+        self.hreflang = hreflang
+        self.seed = seed
+
+    def options(self):
+        return {
+            'pages': self.pages, 'fanout': self.fanout, 'page_kb': self.page_kb, 'traps': self.traps,
+            'redirect_every': self.redirect_every, 'broken_every': self.broken_every,
+            'sitemap': self.sitemap, 'hreflang': self.hreflang, 'seed': self.seed
+        }
+
+    @staticmethod
+    def page_path(number, lang='en'):
+        if number == 0 and lang == 'en':
+            return '/'
+        prefix = '' if lang == 'en' else f'/{lang}'
+        return f'{prefix}/p/{number}.html'
+
+    def _links(self, number, rng):
+        """Tree children (so every page is reachable) plus random cross links"""
+        first_child = number * self.fanout + 1
+        links = [self.page_path(child) for child in range(first_child, min(first_child + self.fanout, self.pages))]
+        links.extend(self.page_path(rng.randrange(self.pages)) for _ in range(self.fanout))
+        if number:
+            links.append(self.page_path(0))
+        if self.redirect_every and number % self.redirect_every == 0:
+            links.append(f'/r/{(number + 1) % self.pages}')
+        if self.broken_every and number % self.broken_every == 0:
+            links.append(f'/missing/{number}.html')
+        if self.traps and number < self.traps:
+            links.append(f'/calendar/{number}/1')
+        return links
+
+    def render_page(self, number, lang='en'):
+        rng = random.Random(self.seed * 1000003 + number)
+        title = ' '.join(rng.choice(WORDS) for _ in range(6)).title()
+        head = [
+            '<meta charset="utf-8">',
+            f'<title>{title} {number}</title>',
+            f'<meta name="description" content="{" ".join(rng.choice(WORDS) for _ in range(20))}">',
+            '<meta name="viewport" content="width=device-width, initial-scale=1">',
+            f'<link rel="canonical" href="{self.page_path(number, lang)}">',
+            f'<meta property="og:title" content="{title}">',
+            '<script type="application/ld+json">{"@context": "https://schema.org", "@type": "WebPage", '
+            f'"name": "{title}"}}</script>'
+        ]
+        if self.hreflang:
+            head.extend(f'<link rel="alternate" hreflang="{alt}" href="{self.page_path(number, alt)}">'
+                        for alt in LANGUAGES)
+
+        body = [f'<h1>{title}</h1>', '<nav>']
+        body.extend(f'<a href="{href}">{rng.choice(WORDS)} {index}</a>'
+                    for index, href in enumerate(self._links(number, rng)))
+        body.append('</nav>')
+        body.extend(f'<img src="/img/{number}-{index}.png" alt="{rng.choice(WORDS)}">' for index in range(3))
+
+        # Filler paragraphs up to the requested page weight
+        size = sum(len(part) for part in head + body)
+        heading = 0
+        while size < self.page_kb * 1024:
+            if heading % 4 == 0:
+                body.append(f'<h2>{rng.choice(WORDS).title()} {heading}</h2>')
+            paragraph = '<p>' + ' '.join(rng.choice(WORDS) for _ in range(80)) + '</p>'
+            body.append(paragraph)
+            size += len(paragraph)
+            heading += 1
+
+        return (f'<!DOCTYPE html><html lang="{lang}"><head>{"".join(head)}</head>'
+                f'<body>{"".join(body)}</body></html>')
+
+    def render_trap(self, trap, step):
+        """Endless calendar: every page links to the next one"""
+        return (f'<!DOCTYPE html><html lang="en"><head><title>Calendar {trap} {step}</title></head>'
+                f'<body><h1>Calendar</h1><a href="/calendar/{trap}/{step + 1}">Next</a></body></html>')
+
+    def render_sitemap(self, host):
+        urls = ''.join(f'<url><loc>http://{host}{self.page_path(number)}</loc></url>' for number in range(self.pages))
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>')
+
+    def render_robots(self, host):
+        robots = 'User-agent: *\nDisallow: /private/\n'
+        if self.sitemap:
+            robots += f'Sitemap: http://{host}/sitemap.xml\n'
+        return robots
+
+    def respond(self, path, host):
+        """(status, headers, body) for a request path"""
+        path = path.split('?', 1)[0].split('#', 1)[0]
+        if path in ('/', '/index.html'):
+            return 200, {'Content-Type': 'text/html; charset=utf-8'}, self.render_page(0)
+        if path == '/robots.txt':
+            return 200, {'Content-Type': 'text/plain'}, self.render_robots(host)
+        if path == '/sitemap.xml' and self.sitemap:
+            return 200, {'Content-Type': 'application/xml'}, self.render_sitemap(host)
+
+        parts = path.strip('/').split('/')
+        try:
+            if parts[0] == 'r' and len(parts) == 2:
+                return 301, {'Location': self.page_path(int(parts[1]))}, ''
+            if parts[0] == 'calendar' and len(parts) == 3:
+                return 200, {'Content-Type': 'text/html; charset=utf-8'}, self.render_trap(int(parts[1]), int(parts[2]))
+            lang = 'en'
+            if parts[0] in LANGUAGES and self.hreflang:
+                lang, parts = parts[0], parts[1:]
+            if parts[0] == 'p' and len(parts) == 2 and parts[1].endswith('.html'):
+                number = int(parts[1][:-5])
+                if 0 <= number < self.pages:
+                    return 200, {'Content-Type': 'text/html; charset=utf-8'}, self.render_page(number, lang)
+        except ValueError:
+            pass
+        return 404, {'Content-Type': 'text/html; charset=utf-8'}, '<html><head><title>Not found</title></head><body>Not found</body></html>'
+
+
+class FixtureServer:
+    """Serves a FixtureSite on 127.0.0.1 with a fixed per-request latency (and jitter)"""
+
+    def __init__(self, site, latency_ms=0, jitter_ms=0, port=0):
+        self.site = site
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self, send_body):
+                with fixture._lock:
+                    fixture.requests += 1
+                delay = fixture.latency + (random.uniform(0, fixture.jitter) if fixture.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                status, headers, body = fixture.site.respond(self.path, self.headers.get('Host', ''))
+                data = body.encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve(True)
+
+            def do_HEAD(self):
+                self._serve(False)
+
+        return Handler
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (current RSS where the peak is not available)"""
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+@contextlib.contextmanager
+def _benchmark_database(enabled):
+    """Run inside a throwaway SQLite database so persistence is measured without touching real data"""
+    if not enabled:
+        yield None
+        return
+    previous_cwd = os.getcwd()
+    previous_db_type = os.environ.get('DB_TYPE')
+    workdir = tempfile.mkdtemp(prefix='librecrawl-bench-')
+    try:
+        os.chdir(workdir)
+        os.environ['DB_TYPE'] = 'sqlite'
+        from src.crawl_db import init_crawl_tables
+        init_crawl_tables(enable_migrations=True)
+        yield workdir
+    finally:
+        os.chdir(previous_cwd)
+        if previous_db_type is None:
+            os.environ.pop('DB_TYPE', None)
+        else:
+            os.environ['DB_TYPE'] = previous_db_type
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_benchmark(site, latency_ms=0, jitter_ms=0, config=None, persist=True, verbose=False):
+    """Crawl site end-to-end and return the report dict"""
+    from src.crawler import WebCrawler
+
+    crawl_config = {
+        'max_urls': site.pages + site.traps * 10 + 100,
+        'max_depth': 50,
+        'delay': 0,
+        'concurrency': 8,
+        'respect_robots': True,
+        'discover_sitemaps': site.sitemap,
+        'max_file_size': 0,
+        'retries': 0,
+        'timeout': 30,
+        'enable_pagespeed': False,
+        'log_level': 'INFO' if verbose else 'WARNING'
+    }
+    crawl_config.update(config or {})
+
+    output = None if verbose else io.StringIO()
+    with FixtureServer(site, latency_ms, jitter_ms) as server, _benchmark_database(persist):
+        crawler = WebCrawler()
+        crawler.update_config(crawl_config)
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+            success, message = crawler.start_crawl(server.base_url + '/', session_id='benchmark' if persist else None)
+            if not success:
+                raise RuntimeError(f'Benchmark crawl did not start: {message}')
+            crawler.crawl_thread.join()
+        elapsed = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        requests_served = server.requests
+
+    crawled = crawler.stats['crawled']
+    stages = crawler.stage_timer.snapshot()
+    for totals in stages.values():
+        totals['cpu_ms_per_page'] = round(1000 * totals['cpu_s'] / crawled, 3) if crawled else 0
+        totals['wall_s'] = round(totals['wall_s'], 4)
+        totals['cpu_s'] = round(totals['cpu_s'], 4)
+
+    persistence = stages.get('persistence', {})
+    return {
+        'site': site.options(),
+        'latency_ms': latency_ms,
+        'config': {key: crawl_config[key] for key in ('concurrency', 'max_urls', 'max_depth')},
+        'distributed_workers': crawl_config.get('distributed_workers', 0),
+        'pages_crawled': crawled,
+        'requests_served': requests_served,
+        'links': len(crawler.link_manager.all_links) if crawler.link_manager else 0,
+        'issues': len(crawler.issue_detector.detected_issues) if crawler.issue_detector else 0,
+        'elapsed_s': round(elapsed, 3),
+        'pages_per_sec': round(crawled / elapsed, 2) if elapsed else 0,
+        'process_cpu_s': round(cpu, 3),
+        'stages': stages,
+        'db_write_s': persistence.get('wall_s', 0),
+        'db_batches': persistence.get('calls', 0),
+        'peak_rss_mb': peak_rss_mb(),
+        'python': sys.version.split()[0]
+    }
+
+
+def _legacy_canonicalize(href, page_url, base_domain):
+    """
+    The per-href work link discovery (extract_links) and link reporting
+    (collect_all_links) each did before UrlCanonicalizer: two urljoin calls
+    and three urlparse calls, one of them for the scope check.
+    """
+    href = href.strip()
+    if not href or href.startswith('#') or href.startswith('mailto:') or href.startswith('tel:'):
+        return None
+
+    # extract_links
+    parsed = urlparse(urljoin(page_url, href))
+    clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    if parsed.query:
+        clean_url += f"?{parsed.query}"
+
+    # collect_all_links
+    absolute_url = urljoin(page_url, href)
+    if '#' in absolute_url:
+        absolute_url = absolute_url.split('#')[0]
+    if not absolute_url.startswith(('http://', 'https://')):
+        return None
+    netloc = urlparse(absolute_url).netloc
+    url_clean = urlparse(absolute_url).netloc.replace('www.', '')
+    base_clean = base_domain.replace('www.', '')
+    if url_clean == base_clean:
+        scope = 'root'
+    elif url_clean.endswith('.' + base_clean):
+        scope = 'sub'
+    else:
+        scope = 'external'
+    return clean_url, netloc, scope
+
+
+def run_canonicalizer_benchmark(iterations=2000):
+    """Time the legacy urljoin/urlparse path against UrlCanonicalizer on CANONICALIZER_CORPUS"""
+    from src.core.url_canonicalizer import UrlCanonicalizer
+
+    canonicalizer = UrlCanonicalizer(CANONICALIZER_BASE)
+    iterations = max(1, int(iterations))
+    hrefs = len(CANONICALIZER_CORPUS) * iterations
+
+    def timed(canonicalize):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for page_url, href in CANONICALIZER_CORPUS:
+                canonicalize(href, page_url)
+        elapsed = time.perf_counter() - start
+        return {'elapsed_s': round(elapsed, 4), 'us_per_href': round(1e6 * elapsed / hrefs, 3)}
+
+    legacy = timed(lambda href, page_url: _legacy_canonicalize(href, page_url, CANONICALIZER_BASE))
+    current = timed(canonicalizer.canonicalize)
+
+    # URLs that now canonicalise differently (case, default ports, tracking parameters, dot segments...)
+    changed = 0
+    for page_url, href in CANONICALIZER_CORPUS:
+        before = _legacy_canonicalize(href, page_url, CANONICALIZER_BASE)
+        after = canonicalizer.canonicalize(href, page_url)
+        if (before[0] if before else None) != (after.url if after else None):
+            changed += 1
+
+    return {
+        'corpus': len(CANONICALIZER_CORPUS),
+        'iterations': iterations,
+        'hrefs': hrefs,
+        'legacy': legacy,
+        'canonicalizer': current,
+        'speedup': round(legacy['elapsed_s'] / current['elapsed_s'], 2) if current['elapsed_s'] else 0,
+        'changed_urls': changed,
+        'python': sys.version.split()[0]
+    }
+
+
+def format_canonicalizer_report(report):
+    return '\n'.join([
+        f"Corpus:          {report['corpus']} hrefs x {report['iterations']} iterations",
+        f"urljoin/urlparse {report['legacy']['us_per_href']:>8.3f} us/href ({report['legacy']['elapsed_s']} s)",
+        f"UrlCanonicalizer {report['canonicalizer']['us_per_href']:>8.3f} us/href "
+        f"({report['canonicalizer']['elapsed_s']} s)",
+        f"Speedup:         {report['speedup']}x",
+        f"Changed URLs:    {report['changed_urls']} of {report['corpus']} canonicalise differently"
+    ])
+
+
+def compare_reports(report, baseline, tolerance=0.15):
+    """Regressions of report against baseline, as readable strings (empty = within tolerance)"""
+    regressions = []
+    before, after = baseline.get('pages_per_sec', 0), report.get('pages_per_sec', 0)
+    if before and after < before * (1 - tolerance):
+        regressions.append(f'pages/sec {after} < {before} (-{100 * (1 - after / before):.1f}%)')
+
+    for stage, totals in report.get('stages', {}).items():
+        before = baseline.get('stages', {}).get(stage, {}).get('cpu_ms_per_page', 0)
+        after = totals.get('cpu_ms_per_page', 0)
+        # Ignore stages too cheap to measure reliably
+        if before >= 0.05 and after > before * (1 + tolerance):
+            regressions.append(f'{stage} CPU {after} ms/page > {before} ms/page (+{100 * (after / before - 1):.1f}%)')
+    return regressions
+
+
+def format_report(report):
+    lines = [
+        f"Pages crawled:   {report['pages_crawled']} ({report['requests_served']} requests, "
+        f"{report['links']} links, {report['issues']} issues)",
+        f"Elapsed:         {report['elapsed_s']} s",
+        f"Throughput:      {report['pages_per_sec']} pages/sec",
+        f"Process CPU:     {report['process_cpu_s']} s",
+        f"Peak RSS:        {report['peak_rss_mb']} MB",
+        f"DB writes:       {report['db_write_s']} s in {report['db_batches']} batches",
+        '',
+        f"{'stage':<12} {'calls':>8} {'wall s':>10} {'cpu s':>10} {'cpu ms/page':>12}"
+    ]
+    for stage, totals in sorted(report['stages'].items(), key=lambda item: -item[1]['cpu_s']):
+        lines.append(f"{stage:<12} {totals['calls']:>8} {totals['wall_s']:>10.3f} {totals['cpu_s']:>10.3f} "
+                     f"{totals['cpu_ms_per_page']:>12.3f}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LibreCrawl crawl benchmark against a generated local site')
+    parser.add_argument('--pages', type=int, default=500, help='Pages on the generated site')
+    parser.add_argument('--fanout', type=int, default=10, help='Links per page (plus as many random cross links)')
+    parser.add_argument('--page-kb', type=int, default=20, help='Approximate HTML size per page')
+    parser.add_argument('--traps', type=int, default=0, help='Endless calendar traps linked from the first pages')
+    parser.add_argument('--redirect-every', type=int, default=25, help='Every Nth page links to a 301 (0 = none)')
+    parser.add_argument('--broken-every', type=int, default=50, help='Every Nth page links to a 404 (0 = none)')
+    parser.add_argument('--no-sitemap', action='store_true', help='Do not serve sitemap.xml')
+    parser.add_argument('--hreflang', action='store_true', help='Add en/fr/de hreflang alternates')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=0, help='Server latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Random extra latency per request')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=0, help='Distributed worker processes (0 = in-process)')
+    parser.add_argument('--no-db', action='store_true', help='Skip persistence (no throwaway SQLite database)')
+    parser.add_argument('--no-duplication', action='store_true', help='Skip end-of-crawl duplication detection')
+    parser.add_argument('--json', help='Write the report to this file')
+    parser.add_argument('--compare', help='Baseline report to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed slowdown before --compare fails')
+    parser.add_argument('--verbose', action='store_true', help='Keep the crawler output (INFO log level)')
+    parser.add_argument('--canonicalizer', action='store_true',
+                        help='Only time URL canonicalisation (old urljoin/urlparse path vs UrlCanonicalizer)')
+    parser.add_argument('--iterations', type=int, default=2000, help='Passes over the href corpus for --canonicalizer')
+    args = parser.parse_args()
+
+    if args.canonicalizer:
+        report = run_canonicalizer_benchmark(args.iterations)
+        print(format_canonicalizer_report(report))
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nReport written to {args.json}")
+        return
+
+    site = FixtureSite(pages=args.pages, fanout=args.fanout, page_kb=args.page_kb, traps=args.traps,
+                       redirect_every=args.redirect_every, broken_every=args.broken_every,
+                       sitemap=not args.no_sitemap, hreflang=args.hreflang, seed=args.seed)
+    config = {
+        'concurrency': args.concurrency,
+        'distributed_workers': args.workers,
+        'enable_duplication_check': not args.no_duplication
+    }
+    report = run_benchmark(site, args.latency_ms, args.jitter_ms, config, persist=not args.no_db, verbose=args.verbose)
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.tolerance)
+        if regressions:
+            print('\nRegressions against ' + args.compare + ':')
+            for regression in regressions:
+                print(f'  - {regression}')
+            sys.exit(1)
+        print(f'\nNo regressions against {args.compare} (tolerance {args.tolerance:.0%})')
+
+
+if __name__ == '__main__':
+    main()
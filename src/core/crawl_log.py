@@ -0,0 +1,105 @@
+"""
+Crawl logging
+Crawler messages go through the 'librecrawl' logger, whose only handler puts
+records on a queue. One listener thread per process writes them to stdout,
+so crawl threads never wait on terminal or log-pipe I/O. Each crawler has a
+CrawlLog with its own level (config['log_level']), checked before a record
+is built; per-URL messages are DEBUG and take %-style arguments so nothing
+is formatted when they are off. Repeating warnings in hot loops go through
+throttled(), which emits one line per interval and counts the rest.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR
+}
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _ensure_listener():
+    """Attach the queue handler and start the writer thread (once per process)"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        log_queue = queue.SimpleQueue()
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+
+        root = logging.getLogger('librecrawl')
+        root.setLevel(logging.DEBUG)  # CrawlLog filters per crawler
+        root.propagate = False
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        _listener = logging.handlers.QueueListener(log_queue, handler)
+        _listener.start()
+        # Flush what is still queued when the process exits
+        atexit.register(_listener.stop)
+
+
+def parse_level(level):
+    """'DEBUG'/'INFO'/... (any case) or a logging level number -> level number"""
+    if isinstance(level, int):
+        return level
+    return LEVELS.get(str(level or 'INFO').upper(), logging.INFO)
+
+
+class CrawlLog:
+    """Leveled logger for one crawler"""
+
+    def __init__(self, name='crawler', level='INFO'):
+        _ensure_listener()
+        self._logger = logging.getLogger(f'librecrawl.{name}')
+        self.level = parse_level(level)
+        self._throttled = {}  # key -> [last emitted at, suppressed since]
+        self._throttle_lock = threading.Lock()
+
+    def set_level(self, level):
+        self.level = parse_level(level)
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def _log(self, level, msg, args, exc_info=False):
+        if level >= self.level:
+            self._logger.log(level, msg, *args, exc_info=exc_info)
+
+    def debug(self, msg, *args):
+        self._log(logging.DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        self._log(logging.INFO, msg, args)
+
+    def warning(self, msg, *args):
+        self._log(logging.WARNING, msg, args)
+
+    def error(self, msg, *args, exc_info=False):
+        self._log(logging.ERROR, msg, args, exc_info)
+
+    def throttled(self, key, interval, level, msg, *args):
+        """Log at most once per interval seconds for key; the next line reports how many were dropped"""
+        level = parse_level(level)
+        if level < self.level:
+            return
+        now = time.monotonic()
+        with self._throttle_lock:
+            state = self._throttled.get(key)
+            if state is not None and now - state[0] < interval:
+                state[1] += 1
+                return
+            suppressed = state[1] if state else 0
+            self._throttled[key] = [now, 0]
+        if suppressed:
+            msg += f' ({suppressed} similar messages suppressed)'
+        self._logger.log(level, msg, *args)
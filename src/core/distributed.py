@@ -0,0 +1,331 @@
+"""Distributed crawl mode: a coordinator shards the frontier across worker processes"""
+import argparse
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from multiprocessing.managers import BaseManager
+from urllib.parse import urlparse
+
+
+AUTHKEY_ENV = 'LIBRECRAWL_BROKER_AUTHKEY'
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def host_partition(url, partitions, host_spread=1):
+    """
+    Map a URL to a worker partition.
+
+    The host picks a home partition so every host has a stable owner. host_spread
+    lets one host fan out over that many neighbouring partitions, which is what a
+    single-site crawl needs to use more than one worker.
+    """
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    home = zlib.crc32(host.encode('utf-8')) % partitions
+
+    if host_spread <= 1:
+        return home
+
+    offset = zlib.crc32(url.encode('utf-8')) % min(host_spread, partitions)
+    return (home + offset) % partitions
+
+
+class _WorkerManager(BaseManager):
+    """Client side of the broker - used by worker processes to reach the coordinator"""
+    pass
+
+
+_WorkerManager.register('get_task_queue')
+_WorkerManager.register('get_result_queue')
+
+
+class CrawlCoordinator:
+    """
+    Owns the partitioned frontier of a distributed crawl.
+
+    URLs are routed to partitions by host, handed out to workers in batches and
+    the parsed results come back on a shared result queue. Queues are served by a
+    multiprocessing manager over TCP, so workers can be local subprocesses or
+    processes on other machines started with `python -m src.core.distributed`.
+    """
+
+    def __init__(self, partitions, bind='127.0.0.1', port=0, authkey=None,
+                 batch_size=10, max_batches_in_flight=2, host_spread=None):
+        self.partitions = max(1, int(partitions))
+        self.bind = bind
+        self.port = port
+        authkey = authkey or secrets.token_hex(16)
+        self.authkey = authkey.encode('utf-8') if isinstance(authkey, str) else authkey
+        self.batch_size = max(1, batch_size)
+        self.max_batches_in_flight = max(1, max_batches_in_flight)
+        # Default: spread a host across every partition (single-site crawls)
+        self.host_spread = self.partitions if host_spread is None else max(1, host_spread)
+
+        self.frontier = [deque() for _ in range(self.partitions)]
+        self.task_queues = [queue.Queue() for _ in range(self.partitions)]
+        self.result_queue = queue.Queue()
+
+        self.in_flight = {}  # batch_id -> (partition, [(url, depth), ...])
+        self.batches_per_partition = [0] * self.partitions
+        self.dead_partitions = set()
+        self.next_batch_id = 0
+
+        self.server = None
+        self.server_thread = None
+        self.address = None
+        self.processes = {}  # partition -> subprocess.Popen
+        self.lock = threading.Lock()
+
+    def start(self, config, base_url, base_domain, spawn_local=True):
+        """Start the broker, queue the crawl setup and optionally spawn local workers"""
+        manager_cls = type('CoordinatorManager', (BaseManager,), {})
+        manager_cls.register('get_task_queue', callable=self._get_task_queue)
+        manager_cls.register('get_result_queue', callable=lambda: self.result_queue)
+
+        manager = manager_cls(address=(self.bind, self.port), authkey=self.authkey)
+        self.server = manager.get_server()
+        self.address = self.server.address
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+        setup = {
+            'type': 'setup',
+            'config': config,
+            'base_url': base_url,
+            'base_domain': base_domain
+        }
+        for task_queue in self.task_queues:
+            task_queue.put(setup)
+
+        host, port = self.address
+        print(f"Distributed crawl broker listening on {host}:{port} with {self.partitions} partitions")
+
+        if spawn_local:
+            for partition in range(self.partitions):
+                self._spawn_worker(partition)
+        else:
+            print(f"Waiting for workers: python -m src.core.distributed --connect {host}:{port} --partition <0-{self.partitions - 1}> "
+                  f"(authkey via ${AUTHKEY_ENV})")
+
+    def _get_task_queue(self, partition):
+        return self.task_queues[int(partition)]
+
+    def _spawn_worker(self, partition):
+        """Launch a worker subprocess attached to one partition"""
+        host, port = self.address
+        env = os.environ.copy()
+        env[AUTHKEY_ENV] = self.authkey.decode('utf-8')
+        self.processes[partition] = subprocess.Popen(
+            [sys.executable, '-m', 'src.core.distributed',
+             '--connect', f"{host}:{port}", '--partition', str(partition)],
+            cwd=PROJECT_ROOT,
+            env=env
+        )
+
+    def _partition_for(self, url):
+        """Home partition for a URL, skipping partitions whose worker has died"""
+        partition = host_partition(url, self.partitions, self.host_spread)
+        for step in range(self.partitions):
+            candidate = (partition + step) % self.partitions
+            if candidate not in self.dead_partitions:
+                return candidate
+        return partition
+
+    def submit(self, url, depth):
+        """Add a URL to its partition of the frontier"""
+        with self.lock:
+            self.frontier[self._partition_for(url)].append((url, depth))
+
+    def dispatch(self):
+        """Hand batches to every partition that has spare capacity"""
+        with self.lock:
+            for partition in range(self.partitions):
+                if partition in self.dead_partitions:
+                    continue
+                pending = self.frontier[partition]
+                while pending and self.batches_per_partition[partition] < self.max_batches_in_flight:
+                    batch = [pending.popleft() for _ in range(min(self.batch_size, len(pending)))]
+                    batch_id = self.next_batch_id
+                    self.next_batch_id += 1
+                    self.in_flight[batch_id] = (partition, batch)
+                    self.batches_per_partition[partition] += 1
+                    self.task_queues[partition].put({'type': 'batch', 'batch_id': batch_id, 'urls': batch})
+
+    def poll(self, timeout=0.5):
+        """Collect finished batches from the workers"""
+        payloads = []
+        try:
+            payloads.append(self.result_queue.get(timeout=timeout))
+            while True:
+                payloads.append(self.result_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        with self.lock:
+            for payload in payloads:
+                entry = self.in_flight.pop(payload.get('batch_id'), None)
+                if entry:
+                    self.batches_per_partition[entry[0]] -= 1
+
+        return payloads
+
+    def reap_lost_work(self):
+        """
+        Detect local workers that exited and return the URLs they were holding.
+        Their queued frontier is re-routed to the surviving partitions.
+        """
+        lost = []
+        rerouted = []
+        with self.lock:
+            for partition, process in self.processes.items():
+                if partition in self.dead_partitions or process.poll() is None:
+                    continue
+
+                print(f"Distributed worker for partition {partition} exited with code {process.returncode}")
+                self.dead_partitions.add(partition)
+                for batch_id, (owner, batch) in list(self.in_flight.items()):
+                    if owner == partition:
+                        lost.extend(batch)
+                        del self.in_flight[batch_id]
+                self.batches_per_partition[partition] = 0
+                rerouted.extend(self.frontier[partition])
+                self.frontier[partition].clear()
+
+        for url, depth in rerouted:
+            self.submit(url, depth)
+        return lost
+
+    def has_live_workers(self):
+        """False once every locally spawned worker has died"""
+        if not self.processes:
+            return True
+        return len(self.dead_partitions) < self.partitions
+
+    def fetching(self):
+        """URLs handed to workers and not yet returned"""
+        with self.lock:
+            return sum(len(batch) for _, batch in self.in_flight.values())
+
+    def outstanding(self):
+        """URLs that are queued in the frontier or being fetched by a worker"""
+        with self.lock:
+            queued = sum(len(pending) for pending in self.frontier)
+            fetching = sum(len(batch) for _, batch in self.in_flight.values())
+            return queued + fetching
+
+    def shutdown(self, timeout=10):
+        """Stop the workers and the broker"""
+        for task_queue in self.task_queues:
+            task_queue.put(None)
+
+        deadline = time.time() + timeout
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=max(0.1, deadline - time.time()))
+            except subprocess.TimeoutExpired:
+                process.terminate()
+
+        if self.server:
+            self.server.stop_event.set()
+            try:
+                self.server.listener.close()
+            except Exception:
+                pass
+        print("Distributed crawl broker stopped")
+
+
+def _build_worker_crawler(setup):
+    """Create a crawler that only fetches and parses pages for a coordinator"""
+    from src.crawler import WebCrawler
+    from src.core.link_manager import LinkManager
+
+    crawler = WebCrawler()
+    crawler.update_config(setup['config'])
+    crawler.base_url = setup['base_url']
+    crawler.base_domain = setup['base_domain']
+    # Workers only report discoveries, the coordinator orders the frontier
+    crawler.link_manager = LinkManager(crawler.base_domain, trap_threshold=crawler.config.get('trap_threshold', 100),
+                                       frontier_strategy='fifo',
+                                       strip_tracking_params=crawler.config.get('strip_tracking_params', True),
+                                       trailing_slash=crawler.config.get('trailing_slash', 'keep'),
+                                       log=crawler.log)
+    return crawler
+
+
+def _process_batch(crawler, message):
+    """Crawl one batch and package the results, links and discovered URLs"""
+    link_manager = crawler.link_manager
+    results = [crawler._crawl_url_with_requests(url, depth) for url, depth in message['urls']]
+
+    with link_manager.urls_lock:
+        discovered = list(link_manager.discovered_urls)
+        link_manager.discovered_urls.clear()
+        # Coordinator owns the global "linked from" index
+        link_manager.source_pages.clear()
+        traps = list(link_manager.trap_patterns.values())
+        link_manager.trap_patterns.clear()
+
+    with link_manager.links_lock:
+        links = link_manager.all_links[:]
+        link_manager.all_links.clear()
+        link_manager.links_set.clear()
+        link_manager.link_graph.reset()
+
+    return {
+        'batch_id': message['batch_id'],
+        'results': results,
+        'discovered': discovered,
+        'links': links,
+        'traps': traps,
+        'stage_times': crawler.stage_timer.drain()
+    }
+
+
+def run_worker(address, authkey, partition):
+    """Attach to a coordinator and crawl batches for one partition until told to stop"""
+    manager = _WorkerManager(address=address, authkey=authkey)
+    manager.connect()
+    tasks = manager.get_task_queue(partition)
+    results = manager.get_result_queue()
+
+    crawler = None
+    print(f"Distributed worker {os.getpid()} attached to partition {partition}")
+
+    while True:
+        message = tasks.get()
+        if message is None:
+            break
+
+        if message['type'] == 'setup':
+            crawler = _build_worker_crawler(message)
+            continue
+
+        payload = _process_batch(crawler, message)
+        payload['partition'] = partition
+        results.put(payload)
+
+    print(f"Distributed worker {os.getpid()} for partition {partition} finished")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LibreCrawl distributed crawl worker')
+    parser.add_argument('--connect', required=True, help='Coordinator broker address (host:port)')
+    parser.add_argument('--partition', type=int, required=True, help='Frontier partition to serve')
+    parser.add_argument('--authkey', default=os.getenv(AUTHKEY_ENV), help=f'Broker auth key (defaults to ${AUTHKEY_ENV})')
+    args = parser.parse_args()
+
+    if not args.authkey:
+        parser.error(f'an auth key is required (--authkey or ${AUTHKEY_ENV})')
+
+    host, port = args.connect.rsplit(':', 1)
+    run_worker((host, int(port)), args.authkey.encode('utf-8'), args.partition)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""Priority crawl frontier - decides which discovered URL is crawled next"""
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from datetime import datetime
+
+
+class PriorityFrontier:
+    """
+    Scored replacement for the FIFO discovery deque.
+
+    Each pending URL is scored from:
+      - inlinks: number of pages linking to it (LinkManager.source_pages)
+      - depth: shallower pages first
+      - sitemap: presence, <priority> and <lastmod> freshness
+      - trap likelihood: how close its URL pattern is to the trap limit (TrapDetector)
+
+    Scores only move when new information arrives, so the heap is kept lazily:
+    a URL is re-pushed when its inlinks grow and stale entries are skipped or
+    re-scored when they reach the top. Equal scores keep discovery order.
+
+    The object behaves like the deque it replaces (append, popleft, len,
+    iteration, clear) so checkpoints and distributed workers keep working.
+    """
+
+    INLINK_WEIGHT = 1.0
+    DEPTH_WEIGHT = 0.75
+    SITEMAP_WEIGHT = 1.0
+    SITEMAP_PRIORITY_WEIGHT = 1.0
+    FRESHNESS_WEIGHT = 0.5
+    FRESHNESS_DAYS = 365
+    TRAP_WEIGHT = 3.0
+
+    def __init__(self, inlinks_for, trap_likelihood_for, urls=None):
+        """
+        inlinks_for: callable(url) -> number of known linking pages
+        trap_likelihood_for: callable(url) -> 0..1, how close the URL's pattern is to being a trap
+        Callables are invoked while the owning LinkManager holds its urls_lock.
+        """
+        self._inlinks_for = inlinks_for
+        self._trap_likelihood_for = trap_likelihood_for
+
+        self._heap = []
+        self._entries = {}  # url -> (depth, version)
+        self._counter = itertools.count()
+        self._sitemap_hints = {}  # url -> {'priority': float|None, 'lastmod': str|None}
+
+        for url, depth in (urls or []):
+            self.append((url, depth))
+
+    def set_sitemap_hints(self, hints):
+        """Register sitemap metadata ({url: {'priority', 'lastmod'}}) used for scoring"""
+        self._sitemap_hints.update(hints)
+        for url in hints:
+            if url in self._entries:
+                self._push(url, self._entries[url][0])
+
+    def score(self, url, depth):
+        """Higher scores are crawled first"""
+        score = self.INLINK_WEIGHT * math.log1p(self._inlinks_for(url))
+        score -= self.DEPTH_WEIGHT * depth
+
+        hint = self._sitemap_hints.get(url)
+        if hint is not None:
+            score += self.SITEMAP_WEIGHT
+            priority = hint.get('priority')
+            score += self.SITEMAP_PRIORITY_WEIGHT * (priority if priority is not None else 0.5)
+            score += self.FRESHNESS_WEIGHT * self._freshness(hint.get('lastmod'))
+
+        score -= self.TRAP_WEIGHT * self._trap_likelihood_for(url)
+        return score
+
+    def _freshness(self, lastmod):
+        """1.0 for content modified today, falling to 0 after FRESHNESS_DAYS"""
+        if not lastmod:
+            return 0.0
+        try:
+            modified = datetime.fromisoformat(lastmod.strip().replace('Z', '+00:00'))
+            age_days = (time.time() - modified.timestamp()) / 86400
+        except (ValueError, OverflowError, OSError):
+            return 0.0
+        return max(0.0, 1.0 - max(0.0, age_days) / self.FRESHNESS_DAYS)
+
+    def _push(self, url, depth):
+        version = next(self._counter)
+        self._entries[url] = (depth, version)
+        heapq.heappush(self._heap, (-self.score(url, depth), version, url, depth))
+
+    def append(self, item):
+        """Queue a (url, depth) pair"""
+        url, depth = item
+        self._push(url, depth)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def touch(self, url, inlinks):
+        """
+        Re-score a pending URL after it gained an inlink.
+        Only done when the count reaches a power of two - the score grows with
+        log(inlinks), so this bounds re-pushes per URL without losing the ordering.
+        """
+        entry = self._entries.get(url)
+        if entry is not None and inlinks & (inlinks - 1) == 0:
+            self._push(url, entry[0])
+
+    def popleft(self):
+        """Remove and return the highest scoring (url, depth)"""
+        while self._heap:
+            neg_score, version, url, depth = heapq.heappop(self._heap)
+            entry = self._entries.get(url)
+            if entry is None or entry[1] != version:
+                continue  # Superseded by a newer push
+
+            # Trap likelihood only grows, so a stored score can be too optimistic
+            current = self.score(url, depth)
+            if self._heap and current < -self._heap[0][0]:
+                heapq.heappush(self._heap, (-current, version, url, depth))
+                continue
+
+            del self._entries[url]
+            return url, depth
+
+        raise IndexError('pop from an empty frontier')
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __iter__(self):
+        """Pending (url, depth) pairs, best first"""
+        by_discovery = sorted(self._entries.items(), key=lambda item: item[1][1])
+        pending = [(url, depth) for url, (depth, _) in by_discovery]
+        pending.sort(key=lambda item: -self.score(*item))
+        return iter(pending)
+
+
+def create_frontier(strategy, inlinks_for, trap_likelihood_for, urls=None):
+    """Build the discovery queue for a crawl: 'priority' or plain FIFO"""
+    if strategy == 'fifo':
+        return deque(urls or [])
+    return PriorityFrontier(inlinks_for, trap_likelihood_for, urls)
@@ -0,0 +1,367 @@
+"""
+Server-side layout for the site structure visualisation
+Pages are grouped into a directory tree and placed with a nested sunflower
+(phyllotaxis) layout: every directory is a disc sized by its page count, with
+its pages and sub-directories spiralling out from the centre, strongest
+PageRank first. Positions take one pass to compute and never change between
+requests, so the browser only draws a screenful of pre-positioned nodes:
+directory super-nodes when zoomed out, the pages of one directory or of the
+visible viewport when zoomed in.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+PAGE_RADIUS = 20            # layout units around each page
+SPIRAL_GAP = 1.2            # spacing factor that keeps neighbouring discs apart
+MAX_TREE_DEPTH = 6          # deeper directories are folded into their ancestor
+MAX_NODES = 500             # nodes per response
+MAX_EDGES = 5000            # edges per response, heaviest first
+VIEW_CACHE_SIZE = 32
+LAYOUT_REFRESH_SECONDS = 10  # a running crawl's layout is rebuilt at most this often
+
+STATUS_COLORS = {
+    2: '#10b981',  # Green for 2xx
+    3: '#3b82f6',  # Blue for 3xx
+    4: '#f59e0b',  # Orange for 4xx
+    5: '#ef4444'   # Red for 5xx
+}
+OTHER_COLOR = '#6b7280'
+
+
+def status_color(status_code):
+    return STATUS_COLORS.get((status_code or 0) // 100, OTHER_COLOR)
+
+
+def _as_list(values):
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
+class Cluster:
+    """One directory of the site tree"""
+
+    __slots__ = ('key', 'label', 'parent', 'children', 'pages', 'count', 'status_counts', 'x', 'y', 'radius', 'offsets')
+
+    def __init__(self, key, label, parent=None):
+        self.key = key
+        self.label = label
+        self.parent = parent
+        self.children = {}
+        self.pages = []            # page indexes directly in this directory
+        self.count = 0             # pages in the whole subtree
+        self.status_counts = {}    # status class -> pages in the subtree
+        self.x = self.y = self.radius = 0.0
+        self.offsets = None
+
+    def dominant_status(self):
+        """Most common status class as a representative code (200, 301, 404 ...)"""
+        if not self.status_counts:
+            return 0
+        status_class = max(self.status_counts.items(), key=lambda item: item[1])[0]
+        return {2: 200, 3: 301, 4: 404, 5: 500}.get(status_class, 0)
+
+
+class GraphLayout:
+    """Positions, directory clusters and level-of-detail views for a crawled site"""
+
+    def __init__(self, analysis, pages):
+        """
+        analysis: LinkGraphAnalysis of the crawl
+        pages: {url: (status_code, title)} for the crawled URLs, in crawl order
+        """
+        self.analysis = analysis
+        self.built_at = time.time()
+        self.urls = list(pages)
+        self.status_codes = [pages[url][0] or 0 for url in self.urls]
+        self.titles = [pages[url][1] or '' for url in self.urls]
+        self.page_count = len(self.urls)
+
+        # Page index <-> link graph node
+        self.node_of = [analysis.node_id(url) for url in self.urls]
+        self.page_of_node = [-1] * analysis.node_count
+        for page, node in enumerate(self.node_of):
+            if node is not None:
+                self.page_of_node[node] = page
+        self.rank = [float(analysis.pagerank[node]) if node is not None else 0.0 for node in self.node_of]
+        # Plain lists: element access on numpy arrays is slow in Python loops
+        self._indptr = _as_list(analysis.indptr)
+        self._indices = _as_list(analysis.indices)
+
+        self.x = [0.0] * self.page_count
+        self.y = [0.0] * self.page_count
+
+        self.hosts = {urlsplit(url).netloc for url in self.urls}
+        self.root = Cluster('', '/')
+        self.clusters = {'': self.root}
+        for page, url in enumerate(self.urls):
+            self._add_page(page, url)
+
+        self._arrange(self.root)
+        self._place(self.root, 0.0, 0.0)
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    # -----------------------------------------------------------------------
+    # Tree and positions
+    # -----------------------------------------------------------------------
+
+    def _directory_path(self, url):
+        """Directory segments of a URL; the host comes first when the crawl spans several"""
+        parts = urlsplit(url)
+        segments = [segment for segment in parts.path.split('/') if segment]
+        if not parts.path.endswith('/'):
+            segments = segments[:-1]
+        if len(self.hosts) > 1:
+            segments = [parts.netloc] + segments
+        return segments[:MAX_TREE_DEPTH]
+
+    def _add_page(self, page, url):
+        cluster = self.root
+        status_class = self.status_codes[page] // 100
+        self._count(cluster, status_class)
+
+        key = '/'
+        for segment in self._directory_path(url):
+            key += segment + '/'
+            child = cluster.children.get(segment)
+            if child is None:
+                child = Cluster(key, key if cluster is self.root else segment + '/', cluster)
+                cluster.children[segment] = child
+                self.clusters[key] = child
+            cluster = child
+            self._count(cluster, status_class)
+
+        cluster.pages.append(page)
+
+    @staticmethod
+    def _count(cluster, status_class):
+        cluster.count += 1
+        cluster.status_counts[status_class] = cluster.status_counts.get(status_class, 0) + 1
+
+    def _arrange(self, cluster):
+        """
+        Spiral a directory's items (sub-directories measured first, then pages,
+        biggest and strongest first) out from its centre: each item sits just
+        outside the area already taken, at the next golden-angle step.
+        """
+        items = []
+        for child in cluster.children.values():
+            self._arrange(child)
+            items.append((child.radius, child.count, child))
+        items += [(PAGE_RADIUS, self.rank[page], page) for page in cluster.pages]
+        items.sort(key=lambda item: (-item[0], -item[1]))
+
+        taken = 0.0  # sum of r^2 of the items placed so far
+        radius = PAGE_RADIUS
+        offsets = []
+        for index, (item_radius, _, item) in enumerate(items):
+            distance = SPIRAL_GAP * math.sqrt(taken) + item_radius if index else 0.0
+            angle = index * GOLDEN_ANGLE
+            offsets.append((item, distance * math.cos(angle), distance * math.sin(angle)))
+            taken += item_radius * item_radius
+            radius = max(radius, distance + item_radius)
+
+        cluster.offsets = offsets
+        cluster.radius = radius
+
+    def _place(self, cluster, x, y):
+        cluster.x, cluster.y = x, y
+        for item, dx, dy in cluster.offsets:
+            if isinstance(item, Cluster):
+                self._place(item, x + dx, y + dy)
+            else:
+                self.x[item] = x + dx
+                self.y[item] = y + dy
+        cluster.offsets = None
+
+    def subtree_pages(self, cluster):
+        pages = list(cluster.pages)
+        for child in cluster.children.values():
+            pages.extend(self.subtree_pages(child))
+        return pages
+
+    def bounds(self):
+        radius = self.root.radius
+        return {'x1': -radius, 'y1': -radius, 'x2': radius, 'y2': radius}
+
+    # -----------------------------------------------------------------------
+    # Elements
+    # -----------------------------------------------------------------------
+
+    def page_element(self, page):
+        url = self.urls[page]
+        node = self.node_of[page]
+        analysis = self.analysis
+        score = analysis.link_score(node) if node is not None else 0
+        depth = int(analysis.depths[node]) if node is not None else -1
+        return {
+            'data': {
+                'id': f'node-{page}',
+                'label': url.split('/')[-1] or url.split('//')[-1],  # Use last path segment or domain
+                'url': url,
+                'status_code': self.status_codes[page],
+                'title': self.titles[page],
+                'color': status_color(self.status_codes[page]),
+                'size': 16 + round(score / 5),  # 16-36 by link score
+                'link_score': score,
+                'inlinks': int(analysis.inlinks[node]) if node is not None else 0,
+                'click_depth': depth if depth >= 0 else None
+            },
+            'position': {'x': round(self.x[page], 1), 'y': round(self.y[page], 1)}
+        }
+
+    def cluster_element(self, cluster):
+        status_code = cluster.dominant_status()
+        return {
+            'data': {
+                'id': f'cluster-{cluster.key}',
+                'label': f'{cluster.label} ({cluster.count})',
+                'url': cluster.key,
+                'cluster': cluster.key,
+                'is_cluster': True,
+                'page_count': cluster.count,
+                'status_code': status_code,
+                'title': f'{cluster.count} pages',
+                'color': status_color(status_code),
+                # Drawn as the disc its pages occupy, so zooming in lands on them
+                'size': max(30, round(2 * cluster.radius)),
+                'font_size': max(12, round(cluster.radius / 6))
+            },
+            'position': {'x': round(cluster.x, 1), 'y': round(cluster.y, 1)}
+        }
+
+    def _edges_between(self, item_of, element_ids):
+        """Aggregate page links into edges between display items (weight = links)"""
+        indptr = self._indptr
+        indices = self._indices
+        page_of_node = self.page_of_node
+        counts = {}
+        for page, item in item_of.items():
+            node = self.node_of[page]
+            if node is None:
+                continue
+            for position in range(indptr[node], indptr[node + 1]):
+                target_page = page_of_node[indices[position]]
+                target_item = item_of.get(target_page)
+                if target_item is not None and target_item != item:
+                    key = (item, target_item)
+                    counts[key] = counts.get(key, 0) + 1
+
+        heaviest = sorted(counts.items(), key=lambda entry: -entry[1])[:MAX_EDGES]
+        return [{
+            'data': {
+                'id': f'edge-{element_ids[source]}-{element_ids[target]}',
+                'source': element_ids[source],
+                'target': element_ids[target],
+                'weight': weight
+            }
+        } for (source, target), weight in heaviest], len(counts) > MAX_EDGES
+
+    def _page_view(self, pages):
+        item_of = {page: page for page in pages}
+        element_ids = {page: f'node-{page}' for page in pages}
+        edges, edges_truncated = self._edges_between(item_of, element_ids)
+        return [self.page_element(page) for page in pages], edges, edges_truncated
+
+    # -----------------------------------------------------------------------
+    # Views
+    # -----------------------------------------------------------------------
+
+    def _cached(self, key, build):
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                return view
+
+        view = build()
+        with self._lock:
+            self._views[key] = view
+            while len(self._views) > VIEW_CACHE_SIZE:
+                self._views.popitem(last=False)
+        return view
+
+    def overview(self, max_nodes=MAX_NODES):
+        """Every page for small sites, the top-level directories otherwise"""
+        if self.page_count <= max_nodes:
+            return self._cached(('pages', max_nodes), lambda: self._all_pages_view())
+        return self.cluster_view('', max_nodes)
+
+    def _all_pages_view(self):
+        nodes, edges, edges_truncated = self._page_view(range(self.page_count))
+        return self._response('pages', nodes, edges, len(nodes), edges_truncated=edges_truncated)
+
+    def cluster_view(self, key, max_nodes=MAX_NODES):
+        """One directory: sub-directories as super-nodes, its own pages as page nodes"""
+        if key not in self.clusters:
+            return None
+        return self._cached(('cluster', key, max_nodes), lambda: self._build_cluster_view(self.clusters[key], max_nodes))
+
+    def _build_cluster_view(self, cluster, max_nodes):
+        # A directory holding a single page is drawn as that page
+        children = sorted(cluster.children.values(), key=lambda child: -child.count)
+        child_clusters = [child for child in children if child.count > 1]
+        loose_pages = list(cluster.pages) + [self.subtree_pages(child)[0] for child in children if child.count == 1]
+        loose_pages.sort(key=lambda page: -self.rank[page])
+
+        child_clusters = child_clusters[:max_nodes]
+        loose_pages = loose_pages[:max(0, max_nodes - len(child_clusters))]
+        truncated = len(child_clusters) + len(loose_pages) < len(children) + len(cluster.pages)
+
+        item_of = {}
+        element_ids = {}
+        nodes = []
+        for child in child_clusters:
+            element = self.cluster_element(child)
+            element_ids[child.key] = element['data']['id']
+            nodes.append(element)
+            for page in self.subtree_pages(child):
+                item_of[page] = child.key
+        for page in loose_pages:
+            element_ids[page] = f'node-{page}'
+            nodes.append(self.page_element(page))
+            item_of[page] = page
+
+        edges, edges_truncated = self._edges_between(item_of, element_ids)
+        return self._response('cluster', nodes, edges, cluster.count, cluster=cluster,
+                              truncated=truncated, edges_truncated=edges_truncated)
+
+    def viewport_view(self, x1, y1, x2, y2, max_nodes=MAX_NODES):
+        """The strongest pages inside a layout rectangle (zoomed-in tiles)"""
+        key = ('viewport', round(x1), round(y1), round(x2), round(y2), max_nodes)
+        return self._cached(key, lambda: self._build_viewport_view(x1, y1, x2, y2, max_nodes))
+
+    def _build_viewport_view(self, x1, y1, x2, y2, max_nodes):
+        xs, ys = self.x, self.y
+        inside = [page for page in range(self.page_count) if x1 <= xs[page] <= x2 and y1 <= ys[page] <= y2]
+        visible = sorted(inside, key=lambda page: -self.rank[page])[:max_nodes]
+        nodes, edges, edges_truncated = self._page_view(visible)
+        return self._response('viewport', nodes, edges, len(inside),
+                              truncated=len(visible) < len(inside), edges_truncated=edges_truncated)
+
+    def _response(self, mode, nodes, edges, total, cluster=None, truncated=False, edges_truncated=False):
+        breadcrumb = []
+        current = cluster
+        while current is not None:
+            breadcrumb.insert(0, {'key': current.key, 'label': current.label})
+            current = current.parent
+
+        return {
+            'success': True,
+            'layout': 'preset',
+            'mode': mode,
+            'cluster': cluster.key if cluster else None,
+            'parent': cluster.parent.key if cluster is not None and cluster.parent is not None else None,
+            'breadcrumb': breadcrumb,
+            'nodes': nodes,
+            'edges': edges,
+            'total_pages': self.page_count,
+            'scope_pages': total,
+            'visualized_pages': sum(1 for node in nodes if not node['data'].get('is_cluster')),
+            'truncated': truncated,
+            'edges_truncated': edges_truncated,
+            'bounds': self.bounds()
+        }
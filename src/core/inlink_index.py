@@ -0,0 +1,75 @@
+"""
+"Linked from" index
+Maps each target URL to the pages linking to it. URLs are interned to integer
+ids and every target keeps a set of source ids, so recording a link is O(1)
+no matter how many pages share a sitewide nav link. An optional limit caps the
+sources stored per target while the count of linking pages stays exact.
+linked_from URL lists are only built when they are read.
+"""
+
+
+class InlinkIndex:
+    """Integer-interned, set-backed target -> source pages index (callers lock)"""
+
+    def __init__(self, limit=0):
+        self.limit = limit or 0   # sources stored per target, 0 = unlimited
+        self._ids = {}            # url -> id
+        self.urls = []            # id -> url
+        self._sources = {}        # target id -> set of source ids
+        self._overflow = {}       # target id -> linking pages past the limit
+
+    def _intern(self, url):
+        url_id = self._ids.get(url)
+        if url_id is None:
+            url_id = len(self.urls)
+            self._ids[url] = url_id
+            self.urls.append(url)
+        return url_id
+
+    def add(self, source_url, target_url):
+        """
+        Record that source_url links to target_url; True if that is new.
+        Past the limit pairs can no longer be told apart, so callers pass each
+        (source, target) once - LinkManager de-duplicates links before this.
+        """
+        target = self._intern(target_url)
+        source = self._intern(source_url)
+        sources = self._sources.get(target)
+        if sources is None:
+            self._sources[target] = {source}
+            return True
+        if source in sources:
+            return False
+        if self.limit and len(sources) >= self.limit:
+            self._overflow[target] = self._overflow.get(target, 0) + 1
+        else:
+            sources.add(source)
+        return True
+
+    def count(self, url):
+        """Number of distinct pages linking to url"""
+        target = self._ids.get(url)
+        if target is None:
+            return 0
+        return len(self._sources.get(target, ())) + self._overflow.get(target, 0)
+
+    def sources(self, url):
+        """Linking page URLs in first-seen order (at most limit of them)"""
+        target = self._ids.get(url)
+        if target is None or target not in self._sources:
+            return []
+        urls = self.urls
+        return [urls[source] for source in sorted(self._sources[target])]
+
+    def __contains__(self, url):
+        target = self._ids.get(url)
+        return target is not None and target in self._sources
+
+    def __len__(self):
+        return len(self._sources)
+
+    def clear(self):
+        self._ids.clear()
+        self.urls.clear()
+        self._sources.clear()
+        self._overflow.clear()
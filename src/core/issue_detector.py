@@ -1,62 +1,179 @@
-"""SEO issue detection and reporting"""
+"""
+SEO issue detection and reporting
+Per-page checks are rules registered with @issue_rule. Each page's derived facts
+(parsed URL, page type, lowercased title / headers / robots) are computed once in
+a PageFeatures object that every rule reads, rules run in one pass, and each
+rule's calls, time and issues are counted so costly checks can be found and
+switched off per crawl (disabled_issue_rules).
+"""
 import threading
+import time
 import re
+from functools import cached_property
 from fnmatch import fnmatch
 from urllib.parse import urlparse
 from difflib import SequenceMatcher
+from src.core.issue_store import IssueStore
+from src.core.site_analysis import SiteAnalysis
+
+# Paths whose missing title / description / H1 is lower priority
+UTILITY_PATTERNS = (
+    '/thank-you', '/thankyou', '/confirmation',
+    '/privacy-policy', '/privacy', '/terms', '/legal',
+    '/cookie-policy', '/gdpr', '/dmca',
+    '/login', '/register', '/signup', '/account',
+    '/cart', '/checkout', '/wishlist',
+    '/search', '/404', '/error',
+)
+
+# Valid ISO 639-1 language codes (common ones)
+VALID_LANG_CODES = {
+    'aa', 'ab', 'af', 'ak', 'am', 'ar', 'as', 'ay', 'az', 'ba', 'be', 'bg', 'bh', 'bi', 'bn', 'bo', 'br', 'bs',
+    'ca', 'co', 'cs', 'cy', 'da', 'de', 'dz', 'el', 'en', 'eo', 'es', 'et', 'eu', 'fa', 'fi', 'fj', 'fo', 'fr',
+    'fy', 'ga', 'gd', 'gl', 'gn', 'gu', 'ha', 'he', 'hi', 'hr', 'hu', 'hy', 'ia', 'id', 'ie', 'ik', 'is', 'it',
+    'iu', 'ja', 'jv', 'ka', 'kk', 'kl', 'km', 'kn', 'ko', 'ks', 'ku', 'ky', 'la', 'lb', 'ln', 'lo', 'lt', 'lv',
+    'mg', 'mi', 'mk', 'ml', 'mn', 'mr', 'ms', 'mt', 'my', 'na', 'ne', 'nl', 'no', 'oc', 'om', 'or', 'pa', 'pl',
+    'ps', 'pt', 'qu', 'rm', 'rn', 'ro', 'ru', 'rw', 'sa', 'sd', 'sg', 'sh', 'si', 'sk', 'sl', 'sm', 'sn', 'so',
+    'sq', 'sr', 'ss', 'st', 'su', 'sv', 'sw', 'ta', 'te', 'tg', 'th', 'ti', 'tk', 'tl', 'tn', 'to', 'tr', 'ts',
+    'tt', 'tw', 'ug', 'uk', 'ur', 'uz', 've', 'vi', 'vo', 'wo', 'xh', 'yi', 'yo', 'za', 'zh', 'zu',
+    'x-default'  # Special value for default/fallback
+}
+
+# Valid hreflang format: lang or lang-region (e.g., en, en-US, zh-Hans-CN)
+HREFLANG_PATTERN = re.compile(r'^[a-z]{2,3}(-[A-Za-z]{2,4})?(-[A-Za-z]{2})?$|^x-default$', re.IGNORECASE)
+
+# (rule_id, method name) in evaluation order, filled by @issue_rule
+RULES = []
+
+
+def issue_rule(rule_id):
+    """Register an IssueDetector method(page, issues) as a per-page rule"""
+    def register(method):
+        RULES.append((rule_id, method.__name__))
+        return method
+    return register
+
+
+class PageFeatures:
+    """Facts about one crawled page, each derived at most once and shared by all rules"""
+
+    def __init__(self, detector, result):
+        self.detector = detector
+        self.result = result
+        self.url = result.get('url', '')
+
+    @cached_property
+    def parsed(self):
+        return urlparse(self.url)
+
+    @cached_property
+    def domain(self):
+        return self.parsed.netloc
+
+    @cached_property
+    def page_type(self):
+        return self.detector._classify_page_type(self.url)
+
+    @cached_property
+    def is_archive_or_utility(self):
+        if self.page_type == 'archive':
+            return True
+        path = self.parsed.path.lower()
+        return any(p in path for p in UTILITY_PATTERNS)
+
+    @cached_property
+    def normalized_url(self):
+        return self.detector._normalize_url_for_comparison(self.url)
+
+    @cached_property
+    def title(self):
+        return self.result.get('title', '')
+
+    @cached_property
+    def title_lower(self):
+        return (self.title or '').lower()
+
+    @cached_property
+    def h1_lower(self):
+        return (self.result.get('h1') or '').lower()
+
+    @cached_property
+    def robots(self):
+        return (self.result.get('robots') or '').lower()
+
+    @cached_property
+    def x_robots_tag(self):
+        return (self.result.get('x_robots_tag') or '').lower()
+
+    @cached_property
+    def is_noindex(self):
+        return 'noindex' in self.robots or 'noindex' in self.x_robots_tag
+
+    @cached_property
+    def headers_lower(self):
+        return {k.lower(): v for k, v in (self.result.get('response_headers') or {}).items()}
 
 
 class IssueDetector:
     """Detects SEO and technical issues in crawled pages"""
 
-    def __init__(self, exclusion_patterns=None):
+    def __init__(self, exclusion_patterns=None, disabled_rules=None):
         self.exclusion_patterns = exclusion_patterns or []
-        self.detected_issues = []
+        self.disabled_rules = set(disabled_rules or [])
+        self.rules = [(rule_id, getattr(self, name)) for rule_id, name in RULES]
+        self.rule_stats = {rule_id: [0, 0.0, 0] for rule_id, _ in RULES}  # calls, seconds, issues
+        self.stats_lock = threading.Lock()
+        self.detected_issues = IssueStore()
         self.issues_lock = threading.Lock()
+        # Sitemap / hreflang / redirect / broken-link analyses, updated page by page
+        self.site_analysis = SiteAnalysis(self)
         # Track site-wide issues that only need to be reported once
         self.reported_sitewide_issues = set()  # Set of (domain, issue_type) tuples
 
     def detect_issues(self, result):
-        """Detect SEO issues for a crawled URL"""
+        """Detect SEO issues for a crawled URL; returns the issues it added"""
         url = result.get('url', '')
         issues = []
 
         # Skip if URL matches exclusion patterns
         if self._should_exclude(url):
-            return
+            return issues
 
         # Check for connection failure (Status 0)
         status_code = result.get('status_code', 0)
         if status_code == 0:
-            with self.issues_lock:
-                self.detected_issues.append({
-                    'url': url,
-                    'type': 'error',
-                    'category': 'Technical',
-                    'issue': 'Connection Failed',
-                    'details': result.get('error', 'Failed to connect to server or request blocked')
-                })
-            return
-
-        # Critical SEO Issues
-        self._check_title_issues(result, issues)
-        self._check_meta_description_issues(result, issues)
-        self._check_heading_issues(result, issues)
-        self._check_content_issues(result, issues)
-        self._check_technical_issues(result, issues)
-        self._check_mobile_issues(result, issues)
-        self._check_accessibility_issues(result, issues)
-        self._check_social_media_issues(result, issues)
-        self._check_structured_data_issues(result, issues)
-        self._check_performance_issues(result, issues)
-        self._check_indexability_issues(result, issues)
-        self._check_url_issues(result, issues)
-        self._check_link_issues(result, issues)
-        self._check_security_issues(result, issues)
+            issues.append({
+                'url': url,
+                'type': 'error',
+                'category': 'Technical',
+                'issue': 'Connection Failed',
+                'details': result.get('error', 'Failed to connect to server or request blocked')
+            })
+            self.detected_issues.extend(issues)
+            return issues
+
+        # Run every enabled rule over the page's shared features
+        page = PageFeatures(self, result)
+        timings = []
+        clock = time.perf_counter
+        for rule_id, check in self.rules:
+            if rule_id in self.disabled_rules:
+                continue
+            found = len(issues)
+            started = clock()
+            check(page, issues)
+            timings.append((rule_id, clock() - started, len(issues) - found))
+
+        with self.stats_lock:
+            for rule_id, elapsed, found in timings:
+                stats = self.rule_stats[rule_id]
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] += found
 
         # Add all detected issues
-        with self.issues_lock:
-            self.detected_issues.extend(issues)
+        self.detected_issues.extend(issues)
+        return issues
 
     def _normalize_url_for_comparison(self, url):
         """
@@ -85,27 +202,14 @@ class IssueDetector:
         except:
             return url.lower().rstrip('/')
 
-    def _check_title_issues(self, result, issues):
+    @issue_rule('title')
+    def _check_title_issues(self, page, issues):
         """Check for title-related issues"""
-        url = result.get('url', '')
-        title = result.get('title', '')
-        
-        # Classify page type to determine severity
-        page_type = self._classify_page_type(url)
-        is_archive_or_utility = page_type == 'archive'
-        
-        # Also check for utility pages
-        parsed_path = urlparse(url).path.lower()
-        utility_patterns = [
-            '/thank-you', '/thankyou', '/confirmation',
-            '/privacy-policy', '/privacy', '/terms', '/legal',
-            '/cookie-policy', '/gdpr', '/dmca',
-            '/login', '/register', '/signup', '/account',
-            '/cart', '/checkout', '/wishlist',
-            '/search', '/404', '/error',
-        ]
-        if any(p in parsed_path for p in utility_patterns):
-            is_archive_or_utility = True
+        url = page.url
+        title = page.title
+
+        # Archive and utility pages get a lower severity
+        is_archive_or_utility = page.is_archive_or_utility
 
         if not title:
             # Archive/utility: downgrade to 'warning' (still needs attention, but lower priority)
@@ -150,32 +254,17 @@ class IssueDetector:
                     'details': f"Title is {len(title)} characters (recommended: 30-60)"
                 })
 
-    def _check_meta_description_issues(self, result, issues):
+    @issue_rule('meta_description')
+    def _check_meta_description_issues(self, page, issues):
         """Check for meta description issues"""
-        url = result.get('url', '')
-        meta_desc = result.get('meta_description', '')
-        
-        # Classify page type to determine severity
-        page_type = self._classify_page_type(url)
+        url = page.url
+        meta_desc = page.result.get('meta_description', '')
 
         if not meta_desc:
             # Archive/utility pages: downgrade to 'info' (expected behavior, low priority)
             # Important/other pages: keep as 'warning' (should be fixed for CTR)
-            severity = 'info' if page_type == 'archive' else 'warning'
-            
-            # Also check for utility pages not covered by _classify_page_type
-            parsed_path = urlparse(url).path.lower()
-            utility_patterns = [
-                '/thank-you', '/thankyou', '/confirmation',
-                '/privacy-policy', '/privacy', '/terms', '/legal',
-                '/cookie-policy', '/gdpr', '/dmca',
-                '/login', '/register', '/signup', '/account',
-                '/cart', '/checkout', '/wishlist',
-                '/search', '/404', '/error',
-            ]
-            if any(p in parsed_path for p in utility_patterns):
-                severity = 'info'
-            
+            severity = 'info' if page.is_archive_or_utility else 'warning'
+
             issue_title = 'Meta Description: Missing (Archive/Utility)' if severity == 'info' else 'Meta Description: Missing'
             
             issues.append({
@@ -206,29 +295,17 @@ class IssueDetector:
                     'details': f"Description is approx {pixel_width} pixels"
                 })
 
-    def _check_heading_issues(self, result, issues):
+    @issue_rule('headings')
+    def _check_heading_issues(self, page, issues):
         """Check for heading-related issues"""
-        url = result.get('url', '')
+        result = page.result
+        url = page.url
         h1 = result.get('h1', '')
         h1_list = result.get('h1_list', [])
         headings = result.get('headings_structure', [])
-        
-        # Classify page type to determine severity
-        page_type = self._classify_page_type(url)
-        is_archive_or_utility = page_type == 'archive'
-        
-        # Check for utility pages
-        parsed_path = urlparse(url).path.lower()
-        utility_patterns = [
-            '/thank-you', '/thankyou', '/confirmation',
-            '/privacy-policy', '/privacy', '/terms', '/legal',
-            '/cookie-policy', '/gdpr', '/dmca',
-            '/login', '/register', '/signup', '/account',
-            '/cart', '/checkout', '/wishlist',
-            '/search', '/404', '/error',
-        ]
-        if any(p in parsed_path for p in utility_patterns):
-            is_archive_or_utility = True
+
+        # Archive and utility pages get a lower severity
+        is_archive_or_utility = page.is_archive_or_utility
 
         if not h1 and not h1_list:
             # Archives often lack a formal H1 or use a generic one.
@@ -350,10 +427,11 @@ class IssueDetector:
                     'details': f"Duplicate template headings found: {', '.join(duplicates)}"
                 })
 
-    def _check_content_issues(self, result, issues):
+    @issue_rule('content')
+    def _check_content_issues(self, page, issues):
         """Check for content-related issues"""
-        url = result.get('url', '')
-        word_count = result.get('word_count', 0)
+        url = page.url
+        word_count = page.result.get('word_count', 0)
 
         if word_count < 300:
             issues.append({
@@ -364,9 +442,11 @@ class IssueDetector:
                 'details': f'Page has only {word_count} words (recommended: ≥300)'
             })
 
-    def _check_technical_issues(self, result, issues):
+    @issue_rule('technical')
+    def _check_technical_issues(self, page, issues):
         """Check for technical SEO issues"""
-        url = result.get('url', '')
+        result = page.result
+        url = page.url
         status_code = result.get('status_code', 0)
 
         if status_code >= 400 and status_code < 500:
@@ -404,8 +484,8 @@ class IssueDetector:
 
         # Soft 404 Detection: 200 OK but appears to be an error page
         if status_code == 200:
-            title = result.get('title', '').lower()
-            h1 = result.get('h1', '').lower()
+            title = page.title_lower
+            h1 = page.h1_lower
             word_count = result.get('word_count', 0)
             page_size = result.get('size', 0)
             
@@ -508,17 +588,13 @@ class IssueDetector:
         canonical_url = result.get('canonical_url', '')
         
         # Check indexability to filter false positives
-        robots_meta = result.get('robots', '').lower()
-        x_robots_tag = result.get('x_robots_tag', '').lower()
-        is_noindex = 'noindex' in robots_meta or 'noindex' in x_robots_tag
-
         if not canonical_url:
-            if is_noindex:
+            if page.is_noindex:
                  # False Positive: NoIndex pages don't strictly need a canonical (Google ignores them anyway)
                  pass
             else:
                 # Real Issue: Indexable page with no canonical
-                page_type = self._classify_page_type(url)
+                page_type = page.page_type
                 
                 if page_type == 'important':
                     issues.append({
@@ -546,17 +622,16 @@ class IssueDetector:
                     })
         else:
             # Normalize URLs before comparing (handle trailing slashes, case, etc.)
-            normalized_url = self._normalize_url_for_comparison(url)
             normalized_canonical = self._normalize_url_for_comparison(canonical_url)
-            
-            if normalized_canonical != normalized_url:
+
+            if normalized_canonical != page.normalized_url:
                 # Analyze the mismatch severity
                 severity = 'warning'
                 issue_label = 'Canonicals: Canonicalised'
                 details = f"Page is canonicalised to: {canonical_url}"
                 
                 try:
-                    p_url = urlparse(url)
+                    p_url = page.parsed
                     p_can = urlparse(canonical_url)
                     
                     # check for root/homepage redirect (Soft 404 risk)
@@ -594,11 +669,12 @@ class IssueDetector:
             # If canonical is pointing to a different domain or path, we can't easily check indexability without crawling it.
             # But we can flag if it looks suspicious.
 
-    def _check_mobile_issues(self, result, issues):
+    @issue_rule('mobile')
+    def _check_mobile_issues(self, page, issues):
         """Check for mobile optimization issues"""
-        url = result.get('url', '')
+        url = page.url
 
-        if not result.get('viewport'):
+        if not page.result.get('viewport'):
             issues.append({
                 'url': url,
                 'type': 'error',
@@ -607,9 +683,11 @@ class IssueDetector:
                 'details': 'Page is not mobile-optimized'
             })
 
-    def _check_accessibility_issues(self, result, issues):
+    @issue_rule('accessibility')
+    def _check_accessibility_issues(self, page, issues):
         """Check for accessibility and image issues"""
-        url = result.get('url', '')
+        result = page.result
+        url = page.url
 
         if not result.get('lang'):
             issues.append({
@@ -650,9 +728,11 @@ class IssueDetector:
                 'details': f'{missing_size_count} images lack width/height attributes'
             })
 
-    def _check_social_media_issues(self, result, issues):
+    @issue_rule('social')
+    def _check_social_media_issues(self, page, issues):
         """Check for social media optimization issues"""
-        url = result.get('url', '')
+        result = page.result
+        url = page.url
 
         if not result.get('og_tags'):
             issues.append({
@@ -672,9 +752,11 @@ class IssueDetector:
                 'details': 'Page has no Twitter Card tags'
             })
 
-    def _check_structured_data_issues(self, result, issues):
+    @issue_rule('structured_data')
+    def _check_structured_data_issues(self, page, issues):
         """Check for structured data issues and AI readiness"""
-        url = result.get('url', '')
+        result = page.result
+        url = page.url
         json_ld_data = result.get('json_ld', [])
         schema_org_data = result.get('schema_org', [])
         
@@ -796,9 +878,7 @@ class IssueDetector:
         
         # Validation checks
         # Check 1: Has basic organizational schema (recommended for all sites)
-        page_type = self._classify_page_type(url)
-        
-        if page_type == 'important' and not schema_analysis['has_organization'] and not schema_analysis['has_website']:
+        if page.page_type == 'important' and not schema_analysis['has_organization'] and not schema_analysis['has_website']:
             if 'Article' not in detected_types and 'BlogPosting' not in detected_types and 'Product' not in detected_types:
                 issues.append({
                     'url': url,
@@ -846,9 +926,11 @@ class IssueDetector:
                     'details': 'Article schema should have headline and datePublished'
                 })
 
-    def _check_performance_issues(self, result, issues):
+    @issue_rule('performance')
+    def _check_performance_issues(self, page, issues):
         """Check for performance issues"""
-        url = result.get('url', '')
+        result = page.result
+        url = page.url
         response_time = result.get('response_time', 0)
         page_size = result.get('size', 0)
 
@@ -870,11 +952,12 @@ class IssueDetector:
                 'details': f'Page size is {page_size / 1024 / 1024:.1f}MB (recommended: <3MB)'
             })
 
-    def _check_indexability_issues(self, result, issues):
+    @issue_rule('indexability')
+    def _check_indexability_issues(self, page, issues):
         """Check for indexability issues"""
-        url = result.get('url', '')
-        robots_meta = result.get('robots', '').lower()
-        x_robots_tag = result.get('x_robots_tag', '').lower()
+        url = page.url
+        robots_meta = page.robots
+        x_robots_tag = page.x_robots_tag
 
         # Check Noindex
         meta_noindex = 'noindex' in robots_meta
@@ -888,7 +971,7 @@ class IssueDetector:
             source_str = " & ".join(sources)
             
             # Determine severity based on page type
-            page_type = self._classify_page_type(url)
+            page_type = page.page_type
             
             if page_type == 'archive':
                 # Archive pages with noindex = expected, low severity
@@ -1034,11 +1117,11 @@ class IssueDetector:
             return 'other'
 
 
-    def _check_url_issues(self, result, issues):
+    @issue_rule('url')
+    def _check_url_issues(self, page, issues):
         """Check for URL structure issues"""
-        url = result.get('url', '')
-        parsed = urlparse(url)
-        path = parsed.path
+        url = page.url
+        path = page.parsed.path
         
         if len(url) > 115:
             issues.append({
@@ -1078,9 +1161,11 @@ class IssueDetector:
                 'details': 'URL path contains duplicate segments'
             })
 
-    def _check_link_issues(self, result, issues):
+    @issue_rule('links')
+    def _check_link_issues(self, page, issues):
         """Check for link-related issues"""
-        url = result.get('url', '')
+        result = page.result
+        url = page.url
         links_data = result.get('links_data', [])
         external_links_count = result.get('external_links', 0)
         
@@ -1183,26 +1268,27 @@ class IssueDetector:
                         'details': f'External domain {domain} opens in new tab without rel="noopener" (Best practice recommendation)'
                     })
 
-    def _check_security_issues(self, result, issues):
+    @issue_rule('security')
+    def _check_security_issues(self, page, issues):
         """Check for security issues"""
-        url = result.get('url', '')
-        headers = result.get('response_headers', {})
+        result = page.result
+        url = page.url
         links_data = result.get('links_data', [])
         images = result.get('images', [])
-        
+
         # Headers keys are case-insensitive in requests usually, but let's normalize for safety
-        headers_lower = {k.lower(): v for k, v in headers.items()}
+        headers_lower = page.headers_lower
         
         # 1. Content-Security-Policy (CSP)
         # SITE-WIDE issue, report only once per domain
         if 'content-security-policy' not in headers_lower:
             try:
-                domain = urlparse(url).netloc
+                domain = page.domain
                 issue_key = (domain, 'missing_csp')
                 if issue_key not in self.reported_sitewide_issues:
                     self.reported_sitewide_issues.add(issue_key)
                     issues.append({
-                        'url': f'{urlparse(url).scheme}://{domain}',
+                        'url': f'{page.parsed.scheme}://{domain}',
                         'type': 'info',
                         'category': 'Security',
                         'issue': 'Security: Missing Content-Security-Policy',
@@ -1215,12 +1301,12 @@ class IssueDetector:
         # Only relevant for HTTPS pages
         if url.startswith('https://') and 'strict-transport-security' not in headers_lower:
              try:
-                domain = urlparse(url).netloc
+                domain = page.domain
                 issue_key = (domain, 'missing_hsts')
                 if issue_key not in self.reported_sitewide_issues:
                     self.reported_sitewide_issues.add(issue_key)
                     issues.append({
-                        'url': f'{urlparse(url).scheme}://{domain}',
+                        'url': f'{page.parsed.scheme}://{domain}',
                         'type': 'warning',
                         'category': 'Security',
                         'issue': 'Security: Missing HSTS Header',
@@ -1232,12 +1318,12 @@ class IssueDetector:
         # 3. X-Frame-Options
         if 'x-frame-options' not in headers_lower:
              try:
-                domain = urlparse(url).netloc
+                domain = page.domain
                 issue_key = (domain, 'missing_xfo')
                 if issue_key not in self.reported_sitewide_issues:
                     self.reported_sitewide_issues.add(issue_key)
                     issues.append({
-                        'url': f'{urlparse(url).scheme}://{domain}',
+                        'url': f'{page.parsed.scheme}://{domain}',
                         'type': 'info',
                         'category': 'Security',
                         'issue': 'Security: Missing X-Frame-Options',
@@ -1489,331 +1575,6 @@ class IssueDetector:
         }
         return messages.get(status_code, f'HTTP {status_code} Error')
 
-    def detect_sitemap_issues(self, sitemap_urls, all_results):
-        """
-        Cross-reference sitemap URLs with crawled results to detect "Dirty Sitemap" issues.
-        
-        Args:
-            sitemap_urls: List of URLs found in sitemaps
-            all_results: List of crawled result dictionaries
-            
-        Returns:
-            dict: Summary with categorized counts and issues list for frontend
-        """
-        if not sitemap_urls or not all_results:
-            return {
-                'total': 0,
-                'valid': 0,
-                'errors': 0,
-                'noindex': 0,
-                'non_canonical': 0,
-                'redirects': 0,
-                'not_crawled': 0,
-                'issues': []
-            }
-        
-        # Build lookup dict from crawled results (normalized URL -> result)
-        results_lookup = {}
-        for result in all_results:
-            url = result.get('url', '')
-            if url:
-                normalized = self._normalize_url_for_comparison(url)
-                results_lookup[normalized] = result
-
-        # DEBUG: Print sample keys
-        if sitemap_urls:
-            print(f"DEBUG SITEMAP: Sitemap URLs count: {len(sitemap_urls)}")
-            print(f"DEBUG SITEMAP: Crawled lookup keys count: {len(results_lookup)}")
-            sample_sitemap = sitemap_urls[0]
-            norm_sitemap = self._normalize_url_for_comparison(sample_sitemap)
-            print(f"DEBUG SITEMAP: Sample Sitemap URL: '{sample_sitemap}' -> '{norm_sitemap}'")
-            if results_lookup:
-                sample_crawled = list(results_lookup.keys())[0]
-                print(f"DEBUG SITEMAP: Sample Crawled Key: '{sample_crawled}'")
-                if norm_sitemap not in results_lookup:
-                    print(f"DEBUG SITEMAP: Mismatch! '{norm_sitemap}' not found in lookup.")
-    
-        # Track counts
-        valid_count = 0
-        error_count = 0
-        noindex_count = 0
-        non_canonical_count = 0
-        redirect_count = 0
-        not_crawled_count = 0
-        sitemap_issues = []
-        
-        for sitemap_url in sitemap_urls:
-            normalized_sitemap_url = self._normalize_url_for_comparison(sitemap_url)
-            result = results_lookup.get(normalized_sitemap_url)
-            
-            if not result:
-                # URL in sitemap but not crawled
-                not_crawled_count += 1
-                continue
-            
-            status_code = result.get('status_code', 0)
-            robots_meta = result.get('robots', '').lower()
-            x_robots_tag = result.get('x_robots_tag', '').lower()
-            canonical_url = result.get('canonical_url', '')
-            
-            is_noindex = 'noindex' in robots_meta or 'noindex' in x_robots_tag
-            
-            # Check for non-self-canonical
-            is_non_canonical = False
-            if canonical_url:
-                normalized_canonical = self._normalize_url_for_comparison(canonical_url)
-                if normalized_canonical != normalized_sitemap_url:
-                    is_non_canonical = True
-            
-            # Categorize the URL
-            if status_code >= 400 or status_code == 0:
-                # Error (4xx, 5xx, or connection failed)
-                error_count += 1
-                sitemap_issues.append({
-                    'url': sitemap_url,
-                    'type': 'error',
-                    'category': 'Sitemap',
-                    'issue': 'Sitemap: Broken URL',
-                    'details': f'URL returns {self._get_status_code_message(status_code)} (Status {status_code})'
-                })
-            elif status_code >= 300 and status_code < 400:
-                # Redirect
-                redirect_count += 1
-                sitemap_issues.append({
-                    'url': sitemap_url,
-                    'type': 'warning',
-                    'category': 'Sitemap',
-                    'issue': 'Sitemap: Redirecting URL',
-                    'details': f'URL redirects ({status_code}) - update sitemap with final destination'
-                })
-            elif is_noindex:
-                # Noindex
-                noindex_count += 1
-                sitemap_issues.append({
-                    'url': sitemap_url,
-                    'type': 'warning',
-                    'category': 'Sitemap',
-                    'issue': 'Sitemap: Noindexed URL',
-                    'details': 'URL has noindex directive - remove from sitemap or remove noindex'
-                })
-            elif is_non_canonical:
-                # Non-canonical
-                non_canonical_count += 1
-                sitemap_issues.append({
-                    'url': sitemap_url,
-                    'type': 'warning',
-                    'category': 'Sitemap',
-                    'issue': 'Sitemap: Non-Canonical URL',
-                    'details': f'URL canonicalises to {canonical_url} - update sitemap with canonical URL'
-                })
-            else:
-                # Valid (200 OK, indexable, self-canonical)
-                valid_count += 1
-        
-        # Add issues to main detected_issues list
-        with self.issues_lock:
-            self.detected_issues.extend(sitemap_issues)
-        
-        return {
-            'total': len(sitemap_urls),
-            'valid': valid_count,
-            'errors': error_count,
-            'noindex': noindex_count,
-            'non_canonical': non_canonical_count,
-            'redirects': redirect_count,
-            'not_crawled': not_crawled_count,
-            'issues': sitemap_issues
-        }
-
-    def detect_links_to_redirects(self, all_results, all_links):
-        """
-        Detect internal links that point to URLs that redirect.
-        This wastes crawl budget and should be fixed by updating the href.
-        
-        Args:
-            all_results: List of all crawled result dictionaries
-            all_links: List of all link dictionaries {source_url, target_url, is_internal, ...}
-            
-        Returns:
-            dict: Summary with count and list of problematic links
-        """
-        if not all_results or not all_links:
-            return {'total_links_to_redirects': 0, 'pages_affected': 0, 'links': []}
-        
-        # Build a lookup of URL -> status code and redirect info
-        url_status_map = {}
-        for result in all_results:
-            url = result.get('url', '')
-            if not url:
-                continue
-            normalized = self._normalize_url_for_comparison(url)
-            url_status_map[normalized] = {
-                'status_code': result.get('status_code', 0),
-                'final_url': result.get('final_url', ''),
-                'redirect_chain': result.get('redirect_chain', [])
-            }
-        
-        # Track links pointing to redirects
-        links_to_redirects = []
-        pages_with_redirect_links = set()
-        
-        for link in all_links:
-            source_url = link.get('source_url', '')
-            target_url = link.get('target_url', '')
-            is_internal = link.get('is_internal', False)
-            
-            if not source_url or not target_url or not is_internal:
-                continue
-            
-            # Check target URL's status
-            normalized_target = self._normalize_url_for_comparison(target_url)
-            target_info = url_status_map.get(normalized_target)
-            
-            if target_info:
-                status = target_info.get('status_code', 0)
-                if 300 <= status < 400:
-                    # This is a link to a redirect!
-                    final_url = target_info.get('final_url', '')
-                    links_to_redirects.append({
-                        'source_url': source_url,
-                        'target_url': target_url,
-                        'target_status': status,
-                        'final_url': final_url,
-                        'anchor_text': link.get('text', ''),
-                        'redirect_chain': target_info.get('redirect_chain', [])
-                    })
-                    pages_with_redirect_links.add(source_url)
-        
-        # Create issues for pages with links to redirects
-        # Group by source URL to avoid duplicate issues per page
-        links_by_source = {}
-        for link in links_to_redirects:
-            source = link['source_url']
-            if source not in links_by_source:
-                links_by_source[source] = []
-            links_by_source[source].append(link)
-        
-        with self.issues_lock:
-            for source_url, source_links in links_by_source.items():
-                count = len(source_links)
-                # Show first few examples
-                examples = [f"{l['target_url']} ({l['target_status']})" for l in source_links[:3]]
-                examples_str = ', '.join(examples)
-                if count > 3:
-                    examples_str += f', and {count - 3} more'
-                
-                self.detected_issues.append({
-                    'url': source_url,
-                    'type': 'warning',
-                    'category': 'Links',
-                    'issue': 'Links: Internal Links to Redirects',
-                    'details': f'{count} internal links point to redirecting URLs: {examples_str}',
-                    'links_to_redirects': source_links
-                })
-        
-        return {
-            'total_links_to_redirects': len(links_to_redirects),
-            'pages_affected': len(pages_with_redirect_links),
-            'links': links_to_redirects
-        }
-
-    def detect_broken_link_sources(self, all_results, all_links):
-        """
-        Find which pages contain links to broken URLs (4xx/5xx status).
-        Enriches broken URL issues with source page information.
-        
-        Args:
-            all_results: List of all crawled result dictionaries
-            all_links: List of all link dictionaries {source_url, target_url, is_internal, ...}
-            
-        Returns:
-            dict: Summary with broken URLs and their source pages
-        """
-        if not all_results or not all_links:
-            return {'broken_urls': [], 'total_broken_links': 0}
-        
-        # Build a lookup of URL -> status code
-        url_status_map = {}
-        for result in all_results:
-            url = result.get('url', '')
-            if not url:
-                continue
-            normalized = self._normalize_url_for_comparison(url)
-            url_status_map[normalized] = {
-                'status_code': result.get('status_code', 0),
-                'title': result.get('title', ''),
-                'url': url
-            }
-        
-        # Build a lookup of target URL -> list of source pages
-        target_sources_map = {}
-        for link in all_links:
-            source_url = link.get('source_url', '')
-            target_url = link.get('target_url', '')
-            
-            if not source_url or not target_url:
-                continue
-            
-            normalized_target = self._normalize_url_for_comparison(target_url)
-            if normalized_target not in target_sources_map:
-                target_sources_map[normalized_target] = []
-            
-            target_sources_map[normalized_target].append({
-                'source_url': source_url,
-                'anchor_text': link.get('text', ''),
-                'is_internal': link.get('is_internal', False)
-            })
-        
-        # Find broken URLs and their sources
-        broken_urls_with_sources = []
-        
-        for normalized_url, status_info in url_status_map.items():
-            status = status_info.get('status_code', 0)
-            original_url = status_info.get('url', normalized_url)
-            
-            if status >= 400 or status == 0:  # 4xx, 5xx, or no response
-                sources = target_sources_map.get(normalized_url, [])
-                
-                if sources:
-                    broken_urls_with_sources.append({
-                        'broken_url': original_url,
-                        'status_code': status,
-                        'title': status_info.get('title', ''),
-                        'source_pages': sources,
-                        'source_count': len(sources)
-                    })
-        
-        # Enhance existing 4xx/5xx issues with source page info
-        # Also create new issues that highlight the source pages
-        with self.issues_lock:
-            for broken_item in broken_urls_with_sources:
-                broken_url = broken_item['broken_url']
-                status = broken_item['status_code']
-                sources = broken_item['source_pages']
-                source_count = broken_item['source_count']
-                
-                if source_count > 0:
-                    # Get first few source URLs for the issue details
-                    source_urls = [s['source_url'] for s in sources[:5]]
-                    source_list = ', '.join(source_urls)
-                    if source_count > 5:
-                        source_list += f' and {source_count - 5} more'
-                    
-                    self.detected_issues.append({
-                        'url': broken_url,
-                        'type': 'error' if status >= 400 else 'warning',
-                        'category': 'Links',
-                        'issue': f'Broken Link Sources: {status} error linked from {source_count} pages',
-                        'details': f'This broken URL is linked from: {source_list}',
-                        'source_pages': sources,
-                        'source_count': source_count
-                    })
-        
-        return {
-            'broken_urls': broken_urls_with_sources,
-            'total_broken_links': sum(item['source_count'] for item in broken_urls_with_sources)
-        }
-
     def detect_hreflang_issues(self, all_results):
         """
         Detect hreflang implementation issues across all crawled pages.
@@ -1826,24 +1587,8 @@ class IssueDetector:
         
         Returns a summary dict with hreflang data for frontend visualization.
         """
-        # Valid ISO 639-1 language codes (common ones)
-        valid_lang_codes = {
-            'aa', 'ab', 'af', 'ak', 'am', 'ar', 'as', 'ay', 'az', 'ba', 'be', 'bg', 'bh', 'bi', 'bn', 'bo', 'br', 'bs',
-            'ca', 'co', 'cs', 'cy', 'da', 'de', 'dz', 'el', 'en', 'eo', 'es', 'et', 'eu', 'fa', 'fi', 'fj', 'fo', 'fr',
-            'fy', 'ga', 'gd', 'gl', 'gn', 'gu', 'ha', 'he', 'hi', 'hr', 'hu', 'hy', 'ia', 'id', 'ie', 'ik', 'is', 'it',
-            'iu', 'ja', 'jv', 'ka', 'kk', 'kl', 'km', 'kn', 'ko', 'ks', 'ku', 'ky', 'la', 'lb', 'ln', 'lo', 'lt', 'lv',
-            'mg', 'mi', 'mk', 'ml', 'mn', 'mr', 'ms', 'mt', 'my', 'na', 'ne', 'nl', 'no', 'oc', 'om', 'or', 'pa', 'pl',
-            'ps', 'pt', 'qu', 'rm', 'rn', 'ro', 'ru', 'rw', 'sa', 'sd', 'sg', 'sh', 'si', 'sk', 'sl', 'sm', 'sn', 'so',
-            'sq', 'sr', 'ss', 'st', 'su', 'sv', 'sw', 'ta', 'te', 'tg', 'th', 'ti', 'tk', 'tl', 'tn', 'to', 'tr', 'ts',
-            'tt', 'tw', 'ug', 'uk', 'ur', 'uz', 've', 'vi', 'vo', 'wo', 'xh', 'yi', 'yo', 'za', 'zh', 'zu',
-            'x-default'  # Special value for default/fallback
-        }
-        
-        # Regex for valid hreflang format: lang or lang-region (e.g., en, en-US, zh-Hans-CN)
-        hreflang_pattern = re.compile(r'^[a-z]{2,3}(-[A-Za-z]{2,4})?(-[A-Za-z]{2})?$|^x-default$', re.IGNORECASE)
-        
         # Build URL -> hreflang map and status map
-        url_hreflang_map = {}  # url -> list of {lang, target_url}
+        url_hreflang_map = {}  # url -> {original_url, hreflangs, targets}
         url_status_map = {}    # url -> status_code
         
         for result in all_results:
@@ -1854,17 +1599,33 @@ class IssueDetector:
             normalized_url = self._normalize_url_for_comparison(url)
             url_status_map[normalized_url] = result.get('status_code', 0)
             
-            hreflang_list = result.get('hreflang', [])
-            if hreflang_list:
-                url_hreflang_map[normalized_url] = {
-                    'original_url': url,
-                    'hreflangs': hreflang_list
-                }
+            entry = self.hreflang_entry(url, result.get('hreflang', []))
+            if entry:
+                url_hreflang_map[normalized_url] = entry
         
-        # Track all hreflang entries for frontend matrix
+        hreflang_data, issues = self.evaluate_hreflang(url_hreflang_map, url_status_map)
+        self.detected_issues.extend(issues)
+        return hreflang_data
+
+    def hreflang_entry(self, url, hreflang_list):
+        """url_hreflang_map value for one page (None if it declares no hreflang)"""
+        if not hreflang_list:
+            return None
+        return {
+            'original_url': url,
+            'hreflangs': hreflang_list,
+            # Normalised targets, so reciprocity is one set lookup
+            'targets': {self._normalize_url_for_comparison(h.get('url', '')) for h in hreflang_list}
+        }
+
+    def evaluate_hreflang(self, url_hreflang_map, url_status_map):
+        """
+        (hreflang_data, issues) for a normalised url -> hreflang_entry map and a
+        normalised url -> status code map. The issues are returned, not stored.
+        """
+        issues = []
         hreflang_matrix = []
         
-        # Detect issues
         for normalized_url, data in url_hreflang_map.items():
             source_url = data['original_url']
             hreflangs = data['hreflangs']
@@ -1882,24 +1643,22 @@ class IssueDetector:
                 
                 # Check 1: Validate language code format
                 lang_base = lang.split('-')[0].lower()
-                if not hreflang_pattern.match(lang):
-                    with self.issues_lock:
-                        self.detected_issues.append({
-                            'url': source_url,
-                            'type': 'warning',
-                            'category': 'International',
-                            'issue': 'Hreflang: Invalid Language Code',
-                            'details': f'Invalid hreflang code "{lang}" - should be ISO 639-1 format (e.g., en, en-US)'
-                        })
-                elif lang_base not in valid_lang_codes and lang.lower() != 'x-default':
-                    with self.issues_lock:
-                        self.detected_issues.append({
-                            'url': source_url,
-                            'type': 'warning',
-                            'category': 'International',
-                            'issue': 'Hreflang: Unknown Language Code',
-                            'details': f'Unrecognized language code "{lang}" - verify it is a valid ISO 639-1 code'
-                        })
+                if not HREFLANG_PATTERN.match(lang):
+                    issues.append({
+                        'url': source_url,
+                        'type': 'warning',
+                        'category': 'International',
+                        'issue': 'Hreflang: Invalid Language Code',
+                        'details': f'Invalid hreflang code "{lang}" - should be ISO 639-1 format (e.g., en, en-US)'
+                    })
+                elif lang_base not in VALID_LANG_CODES and lang.lower() != 'x-default':
+                    issues.append({
+                        'url': source_url,
+                        'type': 'warning',
+                        'category': 'International',
+                        'issue': 'Hreflang: Unknown Language Code',
+                        'details': f'Unrecognized language code "{lang}" - verify it is a valid ISO 639-1 code'
+                    })
                 
                 # Check for self-reference
                 if normalized_target == normalized_url:
@@ -1907,25 +1666,20 @@ class IssueDetector:
                 
                 # Check 2: Reciprocal link validation
                 reciprocal_status = 'unknown'
-                if normalized_target in url_hreflang_map:
-                    target_hreflangs = url_hreflang_map[normalized_target]['hreflangs']
+                target_entry = url_hreflang_map.get(normalized_target)
+                if target_entry:
                     # Check if target points back to source
-                    points_back = any(
-                        self._normalize_url_for_comparison(h.get('url', '')) == normalized_url
-                        for h in target_hreflangs
-                    )
-                    if points_back:
+                    if normalized_url in target_entry['targets']:
                         reciprocal_status = 'valid'
                     else:
                         reciprocal_status = 'missing'
-                        with self.issues_lock:
-                            self.detected_issues.append({
-                                'url': source_url,
-                                'type': 'warning',
-                                'category': 'International',
-                                'issue': 'Hreflang: Missing Reciprocal Link',
-                                'details': f'Page points to {target_url} ({lang}) but target does not point back'
-                            })
+                        issues.append({
+                            'url': source_url,
+                            'type': 'warning',
+                            'category': 'International',
+                            'issue': 'Hreflang: Missing Reciprocal Link',
+                            'details': f'Page points to {target_url} ({lang}) but target does not point back'
+                        })
                 else:
                     # Target not crawled or doesn't have hreflang
                     reciprocal_status = 'not_crawled'
@@ -1933,14 +1687,13 @@ class IssueDetector:
                 # Check 3: Target page status
                 target_status = url_status_map.get(normalized_target, 0)
                 if target_status >= 400 or target_status == 0:
-                    with self.issues_lock:
-                        self.detected_issues.append({
-                            'url': source_url,
-                            'type': 'error',
-                            'category': 'International',
-                            'issue': 'Hreflang: Points to Non-200 Page',
-                            'details': f'Hreflang ({lang}) points to {target_url} which returns status {target_status}'
-                        })
+                    issues.append({
+                        'url': source_url,
+                        'type': 'error',
+                        'category': 'International',
+                        'issue': 'Hreflang: Points to Non-200 Page',
+                        'details': f'Hreflang ({lang}) points to {target_url} which returns status {target_status}'
+                    })
                 
                 # Add to matrix for frontend
                 hreflang_matrix.append({
@@ -1953,29 +1706,92 @@ class IssueDetector:
             
             # Check 4: Missing self-reference
             if hreflangs and not has_self_reference:
-                with self.issues_lock:
-                    self.detected_issues.append({
-                        'url': source_url,
-                        'type': 'info',
-                        'category': 'International',
-                        'issue': 'Hreflang: Missing Self-Reference',
-                        'details': 'Page has hreflang tags but no self-referencing hreflang'
-                    })
+                issues.append({
+                    'url': source_url,
+                    'type': 'info',
+                    'category': 'International',
+                    'issue': 'Hreflang: Missing Self-Reference',
+                    'details': 'Page has hreflang tags but no self-referencing hreflang'
+                })
         
-        return {
+        hreflang_data = {
             'hreflang_matrix': hreflang_matrix,
             'pages_with_hreflang': len(url_hreflang_map),
             'total_hreflang_entries': len(hreflang_matrix)
         }
+        return hreflang_data, issues
 
     def get_issues(self):
         """Get all detected issues"""
-        with self.issues_lock:
-            return self.detected_issues.copy()
+        return self.detected_issues.to_list()
+
+    def get_issues_since(self, seq):
+        """Issues added after sequence number seq (the UI's issue_since)"""
+        return self.detected_issues.since(seq)
+
+    def get_issue_summary(self, exclusion_patterns=None, top=None):
+        """Counts by severity / category / issue, optionally minus excluded URLs"""
+        from src.export_stream import url_excluder
+        return self.detected_issues.summary(url_excluder(exclusion_patterns), top)
+
+    def get_rule_stats(self):
+        """
+        Per-rule calls / time / issues found, costliest first. A shared page
+        feature is charged to the first rule that reads it.
+        """
+        with self.stats_lock:
+            stats = {rule_id: list(values) for rule_id, values in self.rule_stats.items()}
+        total_seconds = sum(values[1] for values in stats.values()) or 1.0
+        rules = []
+        for rule_id, (calls, seconds, found) in stats.items():
+            rules.append({
+                'rule': rule_id,
+                'enabled': rule_id not in self.disabled_rules,
+                'calls': calls,
+                'total_ms': round(seconds * 1000, 2),
+                'avg_us': round(seconds * 1e6 / calls, 1) if calls else 0,
+                'issues': found,
+                'share': round(100 * seconds / total_seconds, 1)
+            })
+        rules.sort(key=lambda rule: rule['total_ms'], reverse=True)
+        return rules
+
+    def set_rule_enabled(self, rule_id, enabled=True):
+        """Switch one rule on or off for the rest of this crawl"""
+        if rule_id not in self.rule_stats:
+            return False
+        if enabled:
+            self.disabled_rules.discard(rule_id)
+        else:
+            self.disabled_rules.add(rule_id)
+        return True
+
+    def set_disabled_rules(self, rule_ids):
+        """Replace the switched-off rules (unknown ids are ignored)"""
+        self.disabled_rules = {rule_id for rule_id in rule_ids or [] if rule_id in self.rule_stats}
+
+    def load_rule_stats(self, rules):
+        """Restore counters from a get_rule_stats() list, e.g. one a crawl worker saved"""
+        with self.stats_lock:
+            for rule in rules or []:
+                if rule.get('rule') in self.rule_stats:
+                    self.rule_stats[rule['rule']] = [rule.get('calls', 0), rule.get('total_ms', 0) / 1000,
+                                                     rule.get('issues', 0)]
+
+    def load_issues(self, issues):
+        """Replace the detected issues (resuming a saved crawl) - DB bookkeeping columns are dropped"""
+        self.detected_issues.load(
+            {k: v for k, v in issue.items() if k not in ('id', 'crawl_id', 'severity', 'created_at')}
+            for issue in issues
+        )
 
     def reset(self):
         """Reset detected issues"""
         with self.issues_lock:
             self.detected_issues.clear()
             self.reported_sitewide_issues.clear()
+        self.site_analysis.reset()
+        with self.stats_lock:
+            for values in self.rule_stats.values():
+                values[:] = [0, 0.0, 0]
 
@@ -0,0 +1,203 @@
+"""
+Issue store
+Append-only, columnar storage for detected issues. The (type, category, issue)
+triple is interned to an integer code, URLs are interned once per page and
+details are kept as-is, so a crawl with millions of issues holds a few int
+arrays instead of millions of dicts. Counters per severity, category and code
+are updated on insert, and every issue gets a sequence number so callers can
+ask for a summary or for the issues after a sequence without copying the rest.
+Issue dicts are only built when they are read. The approximate memory and
+JSON size of the stored issues are also counted on insert (nbytes,
+json_bytes) for the status payload's memory figures.
+"""
+import json
+import sys
+import threading
+from array import array
+
+# Keys every issue has; anything else (source_pages, links_to_redirects, ...) is kept per issue
+CORE_FIELDS = ('url', 'type', 'category', 'issue', 'details')
+_CORE = frozenset(CORE_FIELDS)
+
+# Two array slots and a details pointer per issue; JSON punctuation and key names per issue dict
+_ROW_BYTES = 2 * array('i').itemsize + 8
+_JSON_ROW_BYTES = len(json.dumps(dict.fromkeys(CORE_FIELDS, '')))
+
+
+class IssueStore:
+    """Columnar, counter-indexed issue list (thread-safe)"""
+
+    def __init__(self, issues=None):
+        self._lock = threading.Lock()
+        self._clear()
+        if issues:
+            self.extend(issues)
+
+    def _clear(self):
+        self._code_ids = {}           # (type, category, issue) -> code
+        self.codes = []               # code -> (type, category, issue)
+        self._url_ids = {}            # url -> url id
+        self.urls = []                # url id -> url
+        self._url_col = array('i')    # seq -> url id
+        self._code_col = array('i')   # seq -> code
+        self._details = []            # seq -> details
+        self._extras = {}             # seq -> extra fields of that issue
+        self.code_counts = []         # code -> issues
+        self.type_counts = {}         # severity -> issues
+        self.category_counts = {}     # category -> issues
+        self.nbytes = 0               # approximate memory held by the issues
+        self.json_bytes = 0           # approximate size of the issues as JSON
+
+    def _insert(self, issue):
+        key = (issue.get('type', ''), issue.get('category', ''), issue.get('issue', ''))
+        code = self._code_ids.get(key)
+        if code is None:
+            code = len(self.codes)
+            self._code_ids[key] = code
+            self.codes.append(key)
+            self.code_counts.append(0)
+            self.nbytes += sum(sys.getsizeof(part) for part in key)
+
+        url = issue.get('url', '')
+        url_id = self._url_ids.get(url)
+        if url_id is None:
+            url_id = len(self.urls)
+            self._url_ids[url] = url_id
+            self.urls.append(url)
+            self.nbytes += sys.getsizeof(url)
+
+        seq = len(self._code_col)
+        self._url_col.append(url_id)
+        self._code_col.append(code)
+        details = issue.get('details', '')
+        self._details.append(details)
+        self.nbytes += _ROW_BYTES + sys.getsizeof(details)
+        self.json_bytes += _JSON_ROW_BYTES + len(url) + sum(len(part) for part in key) + len(str(details))
+        if len(issue) > len(CORE_FIELDS) or not _CORE.issuperset(issue):
+            extras = {k: v for k, v in issue.items() if k not in _CORE}
+            self._extras[seq] = extras
+            # Rare (site-wide issues with source page lists); as objects they take roughly twice their JSON size
+            encoded = len(json.dumps(extras, default=str))
+            self.json_bytes += encoded
+            self.nbytes += sys.getsizeof(extras) + 2 * encoded
+
+        self.code_counts[code] += 1
+        self.type_counts[key[0]] = self.type_counts.get(key[0], 0) + 1
+        self.category_counts[key[1]] = self.category_counts.get(key[1], 0) + 1
+
+    def append(self, issue):
+        """Add one issue dict; returns its sequence number"""
+        with self._lock:
+            self._insert(issue)
+            return len(self._code_col) - 1
+
+    def extend(self, issues):
+        """Add issue dicts under one lock; returns the (start, end) sequence range"""
+        with self._lock:
+            start = len(self._code_col)
+            for issue in issues:
+                self._insert(issue)
+            return start, len(self._code_col)
+
+    def load(self, issues):
+        """Replace the contents (resuming a saved crawl)"""
+        with self._lock:
+            self._clear()
+            for issue in issues:
+                self._insert(issue)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _issue(self, seq):
+        issue_type, category, name = self.codes[self._code_col[seq]]
+        issue = {
+            'url': self.urls[self._url_col[seq]],
+            'type': issue_type,
+            'category': category,
+            'issue': name,
+            'details': self._details[seq]
+        }
+        extras = self._extras.get(seq)
+        if extras:
+            issue.update(extras)
+        return issue
+
+    def since(self, seq=0, limit=None):
+        """Issue dicts from sequence number seq onwards (at most limit of them)"""
+        with self._lock:
+            end = len(self._code_col)
+            start = min(max(0, seq or 0), end)
+            if limit:
+                end = min(end, start + limit)
+            return [self._issue(position) for position in range(start, end)]
+
+    def to_list(self):
+        return self.since(0)
+
+    @property
+    def next_seq(self):
+        """Sequence number the next issue will get (= issues stored)"""
+        return len(self._code_col)
+
+    def __len__(self):
+        return len(self._code_col)
+
+    def __iter__(self):
+        # Snapshot the length so issues added while iterating are not visited
+        for seq in range(len(self._code_col)):
+            yield self._issue(seq)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._code_col))
+            if step == 1:
+                return self.since(start, max(0, stop - start)) if stop > start else []
+            return [self._issue(seq) for seq in range(start, stop, step)]
+        if index < 0:
+            index += len(self._code_col)
+        if not 0 <= index < len(self._code_col):
+            raise IndexError('issue index out of range')
+        return self._issue(index)
+
+    def summary(self, exclude=None, top=None):
+        """
+        Issue totals by severity, category and issue. Without exclude these are
+        the insert-time counters; exclude(url) -> bool recounts from the code
+        column, checking each distinct URL once.
+        """
+        with self._lock:
+            if exclude is None:
+                code_counts = list(self.code_counts)
+                by_type = dict(self.type_counts)
+                by_category = dict(self.category_counts)
+                total = len(self._code_col)
+            else:
+                excluded = [bool(exclude(url)) for url in self.urls]
+                code_counts = [0] * len(self.codes)
+                for url_id, code in zip(self._url_col, self._code_col):
+                    if not excluded[url_id]:
+                        code_counts[code] += 1
+                by_type, by_category = {}, {}
+                for code, count in enumerate(code_counts):
+                    if count:
+                        issue_type, category, _ = self.codes[code]
+                        by_type[issue_type] = by_type.get(issue_type, 0) + count
+                        by_category[category] = by_category.get(category, 0) + count
+                total = sum(code_counts)
+            codes = list(self.codes)
+            next_seq = len(self._code_col)
+
+        by_issue = [
+            {'type': codes[code][0], 'category': codes[code][1], 'issue': codes[code][2], 'count': count}
+            for code, count in enumerate(code_counts) if count
+        ]
+        by_issue.sort(key=lambda item: item['count'], reverse=True)
+        return {
+            'total': total,
+            'by_type': by_type,
+            'by_category': by_category,
+            'by_issue': by_issue[:top] if top else by_issue,
+            'next_seq': next_seq
+        }
@@ -13,6 +13,7 @@ class JavaScriptRenderer:
         self.playwright = None
         self.browser = None
         self.page_pool = []
+        self.pool_size = 0  # pages created; pool_size - len(page_pool) are rendering
         self.pool_lock = threading.Lock()
 
     async def initialize(self):
@@ -47,6 +48,7 @@ class JavaScriptRenderer:
                 page.set_default_timeout(self.config.get('js_timeout', 30) * 1000)
                 self.page_pool.append(page)
 
+            self.pool_size = len(self.page_pool)
             print(f"JavaScript rendering initialized with {len(self.page_pool)} browser pages")
 
         except Exception as e:
@@ -64,6 +66,7 @@ class JavaScriptRenderer:
                     except:
                         pass
                 self.page_pool.clear()
+            self.pool_size = 0
 
             if self.browser:
                 await self.browser.close()
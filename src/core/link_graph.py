@@ -0,0 +1,354 @@
+"""
+Internal link graph
+URLs are interned to integer ids as links are collected and internal edges are
+kept in two flat int arrays, so a million-edge crawl costs a few MB. Analysis
+builds CSR adjacency from those arrays and computes PageRank, inlink/outlink
+counts, click depth from the homepage and orphan pages - vectorised with numpy
+when it is installed, in plain Python otherwise. numpy is imported by the
+first analysis, not when the crawler is loaded.
+"""
+import importlib.util
+import threading
+from array import array
+
+try:
+    NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+except (ImportError, ValueError):
+    NUMPY_AVAILABLE = False
+np = None
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+
+class LinkGraph:
+    """Incrementally built graph of internal links between interned URLs"""
+
+    def __init__(self):
+        self._ids = {}                    # url -> node id
+        self.urls = []                    # node id -> url
+        self._sources = array('i')        # internal edges, one entry per link
+        self._targets = array('i')
+        self._external_out = array('i')   # node id -> external links on the page
+        self._lock = threading.Lock()
+        self._analysis = None
+        self._analysis_key = None
+
+    def _intern(self, url):
+        node = self._ids.get(url)
+        if node is None:
+            node = len(self.urls)
+            self._ids[url] = node
+            self.urls.append(url)
+            self._external_out.append(0)
+        return node
+
+    def node_id(self, url):
+        return self._ids.get(url)
+
+    def _add(self, source_url, target_url, is_internal):
+        source = self._intern(source_url)
+        if not is_internal:
+            self._external_out[source] += 1
+            return
+        target = self._intern(target_url)
+        if source != target:
+            self._sources.append(source)
+            self._targets.append(target)
+
+    def add_link(self, source_url, target_url, is_internal=True):
+        """Record one (already de-duplicated) link"""
+        with self._lock:
+            self._add(source_url, target_url, is_internal)
+
+    def add_links(self, links):
+        """Record link dicts (source_url, target_url, is_internal) under one lock"""
+        with self._lock:
+            for link in links:
+                self._add(link['source_url'], link['target_url'], bool(link.get('is_internal')))
+
+    @classmethod
+    def from_links(cls, links):
+        graph = cls()
+        graph.add_links(links)
+        return graph
+
+    @property
+    def node_count(self):
+        return len(self.urls)
+
+    @property
+    def edge_count(self):
+        return len(self._sources)
+
+    def reset(self):
+        with self._lock:
+            self._ids.clear()
+            self.urls.clear()
+            self._sources = array('i')
+            self._targets = array('i')
+            self._external_out = array('i')
+            self._analysis = None
+            self._analysis_key = None
+
+    def analyze(self, crawled_urls, home_urls=(), sitemap_urls=(), damping=DAMPING):
+        """
+        LinkGraphAnalysis for the graph as it is now. Cached until the graph or
+        the crawled set changes, so repeated API calls are free.
+        """
+        crawled_urls = list(crawled_urls)
+        key = (len(self.urls), len(self._sources), len(crawled_urls), tuple(home_urls), len(sitemap_urls), damping)
+        if self._analysis is not None and self._analysis_key == key:
+            return self._analysis
+
+        # Snapshot under the lock, compute outside it so link collection carries on
+        with self._lock:
+            node_count = len(self.urls)
+            edge_count = len(self._sources)
+            urls = self.urls[:node_count]
+            ids = dict(self._ids)
+            sources = self._sources[:edge_count]
+            targets = self._targets[:edge_count]
+            external_out = self._external_out[:node_count]
+
+        analysis = LinkGraphAnalysis(urls, ids, sources, targets, external_out,
+                                     crawled_urls, home_urls, sitemap_urls, damping)
+        self._analysis = analysis
+        self._analysis_key = key
+        return analysis
+
+
+class LinkGraphAnalysis:
+    """Link metrics for one snapshot of a LinkGraph"""
+
+    def __init__(self, urls, ids, sources, targets, external_out, crawled_urls,
+                 home_urls=(), sitemap_urls=(), damping=DAMPING):
+        self.urls = urls
+        self._ids = ids
+        self.node_count = len(urls)
+        self.edge_count = len(sources)
+        self.damping = damping
+
+        if NUMPY_AVAILABLE:
+            _load_numpy()
+            sources = np.frombuffer(sources, dtype=np.int32) if len(sources) else np.zeros(0, dtype=np.int32)
+            targets = np.frombuffer(targets, dtype=np.int32) if len(targets) else np.zeros(0, dtype=np.int32)
+            external_out = np.frombuffer(external_out, dtype=np.int32) if len(external_out) else np.zeros(0, dtype=np.int32)
+
+        self.indptr, self.indices = _build_csr(self.node_count, sources, targets)
+        self.inlinks = _bincount(targets, self.node_count)
+        self.outlinks = _bincount(sources, self.node_count)
+        self.external_outlinks = external_out
+        self.pagerank, self.iterations = _pagerank(self.node_count, sources, targets, self.outlinks, damping)
+
+        self.max_pagerank = float(max(self.pagerank)) if self.node_count else 0.0
+
+        self.crawled_urls = [url for url in crawled_urls if url]
+        self.roots = [ids[url] for url in home_urls if url in ids]
+        if not self.roots and self.crawled_urls and self.crawled_urls[0] in ids:
+            self.roots = [ids[self.crawled_urls[0]]]
+        self.depths = _click_depths(self.node_count, self.indptr, self.indices, self.roots)
+
+        self.sitemap_urls = set(sitemap_urls or ())
+        self.orphans = self._find_orphans()
+
+    def _find_orphans(self):
+        """Crawled or sitemap URLs that no internal page links to"""
+        roots = set(self.roots)
+        crawled = set(self.crawled_urls)
+        orphans = []
+        for url in list(self.crawled_urls) + sorted(self.sitemap_urls - crawled):
+            node = self._ids.get(url)
+            if node is not None and (node in roots or self.inlinks[node]):
+                continue
+            orphans.append({
+                'url': url,
+                'crawled': url in crawled,
+                'in_sitemap': url in self.sitemap_urls
+            })
+        return orphans
+
+    def node_id(self, url):
+        return self._ids.get(url)
+
+    def link_score(self, node):
+        """PageRank scaled to 0-100 relative to the strongest page"""
+        if not self.max_pagerank:
+            return 0
+        return round(100 * float(self.pagerank[node]) / self.max_pagerank, 1)
+
+    def metrics(self, url):
+        """inlinks / outlinks / pagerank / link_score / click_depth for one URL"""
+        node = self._ids.get(url)
+        if node is None:
+            return {
+                'inlinks': 0, 'outlinks': 0, 'external_outlinks': 0,
+                'pagerank': 0.0, 'link_score': 0, 'click_depth': None
+            }
+        depth = int(self.depths[node])
+        return {
+            'inlinks': int(self.inlinks[node]),
+            'outlinks': int(self.outlinks[node]),
+            'external_outlinks': int(self.external_outlinks[node]),
+            'pagerank': float(self.pagerank[node]),
+            'link_score': self.link_score(node),
+            'click_depth': depth if depth >= 0 else None
+        }
+
+    def apply_to_results(self, results):
+        """Add the link metrics to crawl result dicts in place"""
+        for result in results:
+            result.update(self.metrics(result.get('url')))
+
+    def top_pages(self, limit=50):
+        """Crawled URLs with the highest internal PageRank"""
+        nodes = [self._ids[url] for url in self.crawled_urls if url in self._ids]
+        nodes.sort(key=lambda node: self.pagerank[node], reverse=True)
+        return [dict(self.metrics(self.urls[node]), url=self.urls[node]) for node in nodes[:limit]]
+
+    def depth_distribution(self):
+        """[{depth, count}] over crawled URLs; depth None = not reachable from the homepage"""
+        counts = {}
+        for url in self.crawled_urls:
+            node = self._ids.get(url)
+            depth = int(self.depths[node]) if node is not None else -1
+            counts[depth] = counts.get(depth, 0) + 1
+        ordered = sorted(counts.items(), key=lambda item: (item[0] < 0, item[0]))
+        return [{'depth': depth if depth >= 0 else None, 'count': count} for depth, count in ordered]
+
+    def summary(self, limit=50):
+        return {
+            'nodes': self.node_count,
+            'internal_edges': self.edge_count,
+            'crawled': len(self.crawled_urls),
+            'pagerank_iterations': self.iterations,
+            'roots': [self.urls[node] for node in self.roots],
+            'top_pages': self.top_pages(limit),
+            'orphans': self.orphans[:limit],
+            'orphan_count': len(self.orphans),
+            'depth_distribution': self.depth_distribution(),
+            'vectorised': NUMPY_AVAILABLE
+        }
+
+
+# ---------------------------------------------------------------------------
+# Graph kernels (numpy arrays when available, array/list otherwise)
+# ---------------------------------------------------------------------------
+
+def _bincount(values, size):
+    if NUMPY_AVAILABLE:
+        return np.bincount(values, minlength=size)[:size] if size else np.zeros(0, dtype=np.int64)
+    counts = [0] * size
+    for value in values:
+        counts[value] += 1
+    return counts
+
+
+def _build_csr(node_count, sources, targets):
+    """indptr/indices so the targets of node n are indices[indptr[n]:indptr[n + 1]]"""
+    if NUMPY_AVAILABLE:
+        order = np.argsort(sources, kind='stable')
+        indices = targets[order]
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        if node_count:
+            np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+        return indptr, indices
+
+    indptr = [0] * (node_count + 1)
+    for source in sources:
+        indptr[source + 1] += 1
+    for node in range(node_count):
+        indptr[node + 1] += indptr[node]
+    fill = indptr[:-1]
+    indices = array('i', bytes(4 * len(targets)))
+    for source, target in zip(sources, targets):
+        indices[fill[source]] = target
+        fill[source] += 1
+    return indptr, indices
+
+
+def _pagerank(node_count, sources, targets, outlinks, damping):
+    """Power iteration; rank on dangling pages is spread evenly over all pages"""
+    if not node_count:
+        return [], 0
+
+    if NUMPY_AVAILABLE:
+        out_degree = outlinks.astype(np.float64)
+        dangling = out_degree == 0
+        inverse = np.zeros(node_count)
+        inverse[~dangling] = 1.0 / out_degree[~dangling]
+        rank = np.full(node_count, 1.0 / node_count)
+        for iteration in range(1, MAX_ITERATIONS + 1):
+            spread = rank * inverse
+            new_rank = np.bincount(targets, weights=spread[sources], minlength=node_count)
+            new_rank = damping * (new_rank + rank[dangling].sum() / node_count) + (1.0 - damping) / node_count
+            delta = np.abs(new_rank - rank).sum()
+            rank = new_rank
+            if delta < TOLERANCE:
+                break
+        return rank, iteration
+
+    rank = [1.0 / node_count] * node_count
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        dangling_rank = sum(rank[node] for node in range(node_count) if not outlinks[node])
+        base = damping * dangling_rank / node_count + (1.0 - damping) / node_count
+        new_rank = [0.0] * node_count
+        for source, target in zip(sources, targets):
+            new_rank[target] += rank[source] / outlinks[source]
+        new_rank = [base + damping * value for value in new_rank]
+        delta = sum(abs(a - b) for a, b in zip(new_rank, rank))
+        rank = new_rank
+        if delta < TOLERANCE:
+            break
+    return rank, iteration
+
+
+def _click_depths(node_count, indptr, indices, roots):
+    """Breadth-first distance from the root pages over internal links (-1 = unreachable)"""
+    if NUMPY_AVAILABLE:
+        depths = np.full(node_count, -1, dtype=np.int32)
+        if not roots:
+            return depths
+        frontier = np.unique(np.asarray(roots, dtype=np.int64))
+        depths[frontier] = 0
+        level = 0
+        while frontier.size:
+            level += 1
+            # Gather the CSR rows of the whole frontier in one go
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            total = int(counts.sum())
+            if not total:
+                break
+            offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+            neighbours = indices[offsets]
+            frontier = np.unique(neighbours[depths[neighbours] < 0])
+            depths[frontier] = level
+        return depths
+
+    depths = [-1] * node_count
+    frontier = []
+    for root in roots:
+        if depths[root] < 0:
+            depths[root] = 0
+            frontier.append(root)
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for node in frontier:
+            for position in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[position]
+                if depths[neighbour] < 0:
+                    depths[neighbour] = level
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return depths
@@ -1,48 +1,74 @@
-import re
 import threading
-from urllib.parse import urljoin, urlparse
-from collections import deque
+import time
+from urllib.parse import urlsplit
+from src.core.crawl_log import CrawlLog
+from src.core.frontier import create_frontier
+from src.core.inlink_index import InlinkIndex
+from src.core.link_graph import LinkGraph
+from src.core.trap_detector import TrapDetector
+from src.core.url_canonicalizer import UrlCanonicalizer
 
 
 class LinkManager:
     """Manages link discovery, tracking, and extraction"""
 
-    def __init__(self, base_domain, trap_threshold=100):
+    def __init__(self, base_domain, trap_threshold=100, frontier_strategy='priority',
+                 strip_tracking_params=True, trailing_slash='keep', linked_from_limit=0,
+                 stage_timer=None, log=None):
         self.base_domain = base_domain
+        self.canonicalizer = UrlCanonicalizer(base_domain, strip_tracking_params, trailing_slash)
+        # Per-thread memo so collect_all_links and extract_links canonicalise a page once
+        self._page_links = threading.local()
         self.visited_urls = set()
-        self.discovered_urls = deque()
         self.all_discovered_urls = set()
         self.all_links = []
         self.links_set = set()
-        self.source_pages = {}  # Maps target_url -> list of source_urls
+        self.source_pages = InlinkIndex(linked_from_limit)  # target_url -> pages linking to it
+        self.link_graph = LinkGraph()  # Integer-id internal link graph (PageRank, click depth)
         
-        # Trap detection
-        self.url_pattern_counts = {}
-        self.trap_patterns = {}
+        # Trap detection (pattern counts live in a fixed-size sketch)
         self.TRAP_THRESHOLD = trap_threshold  # Configurable per crawl
+        self.trap_detector = TrapDetector(trap_threshold)
+        self.trap_patterns = self.trap_detector.trap_patterns
+
+        # Pending URLs - scored by importance unless strategy is 'fifo'
+        self.frontier_strategy = frontier_strategy
+        self.discovered_urls = create_frontier(
+            frontier_strategy,
+            inlinks_for=self.source_pages.count,
+            trap_likelihood_for=self.trap_detector.likelihood
+        )
+        # With a StageTimer, time from queueing to crawling is recorded as 'queue_wait'
+        self.stage_timer = stage_timer
+        self.log = log or CrawlLog('link_manager')
+        self._queued_at = {}  # pending url -> perf_counter when queued
 
         self.urls_lock = threading.Lock()
         self.links_lock = threading.Lock()
         
-    def _get_url_signature(self, url):
-        """Generate a signature for the URL by replacing dynamic segments"""
-        try:
-            parsed = urlparse(url)
-            path = parsed.path
-            
-            # Replace digits with \d+
-            path = re.sub(r'\d+', r'\\d+', path)
-            
-            # Replace UUIDs (simplistic)
-            path = re.sub(r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}', r'\\uuid', path)
-            
-            return path
-        except:
-            return url
+    def canonical_links(self, soup, page_url):
+        """
+        Canonicalise every <a href> on a page once: [(a_tag, CanonicalUrl or None)].
+        The result is memoised for the calling thread, so the reporting pass and
+        the discovery pass over the same page share it.
+        """
+        memo = getattr(self._page_links, 'entry', None)
+        if memo and memo[0] is soup and memo[1] == page_url:
+            return memo[2]
+
+        canonicalize = self.canonicalizer.canonicalize
+        links = [(a_tag, canonicalize(a_tag['href'], page_url)) for a_tag in soup.find_all('a', href=True)]
+        self._page_links.entry = (soup, page_url, links)
+        return links
 
     def extract_links(self, soup, current_url, depth, should_crawl_callback):
-        """Extract links from HTML and add to discovery queue"""
-        links = soup.find_all('a', href=True)
+        """
+        Extract links from HTML and add to discovery queue.
+        Admission is batched per page: links are filtered without the lock,
+        the crawl policy (which may fetch robots.txt) runs with no lock held,
+        and the survivors are admitted in one short critical section.
+        """
+        links = self.canonical_links(soup, current_url)
         
         # Debug counters
         total_links = len(links)
@@ -52,106 +78,86 @@ class LinkManager:
         skipped_callback = 0
         added = 0
 
-        for link in links:
-            href = link['href'].strip()
-            if not href or href.startswith('#') or href.startswith('mailto:') or href.startswith('tel:'):
+        # Page-local filtering, no lock needed
+        candidates = []
+        seen_on_page = set()
+        for _, canonical in links:
+            # Empty, fragment-only, mailto:, tel:, javascript: ...
+            if canonical is None:
                 skipped_special += 1
                 continue
 
-            # Convert relative URLs to absolute
-            absolute_url = urljoin(current_url, href)
-
-            # Clean URL (remove fragment)
-            parsed = urlparse(absolute_url)
-            clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if parsed.query:
-                clean_url += f"?{parsed.query}"
+            clean_url = canonical.url
+            if clean_url == current_url or clean_url in seen_on_page:
+                skipped_already_seen += 1
+                continue
+            seen_on_page.add(clean_url)
+            candidates.append(clean_url)
 
-            # Thread-safe checking and adding
+        # One quick pass under the lock to drop URLs we already know
+        with self.urls_lock:
+            new_urls = [url for url in candidates
+                        if url not in self.visited_urls and url not in self.all_discovered_urls]
+        skipped_already_seen += len(candidates) - len(new_urls)
+
+        # Crawl policy (robots.txt, patterns, scope) without holding any LinkManager lock
+        allowed = []
+        for url in new_urls:
+            if should_crawl_callback(url):
+                allowed.append(url)
+            else:
+                skipped_callback += 1
+
+        # Admit the batch; another worker may have queued some of these meanwhile
+        if allowed:
             with self.urls_lock:
-                # Track source page for this URL
-                if clean_url not in self.source_pages:
-                    self.source_pages[clean_url] = []
-                if current_url not in self.source_pages[clean_url]:
-                    self.source_pages[clean_url].append(current_url)
-                
-                # Check trap detection BEFORE checking if discovered
-                # This ensures we count patterns even across different discovery paths
-                # But to avoid re-counting the SAME URL, we normally check if in discovered.
-                # Here we only want to block NEW URLs.
-
-                if (clean_url not in self.visited_urls and
-                    clean_url not in self.all_discovered_urls and
-                    clean_url != current_url):
-                    
-                    # Trap logic
-                    signature = self._get_url_signature(clean_url)
-                    count = self.url_pattern_counts.get(signature, 0)
-                    
-                    if count >= self.TRAP_THRESHOLD:
-                         # It is a trap
-                        if signature not in self.trap_patterns:
-                            self.trap_patterns[signature] = {
-                                'pattern': signature,
-                                'example_url': clean_url,
-                                'count': 0
-                            }
-                        self.trap_patterns[signature]['count'] += 1
+                for clean_url in allowed:
+                    if clean_url in self.visited_urls or clean_url in self.all_discovered_urls:
+                        skipped_already_seen += 1
+                        continue
+
+                    # Trap logic - check and record one URL at a time so a page
+                    # full of one pattern still hits the threshold
+                    trap_signature = self.trap_detector.check(clean_url)
+                    if trap_signature:
+                        # It is a trap - SKIP adding
+                        self.trap_detector.report(trap_signature, clean_url)
                         skipped_trap += 1
-                        # SKIP adding
                         continue
 
-                    # Check if checks out with crawler policy
-                    if should_crawl_callback(clean_url):
-                        # Increment count only if we decide to crawl it
-                        self.url_pattern_counts[signature] = count + 1
-                        
-                        self.all_discovered_urls.add(clean_url)
-                        self.discovered_urls.append((clean_url, depth))
-                        added += 1
-                    else:
-                        skipped_callback += 1
-                else:
-                    skipped_already_seen += 1
+                    self.trap_detector.record(clean_url)
+                    self.all_discovered_urls.add(clean_url)
+                    self._enqueue(clean_url, depth)
+                    added += 1
         
+        # Discovery is the last pass over the page - drop the memo so the soup can be freed
+        self._page_links.entry = None
+
         # Log debug info
-        print(f"  [LinkManager] Total <a> tags: {total_links}, Skipped: special={skipped_special}, already_seen={skipped_already_seen}, trap={skipped_trap}, callback_rejected={skipped_callback}, Added to queue: {added}")
+        self.log.debug("  [LinkManager] Total <a> tags: %d, Skipped: special=%d, already_seen=%d, trap=%d, callback_rejected=%d, Added to queue: %d",
+                       total_links, skipped_special, skipped_already_seen, skipped_trap, skipped_callback, added)
 
     def collect_all_links(self, soup, source_url, crawl_results, base_domain=None):
         """
         Extract all links from the page for reporting purposes (Internal vs External)
-        Stores in self.all_links
+        Stores in self.all_links and returns the links that were new. Link records
+        are built without locks and added in one batch per lock.
         """
         if not soup:
-            return
+            return []
 
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag.get('href')
-            anchor_text = a_tag.get_text(strip=True)[:100]  # Limit length
-            
-            absolute_url = urljoin(source_url, href)
-            # Normalize - remove fragment
-            if '#' in absolute_url:
-                absolute_url = absolute_url.split('#')[0]
-            
+        page_links = []
+        for a_tag, canonical in self.canonical_links(soup, source_url):
             # Skip empty or invalid
-            if not absolute_url.startswith(('http://', 'https://')):
+            if canonical is None:
                 continue
-            
+
             try:
-                # Parse target URL for domain info
-                parsed_target = urlparse(absolute_url)
-                
-                # Determine scope if base_domain provided
-                scope = 'external'
-                if base_domain:
-                    scope = self._determine_scope(absolute_url, base_domain)
-                else:
-                    # Fallback logic if no base_domain
-                    is_int = self.is_internal(absolute_url)
-                    scope = 'root' if is_int else 'external'
-
-                # Define is_internal for DB compatibility (root or sub = internal)
+                absolute_url = canonical.url
+                anchor_text = a_tag.get_text(strip=True)[:100]  # Limit length
+
+                # Scope comes from the per-host cache (root or sub = internal)
+                scope = canonical.scope
                 is_internal = scope in ['root', 'sub']
                 
                 # Find the status of the target URL if we've crawled it
@@ -167,37 +173,72 @@ class LinkManager:
                 # Determine nofollow attribute
                 nofollow = 'nofollow' in a_tag.get('rel', [])
 
-                link_data = {
+                page_links.append({
                     'source_url': source_url,
                     'target_url': absolute_url,
                     'anchor_text': anchor_text or '(no text)',
                     'is_internal': is_internal,
-                    'target_domain': parsed_target.netloc,
+                    'target_domain': canonical.netloc,
                     'target_status': target_status,
                     'placement': placement,
                     'nofollow': nofollow,
                     'scope': scope
-                }
-
-                # Track source page for this URL (for "Linked From" feature)
-                with self.urls_lock:
-                    if absolute_url not in self.source_pages:
-                        self.source_pages[absolute_url] = []
-                    if source_url not in self.source_pages[absolute_url]:
-                        self.source_pages[absolute_url].append(source_url)
-
-                # Thread-safe adding to links collection with duplicate checking
-                with self.links_lock:
-                    link_key = f"{link_data['source_url']}|{link_data['target_url']}"
-
-                    if link_key not in self.links_set:
-                        self.links_set.add(link_key)
-                        self.all_links.append(link_data)
+                })
 
             except Exception:
                 # Skip problematic links silently
                 continue
 
+        if not page_links:
+            return []
+
+        # Thread-safe adding to links collection with duplicate checking
+        new_links = []
+        with self.links_lock:
+            for link_data in page_links:
+                link_key = f"{link_data['source_url']}|{link_data['target_url']}"
+                if link_key not in self.links_set:
+                    self.links_set.add(link_key)
+                    self.all_links.append(link_data)
+                    new_links.append(link_data)
+            self.link_graph.add_links(new_links)
+
+        # Track source page for each new link (for "Linked From" feature)
+        with self.urls_lock:
+            for link_data in new_links:
+                if self.source_pages.add(source_url, link_data['target_url']):
+                    self._note_inlink(link_data['target_url'])
+
+        return new_links
+
+
+    def merge_links(self, links):
+        """
+        Merge link records collected elsewhere (e.g. a distributed worker).
+        Returns the links that were new to this manager.
+        """
+        added = []
+        with self.links_lock:
+            for link in links:
+                link_key = f"{link['source_url']}|{link['target_url']}"
+                if link_key not in self.links_set:
+                    self.links_set.add(link_key)
+                    self.all_links.append(link)
+                    added.append(link)
+            self.link_graph.add_links(added)
+
+        with self.urls_lock:
+            for link in added:
+                if self.source_pages.add(link['source_url'], link['target_url']):
+                    self._note_inlink(link['target_url'])
+
+        return added
+
+    def merge_traps(self, traps):
+        """Fold trap patterns reported by another LinkManager into this one"""
+        with self.urls_lock:
+            for trap in traps:
+                self.trap_detector.report(trap['pattern'], trap.get('example_url'), trap.get('count', 0))
 
     def _detect_link_placement(self, link_element):
         """Detect where on the page a link is placed"""
@@ -233,17 +274,49 @@ class LinkManager:
 
     def is_internal(self, url):
         """Check if URL is internal to the base domain"""
-        parsed_url = urlparse(url)
-        url_domain_clean = parsed_url.netloc.replace('www.', '', 1)
-        base_domain_clean = self.base_domain.replace('www.', '', 1)
-        return url_domain_clean == base_domain_clean
+        return self.canonicalizer.classify_host(urlsplit(url).netloc.lower()) == 'root'
 
     def add_url(self, url, depth):
         """Add a URL to the discovery queue"""
+        canonical = self.canonicalizer.canonicalize(url)
+        if canonical:
+            url = canonical.url
         with self.urls_lock:
             if url not in self.all_discovered_urls and url not in self.visited_urls:
                 self.all_discovered_urls.add(url)
-                self.discovered_urls.append((url, depth))
+                self._enqueue(url, depth)
+
+    def _enqueue(self, url, depth):
+        """Queue a URL for crawling (urls_lock held)"""
+        self.discovered_urls.append((url, depth))
+        if self.stage_timer is not None:
+            self._queued_at[url] = time.perf_counter()
+
+    def _note_inlink(self, url):
+        """Let the priority frontier re-score a pending URL that gained a linking page (urls_lock held)"""
+        if self.frontier_strategy != 'fifo':
+            self.discovered_urls.touch(url, self.source_pages.count(url))
+
+    def set_sitemap_hints(self, hints):
+        """Pass sitemap <priority>/<lastmod> metadata to the frontier"""
+        if self.frontier_strategy == 'fifo' or not hints:
+            return
+        # Keyed like the queue: sitemaps list raw <loc> text, the frontier holds canonical URLs
+        canonical_hints = {}
+        for url, hint in hints.items():
+            canonical = self.canonicalizer.canonicalize(url)
+            if canonical:
+                canonical_hints[canonical.url] = hint
+        with self.urls_lock:
+            self.discovered_urls.set_sitemap_hints(canonical_hints)
+
+    def restore_queue(self, pending):
+        """Replace the pending queue with (url, depth) pairs from a checkpoint"""
+        with self.urls_lock:
+            self.discovered_urls.clear()
+            self._queued_at.clear()
+            for url, depth in pending:
+                self._enqueue(url, depth)
 
     def mark_visited(self, url):
         """Mark a URL as visited"""
@@ -254,7 +327,11 @@ class LinkManager:
         """Get the next URL to crawl"""
         with self.urls_lock:
             if self.discovered_urls:
-                return self.discovered_urls.popleft()
+                url_info = self.discovered_urls.popleft()
+                queued_at = self._queued_at.pop(url_info[0], None)
+                if queued_at is not None:
+                    self.stage_timer.add('queue_wait', time.perf_counter() - queued_at)
+                return url_info
         return None
 
     def get_stats(self):
@@ -278,21 +355,29 @@ class LinkManager:
                     link['target_status'] = status_lookup[target_url]
 
     def get_source_pages(self, url):
-        """Get list of source pages that link to this URL"""
+        """Get list of source pages that link to this URL (built from the index on each call)"""
+        with self.urls_lock:
+            return self.source_pages.sources(url)
+
+    def get_inlink_count(self, url):
+        """Number of distinct pages linking to this URL (exact even past linked_from_limit)"""
         with self.urls_lock:
-            return self.source_pages.get(url, []).copy()
+            return self.source_pages.count(url)
 
     def reset(self):
         """Reset all state"""
         with self.urls_lock:
             self.visited_urls.clear()
             self.discovered_urls.clear()
+            self._queued_at.clear()
             self.all_discovered_urls.clear()
             self.source_pages.clear()
+            self.trap_detector.reset()
 
         with self.links_lock:
             self.all_links.clear()
             self.links_set.clear()
+            self.link_graph.reset()
 
     def _determine_scope(self, url, base_domain):
         """
@@ -301,7 +386,7 @@ class LinkManager:
         sub: blog.example.com
         external: google.com
         """
-        parsed_url = urlparse(url)
+        parsed_url = urlsplit(url)
         url_domain = parsed_url.netloc
         base_clean = base_domain.replace('www.', '')
         url_clean = url_domain.replace('www.', '')
@@ -313,6 +398,27 @@ class LinkManager:
         else:
             return 'external'
 
+    def restore_links(self, links):
+        """Replace the collected links with saved link records (resume from the database)"""
+        with self.links_lock:
+            self.all_links = links
+            self.links_set = {f"{link['source_url']}|{link['target_url']}" for link in links}
+            self.link_graph.reset()
+            self.link_graph.add_links(links)
+
+        with self.urls_lock:
+            self.source_pages.clear()
+            for link in links:
+                self.source_pages.add(link['source_url'], link['target_url'])
+
+    def analyze_link_graph(self, crawl_results, home_urls=(), sitemap_urls=()):
+        """PageRank / inlinks / click depth / orphans over the links collected so far"""
+        return self.link_graph.analyze(
+            (result.get('url') for result in crawl_results),
+            home_urls=home_urls,
+            sitemap_urls=sitemap_urls
+        )
+
     def get_traps(self):
         """Get list of detected crawl traps"""
         with self.urls_lock:
@@ -2,6 +2,9 @@
 import sys
 import gc
 import json
+import threading
+import time
+import tracemalloc
 from collections import defaultdict
 
 
@@ -64,7 +67,7 @@ class MemoryProfiler:
 
     @staticmethod
     def get_crawler_data_size(crawl_results, links, issues):
-        """Estimate actual data size with DEEP measurement"""
+        """Estimate actual data size with DEEP measurement (walks everything - see DataSizeTracker)"""
 
         # Deep size calculation
         crawl_results_deep = MemoryProfiler.get_deep_size(crawl_results)
@@ -98,3 +101,198 @@ class MemoryProfiler:
             'total_deep_mb': round((crawl_results_deep + links_deep + issues_deep) / 1024 / 1024, 2),
             'total_json_mb': round((crawl_json_size + links_json_size + issues_json_size) / 1024 / 1024, 2)
         }
+
+
+class DataSizeTracker:
+    """
+    Running size estimates for a crawl's results and links. Each appended row
+    costs a shallow getsizeof of the row and its values; every CALIBRATE_EVERY
+    rows (and the first few) one row is deep-sized and JSON-encoded, and the
+    shallow total is scaled by the sampled ratios. Issues report their own size
+    (IssueStore.nbytes), so a status poll never walks the crawl data.
+    """
+
+    CALIBRATE_EVERY = 250
+    WARMUP_SAMPLES = 8
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # kind -> [rows, shallow bytes, sampled shallow, sampled deep, sampled json]
+            self._kinds = {kind: [0, 0, 0, 0, 0] for kind in ('crawl_results', 'links')}
+
+    @staticmethod
+    def _shallow_size(row):
+        size = sys.getsizeof(row)
+        if isinstance(row, dict):
+            for value in row.values():
+                size += sys.getsizeof(value)
+        return size
+
+    @staticmethod
+    def _sample(row):
+        """(deep, json) bytes of one row; dict keys are shared between rows and not counted"""
+        if isinstance(row, dict):
+            seen = set()
+            deep = sys.getsizeof(row) + sum(MemoryProfiler.get_deep_size(value, seen) for value in row.values())
+        else:
+            deep = MemoryProfiler.get_deep_size(row)
+        try:
+            encoded = len(json.dumps(row, default=str))
+        except Exception:
+            encoded = 0
+        return deep, encoded
+
+    def add(self, kind, rows):
+        """Account for rows just appended to kind ('crawl_results' or 'links')"""
+        samples = []
+        shallow = 0
+        with self._lock:
+            totals = self._kinds[kind]
+            for row in rows:
+                size = self._shallow_size(row)
+                shallow += size
+                totals[0] += 1
+                if totals[0] <= self.WARMUP_SAMPLES or totals[0] % self.CALIBRATE_EVERY == 0:
+                    samples.append((row, size))
+            totals[1] += shallow
+
+        # Deep-size the sampled rows outside the lock
+        measured = [(size,) + self._sample(row) for row, size in samples]
+        if measured:
+            with self._lock:
+                totals = self._kinds[kind]
+                for size, deep, encoded in measured:
+                    totals[2] += size
+                    totals[3] += deep
+                    totals[4] += encoded
+
+    def estimate(self, kind):
+        """(rows, estimated deep bytes, estimated JSON bytes)"""
+        with self._lock:
+            rows, shallow, sampled, deep, encoded = self._kinds[kind]
+        if not sampled:
+            return rows, shallow, 0
+        return rows, int(shallow * deep / sampled), int(shallow * encoded / sampled)
+
+    def report(self, issues=None):
+        """Same keys as MemoryProfiler.get_crawler_data_size, from the running estimates"""
+        results_count, results_deep, results_json = self.estimate('crawl_results')
+        links_count, links_deep, links_json = self.estimate('links')
+        issues_count = len(issues) if issues is not None else 0
+        issues_deep = getattr(issues, 'nbytes', 0)
+        issues_json = getattr(issues, 'json_bytes', 0)
+        mb = 1024 * 1024
+
+        return {
+            'crawl_results_deep_mb': round(results_deep / mb, 2),
+            'crawl_results_json_mb': round(results_json / mb, 2),
+            'crawl_results_count': results_count,
+            'avg_per_url_kb': round(results_deep / results_count / 1024, 2) if results_count else 0,
+
+            'links_deep_mb': round(links_deep / mb, 2),
+            'links_json_mb': round(links_json / mb, 2),
+            'links_count': links_count,
+
+            'issues_deep_mb': round(issues_deep / mb, 2),
+            'issues_json_mb': round(issues_json / mb, 2),
+            'issues_count': issues_count,
+
+            'total_deep_mb': round((results_deep + links_deep + issues_deep) / mb, 2),
+            'total_json_mb': round((results_json + links_json + issues_json) / mb, 2),
+            'estimated': True
+        }
+
+
+class TracemallocSession:
+    """
+    Opt-in allocation profiling for the debug endpoint. Tracing costs memory
+    and slows every allocation, so it only runs between start() and stop().
+    diff() compares a fresh snapshot with the baseline taken at start (or at
+    the last baseline() call).
+    """
+
+    _lock = threading.Lock()
+    _baseline = None
+    _started_at = None
+
+    @classmethod
+    def _filtered(cls, snapshot):
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>')
+        ))
+
+    @classmethod
+    def start(cls, frames=1):
+        with cls._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(max(1, min(int(frames), 25)))
+                cls._started_at = time.time()
+            cls._baseline = cls._filtered(tracemalloc.take_snapshot())
+        return cls.status()
+
+    @classmethod
+    def baseline(cls):
+        """Make the current heap the reference for the next diff"""
+        with cls._lock:
+            if not tracemalloc.is_tracing():
+                return None
+            cls._baseline = cls._filtered(tracemalloc.take_snapshot())
+        return cls.status()
+
+    @classmethod
+    def stop(cls):
+        with cls._lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            cls._baseline = None
+            cls._started_at = None
+        return cls.status()
+
+    @classmethod
+    def status(cls):
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else 0,
+            'started_at': cls._started_at,
+            'traced_mb': round(current / 1024 / 1024, 2),
+            'traced_peak_mb': round(peak / 1024 / 1024, 2)
+        }
+
+    @classmethod
+    def diff(cls, limit=25, key_type='lineno'):
+        """Top allocation changes since the baseline, grouped by 'lineno', 'filename' or 'traceback'"""
+        if key_type not in ('lineno', 'filename', 'traceback'):
+            key_type = 'lineno'
+        with cls._lock:
+            if not tracemalloc.is_tracing() or cls._baseline is None:
+                return None
+            snapshot = cls._filtered(tracemalloc.take_snapshot())
+            baseline = cls._baseline
+
+        stats = snapshot.compare_to(baseline, key_type)
+        top = []
+        for stat in stats[:max(1, int(limit))]:
+            frames = stat.traceback.format() if key_type == 'traceback' else None
+            frame = stat.traceback[0]
+            top.append({
+                'location': f'{frame.filename}:{frame.lineno}' if key_type != 'filename' else frame.filename,
+                'size_kb': round(stat.size / 1024, 1),
+                'size_diff_kb': round(stat.size_diff / 1024, 1),
+                'count': stat.count,
+                'count_diff': stat.count_diff,
+                'traceback': frames
+            })
+        return {
+            **cls.status(),
+            'key_type': key_type,
+            'total_diff_mb': round(sum(stat.size_diff for stat in stats) / 1024 / 1024, 2),
+            'top': top
+        }
@@ -0,0 +1,74 @@
+"""
+Prometheus metrics
+Renders crawl stage histograms and live gauges in the Prometheus text
+exposition format. Gauges are summed over the crawlers passed in; stage
+histograms and CPU counters come from the process-wide totals, which only
+grow, so a crawl restarting or a session expiring never lowers them.
+"""
+from src.core.stage_timer import BUCKETS, process_totals
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+GAUGES = (
+    ('librecrawl_crawls_running', 'Crawls in progress', lambda m: int(m['running'] and not m['paused'])),
+    ('librecrawl_crawls_paused', 'Crawls paused', lambda m: int(m['running'] and m['paused'])),
+    ('librecrawl_queue_depth', 'URLs waiting in the crawl frontier', lambda m: m['queue_depth']),
+    ('librecrawl_in_flight_requests', 'Pages being fetched or rendered', lambda m: m['in_flight']),
+    ('librecrawl_pages_crawled', 'Pages crawled by the current crawls', lambda m: m['crawled']),
+    ('librecrawl_urls_discovered', 'URLs discovered by the current crawls', lambda m: m['discovered']),
+    ('librecrawl_unsaved_urls', 'Crawled pages waiting for the next database batch', lambda m: m['unsaved_urls']),
+    ('librecrawl_issues', 'Issues detected by the current crawls', lambda m: m['issues']),
+)
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def render_prometheus(instances):
+    """Text exposition for a list of WebCrawler.get_metrics() dicts"""
+    lines = [
+        '# HELP librecrawl_crawler_instances Crawler instances held by this process',
+        '# TYPE librecrawl_crawler_instances gauge',
+        f'librecrawl_crawler_instances {len(instances)}'
+    ]
+
+    for name, help_text, value in GAUGES:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {sum(value(metrics) for metrics in instances)}')
+
+    in_use = sum(metrics['browser_pages_in_use'] for metrics in instances)
+    pages = sum(metrics['browser_pages'] for metrics in instances)
+    lines.extend([
+        '# HELP librecrawl_browser_pages JavaScript rendering pool pages by state',
+        '# TYPE librecrawl_browser_pages gauge',
+        f'librecrawl_browser_pages{{state="in_use"}} {in_use}',
+        f'librecrawl_browser_pages{{state="idle"}} {pages - in_use}'
+    ])
+
+    stages = process_totals.snapshot()
+
+    lines.extend([
+        '# HELP librecrawl_stage_duration_seconds Wall time of crawl stage spans (persistence = database batch)',
+        '# TYPE librecrawl_stage_duration_seconds histogram'
+    ])
+    for stage in sorted(stages):
+        cumulative = 0
+        for bound, count in zip(BUCKETS, stages[stage]['buckets']):
+            cumulative += count
+            lines.append(f'librecrawl_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'librecrawl_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {stages[stage]["calls"]}')
+        lines.append(f'librecrawl_stage_duration_seconds_sum{{stage="{stage}"}} {_number(stages[stage]["wall_s"])}')
+        lines.append(f'librecrawl_stage_duration_seconds_count{{stage="{stage}"}} {stages[stage]["calls"]}')
+
+    lines.extend([
+        '# HELP librecrawl_stage_cpu_seconds_total Thread CPU time spent in crawl stages',
+        '# TYPE librecrawl_stage_cpu_seconds_total counter'
+    ])
+    for stage in sorted(stages):
+        lines.append(f'librecrawl_stage_cpu_seconds_total{{stage="{stage}"}} {_number(stages[stage]["cpu_s"])}')
+
+    return '\n'.join(lines) + '\n'
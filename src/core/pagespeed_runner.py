@@ -0,0 +1,238 @@
+"""
+PageSpeed runner
+Runs Google PageSpeed Insights calls for many pages at once. Every
+(url, strategy) pair is a job on a bounded thread pool; all jobs for one API
+key share a process-wide QuotaLimiter that spaces requests to the configured
+rate and pauses the key when Google answers 429. Successful results are kept
+in a TTL cache keyed by (url, strategy), so re-running a report or the
+on-demand endpoint within the TTL costs no quota. A page's entry is handed
+to on_result as soon as both its strategies finish.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+from src.core.trap_detector import UUID_PATTERN, HEX_PATTERN, DIGITS_PATTERN
+
+STRATEGIES = ('mobile', 'desktop')
+
+# Requests without an API key get a small shared quota from Google
+KEYLESS_PER_MINUTE = 10
+# How long a key stays paused after Google reports its daily quota exhausted
+DAILY_QUOTA_PAUSE = 3600
+# Longest pause after a per-minute 429
+MAX_BACKOFF = 60
+
+CACHE_MAX_ENTRIES = 5000
+
+
+def template_signature(url):
+    """
+    Page template of a URL: the path with numbers, UUIDs and hashes
+    normalised, the last segment of a nested path replaced by '*' (the slug
+    of a post or product) and the sorted query parameter names.
+    /blog/2024/my-post and /blog/2023/other-post share '/blog/\\d+/*'.
+    """
+    parsed = urlparse(url)
+    path = UUID_PATTERN.sub(r'\\uuid', parsed.path or '/')
+    path = HEX_PATTERN.sub(r'\\hex', path)
+    path = DIGITS_PATTERN.sub(r'\\d+', path)
+    segments = [segment for segment in path.split('/') if segment]
+    if len(segments) > 1:
+        segments[-1] = '*'
+    signature = '/' + '/'.join(segments)
+    if parsed.query:
+        keys = sorted({part.split('=', 1)[0] for part in parsed.query.split('&') if part})
+        signature += '?' + '&'.join(keys)
+    return signature
+
+
+def sample_by_template(urls, limit=None):
+    """
+    One URL per template, most common templates first (ties keep crawl
+    order). The first URL seen for a template represents it.
+    """
+    groups = OrderedDict()
+    for url in urls:
+        signature = template_signature(url)
+        if signature in groups:
+            groups[signature][1] += 1
+        else:
+            groups[signature] = [url, 1]
+    ranked = sorted(groups.values(), key=lambda group: -group[1])
+    sampled = [url for url, _ in ranked]
+    return sampled[:limit] if limit else sampled
+
+
+class QuotaLimiter:
+    """
+    Spaces requests for one API key to per_minute and pauses the key after a
+    429. Callers reserve the next free slot under the lock and sleep outside
+    it, so concurrent jobs queue up instead of bursting.
+    """
+
+    def __init__(self, per_minute=60):
+        self.lock = threading.Lock()
+        self.interval = 60.0 / max(1, per_minute)
+        self.next_slot = 0.0
+        self.paused_until = 0.0
+        self.exhausted_until = 0.0
+        self.rate_limited = 0
+
+    def update_rate(self, per_minute):
+        with self.lock:
+            self.interval = 60.0 / max(1, per_minute)
+
+    def exhausted(self):
+        return time.monotonic() < self.exhausted_until
+
+    def acquire(self, should_continue=None):
+        """Wait for a request slot; False if the key is out of quota or the caller cancelled"""
+        with self.lock:
+            now = time.monotonic()
+            if now < self.exhausted_until:
+                return False
+            slot = max(now, self.next_slot, self.paused_until)
+            self.next_slot = slot + self.interval
+
+        while True:
+            remaining = slot - time.monotonic()
+            if remaining <= 0:
+                return True
+            if should_continue is not None and not should_continue():
+                return False
+            time.sleep(min(remaining, 0.5))
+
+    def backoff(self, attempt, daily=False):
+        """Pause the key after a 429: briefly (growing with attempt) or, for the daily quota, for an hour"""
+        with self.lock:
+            self.rate_limited += 1
+            now = time.monotonic()
+            if daily:
+                self.exhausted_until = now + DAILY_QUOTA_PAUSE
+            else:
+                self.paused_until = max(self.paused_until, now + min(MAX_BACKOFF, 5 * (2 ** attempt)))
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(api_key, per_minute=60):
+    """Process-wide limiter for an API key (keyless calls share one)"""
+    if not api_key:
+        per_minute = min(per_minute, KEYLESS_PER_MINUTE)
+    key = hashlib.sha256(api_key.encode('utf-8')).hexdigest() if api_key else ''
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = QuotaLimiter(per_minute)
+        else:
+            limiter.update_rate(per_minute)
+        return limiter
+
+
+class ResultCache:
+    """Successful PageSpeed results by (url, strategy), dropped after ttl seconds"""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # (url, strategy) -> (stored at, result)
+        self.max_entries = max_entries
+
+    def get(self, url, strategy, ttl):
+        if ttl <= 0:
+            return None
+        with self.lock:
+            entry = self.entries.get((url, strategy))
+            if entry is None:
+                return None
+            if time.time() - entry[0] > ttl:
+                del self.entries[(url, strategy)]
+                return None
+            return dict(entry[1], cached=True, cached_at=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry[0])))
+
+    def put(self, url, strategy, result):
+        with self.lock:
+            self.entries[(url, strategy)] = (time.time(), result)
+            self.entries.move_to_end((url, strategy))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+result_cache = ResultCache()
+
+
+class PageSpeedRunner:
+    """
+    Runs fetch(url, strategy) for every URL and strategy on a pool of
+    concurrency threads. fetch does the HTTP call (and its own retries);
+    the runner adds caching, cancellation and per-page assembly.
+    """
+
+    def __init__(self, fetch, concurrency=4, cache_ttl=0, should_continue=None, on_result=None, log=None):
+        self.fetch = fetch
+        self.concurrency = max(1, int(concurrency))
+        self.cache_ttl = cache_ttl
+        self.should_continue = should_continue or (lambda: True)
+        self.on_result = on_result
+        self.log = log
+        self.cache_hits = 0
+
+    def _job(self, url, strategy):
+        cached = result_cache.get(url, strategy, self.cache_ttl)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        if not self.should_continue():
+            return {'success': False, 'error': 'Cancelled', 'strategy': strategy}
+        result = self.fetch(url, strategy)
+        if result.get('success') and self.cache_ttl > 0:
+            result_cache.put(url, strategy, result)
+        return result
+
+    def run(self, urls):
+        """Analyse urls; returns entries in input order (pages not finished when cancelled are left out)"""
+        urls = list(dict.fromkeys(urls))
+        pending = {url: {} for url in urls}
+        entries = {}
+
+        executor = ThreadPoolExecutor(max_workers=min(self.concurrency, len(urls) * len(STRATEGIES)) or 1,
+                                      thread_name_prefix='pagespeed')
+        try:
+            futures = {executor.submit(self._job, url, strategy): (url, strategy)
+                       for url in urls for strategy in STRATEGIES}
+            for future in as_completed(futures):
+                url, strategy = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'success': False, 'error': str(e), 'strategy': strategy}
+                pending[url][strategy] = result
+
+                if len(pending[url]) == len(STRATEGIES):
+                    if any(r.get('error') == 'Cancelled' for r in pending[url].values()):
+                        continue
+                    entry = entries[url] = {
+                        'url': url,
+                        'mobile': pending[url]['mobile'],
+                        'desktop': pending[url]['desktop'],
+                        'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S')
+                    }
+                    if self.log:
+                        self.log.info(f"PageSpeed {len(entries)}/{len(urls)}: {url} "
+                                      f"(mobile {entry['mobile'].get('performance_score')}, "
+                                      f"desktop {entry['desktop'].get('performance_score')})")
+                    if self.on_result:
+                        self.on_result(entry)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return [entries[url] for url in urls if url in entries]
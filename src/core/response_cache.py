@@ -0,0 +1,176 @@
+"""
+HTTP response cache
+Records the crawler's HTTP responses to disk and replays them, so extraction
+and issue rules can be re-run over a site without touching the network:
+
+    response_cache_mode = 'record'  fetch everything, store every response
+                          'cache'   serve stored responses, fetch and store misses
+                          'replay'  serve stored responses only; misses raise
+                                    ReplayMiss (a ConnectionError) and nothing is fetched
+
+The cache is a requests transport adapter mounted on the crawler's session,
+so page fetches, HEAD checks, robots.txt, sitemaps and llms.txt all go
+through it and redirects are stored hop by hop. The store is content
+addressed: bodies are zlib-compressed under objects/ by SHA-256 (identical
+bodies are kept once) and each request has a small JSON record under index/
+keyed by method, URL and request headers. Files are written atomically, so
+several crawls or worker processes can share one directory.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+MODES = ('record', 'cache', 'replay')
+
+CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR', 'response_cache')
+
+# Request headers left out of the key: they change between runs without changing the page
+IGNORED_HEADERS = frozenset(('cookie', 'connection', 'content-length', 'accept-encoding'))
+# Responses not worth replaying (the crawler retries them)
+UNCACHED_STATUSES = frozenset((429,))
+
+
+class ReplayMiss(requests.exceptions.ConnectionError):
+    """A request that is not in the cache in replay mode - retrying cannot help"""
+
+
+def request_key(method, url, headers):
+    """Cache key of a request: method, URL and the headers that can change the response"""
+    parts = [method.upper(), url]
+    for name, value in sorted((name.lower(), value) for name, value in headers.items()):
+        if name not in IGNORED_HEADERS:
+            parts.append(f'{name}:{value}')
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+class ResponseStore:
+    """Content-addressed response store in a directory"""
+
+    def __init__(self, root=None):
+        self.root = os.path.abspath(root or CACHE_DIR)
+
+    def _path(self, kind, digest, suffix=''):
+        return os.path.join(self.root, kind, digest[:2], digest + suffix)
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        """(record, body) for a request key, or None"""
+        try:
+            with open(self._path('index', key, '.json'), 'rb') as f:
+                record = json.loads(f.read())
+            with open(self._path('objects', record['body_sha256']), 'rb') as f:
+                body = zlib.decompress(f.read())
+        except (OSError, ValueError, KeyError, zlib.error):
+            return None
+        return record, body
+
+    def put(self, key, record, body):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._path('objects', digest)
+        if not os.path.exists(path):
+            self._write(path, zlib.compress(body, 6))
+        record = dict(record, body_sha256=digest, body_size=len(body))
+        self._write(self._path('index', key, '.json'), json.dumps(record).encode('utf-8'))
+
+    def stats(self):
+        """Entry and object counts and bytes on disk"""
+        counts = {'responses': 0, 'bodies': 0, 'disk_bytes': 0}
+        for kind, field in (('index', 'responses'), ('objects', 'bodies')):
+            for directory, _, files in os.walk(os.path.join(self.root, kind)):
+                for name in files:
+                    if name.endswith('.tmp'):
+                        continue
+                    counts[field] += 1
+                    counts['disk_bytes'] += os.path.getsize(os.path.join(directory, name))
+        return counts
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that records responses to, or replays them from, a ResponseStore"""
+
+    def __init__(self, store, mode='cache', **kwargs):
+        if mode not in MODES:
+            raise ValueError(f'Unknown response cache mode: {mode}')
+        super().__init__(**kwargs)
+        self.store = store
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.counts = {'hits': 0, 'misses': 0, 'stored': 0}
+
+    def _count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def _replay(self, request, record, body):
+        response = requests.Response()
+        response.status_code = record['status_code']
+        response.reason = record.get('reason', '')
+        response.headers = CaseInsensitiveDict(record.get('headers', {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        # The body is already decoded; iter_content() and .text read it from here
+        response._content = body
+        response._content_consumed = True
+        response.raw = None
+        return response
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, request.headers)
+
+        if self.mode != 'record':
+            cached = self.store.get(key)
+            if cached is not None:
+                self._count('hits')
+                return self._replay(request, *cached)
+            self._count('misses')
+            if self.mode == 'replay':
+                raise ReplayMiss(f'Not in response cache (replay mode): {request.url}', request=request)
+
+        response = super().send(request, **kwargs)
+        if response.status_code not in UNCACHED_STATUSES:
+            body = response.content
+            self.store.put(key, {
+                'method': request.method,
+                'url': request.url,
+                'status_code': response.status_code,
+                'reason': response.reason,
+                'headers': dict(response.headers),
+                'fetched_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            }, body)
+            self._count('stored')
+        return response
+
+
+def install(session, mode, root=None):
+    """Mount a CachingAdapter on session for mode (or restore plain adapters for 'off'); returns it or None"""
+    if mode not in MODES:
+        if isinstance(session.get_adapter('https://'), CachingAdapter):
+            session.mount('https://', HTTPAdapter())
+            session.mount('http://', HTTPAdapter())
+        return None
+
+    adapter = session.get_adapter('https://')
+    store_root = os.path.abspath(root or CACHE_DIR)
+    if isinstance(adapter, CachingAdapter) and adapter.mode == mode and adapter.store.root == store_root:
+        return adapter
+
+    adapter = CachingAdapter(ResponseStore(store_root), mode)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return adapter
@@ -0,0 +1,316 @@
+"""
+Site-wide analyses kept up to date during the crawl
+Sitemap coverage, hreflang reciprocity, internal links to redirects and broken
+link sources depend on more than one page. Instead of rebuilding a normalised
+URL map over every result and link at the end (and on every status poll), each
+page and each batch of new links updates these structures as it lands. Links
+are matched to pages by their canonical URL (both come from the same
+canonicaliser) and only remembered while the target is uncrawled, broken or
+redirecting. Sitemap and hreflang URLs are written by hand, so those are
+matched on the normalised URL. The issues are emitted once, when the crawl
+finishes.
+"""
+import threading
+
+SITEMAP_CATEGORIES = ('valid', 'errors', 'noindex', 'non_canonical', 'redirects')
+
+
+def _is_broken(status):
+    return status >= 400 or status == 0
+
+
+def _is_redirect(status):
+    return 300 <= status < 400
+
+
+class SiteAnalysis:
+    """Incremental cross-page state for one crawl (thread-safe)"""
+
+    def __init__(self, detector):
+        self.detector = detector
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._normalized = {}         # url -> normalised url
+        self._status = {}             # normalised url -> status code
+        self._pages = {}              # url -> (url, status, final_url, redirect_chain, title)
+        self._inbound = {}            # target url -> [(source, target, anchor, is_internal)] while it matters
+        self._redirect_links = {}     # source url -> [link to a redirecting URL]
+        self._sitemap = {}            # normalised url -> sitemap URLs
+        self._sitemap_urls = []
+        self._sitemap_state = {}      # sitemap url -> (category, issue or None)
+        self._sitemap_facts = {}      # normalised url -> (status, is_noindex, canonical_url) of crawled pages
+        self._hreflang = {}           # normalised url -> IssueDetector.hreflang_entry
+        self._hreflang_targets = set()  # normalised hreflang targets (their status matters)
+        self._hreflang_version = 0
+        self._hreflang_cache = None
+        self.version = 0
+        self.finalized = False
+
+    def _norm(self, url):
+        normalized = self._normalized.get(url)
+        if normalized is None:
+            normalized = self.detector._normalize_url_for_comparison(url)
+            self._normalized[url] = normalized
+        return normalized
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def set_sitemap_urls(self, sitemap_urls):
+        """Sitemap URLs to check coverage against (pages already crawled are classified now)"""
+        with self._lock:
+            self._sitemap = {}
+            self._sitemap_state = {}
+            self._sitemap_urls = list(sitemap_urls or [])
+            for sitemap_url in self._sitemap_urls:
+                self._sitemap.setdefault(self._norm(sitemap_url), []).append(sitemap_url)
+            for normalized, facts in self._sitemap_facts.items():
+                if normalized in self._sitemap:
+                    self._classify_sitemap(normalized, *facts)
+            self.version += 1
+
+    def add_page(self, result):
+        """Fold one crawled page into every analysis"""
+        url = result.get('url', '')
+        if not url:
+            return
+
+        robots_meta = (result.get('robots') or '').lower()
+        x_robots_tag = (result.get('x_robots_tag') or '').lower()
+        is_noindex = 'noindex' in robots_meta or 'noindex' in x_robots_tag
+        status = result.get('status_code', 0) or 0
+        entry = self.detector.hreflang_entry(url, result.get('hreflang', []))
+
+        with self._lock:
+            normalized = self._norm(url)
+            self._status[normalized] = status
+            self._pages[url] = (url, status, result.get('final_url', ''),
+                                result.get('redirect_chain', []), result.get('title', ''))
+
+            # Links seen before this page landed
+            pending = self._inbound.get(url, [])
+            if _is_redirect(status):
+                for link in pending:
+                    self._add_redirect_link(link)
+            if not _is_broken(status):
+                self._inbound.pop(url, None)
+
+            self._sitemap_facts[normalized] = (status, is_noindex, result.get('canonical_url', ''))
+            if normalized in self._sitemap:
+                self._classify_sitemap(normalized, status, is_noindex, result.get('canonical_url', ''))
+
+            if entry:
+                self._hreflang[normalized] = entry
+                self._hreflang_targets.update(entry['targets'])
+            if entry or normalized in self._hreflang_targets:
+                self._hreflang_version += 1
+            self.version += 1
+
+    def add_links(self, links):
+        """Fold newly collected (already de-duplicated) link records in"""
+        if not links:
+            return
+        with self._lock:
+            for link in links:
+                source_url = link.get('source_url', '')
+                target_url = link.get('target_url', '')
+                if not source_url or not target_url:
+                    continue
+                record = (source_url, target_url, link.get('anchor_text', ''), bool(link.get('is_internal')))
+                page = self._pages.get(target_url)
+                if page is None or _is_broken(page[1]):
+                    self._inbound.setdefault(target_url, []).append(record)
+                elif _is_redirect(page[1]):
+                    self._add_redirect_link(record)
+            self.version += 1
+
+    def _add_redirect_link(self, record):
+        source_url, target_url, anchor_text, is_internal = record
+        if not is_internal:
+            return
+        _, status, final_url, redirect_chain, _ = self._pages[target_url]
+        self._redirect_links.setdefault(source_url, []).append({
+            'source_url': source_url,
+            'target_url': target_url,
+            'target_status': status,
+            'final_url': final_url,
+            'anchor_text': anchor_text,
+            'redirect_chain': redirect_chain
+        })
+
+    def _classify_sitemap(self, normalized, status, is_noindex, canonical_url):
+        """Sort the sitemap URLs of one crawled page into the health categories"""
+        is_non_canonical = bool(canonical_url) and self._norm(canonical_url) != normalized
+        for sitemap_url in self._sitemap[normalized]:
+            if _is_broken(status):
+                state = ('errors', {
+                    'url': sitemap_url,
+                    'type': 'error',
+                    'category': 'Sitemap',
+                    'issue': 'Sitemap: Broken URL',
+                    'details': f'URL returns {self.detector._get_status_code_message(status)} (Status {status})'
+                })
+            elif _is_redirect(status):
+                state = ('redirects', {
+                    'url': sitemap_url,
+                    'type': 'warning',
+                    'category': 'Sitemap',
+                    'issue': 'Sitemap: Redirecting URL',
+                    'details': f'URL redirects ({status}) - update sitemap with final destination'
+                })
+            elif is_noindex:
+                state = ('noindex', {
+                    'url': sitemap_url,
+                    'type': 'warning',
+                    'category': 'Sitemap',
+                    'issue': 'Sitemap: Noindexed URL',
+                    'details': 'URL has noindex directive - remove from sitemap or remove noindex'
+                })
+            elif is_non_canonical:
+                state = ('non_canonical', {
+                    'url': sitemap_url,
+                    'type': 'warning',
+                    'category': 'Sitemap',
+                    'issue': 'Sitemap: Non-Canonical URL',
+                    'details': f'URL canonicalises to {canonical_url} - update sitemap with canonical URL'
+                })
+            else:
+                # Valid (200 OK, indexable, self-canonical)
+                state = ('valid', None)
+            self._sitemap_state[sitemap_url] = state
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def sitemap_health(self):
+        """Sitemap coverage counts for the status payload (None without a sitemap)"""
+        with self._lock:
+            if not self._sitemap_urls:
+                return None
+            counts = dict.fromkeys(SITEMAP_CATEGORIES, 0)
+            for category, _ in self._sitemap_state.values():
+                counts[category] += 1
+            total = len(self._sitemap_urls)
+        counts['total'] = total
+        counts['not_crawled'] = total - sum(counts[category] for category in SITEMAP_CATEGORIES)
+        return counts
+
+    def _evaluate_hreflang(self):
+        """(hreflang_data, issues), recomputed over the hreflang pages only when something changed"""
+        with self._lock:
+            cached = self._hreflang_cache
+            if cached and cached[0] == self._hreflang_version:
+                return cached[1], cached[2]
+            version = self._hreflang_version
+            hreflang = dict(self._hreflang)
+            status = {target: self._status.get(target, 0)
+                      for entry in hreflang.values() for target in entry['targets']}
+        data, issues = self.detector.evaluate_hreflang(hreflang, status)
+        self._hreflang_cache = (version, data, issues)
+        return data, issues
+
+    def hreflang_data(self):
+        """Hreflang matrix for the status payload (None before any page lands)"""
+        if not self._pages:
+            return None
+        return self._evaluate_hreflang()[0]
+
+    def broken_link_sources(self):
+        """Crawled broken URLs with the pages that link to them"""
+        with self._lock:
+            broken = []
+            for target_url, records in self._inbound.items():
+                page = self._pages.get(target_url)
+                if page is None or not records:
+                    continue
+                url, status, _, _, title = page
+                sources = [{'source_url': source, 'anchor_text': anchor, 'is_internal': is_internal}
+                           for source, _, anchor, is_internal in records]
+                broken.append({
+                    'broken_url': url,
+                    'status_code': status,
+                    'title': title,
+                    'source_pages': sources,
+                    'source_count': len(sources)
+                })
+        return broken
+
+    def summary(self):
+        with self._lock:
+            redirect_links = sum(len(links) for links in self._redirect_links.values())
+            pages_with_redirect_links = len(self._redirect_links)
+            pending = sum(len(records) for records in self._inbound.values())
+        return {
+            'pages': len(self._pages),
+            'links_to_redirects': redirect_links,
+            'pages_with_redirect_links': pages_with_redirect_links,
+            'tracked_links': pending,
+            'hreflang_pages': len(self._hreflang),
+            'sitemap': self.sitemap_health()
+        }
+
+    # ------------------------------------------------------------------
+    # End of crawl
+    # ------------------------------------------------------------------
+
+    def site_issues(self):
+        """Sitemap, hreflang, links-to-redirects and broken-link-source issues as they stand"""
+        issues = []
+
+        with self._lock:
+            for sitemap_url in self._sitemap_urls:
+                state = self._sitemap_state.get(sitemap_url)
+                if state and state[1]:
+                    issues.append(state[1])
+            redirect_links = [(source, list(links)) for source, links in self._redirect_links.items()]
+
+        issues.extend(self._evaluate_hreflang()[1])
+
+        for source_url, source_links in redirect_links:
+            count = len(source_links)
+            # Show first few examples
+            examples = [f"{l['target_url']} ({l['target_status']})" for l in source_links[:3]]
+            examples_str = ', '.join(examples)
+            if count > 3:
+                examples_str += f', and {count - 3} more'
+            issues.append({
+                'url': source_url,
+                'type': 'warning',
+                'category': 'Links',
+                'issue': 'Links: Internal Links to Redirects',
+                'details': f'{count} internal links point to redirecting URLs: {examples_str}',
+                'links_to_redirects': source_links
+            })
+
+        for broken_item in self.broken_link_sources():
+            status = broken_item['status_code']
+            sources = broken_item['source_pages']
+            source_count = broken_item['source_count']
+            # Get first few source URLs for the issue details
+            source_list = ', '.join(s['source_url'] for s in sources[:5])
+            if source_count > 5:
+                source_list += f' and {source_count - 5} more'
+            issues.append({
+                'url': broken_item['broken_url'],
+                'type': 'error' if status >= 400 else 'warning',
+                'category': 'Links',
+                'issue': f'Broken Link Sources: {status} error linked from {source_count} pages',
+                'details': f'This broken URL is linked from: {source_list}',
+                'source_pages': sources,
+                'source_count': source_count
+            })
+
+        return issues
+
+    def finalize(self):
+        """Add the site-wide issues to the detector once; returns them"""
+        if self.finalized:
+            return []
+        issues = self.site_issues()
+        self.detector.detected_issues.extend(issues)
+        self.finalized = True
+        return issues
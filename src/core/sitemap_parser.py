@@ -11,6 +11,7 @@ class SitemapParser:
         self.session = session
         self.base_domain = base_domain
         self.timeout = timeout
+        self.url_metadata = {}  # url -> {'priority': float|None, 'lastmod': str|None}
 
     def discover_sitemaps(self, base_url):
         """
@@ -65,6 +66,21 @@ class SitemapParser:
 
         return sitemaps
 
+    def _parse_url_metadata(self, url_elem):
+        """Read <priority> and <lastmod> for a <url> entry"""
+        priority = None
+        priority_elem = url_elem.find('priority')
+        if priority_elem is not None and priority_elem.text:
+            try:
+                priority = min(1.0, max(0.0, float(priority_elem.text.strip())))
+            except ValueError:
+                pass
+
+        lastmod_elem = url_elem.find('lastmod')
+        lastmod = lastmod_elem.text.strip() if lastmod_elem is not None and lastmod_elem.text else None
+
+        return {'priority': priority, 'lastmod': lastmod}
+
     def _parse_sitemap(self, sitemap_url, depth=1, max_depth=10):
         """
         Parse a sitemap.xml file and extract URLs
@@ -140,6 +156,7 @@ class SitemapParser:
                     if loc_elem is not None and loc_elem.text:
                         url = loc_elem.text.strip()
                         all_urls.append(url)
+                        self.url_metadata[url] = self._parse_url_metadata(url_elem)
 
             return all_urls
 
@@ -0,0 +1,104 @@
+"""
+Stage timer
+Running wall-clock and CPU totals for the stages of crawling a page (fetch,
+parse, extract, issue detection, persistence) and for end-of-crawl
+duplication detection, plus a latency histogram per stage. CPU time is the
+calling thread's, so concurrent workers do not bill each other. Spans that
+are only waited on (queue wait, time to first byte, download, browser
+render) are recorded with wall time alone. Distributed workers send their
+totals back with each batch and the coordinator merges them.
+
+Each crawler's timer restarts with its crawl; everything it records is also
+added to process_totals, which is never reset and backs the exported counters.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+STAGES = ('queue_wait', 'fetch', 'ttfb', 'download', 'render', 'parse', 'extract', 'issues',
+          'persistence', 'duplication')
+
+# Histogram upper bounds in seconds (a final +Inf bucket is implied)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class StageTimer:
+    """Per-stage call count, wall seconds, CPU seconds and wall-time histogram (thread-safe)"""
+
+    def __init__(self, parent=None):
+        self._lock = threading.Lock()
+        self._totals = {}    # stage -> [calls, wall seconds, cpu seconds, bucket counts]
+        self.parent = parent  # timer that also receives every call (process_totals)
+
+    def _totals_for(self, stage):
+        totals = self._totals.get(stage)
+        if totals is None:
+            totals = self._totals[stage] = [0, 0.0, 0.0, [0] * (len(BUCKETS) + 1)]
+        return totals
+
+    def add(self, stage, wall, cpu=0.0):
+        """Record one call of stage"""
+        with self._lock:
+            totals = self._totals_for(stage)
+            totals[0] += 1
+            totals[1] += wall
+            totals[2] += cpu
+            totals[3][bisect_left(BUCKETS, wall)] += 1
+        if self.parent is not None:
+            self.parent.add(stage, wall, cpu)
+
+    def start(self):
+        """Token for stop() where a with block would not fit the code"""
+        return time.perf_counter(), time.thread_time()
+
+    def stop(self, stage, started):
+        wall, cpu = started
+        self.add(stage, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    @contextmanager
+    def track(self, stage):
+        """Time the body of a with block as one call of stage"""
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    @staticmethod
+    def _export(totals):
+        return {stage: {'calls': calls, 'wall_s': wall, 'cpu_s': cpu, 'buckets': list(buckets)}
+                for stage, (calls, wall, cpu, buckets) in totals.items()}
+
+    def snapshot(self):
+        """{stage: {calls, wall_s, cpu_s, buckets}}; buckets[i] counts calls up to BUCKETS[i], the last one the rest"""
+        with self._lock:
+            return self._export(self._totals)
+
+    def drain(self):
+        """Snapshot and reset (distributed workers report per batch)"""
+        with self._lock:
+            totals, self._totals = self._totals, {}
+        return self._export(totals)
+
+    def merge(self, snapshot):
+        """Add a snapshot from another process"""
+        with self._lock:
+            for stage, other in (snapshot or {}).items():
+                totals = self._totals_for(stage)
+                totals[0] += other.get('calls', 0)
+                totals[1] += other.get('wall_s', 0.0)
+                totals[2] += other.get('cpu_s', 0.0)
+                for index, count in enumerate(other.get('buckets', ())[:len(totals[3])]):
+                    totals[3][index] += count
+        if self.parent is not None:
+            self.parent.merge(snapshot)
+
+    def reset(self):
+        with self._lock:
+            self._totals = {}
+
+
+# Totals of every crawler in this process since it started
+process_totals = StageTimer()
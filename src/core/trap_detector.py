@@ -0,0 +1,136 @@
+"""Crawl-trap detection with bounded memory"""
+import hashlib
+import re
+from array import array
+from urllib.parse import urlparse, parse_qsl
+
+
+# Compiled once - signatures are computed for every candidate link
+UUID_PATTERN = re.compile(r'[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}')
+HEX_PATTERN = re.compile(r'(?<![A-Za-z0-9])[a-fA-F0-9]{16,}(?![A-Za-z0-9])')
+DIGITS_PATTERN = re.compile(r'\d+')
+NUMBER_VALUE = re.compile(r'^-?\d+(?:\.\d+)?$')
+
+
+class CountMinSketch:
+    """
+    Fixed-size frequency counter. Estimates never undercount and overcount
+    by at most ~2N/width with high probability, so memory stays at
+    width * depth counters no matter how many distinct patterns a site has.
+    """
+
+    def __init__(self, width=4096, depth=4):
+        self.width = width
+        self.depth = min(depth, 8)  # one 4-byte slice of the digest per row
+        self.tables = [array('I', [0]) * width for _ in range(self.depth)]
+
+    def _indexes(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[i * 4:i * 4 + 4], 'little') % self.width for i in range(self.depth)]
+
+    def add(self, key, count=1):
+        """Add to a key (conservative update) and return its new estimate"""
+        indexes = self._indexes(key)
+        estimate = min(table[i] for table, i in zip(self.tables, indexes)) + count
+        for table, i in zip(self.tables, indexes):
+            if table[i] < estimate:
+                table[i] = min(estimate, 0xFFFFFFFF)
+        return estimate
+
+    def estimate(self, key):
+        return min(table[i] for table, i in zip(self.tables, self._indexes(key)))
+
+    def clear(self):
+        self.tables = [array('I', [0]) * self.width for _ in range(self.depth)]
+
+
+class TrapDetector:
+    """
+    Flags URL patterns that repeat too often to be real content.
+
+    A URL's signature normalises the path (numbers, UUIDs, hashes) and the
+    query string: parameter names are sorted and values bucketed, so
+    ?color=red&size=9 and ?size=12&color=blue share one pattern. Counts live
+    in a count-min sketch. Two limits apply:
+      - pattern: the same signature seen `threshold` times (pagination, calendars)
+      - facet family: any query variant of one path seen `facet_threshold`
+        times, which catches filter combinations exploding into new key sets
+    """
+
+    MAX_REPORTED_TRAPS = 500
+
+    def __init__(self, threshold=100, facet_threshold=None, width=4096, depth=4):
+        self.threshold = max(1, threshold)
+        self.facet_threshold = facet_threshold or self.threshold * 3
+        self.sketch = CountMinSketch(width, depth)
+        self.trap_patterns = {}
+
+    def _path_signature(self, path):
+        path = UUID_PATTERN.sub(r'\\uuid', path)
+        path = HEX_PATTERN.sub(r'\\hex', path)
+        return DIGITS_PATTERN.sub(r'\\d+', path)
+
+    def _value_bucket(self, value):
+        if not value:
+            return ''
+        if NUMBER_VALUE.match(value):
+            return r'\d+'
+        return '*'
+
+    def signatures(self, url):
+        """Return (pattern, facet_family) for a URL; facet_family is None without a query"""
+        try:
+            parsed = urlparse(url)
+        except ValueError:
+            return url, None
+
+        path = self._path_signature(parsed.path)
+        if not parsed.query:
+            return path, None
+
+        params = {}
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True):
+            params.setdefault(key, set()).add(self._value_bucket(value))
+        query = '&'.join(f"{key}={'|'.join(sorted(params[key]))}" for key in sorted(params))
+        return f"{path}?{query}", f"{path}?*"
+
+    def check(self, url):
+        """Return the trap signature a URL falls under, or None if it may be crawled"""
+        pattern, family = self.signatures(url)
+        if self.sketch.estimate(pattern) >= self.threshold:
+            return pattern
+        if family and self.sketch.estimate(family) >= self.facet_threshold:
+            return family
+        return None
+
+    def record(self, url):
+        """Count a URL that is being queued"""
+        pattern, family = self.signatures(url)
+        self.sketch.add(pattern)
+        if family:
+            self.sketch.add(family)
+
+    def likelihood(self, url):
+        """0..1 - how close a URL's patterns are to their trap limits"""
+        pattern, family = self.signatures(url)
+        ratio = self.sketch.estimate(pattern) / self.threshold
+        if family:
+            ratio = max(ratio, self.sketch.estimate(family) / self.facet_threshold)
+        return min(1.0, ratio)
+
+    def report(self, signature, example_url, count=1):
+        """Record a blocked URL for the traps report (bounded)"""
+        trap = self.trap_patterns.get(signature)
+        if trap is None:
+            if len(self.trap_patterns) >= self.MAX_REPORTED_TRAPS:
+                return
+            trap = self.trap_patterns[signature] = {
+                'pattern': signature,
+                'example_url': example_url,
+                'count': 0
+            }
+        trap['count'] += count
+
+    def reset(self):
+        self.sketch.clear()
+        self.trap_patterns.clear()
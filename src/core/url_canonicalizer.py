@@ -0,0 +1,144 @@
+"""URL canonicalisation shared by link discovery and link reporting"""
+import re
+from collections import namedtuple
+from urllib.parse import urljoin, urlsplit
+
+
+# url: canonical absolute URL, netloc: normalised host[:port], scope: 'root' | 'sub' | 'external'
+CanonicalUrl = namedtuple('CanonicalUrl', ['url', 'netloc', 'scope'])
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+# Query parameters that only identify the visit, never the content
+TRACKING_PARAMS = {
+    'gclid', 'dclid', 'gbraid', 'wbraid', 'fbclid', 'msclkid', 'yclid', 'twclid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'igshid', 'ref_src'
+}
+TRACKING_PREFIXES = ('utm_',)
+
+PERCENT_ESCAPE = re.compile(r'%[0-9a-fA-F]{2}')
+UNRESERVED = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+# Host classifications cached per netloc; cleared if a crawl sees more hosts than this
+HOST_CACHE_LIMIT = 10000
+
+
+def _normalize_escape(match):
+    """Decode escapes of unreserved characters, uppercase the rest (RFC 3986 6.2.2)"""
+    char = chr(int(match.group(0)[1:], 16))
+    if char in UNRESERVED:
+        return char
+    return match.group(0).upper()
+
+
+def _remove_dot_segments(path):
+    """Resolve '.' and '..' segments in an absolute path"""
+    output = []
+    for segment in path.split('/'):
+        if segment == '..':
+            if len(output) > 1:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    result = '/'.join(output)
+    if path.endswith(('/.', '/..')):
+        result += '/'
+    return result or '/'
+
+
+class UrlCanonicalizer:
+    """
+    Turns an href into one canonical absolute URL with a single parse.
+
+    Normalisation: lowercase scheme and host, drop default ports and fragments,
+    normalise percent-encoding, strip tracking parameters and apply the
+    trailing-slash policy ('keep', 'strip' or 'add'). Host classification
+    (root / sub / external relative to base_domain) is cached per netloc.
+    """
+
+    def __init__(self, base_domain, strip_tracking_params=True, trailing_slash='keep'):
+        self.base_domain = base_domain or ''
+        self.base_clean = self.base_domain.lower().replace('www.', '')
+        self.strip_tracking_params = strip_tracking_params
+        self.trailing_slash = trailing_slash
+        self._host_scopes = {}
+
+    def classify_host(self, netloc):
+        """root / sub / external for a normalised netloc (cached)"""
+        scope = self._host_scopes.get(netloc)
+        if scope is None:
+            host = netloc.replace('www.', '')
+            if host == self.base_clean:
+                scope = 'root'
+            elif host.endswith('.' + self.base_clean):
+                scope = 'sub'
+            else:
+                scope = 'external'
+
+            if len(self._host_scopes) >= HOST_CACHE_LIMIT:
+                self._host_scopes.clear()
+            self._host_scopes[netloc] = scope
+        return scope
+
+    def canonicalize(self, href, base_url=None):
+        """
+        Return a CanonicalUrl for an href (resolved against base_url), or None
+        for empty, fragment-only and non-http(s) links.
+        """
+        href = href.strip()
+        if not href or href[0] == '#':
+            return None
+
+        if href.startswith(('http://', 'https://', 'HTTP://', 'HTTPS://')):
+            absolute_url = href
+        elif base_url:
+            absolute_url = urljoin(base_url, href)
+        else:
+            return None
+
+        try:
+            parts = urlsplit(absolute_url)
+        except ValueError:
+            return None
+
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS:
+            return None
+
+        netloc = parts.netloc.lower()
+        if not netloc:
+            return None
+        if netloc.endswith(':' + DEFAULT_PORTS[scheme]):
+            netloc = netloc[:-len(DEFAULT_PORTS[scheme]) - 1]
+
+        path = parts.path or '/'
+        if '/.' in path:
+            path = _remove_dot_segments(path)
+        if '%' in path:
+            path = PERCENT_ESCAPE.sub(_normalize_escape, path)
+        if self.trailing_slash == 'strip' and len(path) > 1 and path.endswith('/'):
+            path = path.rstrip('/') or '/'
+        elif self.trailing_slash == 'add' and not path.endswith('/') and '.' not in path.rsplit('/', 1)[-1]:
+            path += '/'
+
+        query = parts.query
+        if query:
+            if self.strip_tracking_params:
+                query = self._strip_tracking(query)
+            if '%' in query:
+                query = PERCENT_ESCAPE.sub(_normalize_escape, query)
+
+        url = f"{scheme}://{netloc}{path}"
+        if query:
+            url += f"?{query}"
+
+        return CanonicalUrl(url, netloc, self.classify_host(netloc))
+
+    def _strip_tracking(self, query):
+        kept = []
+        for pair in query.split('&'):
+            name = pair.split('=', 1)[0].lower()
+            if name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES):
+                continue
+            kept.append(pair)
+        return '&'.join(kept)
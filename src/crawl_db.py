@@ -3,15 +3,85 @@ Crawl data persistence module
 Handles database operations for storing and retrieving crawl data
 Enables crash recovery and historical crawl access
 """
+import base64
+import os
 import time
 import json
 from datetime import datetime, timedelta
 from .database import get_db
 
 
+CRAWL_ISSUES_DDL = '''
+            CREATE TABLE IF NOT EXISTS crawl_issues (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                crawl_id INTEGER NOT NULL,
+                url TEXT,
+                type TEXT,
+                category TEXT,
+                issue TEXT,
+                details TEXT,
+                severity TEXT DEFAULT 'info',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (crawl_id) REFERENCES crawls(id) ON DELETE CASCADE
+            )
+        '''
+
+def _migrate_sqlite_issue_ids(cursor):
+    """
+    crawl_issues used to be declared 'id SERIAL', which SQLite does not treat as
+    a rowid alias, so every id was NULL. Rebuild such tables with real ids.
+    """
+    if os.getenv('DB_TYPE', 'sqlite') != 'sqlite':
+        return
+
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'crawl_issues'")
+    row = cursor.fetchone()
+    if not row or 'SERIAL' not in row[0].upper():
+        return
+
+    print("Migrating crawl_issues to integer ids...")
+    cursor.execute('ALTER TABLE crawl_issues RENAME TO crawl_issues_old')
+    cursor.execute(CRAWL_ISSUES_DDL)
+    cursor.execute('''
+        INSERT INTO crawl_issues (crawl_id, url, type, category, issue, details, severity, created_at)
+        SELECT crawl_id, url, type, category, issue, details, severity, created_at
+        FROM crawl_issues_old ORDER BY rowid
+    ''')
+    cursor.execute('DROP TABLE crawl_issues_old')
+
+def _table_exists(cursor, table):
+    if os.getenv('DB_TYPE', 'sqlite') == 'postgres':
+        cursor.execute('SELECT 1 FROM information_schema.tables WHERE table_name = ?', (table,))
+    else:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cursor.fetchone() is not None
+
+def _ensure_query_indexes(cursor):
+    """
+    The issue-id rebuild and the composite indexes behind the paginated table API
+    (query_crawl_rows). Both are idempotent; tables that do not exist yet are skipped.
+    """
+    _migrate_sqlite_issue_ids(cursor)
+    for index_name, table, columns in TABLE_QUERY_INDEXES:
+        if not _table_exists(cursor, table):
+            continue
+        try:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table}({columns})')
+        except Exception as e:
+            print(f"Could not create index {index_name}: {e}")
+
 def init_crawl_tables(enable_migrations=False):
-    """Initialize crawl persistence tables"""
+    """
+    Initialize crawl persistence tables. Without enable_migrations the tables
+    are left to the migration run, but the query indexes are still checked:
+    every start needs them and they cost nothing once they exist.
+    """
     if not enable_migrations:
+        try:
+            with get_db() as conn:
+                _ensure_query_indexes(conn.cursor())
+        except Exception as e:
+            print(f"Warning: could not check crawl table indexes: {e}")
         return
         
     with get_db() as conn:
@@ -142,33 +212,33 @@ def init_crawl_tables(enable_migrations=False):
         ''')
 
         # === Create crawl_issues table ===
+        cursor.execute(CRAWL_ISSUES_DDL)
+        _migrate_sqlite_issue_ids(cursor)
+        
+        # === Create audit_insights table ===
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS crawl_issues (
+            CREATE TABLE IF NOT EXISTS audit_insights (
                 id SERIAL PRIMARY KEY,
-                crawl_id INTEGER NOT NULL,
-                url TEXT,
-                type TEXT,
-                category TEXT,
-                issue TEXT,
-                details TEXT,
-                severity TEXT DEFAULT 'info',
+                crawl_id INTEGER NOT NULL UNIQUE,
+                insights_json TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (crawl_id) REFERENCES crawls(id) ON DELETE CASCADE
             )
         ''')
         
-        # === Create audit_insights table ===
+        # === Create audit_summaries table (compact crawl digest for the AI audit) ===
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS audit_insights (
-                id SERIAL PRIMARY KEY,
+            CREATE TABLE IF NOT EXISTS audit_summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
                 crawl_id INTEGER NOT NULL UNIQUE,
-                insights_json TEXT,
+                summary_json TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (crawl_id) REFERENCES crawls(id) ON DELETE CASCADE
             )
         ''')
-        
+
         # Create indexes for better performance
         try:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_crawl_issues_crawl_id ON crawl_issues(crawl_id)')
@@ -176,6 +246,9 @@ def init_crawl_tables(enable_migrations=False):
         except:
             pass  # Indexes may already exist
 
+        # Composite indexes behind the paginated table API (query_crawl_rows)
+        _ensure_query_indexes(cursor)
+
         print("Crawl persistence tables initialized successfully")
 
 def create_crawl(user_id, session_id, base_url, base_domain, config_snapshot, client_id=None):
@@ -528,6 +601,29 @@ def get_user_crawls(user_id, limit=50, offset=0, status_filter=None, client_id=N
         print(f"Error fetching user crawls: {e}")
         return []
 
+URL_JSON_FIELDS = ['h2', 'h3', 'meta_tags', 'og_tags', 'twitter_tags',
+                   'json_ld', 'analytics', 'images', 'hreflang',
+                   'schema_org', 'redirects', 'linked_from']
+
+def _parse_url_row(row, summary=False):
+    """Turn a crawled_urls row into the dict shape the crawler produces"""
+    url_data = dict(row)
+
+    # If summary, we selected specific columns, so we don't need to parse everything
+    # logic to parse JSON fields safely
+    for field in URL_JSON_FIELDS:
+        if url_data.get(field):
+            try:
+                url_data[field] = json.loads(url_data[field])
+            except:
+                url_data[field] = []
+        elif summary and field in ['og_tags', 'twitter_tags']:
+             # Ensure these are objects if present but empty/null in DB
+             if field not in url_data or not url_data[field]:
+                 url_data[field] = {}
+
+    return url_data
+
 def load_crawled_urls(crawl_id, limit=None, offset=0, summary=False):
     """Load all crawled URLs for a crawl. Use summary=True for lighter payload."""
     try:
@@ -559,30 +655,7 @@ def load_crawled_urls(crawl_id, limit=None, offset=0, summary=False):
 
             cursor.execute(query, params)
 
-            urls = []
-            for row in cursor.fetchall():
-                url_data = dict(row)
-                
-                # If summary, we selected specific columns, so we don't need to parse everything
-                # logic to parse JSON fields safely
-                json_fields = ['h2', 'h3', 'meta_tags', 'og_tags', 'twitter_tags',
-                             'json_ld', 'analytics', 'images', 'hreflang',
-                             'schema_org', 'redirects', 'linked_from']
-                
-                for field in json_fields:
-                    if url_data.get(field):
-                        try:
-                            url_data[field] = json.loads(url_data[field])
-                        except:
-                            url_data[field] = []
-                    elif summary and field in ['og_tags', 'twitter_tags']:
-                         # Ensure these are objects if present but empty/null in DB
-                         if field not in url_data or not url_data[field]:
-                             url_data[field] = {}
-
-                urls.append(url_data)
-
-            return urls
+            return [_parse_url_row(row, summary) for row in cursor.fetchall()]
 
     except Exception as e:
         print(f"Error loading crawled URLs: {e}")
@@ -594,7 +667,7 @@ def load_crawl_links(crawl_id, limit=None, offset=0):
         with get_db() as conn:
             cursor = conn.cursor()
 
-            query = 'SELECT * FROM crawl_links WHERE crawl_id = ?'
+            query = 'SELECT * FROM crawl_links WHERE crawl_id = ? ORDER BY id'
             params = [crawl_id]
 
             if limit:
@@ -615,7 +688,7 @@ def load_crawl_issues(crawl_id, limit=None, offset=0):
         with get_db() as conn:
             cursor = conn.cursor()
 
-            query = 'SELECT * FROM crawl_issues WHERE crawl_id = ?'
+            query = 'SELECT * FROM crawl_issues WHERE crawl_id = ? ORDER BY id'
             params = [crawl_id]
 
             if limit:
@@ -630,6 +703,447 @@ def load_crawl_issues(crawl_id, limit=None, offset=0):
         print(f"Error loading issues: {e}")
         return []
 
+def _iter_rows(table, crawl_id, columns='*', batch_size=1000):
+    """
+    Yield a crawl's rows from one table in id order, one keyset page at a time
+    (WHERE id > last_id), so exports never hold the whole crawl in memory.
+    """
+    last_id = 0
+    while True:
+        try:
+            with get_db() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT {columns} FROM {table}
+                    WHERE crawl_id = ? AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                ''', (crawl_id, last_id, batch_size))
+                rows = [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error reading {table} for crawl {crawl_id}: {e}")
+            return
+
+        for row in rows:
+            yield row
+
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]['id']
+
+def iter_crawled_urls(crawl_id, batch_size=500):
+    """Stream crawled URLs for a crawl (JSON fields parsed)"""
+    for row in _iter_rows('crawled_urls', crawl_id, batch_size=batch_size):
+        yield _parse_url_row(row)
+
+def iter_crawl_links(crawl_id, batch_size=2000):
+    """Stream link rows for a crawl"""
+    return _iter_rows('crawl_links', crawl_id, batch_size=batch_size)
+
+def iter_crawl_issues(crawl_id, batch_size=2000):
+    """Stream issue rows for a crawl"""
+    return _iter_rows('crawl_issues', crawl_id, batch_size=batch_size)
+
+def iter_hreflang_rows(crawl_id):
+    """url/status_code/hreflang for the URLs that declare hreflang links"""
+    for row in _iter_rows('crawled_urls', crawl_id, columns='id, url, status_code, hreflang', batch_size=5000):
+        if row.get('hreflang') and row['hreflang'] != '[]':
+            yield _parse_url_row(row)
+
+def load_url_statuses(crawl_id):
+    """Map url -> status_code for a crawl (used to fill link target statuses)"""
+    return {row['url']: row['status_code']
+            for row in _iter_rows('crawled_urls', crawl_id, columns='id, url, status_code', batch_size=5000)}
+
+def iter_graph_links(crawl_id):
+    """source_url/target_url/is_internal for every link (enough to rebuild the link graph)"""
+    return _iter_rows('crawl_links', crawl_id, columns='id, source_url, target_url, is_internal', batch_size=10000)
+
+def iter_url_labels(crawl_id):
+    """(url, status_code, title) in crawl order, for the visualisation"""
+    for row in _iter_rows('crawled_urls', crawl_id, columns='id, url, status_code, title', batch_size=10000):
+        yield row['url'], row['status_code'], row['title']
+
+def iter_issue_codes(crawl_id):
+    """url/type/category/issue of a crawl's issues (no details), for issue counts"""
+    return _iter_rows('crawl_issues', crawl_id, columns='id, url, type, category, issue', batch_size=10000)
+
+def iter_audit_rows(crawl_id):
+    """The crawled_urls columns the audit summary aggregates, in crawl order"""
+    return _iter_rows('crawled_urls', crawl_id,
+                      columns='id, url, status_code, content_type, is_internal, depth, title, meta_description, '
+                              'h1, word_count, response_time, canonical_url, robots',
+                      batch_size=5000)
+
+def iter_crawled_url_names(crawl_id):
+    """Crawled URLs in crawl order"""
+    for row in _iter_rows('crawled_urls', crawl_id, columns='id, url', batch_size=10000):
+        yield row['url']
+
+# =============================================================================
+# Paginated table queries
+# =============================================================================
+
+# Sortable columns are compared as COALESCE(column, default) so NULLs have a
+# place in the keyset order; the same expressions are indexed below.
+TABLE_QUERY_SPECS = {
+    'urls': {
+        'table': 'crawled_urls',
+        'columns': '''id, url, status_code, content_type, size, is_internal, depth,
+                      title, meta_description, h1, word_count, response_time,
+                      canonical_url, lang, charset, robots, og_tags, twitter_tags,
+                      internal_links, external_links, requires_js, crawled_at''',
+        'sorts': {
+            'id': 'id',
+            'url': 'url',
+            'status_code': 'COALESCE(status_code, -1)',
+            'depth': 'COALESCE(depth, -1)',
+            'response_time': 'COALESCE(response_time, -1)',
+            'word_count': 'COALESCE(word_count, -1)'
+        },
+        'filters': {
+            'status_code': ('status_code', int),
+            'depth': ('depth', int),
+            'is_internal': ('is_internal', 'bool'),
+            'requires_js': ('requires_js', 'bool'),
+            'content_type': ('content_type', str)
+        },
+        'search': ['url', 'title']
+    },
+    'links': {
+        'table': 'crawl_links',
+        'columns': 'id, source_url, target_url, anchor_text, is_internal, is_nofollow, target_status, placement, scope',
+        'sorts': {
+            'id': 'id',
+            'source_url': 'source_url',
+            'target_url': 'target_url',
+            'target_status': 'COALESCE(target_status, -1)'
+        },
+        'filters': {
+            'source_url': ('source_url', str),
+            'target_url': ('target_url', str),
+            'target_status': ('target_status', int),
+            'is_internal': ('is_internal', 'bool'),
+            'is_nofollow': ('is_nofollow', 'bool'),
+            'placement': ('placement', str),
+            'scope': ('scope', str)
+        },
+        'search': ['source_url', 'target_url', 'anchor_text']
+    },
+    'issues': {
+        'table': 'crawl_issues',
+        'columns': 'id, url, type, category, issue, details, severity',
+        'sorts': {
+            'id': 'id',
+            'url': 'url',
+            'type': 'type',
+            'category': 'category',
+            'issue': 'issue'
+        },
+        'filters': {
+            'url': ('url', str),
+            'type': ('type', str),
+            'category': ('category', str),
+            'issue': ('issue', str),
+            'severity': ('severity', str)
+        },
+        'search': ['url', 'issue', 'details']
+    }
+}
+
+# (crawl_id, <sort or filter expression>, id) so every filter + sort pair is an index range scan
+TABLE_QUERY_INDEXES = [
+    ('idx_crawled_urls_crawl_id_id', 'crawled_urls', 'crawl_id, id'),
+    ('idx_crawled_urls_crawl_url', 'crawled_urls', 'crawl_id, url, id'),
+    ('idx_crawled_urls_crawl_status', 'crawled_urls', 'crawl_id, COALESCE(status_code, -1), id'),
+    ('idx_crawled_urls_crawl_depth', 'crawled_urls', 'crawl_id, COALESCE(depth, -1), id'),
+    ('idx_crawled_urls_crawl_response_time', 'crawled_urls', 'crawl_id, COALESCE(response_time, -1), id'),
+    ('idx_crawled_urls_crawl_word_count', 'crawled_urls', 'crawl_id, COALESCE(word_count, -1), id'),
+    ('idx_crawl_links_crawl_id_id', 'crawl_links', 'crawl_id, id'),
+    ('idx_crawl_links_crawl_source', 'crawl_links', 'crawl_id, source_url, id'),
+    ('idx_crawl_links_crawl_target', 'crawl_links', 'crawl_id, target_url, id'),
+    ('idx_crawl_links_crawl_status', 'crawl_links', 'crawl_id, COALESCE(target_status, -1), id'),
+    ('idx_crawl_links_crawl_internal', 'crawl_links', 'crawl_id, is_internal, id'),
+    ('idx_crawl_issues_crawl_id_id', 'crawl_issues', 'crawl_id, id'),
+    ('idx_crawl_issues_crawl_url', 'crawl_issues', 'crawl_id, url, id'),
+    ('idx_crawl_issues_crawl_type', 'crawl_issues', 'crawl_id, type, id'),
+    ('idx_crawl_issues_crawl_category', 'crawl_issues', 'crawl_id, category, id'),
+    ('idx_crawl_issues_crawl_issue', 'crawl_issues', 'crawl_id, issue, id')
+]
+
+MAX_PAGE_SIZE = 1000
+
+# Content filters of the URL tables -> substring of content_type
+URL_CONTENT_CLASSES = {'html': 'html', 'css': 'css', 'js': 'javascript', 'images': 'image'}
+
+# Status column status_class applies to
+STATUS_CLASS_COLUMNS = {'urls': 'status_code', 'links': 'target_status'}
+
+def encode_page_cursor(sort_value, row_id):
+    """Opaque cursor for the row a page ended on"""
+    raw = json.dumps([sort_value, row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_page_cursor(cursor):
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return sort_value, int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def _filter_value(value, kind):
+    if kind == 'bool':
+        return str(value).lower() in ('1', 'true', 'yes')
+    return kind(value)
+
+def _like_pattern(text):
+    escaped = text.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def query_crawl_rows(crawl_id, dataset, filters=None, sort='id', direction='asc',
+                     search=None, cursor=None, limit=100, status_class=None, content_class=None):
+    """
+    One keyset page of a crawl table with server-side filtering, sorting and search.
+
+    filters: {column: value} for the dataset's filter columns (exact match)
+    status_class: 2..5 on URL status / link target status - 4 means 400-499
+    content_class: html, css, js or images, URLs only
+    cursor: next_cursor from the previous page (same filters/sort)
+
+    URL rows are the table view (see load_table_page).
+
+    Returns {'rows', 'next_cursor', 'has_more', 'total'}; total is only
+    counted for the first page.
+    """
+    spec = TABLE_QUERY_SPECS.get(dataset)
+    if not spec:
+        raise ValueError(f'Unknown dataset: {dataset}')
+    if sort not in spec['sorts']:
+        raise ValueError(f'Cannot sort {dataset} by {sort}')
+
+    sort_expr = spec['sorts'][sort]
+    descending = str(direction).lower() == 'desc'
+    limit = max(1, min(int(limit or 100), MAX_PAGE_SIZE))
+
+    where = ['crawl_id = ?']
+    params = [crawl_id]
+
+    for name, value in (filters or {}).items():
+        if name not in spec['filters'] or value in (None, ''):
+            continue
+        column, kind = spec['filters'][name]
+        where.append(f'{column} = ?')
+        params.append(_filter_value(value, kind))
+
+    if status_class and dataset in STATUS_CLASS_COLUMNS:
+        column = STATUS_CLASS_COLUMNS[dataset]
+        low = int(status_class) * 100
+        where.append(f'{column} >= ? AND {column} < ?')
+        params.extend([low, low + 100])
+
+    if content_class and dataset == 'urls':
+        if content_class not in URL_CONTENT_CLASSES:
+            raise ValueError(f'Unknown content class: {content_class}')
+        where.append("LOWER(COALESCE(content_type, '')) LIKE ?")
+        params.append(f'%{URL_CONTENT_CLASSES[content_class]}%')
+
+    if search:
+        pattern = _like_pattern(search)
+        where.append('(' + ' OR '.join(f"LOWER({column}) LIKE ? ESCAPE '\\'" for column in spec['search']) + ')')
+        params.extend([pattern] * len(spec['search']))
+
+    count_where = list(where)
+    count_params = list(params)
+
+    if cursor:
+        sort_value, last_id = decode_page_cursor(cursor)
+        if sort_expr == 'id':
+            where.append('id < ?' if descending else 'id > ?')
+            params.append(last_id)
+        else:
+            # Written as a range on the sort expression so the composite index can seek to it
+            if descending:
+                where.append(f'{sort_expr} <= ? AND ({sort_expr} < ? OR id < ?)')
+            else:
+                where.append(f'{sort_expr} >= ? AND ({sort_expr} > ? OR id > ?)')
+            params.extend([sort_value, sort_value, last_id])
+
+    order = 'DESC' if descending else 'ASC'
+    order_by = f'id {order}' if sort_expr == 'id' else f'{sort_expr} {order}, id {order}'
+    columns = _url_table_columns() if dataset == 'urls' else spec['columns']
+
+    try:
+        with get_db() as conn:
+            db_cursor = conn.cursor()
+            db_cursor.execute(f'''
+                SELECT {columns}, {sort_expr} AS sort_key FROM {spec['table']}
+                WHERE {' AND '.join(where)}
+                ORDER BY {order_by}
+                LIMIT ?
+            ''', params + [limit + 1])
+            rows = [dict(row) for row in db_cursor.fetchall()]
+
+            total = None
+            if not cursor:
+                db_cursor.execute(f'''
+                    SELECT COUNT(*) AS total FROM {spec['table']}
+                    WHERE {' AND '.join(count_where)}
+                ''', count_params)
+                total = dict(db_cursor.fetchone())['total']
+    except Exception as e:
+        print(f"Error querying {dataset} for crawl {crawl_id}: {e}")
+        raise
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_page_cursor(rows[-1]['sort_key'], rows[-1]['id']) if has_more else None
+
+    for row in rows:
+        del row['sort_key']
+    if dataset == 'urls':
+        rows = [_url_table_row(row) for row in rows]
+
+    return {
+        'rows': rows,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+        'total': total
+    }
+
+def _json_array_length_sql(column):
+    """Element count of a JSON array column without fetching it"""
+    if os.getenv('DB_TYPE', 'sqlite') == 'postgres':
+        return f"COALESCE(json_array_length(NULLIF({column}, '')::json), 0)"
+    return f"COALESCE(json_array_length(NULLIF({column}, '')), 0)"
+
+# Small JSON columns the results tables render directly
+URL_PAGE_JSON_FIELDS = ('og_tags', 'twitter_tags', 'analytics')
+
+def _url_table_columns():
+    """
+    URL table view: heavy JSON columns (images, json_ld, meta tags, linked_from...)
+    are left out and replaced by counts; load_url_detail has the rest.
+    """
+    return (f"{TABLE_QUERY_SPECS['urls']['columns']}, crawl_id, analytics, javascript_rendered, "
+            f"{_json_array_length_sql('images')} AS images_count, "
+            f"{_json_array_length_sql('json_ld')} AS json_ld_count")
+
+def _url_table_row(row):
+    for field in URL_PAGE_JSON_FIELDS:
+        try:
+            row[field] = json.loads(row[field]) if row.get(field) else {}
+        except ValueError:
+            row[field] = {}
+    row['details_loaded'] = False
+    return row
+
+def load_table_page(crawl_id, dataset, offset=0, limit=2000):
+    """
+    Rows [offset, offset + limit) of a crawl table in id order.
+    URL rows are the table view (_url_table_columns).
+    """
+    spec = TABLE_QUERY_SPECS[dataset]
+    columns = _url_table_columns() if dataset == 'urls' else '*'
+
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {columns} FROM {spec['table']}
+                WHERE crawl_id = ?
+                ORDER BY id
+                LIMIT ? OFFSET ?
+            ''', (crawl_id, limit, offset))
+            rows = [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Error loading {dataset} page for crawl {crawl_id}: {e}")
+        return []
+
+    if dataset == 'urls':
+        rows = [_url_table_row(row) for row in rows]
+    return rows
+
+def load_url_facets(crawl_id):
+    """
+    URL counts per (status_code, is_internal, content_class) - what the filter
+    badges and the status code table need, without reading any rows.
+    """
+    cases = ' '.join("WHEN LOWER(content_type) LIKE ? THEN ?" for _ in URL_CONTENT_CLASSES)
+    params = []
+    for name, needle in URL_CONTENT_CLASSES.items():
+        params.extend([f'%{needle}%', name])
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT status_code, is_internal, content_class, COUNT(*) AS count
+                FROM (
+                    SELECT status_code, is_internal,
+                           CASE {cases} ELSE 'other' END AS content_class
+                    FROM crawled_urls WHERE crawl_id = ?
+                ) AS url_classes
+                GROUP BY status_code, is_internal, content_class
+            ''', params + [crawl_id])
+            facets = [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Error loading URL facets for crawl {crawl_id}: {e}")
+        return []
+    for facet in facets:
+        facet['is_internal'] = bool(facet['is_internal'])
+    return facets
+
+def load_url_detail(crawl_id, url):
+    """Full row for one crawled URL, every JSON column parsed"""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM crawled_urls WHERE crawl_id = ? AND url = ?
+                ORDER BY id LIMIT 1
+            ''', (crawl_id, url))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            url_data = _parse_url_row(row)
+
+        # The stored column only holds the pages known when the URL was crawled
+        linked_from = load_linked_from(crawl_id, url)
+        if linked_from:
+            url_data['linked_from'] = linked_from
+        return url_data
+    except Exception as e:
+        print(f"Error loading URL detail: {e}")
+        return None
+
+def load_linked_from(crawl_id, url, limit=None):
+    """Pages linking to a URL, read from crawl_links (indexed on crawl_id, target_url)"""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            query = 'SELECT source_url FROM crawl_links WHERE crawl_id = ? AND target_url = ? ORDER BY id'
+            params = [crawl_id, url]
+            if limit:
+                query += ' LIMIT ?'
+                params.append(limit)
+            cursor.execute(query, params)
+            return [dict(row)['source_url'] for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Error loading linked_from for {url}: {e}")
+        return []
+
+def count_crawl_rows(crawl_id):
+    """Row counts per table for a crawl"""
+    counts = {}
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            for dataset, spec in TABLE_QUERY_SPECS.items():
+                cursor.execute(f"SELECT COUNT(*) AS total FROM {spec['table']} WHERE crawl_id = ?", (crawl_id,))
+                counts[dataset] = dict(cursor.fetchone())['total']
+    except Exception as e:
+        print(f"Error counting rows for crawl {crawl_id}: {e}")
+    return counts
+
 def get_resume_data(crawl_id):
     """Get all data needed to resume a crawl"""
     crawl = get_crawl_by_id(crawl_id)
@@ -754,6 +1268,37 @@ def save_audit_insights(crawl_id, insights_data):
         print(f"Error saving insights: {e}")
         return False
 
+def save_audit_summary(crawl_id, summary):
+    """Store the audit summary built for a crawl (replaces the previous one)"""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO audit_summaries (crawl_id, summary_json, created_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(crawl_id) DO UPDATE SET
+                    summary_json = excluded.summary_json,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (crawl_id, json.dumps(summary)))
+            return True
+    except Exception as e:
+        print(f"Error saving audit summary: {e}")
+        return False
+
+def get_audit_summary(crawl_id):
+    """Stored audit summary for a crawl, or None"""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT summary_json FROM audit_summaries WHERE crawl_id = ?', (crawl_id,))
+            row = cursor.fetchone()
+            if row and row['summary_json']:
+                return json.loads(row['summary_json'])
+            return None
+    except Exception as e:
+        print(f"Error getting audit summary: {e}")
+        return None
+
 def get_audit_insights(crawl_id):
     """Get AI insights for a crawl"""
     try:
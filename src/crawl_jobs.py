@@ -0,0 +1,423 @@
+"""
+Crawl job queue
+Crawls submitted through the API are stored as jobs and executed by worker
+processes (src/crawl_worker.py), so crawl load never runs inside the web process.
+"""
+import os
+import time
+import json
+import uuid
+from urllib.parse import urlparse
+from .database import get_db
+
+
+# Seconds without a heartbeat before a running job is considered orphaned
+JOB_HEARTBEAT_TIMEOUT = 90
+
+# Max rows of each kind returned per status poll (the frontend polls incrementally)
+STATUS_PAGE_SIZE = 2000
+
+
+def init_crawl_job_tables(enable_migrations=False):
+    """Initialize the crawl job queue table"""
+    if not enable_migrations:
+        return
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT UNIQUE NOT NULL,
+                crawl_id INTEGER NOT NULL,
+                user_id INTEGER,
+                session_id TEXT,
+                client_id TEXT,
+                start_url TEXT NOT NULL,
+                config_snapshot TEXT,
+
+                status TEXT DEFAULT 'pending',
+                control TEXT,
+                worker_id TEXT,
+                heartbeat_at REAL,
+                rule_stats TEXT,
+
+                retry_count INTEGER DEFAULT 0,
+                max_retries INTEGER DEFAULT 3,
+                error_message TEXT,
+
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                completed_at TIMESTAMP,
+
+                FOREIGN KEY (crawl_id) REFERENCES crawls(id) ON DELETE CASCADE
+            )
+        ''')
+
+        _migrate_job_rule_stats(cursor)
+
+        try:
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_crawl_jobs_status ON crawl_jobs(status, created_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_crawl_jobs_crawl_id ON crawl_jobs(crawl_id)')
+        except:
+            pass  # Indexes may already exist
+
+        print("Crawl job queue table initialized successfully")
+
+
+def _migrate_job_rule_stats(cursor):
+    """crawl_jobs tables created before per-rule stats were saved get the column"""
+    if os.getenv('DB_TYPE', 'sqlite') == 'postgres':
+        cursor.execute('ALTER TABLE crawl_jobs ADD COLUMN IF NOT EXISTS rule_stats TEXT')
+        return
+
+    cursor.execute('PRAGMA table_info(crawl_jobs)')
+    if 'rule_stats' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute('ALTER TABLE crawl_jobs ADD COLUMN rule_stats TEXT')
+
+
+def enqueue_crawl_job(crawl_id, start_url, config_snapshot, user_id=None, session_id=None, client_id=None):
+    """
+    Queue a crawl for the worker pool
+    Returns the job_id
+    """
+    job_id = str(uuid.uuid4())
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO crawl_jobs (
+                    job_id, crawl_id, user_id, session_id, client_id, start_url, config_snapshot
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (job_id, crawl_id, user_id, session_id, client_id, start_url, json.dumps(config_snapshot)))
+
+            print(f"Queued crawl job {job_id} for crawl {crawl_id}")
+            return job_id
+    except Exception as e:
+        print(f"Error queueing crawl job: {e}")
+        return None
+
+
+def submit_crawl_job(url, config_snapshot, user_id=None, session_id=None, client_id=None):
+    """
+    Create the crawl record up front and queue it, so the API can report on it
+    before a worker has picked it up.
+    Returns (crawl_id, job_id)
+    """
+    from .crawl_db import create_crawl, set_crawl_status
+
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    parsed = urlparse(url)
+
+    crawl_id = create_crawl(
+        user_id=user_id,
+        session_id=session_id,
+        base_url=f"{parsed.scheme}://{parsed.netloc}",
+        base_domain=parsed.netloc,
+        config_snapshot=config_snapshot,
+        client_id=client_id
+    )
+    if not crawl_id:
+        return None, None
+
+    job_id = enqueue_crawl_job(crawl_id, url, config_snapshot, user_id, session_id, client_id)
+    if not job_id:
+        set_crawl_status(crawl_id, 'failed')
+        return crawl_id, None
+
+    return crawl_id, job_id
+
+
+def claim_next_job(worker_id):
+    """
+    Atomically claim the oldest pending job for this worker.
+    The conditional UPDATE only succeeds for one worker, so no row locks are needed.
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id FROM crawl_jobs
+                WHERE status = 'pending'
+                ORDER BY created_at ASC, id ASC
+                LIMIT 5
+            ''')
+            candidates = [row['id'] for row in cursor.fetchall()]
+
+            for job_row_id in candidates:
+                cursor.execute('''
+                    UPDATE crawl_jobs
+                    SET status = 'running', worker_id = ?, heartbeat_at = ?,
+                        control = NULL, started_at = CURRENT_TIMESTAMP
+                    WHERE id = ? AND status = 'pending'
+                ''', (worker_id, time.time(), job_row_id))
+
+                if cursor.rowcount == 1:
+                    cursor.execute('SELECT * FROM crawl_jobs WHERE id = ?', (job_row_id,))
+                    job = dict(cursor.fetchone())
+                    if job.get('config_snapshot'):
+                        job['config_snapshot'] = json.loads(job['config_snapshot'])
+                    return job
+
+            return None
+    except Exception as e:
+        print(f"Error claiming crawl job: {e}")
+        return None
+
+
+def heartbeat_job(job_id, rule_stats=None):
+    """
+    Record that the owning worker is still alive, with the crawl's per-rule
+    issue detection stats so the web process can show them.
+    Returns a pending control request ('pause', 'resume', 'stop', 'rules') and clears it.
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE crawl_jobs SET heartbeat_at = ?, rule_stats = COALESCE(?, rule_stats)
+                WHERE job_id = ?
+            ''', (time.time(), json.dumps(rule_stats) if rule_stats is not None else None, job_id))
+            cursor.execute('SELECT control FROM crawl_jobs WHERE job_id = ?', (job_id,))
+            row = cursor.fetchone()
+            control = row['control'] if row else None
+
+            if control:
+                cursor.execute('UPDATE crawl_jobs SET control = NULL WHERE job_id = ? AND control = ?', (job_id, control))
+            return control
+    except Exception as e:
+        print(f"Error updating job heartbeat: {e}")
+        return None
+
+
+def finish_job(job_id, status, error_message=None, rule_stats=None):
+    """
+    Mark a job as finished
+    status: 'completed', 'failed', 'stopped'
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE crawl_jobs
+                SET status = ?, error_message = ?, control = NULL, completed_at = CURRENT_TIMESTAMP,
+                    rule_stats = COALESCE(?, rule_stats)
+                WHERE job_id = ?
+            ''', (status, error_message, json.dumps(rule_stats) if rule_stats is not None else None, job_id))
+            return True
+    except Exception as e:
+        print(f"Error finishing crawl job: {e}")
+        return False
+
+
+def request_job_control(crawl_id, action):
+    """
+    Ask the worker running a crawl to pause, resume or stop it.
+    The worker picks the request up on its next heartbeat.
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+
+            if action == 'stop':
+                # Jobs no worker has claimed yet can be cancelled directly
+                cursor.execute('''
+                    UPDATE crawl_jobs
+                    SET status = 'stopped', completed_at = CURRENT_TIMESTAMP
+                    WHERE crawl_id = ? AND status = 'pending'
+                ''', (crawl_id,))
+                if cursor.rowcount:
+                    cursor.execute('''
+                        UPDATE crawls SET status = 'stopped', completed_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (crawl_id,))
+                    return True
+
+            cursor.execute('''
+                UPDATE crawl_jobs SET control = ?
+                WHERE crawl_id = ? AND status = 'running'
+            ''', (action, crawl_id))
+            return cursor.rowcount > 0
+    except Exception as e:
+        print(f"Error requesting job control: {e}")
+        return False
+
+
+def set_job_issue_rule(crawl_id, rule_id, enabled):
+    """
+    Switch an issue rule for a queued or running crawl. The rule set is kept in
+    the job's config_snapshot (disabled_issue_rules), so a worker that resumes
+    the job keeps it; the running worker re-reads it on its next heartbeat.
+    Returns False if the crawl has no active job.
+    """
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, config_snapshot FROM crawl_jobs
+                WHERE crawl_id = ? AND status IN ('pending', 'running')
+                ORDER BY id DESC LIMIT 1
+            ''', (crawl_id,))
+            row = cursor.fetchone()
+            if not row:
+                return False
+
+            config = json.loads(row['config_snapshot']) if row['config_snapshot'] else {}
+            disabled = [rule for rule in config.get('disabled_issue_rules') or [] if rule != rule_id]
+            if not enabled:
+                disabled.append(rule_id)
+            config['disabled_issue_rules'] = disabled
+
+            # A pending pause/stop wins; the worker re-reads the rules after any control request
+            cursor.execute('''
+                UPDATE crawl_jobs SET config_snapshot = ?, control = COALESCE(control, 'rules')
+                WHERE id = ?
+            ''', (json.dumps(config), row['id']))
+            return True
+    except Exception as e:
+        print(f"Error switching issue rule for crawl {crawl_id}: {e}")
+        return False
+
+
+def get_job_config(job_id):
+    """The job's current config_snapshot as a dict"""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT config_snapshot FROM crawl_jobs WHERE job_id = ?', (job_id,))
+            row = cursor.fetchone()
+            return json.loads(row['config_snapshot']) if row and row['config_snapshot'] else {}
+    except Exception as e:
+        print(f"Error reading job config: {e}")
+        return {}
+
+
+def get_job_for_crawl(crawl_id):
+    """Get the most recent job for a crawl"""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM crawl_jobs WHERE crawl_id = ?
+                ORDER BY id DESC LIMIT 1
+            ''', (crawl_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    except Exception as e:
+        print(f"Error fetching crawl job: {e}")
+        return None
+
+
+def requeue_orphaned_jobs(timeout=JOB_HEARTBEAT_TIMEOUT):
+    """
+    Put running jobs whose worker stopped sending heartbeats back in the queue.
+    The next worker resumes them from the last database checkpoint; jobs that
+    keep losing their worker are failed once they run out of retries.
+    """
+    cutoff = time.time() - timeout
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT crawl_id FROM crawl_jobs
+                WHERE status = 'running' AND heartbeat_at < ? AND retry_count + 1 >= max_retries
+            ''', (cutoff,))
+            exhausted = [row['crawl_id'] for row in cursor.fetchall()]
+
+            if exhausted:
+                cursor.execute('''
+                    UPDATE crawl_jobs
+                    SET status = 'failed', error_message = 'Worker lost too many times',
+                        completed_at = CURRENT_TIMESTAMP
+                    WHERE status = 'running' AND heartbeat_at < ? AND retry_count + 1 >= max_retries
+                ''', (cutoff,))
+                for crawl_id in exhausted:
+                    cursor.execute("UPDATE crawls SET status = 'failed' WHERE id = ?", (crawl_id,))
+
+            cursor.execute('''
+                UPDATE crawl_jobs
+                SET status = 'pending', worker_id = NULL, control = NULL, retry_count = retry_count + 1
+                WHERE status = 'running' AND heartbeat_at < ?
+            ''', (cutoff,))
+            requeued = cursor.rowcount
+
+            if requeued or exhausted:
+                print(f"Re-queued {requeued} orphaned crawl jobs, failed {len(exhausted)}")
+            return requeued
+    except Exception as e:
+        print(f"Error re-queueing orphaned jobs: {e}")
+        return 0
+
+
+def get_active_job_crawl_ids():
+    """Crawl IDs that currently belong to the worker pool (queued or running)"""
+    try:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT crawl_id FROM crawl_jobs
+                WHERE status IN ('pending', 'running')
+            ''')
+            return {row['crawl_id'] for row in cursor.fetchall()}
+    except Exception as e:
+        print(f"Error fetching active crawl jobs: {e}")
+        return set()
+
+
+def get_queued_crawl_status(crawl_id, url_since=0, link_since=0, issue_since=0):
+    """
+    Build a crawl_status payload for a queued crawl from the database.
+    Mirrors WebCrawler.get_status() but only returns rows after the *_since offsets.
+    """
+    from .crawl_db import get_crawl_by_id, load_crawled_urls, load_crawl_links, load_crawl_issues
+
+    crawl = get_crawl_by_id(crawl_id)
+    if not crawl:
+        return None
+
+    job = get_job_for_crawl(crawl_id)
+    job_status = job['status'] if job else None
+
+    crawled = crawl.get('urls_crawled') or 0
+    discovered = crawl.get('urls_discovered') or 0
+
+    if job_status in ('pending', 'running'):
+        status = 'running'
+    else:
+        status = 'completed' if crawled > 0 else 'idle'
+
+    return {
+        'status': status,
+        'crawl_id': crawl_id,
+        'client_id': crawl.get('client_id'),
+        'stats': {
+            'discovered': discovered,
+            'crawled': crawled,
+            'depth': crawl.get('max_depth_reached') or 0,
+            'speed': 0.0,
+            'start_time': None,
+            'baseUrl': crawl.get('base_url')
+        },
+        'urls': load_crawled_urls(crawl_id, limit=STATUS_PAGE_SIZE, offset=url_since or 0),
+        'links': load_crawl_links(crawl_id, limit=STATUS_PAGE_SIZE, offset=link_since or 0),
+        'issues': load_crawl_issues(crawl_id, limit=STATUS_PAGE_SIZE, offset=issue_since or 0),
+        'traps': [],
+        'robots_data': crawl.get('robots_data'),
+        'llms_data': crawl.get('llms_data'),
+        'sitemap_urls': crawl.get('sitemap_urls') or [],
+        'sitemap_health': None,
+        'hreflang_data': None,
+        'progress': min(100, (crawled / max(discovered, 1)) * 100),
+        'is_running_pagespeed': False,
+        'is_paused': crawl.get('status') == 'paused',
+        'job': {
+            'status': job_status,
+            'worker_id': job.get('worker_id'),
+            'retry_count': job.get('retry_count'),
+            'error_message': job.get('error_message')
+        } if job else None,
+        'memory': None,
+        'memory_data': None
+    }
@@ -0,0 +1,500 @@
+"""
+Columnar crawl data
+Parquet / Arrow IPC exports of URLs, links and issues, and read-only Arrow
+snapshots of finished crawls that are memory-mapped when a crawl is reloaded.
+
+Needs pyarrow (pip install pyarrow); everything here reports unavailable without it.
+"""
+import json
+import os
+import threading
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = ipc = pq = None
+    PYARROW_AVAILABLE = False
+
+COLUMNAR_FORMATS = {
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.file'
+}
+
+# Rows converted per record batch / parquet row group
+BATCH_ROWS = 5000
+
+SNAPSHOT_DIR = os.getenv('CRAWL_SNAPSHOT_DIR', 'snapshots')
+SNAPSHOT_DATASETS = ('urls', 'links', 'issues')
+
+# JSON-ish URL fields without a fixed shape stay JSON text
+URL_JSON_TEXT_FIELDS = ('json_ld', 'analytics', 'schema_org', 'redirects')
+
+
+def _dict_type(value_type):
+    return pa.dictionary(pa.int32(), value_type)
+
+
+def _schemas():
+    string_map = pa.map_(pa.string(), pa.string())
+    strings = pa.list_(pa.string())
+    return {
+        'urls': pa.schema([
+            ('url', pa.string()),
+            ('domain', _dict_type(pa.string())),
+            ('status_code', _dict_type(pa.int32())),
+            ('content_type', _dict_type(pa.string())),
+            ('size', pa.int64()),
+            ('is_internal', pa.bool_()),
+            ('depth', pa.int32()),
+            ('title', pa.string()),
+            ('meta_description', pa.string()),
+            ('h1', pa.string()),
+            ('h2', strings),
+            ('h3', strings),
+            ('word_count', pa.int32()),
+            ('canonical_url', pa.string()),
+            ('lang', _dict_type(pa.string())),
+            ('charset', _dict_type(pa.string())),
+            ('viewport', pa.string()),
+            ('robots', _dict_type(pa.string())),
+            ('meta_tags', string_map),
+            ('og_tags', string_map),
+            ('twitter_tags', string_map),
+            ('json_ld', pa.string()),
+            ('analytics', pa.string()),
+            ('images', pa.list_(pa.struct([('src', pa.string()), ('alt', pa.string()),
+                                           ('width', pa.string()), ('height', pa.string())]))),
+            ('hreflang', pa.list_(pa.struct([('lang', pa.string()), ('url', pa.string())]))),
+            ('schema_org', pa.string()),
+            ('redirects', pa.string()),
+            ('linked_from', strings),
+            ('internal_links', pa.int32()),
+            ('external_links', pa.int32()),
+            ('response_time', pa.float64()),
+            ('javascript_rendered', pa.bool_()),
+            ('dom_size', pa.int32()),
+            ('dom_depth', pa.int32()),
+            ('requires_js', pa.bool_()),
+            ('crawled_at', pa.string())
+        ]),
+        'links': pa.schema([
+            ('source_url', pa.string()),
+            ('target_url', pa.string()),
+            ('anchor_text', pa.string()),
+            ('is_internal', pa.bool_()),
+            ('target_domain', _dict_type(pa.string())),
+            ('target_status', _dict_type(pa.int32())),
+            ('placement', _dict_type(pa.string())),
+            ('scope', _dict_type(pa.string())),
+            ('nofollow', pa.bool_())
+        ]),
+        'issues': pa.schema([
+            ('url', pa.string()),
+            ('type', _dict_type(pa.string())),
+            ('category', _dict_type(pa.string())),
+            ('issue', _dict_type(pa.string())),
+            ('details', pa.string()),
+            ('severity', _dict_type(pa.string()))
+        ])
+    }
+
+
+_SCHEMAS = None
+
+
+def get_schema(dataset):
+    global _SCHEMAS
+    if _SCHEMAS is None:
+        _SCHEMAS = _schemas()
+    return _SCHEMAS[dataset]
+
+
+# ---------------------------------------------------------------------------
+# Row -> column conversion
+# ---------------------------------------------------------------------------
+
+def _text(value):
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _int(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value):
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _bool(value):
+    return None if value is None else bool(value)
+
+
+def _string_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [_text(item) for item in value]
+
+
+def _string_map(value):
+    if not isinstance(value, dict):
+        return []
+    return [(str(key), _text(item)) for key, item in value.items()]
+
+
+def _json_text(value):
+    if value in (None, '', [], {}):
+        return None
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def _images(value):
+    if not isinstance(value, list):
+        return []
+    return [{key: _text(image.get(key, '')) for key in ('src', 'alt', 'width', 'height')}
+            for image in value if isinstance(image, dict)]
+
+
+def _hreflang(value):
+    if not isinstance(value, list):
+        return []
+    return [{'lang': _text(item.get('lang', '')), 'url': _text(item.get('url', ''))}
+            for item in value if isinstance(item, dict)]
+
+
+def _domain(url):
+    # Cheaper than urlparse for an already canonical absolute URL
+    if not url:
+        return None
+    rest = url.split('://', 1)[-1]
+    return rest.split('/', 1)[0].split('?', 1)[0]
+
+
+URL_CONVERTERS = {
+    'url': lambda row: _text(row.get('url')),
+    'domain': lambda row: _domain(row.get('url')),
+    'status_code': lambda row: _int(row.get('status_code')),
+    'content_type': lambda row: _text(row.get('content_type')),
+    'size': lambda row: _int(row.get('size')),
+    'is_internal': lambda row: _bool(row.get('is_internal')),
+    'depth': lambda row: _int(row.get('depth')),
+    'title': lambda row: _text(row.get('title')),
+    'meta_description': lambda row: _text(row.get('meta_description')),
+    'h1': lambda row: _text(row.get('h1')),
+    'h2': lambda row: _string_list(row.get('h2')),
+    'h3': lambda row: _string_list(row.get('h3')),
+    'word_count': lambda row: _int(row.get('word_count')),
+    'canonical_url': lambda row: _text(row.get('canonical_url')),
+    'lang': lambda row: _text(row.get('lang')),
+    'charset': lambda row: _text(row.get('charset')),
+    'viewport': lambda row: _text(row.get('viewport')),
+    'robots': lambda row: _text(row.get('robots')),
+    'meta_tags': lambda row: _string_map(row.get('meta_tags')),
+    'og_tags': lambda row: _string_map(row.get('og_tags')),
+    'twitter_tags': lambda row: _string_map(row.get('twitter_tags')),
+    'images': lambda row: _images(row.get('images')),
+    'hreflang': lambda row: _hreflang(row.get('hreflang')),
+    'linked_from': lambda row: _string_list(row.get('linked_from')),
+    'internal_links': lambda row: _int(row.get('internal_links')),
+    'external_links': lambda row: _int(row.get('external_links')),
+    'response_time': lambda row: _float(row.get('response_time')),
+    'javascript_rendered': lambda row: _bool(row.get('javascript_rendered')),
+    'dom_size': lambda row: _int(row.get('dom_size')),
+    'dom_depth': lambda row: _int(row.get('dom_depth')),
+    'requires_js': lambda row: _bool(row.get('requires_js')),
+    'crawled_at': lambda row: _text(row.get('crawled_at'))
+}
+for _field in URL_JSON_TEXT_FIELDS:
+    URL_CONVERTERS[_field] = lambda row, field=_field: _json_text(row.get(field))
+
+LINK_CONVERTERS = {
+    'source_url': lambda row: _text(row.get('source_url')),
+    'target_url': lambda row: _text(row.get('target_url')),
+    'anchor_text': lambda row: _text(row.get('anchor_text')),
+    'is_internal': lambda row: _bool(row.get('is_internal')),
+    'target_domain': lambda row: _text(row.get('target_domain')) or _domain(row.get('target_url')),
+    'target_status': lambda row: _int(row.get('target_status')),
+    'placement': lambda row: _text(row.get('placement')),
+    'scope': lambda row: _text(row.get('scope')),
+    # Live links carry 'nofollow', saved links 'is_nofollow'
+    'nofollow': lambda row: _bool(row.get('nofollow', row.get('is_nofollow')))
+}
+
+ISSUE_CONVERTERS = {
+    'url': lambda row: _text(row.get('url')),
+    'type': lambda row: _text(row.get('type')),
+    'category': lambda row: _text(row.get('category')),
+    'issue': lambda row: _text(row.get('issue')),
+    'details': lambda row: _text(row.get('details')),
+    'severity': lambda row: _text(row.get('severity'))
+}
+
+CONVERTERS = {'urls': URL_CONVERTERS, 'links': LINK_CONVERTERS, 'issues': ISSUE_CONVERTERS}
+
+
+def _record_batch(dataset, rows):
+    schema = get_schema(dataset)
+    converters = CONVERTERS[dataset]
+    arrays = []
+    for field in schema:
+        convert = converters[field.name]
+        values = [convert(row) for row in rows]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=field.type.value_type).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_record_batches(dataset, rows, batch_rows=BATCH_ROWS):
+    """Convert row dicts into Arrow record batches of at most batch_rows rows"""
+    pending = []
+    for row in rows:
+        pending.append(row)
+        if len(pending) >= batch_rows:
+            yield _record_batch(dataset, pending)
+            pending = []
+    if pending:
+        yield _record_batch(dataset, pending)
+
+
+def build_table(dataset, rows):
+    """One Arrow table with a single dictionary per column (needed by the IPC file format)"""
+    batches = list(iter_record_batches(dataset, rows))
+    if not batches:
+        return get_schema(dataset).empty_table()
+    return pa.Table.from_batches(batches).unify_dictionaries().combine_chunks()
+
+
+# ---------------------------------------------------------------------------
+# Exports
+# ---------------------------------------------------------------------------
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_columnar(dataset, export_format, rows):
+    """
+    Bytes of a Parquet or Arrow IPC file for the rows.
+    Parquet is written one row group per batch as rows arrive; Arrow IPC
+    needs one dictionary per column, so that table is built first.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError('Columnar exports need pyarrow (pip install pyarrow)')
+
+    sink = _ChunkSink()
+    if export_format == 'parquet':
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), get_schema(dataset), compression='zstd')
+        for batch in iter_record_batches(dataset, rows):
+            writer.write_batch(batch)
+            data = sink.drain()
+            if data:
+                yield data
+        writer.close()
+    elif export_format == 'arrow':
+        table = build_table(dataset, rows)
+        with ipc.new_file(pa.PythonFile(sink, mode='w'), table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f'Unsupported columnar format: {export_format}')
+
+    data = sink.drain()
+    if data:
+        yield data
+
+
+# ---------------------------------------------------------------------------
+# Snapshots
+# ---------------------------------------------------------------------------
+
+_snapshot_lock = threading.Lock()
+
+
+def snapshot_path(crawl_id, dataset):
+    return os.path.join(SNAPSHOT_DIR, str(int(crawl_id)), f'{dataset}.arrow')
+
+
+def has_snapshot(crawl_id):
+    return PYARROW_AVAILABLE and all(os.path.exists(snapshot_path(crawl_id, d)) for d in SNAPSHOT_DATASETS)
+
+
+def write_snapshot(crawl_id):
+    """
+    Write an uncompressed Arrow IPC snapshot of a saved crawl so it can be
+    memory-mapped on reload. Only meant for crawls that will not change.
+    """
+    if not PYARROW_AVAILABLE:
+        return False
+
+    from src.crawl_db import iter_crawled_urls, iter_crawl_links, iter_crawl_issues
+
+    sources = {
+        'urls': iter_crawled_urls,
+        'links': iter_crawl_links,
+        'issues': iter_crawl_issues
+    }
+
+    try:
+        with _snapshot_lock:
+            directory = os.path.dirname(snapshot_path(crawl_id, 'urls'))
+            os.makedirs(directory, exist_ok=True)
+            for dataset in SNAPSHOT_DATASETS:
+                table = build_table(dataset, sources[dataset](crawl_id))
+                path = snapshot_path(crawl_id, dataset)
+                # Write then rename so readers never map a half-written file
+                with ipc.new_file(path + '.tmp', table.schema) as writer:
+                    writer.write_table(table)
+                os.replace(path + '.tmp', path)
+        print(f"Wrote columnar snapshot for crawl {crawl_id}")
+        return True
+    except Exception as e:
+        print(f"Error writing snapshot for crawl {crawl_id}: {e}")
+        return False
+
+
+def write_snapshot_async(crawl_id):
+    """Write a snapshot in the background (after a completed crawl is first loaded)"""
+    if PYARROW_AVAILABLE and not has_snapshot(crawl_id):
+        threading.Thread(target=write_snapshot, args=(crawl_id,), daemon=True).start()
+
+
+def open_snapshot(crawl_id, dataset):
+    """Memory-mapped, zero-copy Arrow table for one dataset of a snapshot"""
+    source = pa.memory_map(snapshot_path(crawl_id, dataset), 'r')
+    return ipc.open_file(source).read_all()
+
+
+def _restore_url_row(row):
+    for field in ('meta_tags', 'og_tags', 'twitter_tags'):
+        row[field] = dict(row[field] or [])
+    for field in URL_JSON_TEXT_FIELDS:
+        value = row[field]
+        if value:
+            try:
+                row[field] = json.loads(value)
+            except ValueError:
+                row[field] = []
+        else:
+            row[field] = []
+    del row['domain']
+    return row
+
+
+def _restore_link_row(row):
+    row['is_nofollow'] = row['nofollow']
+    return row
+
+
+def load_snapshot_rows(crawl_id, dataset):
+    """Rows of a snapshot as the dicts the rest of the app uses, or None if there is none"""
+    if not PYARROW_AVAILABLE or not os.path.exists(snapshot_path(crawl_id, dataset)):
+        return None
+    try:
+        rows = open_snapshot(crawl_id, dataset).to_pylist()
+    except Exception as e:
+        print(f"Error reading snapshot for crawl {crawl_id}: {e}")
+        return None
+
+    if dataset == 'urls':
+        return [_restore_url_row(row) for row in rows]
+    if dataset == 'links':
+        return [_restore_link_row(row) for row in rows]
+    return rows
+
+
+# Columns of a URL row in the results tables (see crawl_db.load_table_page)
+URL_PAGE_COLUMNS = ['url', 'status_code', 'content_type', 'size', 'is_internal', 'depth',
+                    'title', 'meta_description', 'h1', 'word_count', 'response_time',
+                    'canonical_url', 'lang', 'charset', 'robots', 'og_tags', 'twitter_tags',
+                    'analytics', 'internal_links', 'external_links', 'javascript_rendered',
+                    'requires_js', 'crawled_at']
+
+
+def load_snapshot_page(crawl_id, dataset, offset, limit):
+    """Rows [offset, offset + limit) read from the memory-mapped snapshot, or None"""
+    if not PYARROW_AVAILABLE or not os.path.exists(snapshot_path(crawl_id, dataset)):
+        return None
+    try:
+        table = open_snapshot(crawl_id, dataset).slice(offset, limit)
+        if dataset != 'urls':
+            rows = table.to_pylist()
+            return [_restore_link_row(row) for row in rows] if dataset == 'links' else rows
+
+        import pyarrow.compute as pc
+        images_count = pc.fill_null(pc.list_value_length(table.column('images')), 0).to_pylist()
+        json_ld = table.column('json_ld').to_pylist()
+        rows = table.select(URL_PAGE_COLUMNS).to_pylist()
+    except Exception as e:
+        print(f"Error reading snapshot page for crawl {crawl_id}: {e}")
+        return None
+
+    for row, images, scripts in zip(rows, images_count, json_ld):
+        for field in ('og_tags', 'twitter_tags'):
+            row[field] = dict(row[field] or [])
+        try:
+            row['analytics'] = json.loads(row['analytics']) if row['analytics'] else {}
+        except ValueError:
+            row['analytics'] = {}
+        try:
+            row['json_ld_count'] = len(json.loads(scripts)) if scripts else 0
+        except ValueError:
+            row['json_ld_count'] = 0
+        row['images_count'] = images
+        row['crawl_id'] = crawl_id
+        row['details_loaded'] = False
+    return rows
+
+
+def delete_snapshot(crawl_id):
+    """Remove a crawl's snapshot files (crawl deleted or changed)"""
+    directory = os.path.dirname(snapshot_path(crawl_id, 'urls'))
+    if not os.path.isdir(directory):
+        return
+    with _snapshot_lock:
+        for name in os.listdir(directory):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
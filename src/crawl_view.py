@@ -0,0 +1,229 @@
+"""
+Lazy view of a saved crawl
+Serves a historical crawl to the UI a page at a time instead of loading every
+row into the session's WebCrawler. Pages come from the crawl's Arrow snapshot
+when it has one, otherwise from the crawl DB; a small LRU keeps hot pages.
+"""
+import threading
+from collections import OrderedDict
+
+# Rows per page - matches the job queue's status page size
+PAGE_SIZE = 2000
+# Pages kept across urls/links/issues
+PAGE_CACHE_SIZE = 12
+# Fully parsed URL rows kept for the details panel
+DETAIL_CACHE_SIZE = 64
+
+DATASETS = ('urls', 'links', 'issues')
+
+
+class LazyCrawlView:
+    """Read-only, page-cached access to one saved crawl"""
+
+    def __init__(self, crawl, page_size=PAGE_SIZE, cache_pages=PAGE_CACHE_SIZE):
+        from src.crawl_db import count_crawl_rows
+        from src.crawl_snapshot import has_snapshot
+
+        self.crawl = crawl
+        self.crawl_id = crawl['id']
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.counts = count_crawl_rows(self.crawl_id)
+        for dataset in DATASETS:
+            self.counts.setdefault(dataset, 0)
+
+        # Snapshots are only written for completed crawls, which no longer change
+        self.use_snapshot = crawl.get('status') == 'completed' and has_snapshot(self.crawl_id)
+
+        self._hreflang_data = None
+        self._link_graph = None
+        self._graph_layout = None
+        self._issue_store = None
+        self._pages = OrderedDict()    # (dataset, index) -> rows
+        self._details = OrderedDict()  # url -> full row
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load_page(self, dataset, index):
+        offset = index * self.page_size
+        if self.use_snapshot:
+            from src.crawl_snapshot import load_snapshot_page
+            rows = load_snapshot_page(self.crawl_id, dataset, offset, self.page_size)
+            if rows is not None:
+                return rows
+
+        from src.crawl_db import load_table_page
+        return load_table_page(self.crawl_id, dataset, offset, self.page_size)
+
+    def page(self, dataset, index):
+        """One page of rows (LRU cached)"""
+        key = (dataset, index)
+        with self._lock:
+            rows = self._pages.get(key)
+            if rows is not None:
+                self._pages.move_to_end(key)
+                self.hits += 1
+                return rows
+
+        # Load outside the lock so other requests are not held up by the DB
+        rows = self._load_page(dataset, index)
+
+        with self._lock:
+            self.misses += 1
+            self._pages[key] = rows
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.cache_pages:
+                self._pages.popitem(last=False)
+        return rows
+
+    def rows(self, dataset, since=0, limit=None):
+        """Rows [since, since + limit) in id order"""
+        since = max(0, since or 0)
+        end = min(since + (limit or self.page_size), self.counts[dataset])
+
+        result = []
+        position = since
+        while position < end:
+            index = position // self.page_size
+            start = position - index * self.page_size
+            chunk = self.page(dataset, index)[start:start + end - position]
+            if not chunk:
+                break
+            result.extend(chunk)
+            position += len(chunk)
+        return result
+
+    def iter_rows(self, dataset):
+        """Every row of a dataset, page by page, without evicting the cached pages"""
+        for index in range((self.counts[dataset] + self.page_size - 1) // self.page_size):
+            yield from self._load_page(dataset, index)
+
+    def url_detail(self, url):
+        """Full row (all JSON columns parsed) for the details panel"""
+        with self._lock:
+            row = self._details.get(url)
+            if row is not None:
+                self._details.move_to_end(url)
+                return row
+
+        from src.crawl_db import load_url_detail
+        row = load_url_detail(self.crawl_id, url)
+        if row is None:
+            return None
+        row['details_loaded'] = True
+
+        with self._lock:
+            self._details[url] = row
+            while len(self._details) > DETAIL_CACHE_SIZE:
+                self._details.popitem(last=False)
+        return row
+
+    def hreflang_data(self):
+        """Hreflang matrix data, computed once from the hreflang column only"""
+        if self._hreflang_data is None:
+            from src.crawl_db import iter_hreflang_rows
+            from src.core.issue_detector import IssueDetector
+            self._hreflang_data = IssueDetector().detect_hreflang_issues(list(iter_hreflang_rows(self.crawl_id)))
+        return self._hreflang_data
+
+    def link_graph_analysis(self):
+        """Link graph metrics rebuilt from the saved links (once per view)"""
+        if self._link_graph is None:
+            from src.crawl_db import iter_graph_links, iter_crawled_url_names
+            from src.core.link_graph import LinkGraph
+
+            graph = LinkGraph.from_links(iter_graph_links(self.crawl_id))
+            base_url = self.crawl.get('base_url')
+            home_urls = [base_url + '/', base_url] if base_url else []
+            self._link_graph = graph.analyze(iter_crawled_url_names(self.crawl_id), home_urls,
+                                             self.crawl.get('sitemap_urls') or [])
+        return self._link_graph
+
+    def graph_layout(self):
+        """Server-side visualisation layout (built once per view)"""
+        if self._graph_layout is None:
+            from src.crawl_db import iter_url_labels
+            from src.core.graph_layout import GraphLayout
+
+            pages = {url: (status_code, title) for url, status_code, title in iter_url_labels(self.crawl_id)}
+            self._graph_layout = GraphLayout(self.link_graph_analysis(), pages)
+        return self._graph_layout
+
+    def issue_summary(self, exclusion_patterns=None, top=None):
+        """Issue counts by severity / category / issue (codes loaded once per view)"""
+        if self._issue_store is None:
+            from src.crawl_db import iter_issue_codes
+            from src.core.issue_store import IssueStore
+
+            store = IssueStore()
+            store.extend({'url': row['url'], 'type': row['type'], 'category': row['category'],
+                          'issue': row['issue'], 'details': ''} for row in iter_issue_codes(self.crawl_id))
+            self._issue_store = store
+
+        from src.export_stream import url_excluder
+        return self._issue_store.summary(url_excluder(exclusion_patterns), top)
+
+    def status_payload(self, url_since=0, link_since=0, issue_since=0, include_rows=True):
+        """
+        A crawl_status response for the loaded crawl: the next page of each table
+        after the *_since offsets, plus next_since/has_more so the UI can keep paging.
+        include_rows=False leaves the tables empty (stats, counts and crawl data only).
+        """
+        if include_rows:
+            urls = self.rows('urls', url_since)
+            links = self.rows('links', link_since)
+            issues = self.rows('issues', issue_since)
+        else:
+            urls, links, issues = [], [], []
+
+        next_since = {
+            'urls': (url_since or 0) + len(urls),
+            'links': (link_since or 0) + len(links),
+            'issues': (issue_since or 0) + len(issues)
+        }
+        has_more = include_rows and any(next_since[dataset] < self.counts[dataset] for dataset in DATASETS)
+
+        crawl = self.crawl
+        crawled = self.counts['urls']
+        return {
+            'status': 'completed' if crawled else 'idle',
+            'crawl_id': self.crawl_id,
+            'client_id': crawl.get('client_id'),
+            'lazy': True,
+            'stats': {
+                'discovered': crawl.get('urls_discovered') or crawled,
+                'crawled': crawled,
+                'depth': crawl.get('max_depth_reached') or 0,
+                'speed': 0.0,
+                'start_time': None,
+                'baseUrl': crawl.get('base_url'),
+                'pagespeed_results': crawl.get('pagespeed_results')
+            },
+            'urls': urls,
+            'links': links,
+            'issues': issues,
+            'counts': dict(self.counts),
+            'next_since': next_since,
+            'has_more': has_more,
+            'traps': [],
+            'robots_data': crawl.get('robots_data'),
+            'llms_data': crawl.get('llms_data'),
+            'sitemap_urls': crawl.get('sitemap_urls') or [],
+            'sitemap_health': None,
+            'hreflang_data': self.hreflang_data() if not url_since else None,
+            'progress': 100 if crawled else 0,
+            'is_running_pagespeed': False,
+            'memory': None,
+            'memory_data': None
+        }
+
+    def cache_info(self):
+        with self._lock:
+            return {
+                'pages_cached': len(self._pages),
+                'details_cached': len(self._details),
+                'hits': self.hits,
+                'misses': self.misses,
+                'snapshot': self.use_snapshot
+            }
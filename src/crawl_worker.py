@@ -0,0 +1,222 @@
+"""
+Crawl worker pool
+Runs queued crawl jobs outside the web process:
+
+    python -m src.crawl_worker --processes 4
+
+A supervisor keeps N worker processes alive and re-queues jobs whose worker
+stopped sending heartbeats. Each worker runs one crawl at a time.
+
+With --metrics-port P, worker i serves its Prometheus metrics (the same
+format as the web process's /metrics) on port P + i.
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds between heartbeats / control checks while a crawl runs
+HEARTBEAT_INTERVAL = 5
+# Seconds an idle worker waits before polling the queue again
+IDLE_POLL_INTERVAL = 2
+
+# Crawler of the job this worker process is running, read by the metrics server
+_current_crawler = None
+
+
+def _should_resume(job, crawl):
+    """Crawls with saved progress continue from their checkpoint instead of starting over"""
+    if job.get('retry_count'):
+        return True
+    if crawl.get('status') != 'running':
+        return True
+    return bool(crawl.get('urls_crawled'))
+
+
+def run_job(job, worker_id):
+    """Run one claimed job to completion, applying pause/resume/stop and issue rule requests"""
+    global _current_crawler
+    from src.crawler import WebCrawler
+    from src.crawl_db import get_crawl_by_id, set_crawl_status
+    from src.crawl_jobs import heartbeat_job, finish_job, get_job_config
+
+    job_id = job['job_id']
+    crawl_id = job['crawl_id']
+    crawl = get_crawl_by_id(crawl_id)
+    if not crawl:
+        finish_job(job_id, 'failed', 'Crawl record not found')
+        return
+
+    crawler = _current_crawler = WebCrawler()
+    crawler.update_config(job.get('config_snapshot') or {})
+
+    if _should_resume(job, crawl):
+        print(f"[{worker_id}] Resuming crawl {crawl_id} (job {job_id})")
+        success, message = crawler.resume_from_database(crawl_id)
+    else:
+        print(f"[{worker_id}] Starting crawl {crawl_id} for {job['start_url']} (job {job_id})")
+        success, message = crawler.start_crawl(
+            job['start_url'],
+            user_id=job.get('user_id'),
+            session_id=job.get('session_id'),
+            client_id=job.get('client_id'),
+            crawl_id=crawl_id
+        )
+
+    if not success:
+        print(f"[{worker_id}] Crawl {crawl_id} could not start: {message}")
+        set_crawl_status(crawl_id, 'failed')
+        finish_job(job_id, 'failed', message)
+        return
+
+    def rule_stats():
+        return crawler.issue_detector.get_rule_stats() if crawler.issue_detector else None
+
+    stopped = False
+    while crawler.crawl_thread and crawler.crawl_thread.is_alive():
+        crawler.crawl_thread.join(timeout=HEARTBEAT_INTERVAL)
+
+        control = heartbeat_job(job_id, rule_stats())
+        if control and control != 'stop':
+            # Rule switches are written to the job's config; pause/resume may have displaced the 'rules' request
+            disabled_rules = get_job_config(job_id).get('disabled_issue_rules', [])
+            crawler.config['disabled_issue_rules'] = disabled_rules
+            if crawler.issue_detector:
+                crawler.issue_detector.set_disabled_rules(disabled_rules)
+        if control == 'pause':
+            crawler.pause_crawl()
+        elif control == 'resume':
+            crawler.resume_crawl()
+        elif control == 'stop':
+            crawler.stop_crawl()
+            stopped = True
+            break
+
+    finish_job(job_id, 'stopped' if stopped else 'completed', rule_stats=rule_stats())
+    print(f"[{worker_id}] Crawl {crawl_id} finished ({'stopped' if stopped else 'completed'})")
+
+
+def _serve_metrics(worker_id, host, port):
+    """Serve GET /metrics for this worker process on a background thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from src.core.metrics import render_prometheus, CONTENT_TYPE
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            token = os.getenv('METRICS_TOKEN')
+            if self.path.split('?')[0] != '/metrics':
+                status, body, content_type = 404, 'Not found\n', 'text/plain'
+            elif token and self.headers.get('Authorization', '') != f'Bearer {token}':
+                status, body, content_type = 401, 'Unauthorized\n', 'text/plain'
+            else:
+                crawler = _current_crawler
+                status, content_type = 200, CONTENT_TYPE
+                body = render_prometheus([crawler.get_metrics()] if crawler else [])
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        print(f"[{worker_id}] Metrics server could not listen on {host}:{port}: {e}")
+        return
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    print(f"[{worker_id}] Metrics on http://{host}:{port}/metrics")
+
+
+def worker_loop(worker_id, metrics_host=None, metrics_port=None):
+    """Claim and run jobs until the process is terminated"""
+    global _current_crawler
+    from src.crawl_jobs import claim_next_job, finish_job
+    from src.crawl_db import set_crawl_status
+
+    print(f"[{worker_id}] Crawl worker started (pid {os.getpid()})")
+    if metrics_port:
+        _serve_metrics(worker_id, metrics_host, metrics_port)
+
+    while True:
+        job = claim_next_job(worker_id)
+        if not job:
+            time.sleep(IDLE_POLL_INTERVAL)
+            continue
+
+        try:
+            run_job(job, worker_id)
+        except Exception as e:
+            print(f"[{worker_id}] Crawl job {job['job_id']} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            set_crawl_status(job['crawl_id'], 'failed')
+            finish_job(job['job_id'], 'failed', str(e))
+        finally:
+            # Idle workers report no crawl; the stage counters keep their totals
+            _current_crawler = None
+
+
+def _start_worker(index, metrics_host=None, metrics_port=None):
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{index}"
+    port = metrics_port + index if metrics_port else None
+    # Spawned, not forked: the supervisor holds open database connections a forked child would share
+    process = multiprocessing.get_context('spawn').Process(target=worker_loop, args=(worker_id, metrics_host, port),
+                                                          daemon=True)
+    process.start()
+    return process
+
+
+def run_pool(processes, metrics_host='127.0.0.1', metrics_port=None):
+    """Supervise the worker processes and recover orphaned jobs"""
+    from src.crawl_jobs import init_crawl_job_tables, requeue_orphaned_jobs
+
+    init_crawl_job_tables()
+
+    workers = {index: _start_worker(index, metrics_host, metrics_port) for index in range(processes)}
+    print(f"Crawl worker pool running with {processes} processes")
+
+    try:
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+
+            for index, process in list(workers.items()):
+                if not process.is_alive():
+                    print(f"Crawl worker {index} exited with code {process.exitcode}, restarting")
+                    workers[index] = _start_worker(index, metrics_host, metrics_port)
+
+            # Jobs owned by a dead worker go back to the queue once their heartbeat expires
+            requeue_orphaned_jobs()
+    except KeyboardInterrupt:
+        print("Stopping crawl worker pool...")
+    finally:
+        for process in workers.values():
+            process.terminate()
+        for process in workers.values():
+            process.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LibreCrawl crawl worker pool')
+    parser.add_argument('--processes', '-p', type=int, default=int(os.getenv('CRAWL_WORKER_PROCESSES', 2)),
+                        help='Number of crawl worker processes (default: $CRAWL_WORKER_PROCESSES or 2)')
+    parser.add_argument('--metrics-port', type=int, default=int(os.getenv('CRAWL_WORKER_METRICS_PORT', 0)),
+                        help='Serve /metrics from worker i on this port + i (default: $CRAWL_WORKER_METRICS_PORT, 0 = off)')
+    parser.add_argument('--metrics-host', default=os.getenv('CRAWL_WORKER_METRICS_HOST', '127.0.0.1'),
+                        help='Address the worker metrics servers listen on (default: $CRAWL_WORKER_METRICS_HOST or 127.0.0.1)')
+    args = parser.parse_args()
+
+    run_pool(max(1, args.processes), args.metrics_host, args.metrics_port or None)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import requests
 import threading
 import time
+import logging
 import asyncio
 import re
 import random
@@ -14,12 +15,14 @@ import nest_asyncio
 from src.core.rate_limiter import RateLimiter
 from src.core.seo_extractor import SEOExtractor
 from src.core.link_manager import LinkManager
-from src.core.js_renderer import JavaScriptRenderer
 from src.core.sitemap_parser import SitemapParser
 from src.core.issue_detector import IssueDetector
 from src.core.memory_monitor import MemoryMonitor
+from src.core.memory_profiler import DataSizeTracker
+from src.core.stage_timer import StageTimer, process_totals
+from src.core.crawl_log import CrawlLog
 from src.core.llms_parser import LlmsTxtParser
-from src.audit.ai_service import AuditAIService
+from src.core.response_cache import install as install_response_cache, ReplayMiss
 
 
 class WebCrawler:
@@ -52,6 +55,7 @@ class WebCrawler:
         self.llms_data = {'content': None, 'issues': []}
 
         # Component instances (initialized on demand)
+        self.response_cache = None
         self.rate_limiter = None
         self.link_manager = None
         self.js_renderer = None
@@ -61,18 +65,26 @@ class WebCrawler:
         self.ai_service = None
         self.seo_extractor = SEOExtractor()
         self.memory_monitor = MemoryMonitor()
+        self.data_size = DataSizeTracker()  # running size estimates of results and links
+        self.stage_timer = StageTimer(process_totals)  # per-stage totals and latency histograms of this crawl
+        self.in_flight = 0  # pages being fetched right now
 
         # Results storage
         self.crawl_results = []
         self.results_lock = threading.Lock()
+        self.loaded_view = None  # LazyCrawlView of a historical crawl loaded into this session
+        self._graph_layout = None  # GraphLayout for the visualisation tab
+        self.save_lock = threading.Lock()  # Serializes batch saves from crawl threads and auto-save
 
         # State flags
         self.is_running = False
         self.is_paused = False
         self.is_running_pagespeed = False
+        self._pagespeed_lock = threading.Lock()
 
         # Configuration
         self.config = self._get_default_config()
+        self.log = CrawlLog('crawler', self.config['log_level'])
 
         # Statistics
         self.stats = {
@@ -86,8 +98,10 @@ class WebCrawler:
         # Thread reference
         self.crawl_thread = None
 
-        # Robots.txt cache
+        # Robots.txt cache; one fetch lock per robots.txt so workers never wait on another host
         self._robots_cache = {}
+        self._robots_locks = {}
+        self._robots_locks_guard = threading.Lock()
 
         # Sitemap data
         self.sitemap_urls = []
@@ -117,6 +131,10 @@ class WebCrawler:
             'follow_redirects': True,
             'crawl_external': False,
             'crawl_subdomains': True,
+            'frontier_strategy': 'priority',  # 'priority' (importance-scored) or 'fifo' (discovery order)
+            'linked_from_limit': 0,  # linking pages kept per URL for "Linked From" (0 = all)
+            'strip_tracking_params': True,  # Drop utm_*, gclid, fbclid... when canonicalising links
+            'trailing_slash': 'keep',  # 'keep', 'strip' or 'add'
             # Use a real browser User-Agent to avoid bot detection
             'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'timeout': 15,  # Increased timeout
@@ -137,6 +155,13 @@ class WebCrawler:
             'custom_headers': {},
             'discover_sitemaps': True,
             'enable_pagespeed': False,
+            'response_cache_mode': 'off',  # 'record', 'cache' or 'replay' (src/core/response_cache.py)
+            'response_cache_dir': None,  # Defaults to $RESPONSE_CACHE_DIR or ./response_cache
+            'pagespeed_concurrency': 4,
+            'pagespeed_requests_per_minute': 60,
+            'pagespeed_cache_hours': 24,
+            'pagespeed_sample_templates': False,
+            'pagespeed_max_pages': 50,
             # Polite mode for aggressive anti-bot sites (Cloudflare, etc.)
             'polite_mode': False,  # When enabled: 5-10s delays, single worker, random jitter
             'enable_javascript': False,
@@ -148,6 +173,14 @@ class WebCrawler:
             'js_viewport_width': 1920,
             'js_viewport_height': 1080,
             'js_max_concurrent_pages': 3,
+            # Distributed mode: number of worker processes/partitions (0 = crawl in-process)
+            'distributed_workers': 0,
+            'distributed_batch_size': 10,
+            'distributed_host_spread': None,  # Partitions one host may use (None = all)
+            'distributed_spawn_local': True,  # False = wait for remote workers to attach
+            'distributed_bind': '127.0.0.1',
+            'distributed_port': 0,
+            'disabled_issue_rules': [],  # IssueDetector rule ids to skip (see /api/issues/rules)
             'issue_exclusion_patterns': [
                 # WordPress admin & system paths
                 '/wp-admin/*', '/wp-content/plugins/*', '/wp-content/themes/*', '/wp-content/uploads/*',
@@ -223,8 +256,11 @@ class WebCrawler:
             ]
         }
 
-    def start_crawl(self, url, user_id=None, session_id=None, client_id=None):
-        """Start crawling from the given URL"""
+    def start_crawl(self, url, user_id=None, session_id=None, client_id=None, crawl_id=None):
+        """
+        Start crawling from the given URL
+        Pass crawl_id to run a crawl record that was already created (job queue workers)
+        """
         if self.is_running:
             return False, "Crawl already in progress"
 
@@ -240,11 +276,18 @@ class WebCrawler:
             # If URL has a path (not just domain), set max_depth to 0 to only crawl that page
             has_path = parsed.path and parsed.path not in ('/', '')
             if has_path:
-                print(f"URL has path '{parsed.path}' - limiting crawl to single page only")
+                self.log.info(f"URL has path '{parsed.path}' - limiting crawl to single page only")
                 self.config['max_depth'] = 0
 
+            # Reuse a crawl record created by the API when running as a queued job
+            if crawl_id:
+                self.client_id = client_id
+                self.crawl_id = crawl_id
+                self.db_save_enabled = True
+                self.log.info(f"Database persistence enabled for queued crawl {self.crawl_id}, client_id={client_id}")
+
             # Create database crawl record if session_id provided
-            if session_id:
+            elif session_id:
                 self.client_id = client_id  # Store client_id in instance
                 from src.crawl_db import create_crawl
                 self.crawl_id = create_crawl(
@@ -257,7 +300,7 @@ class WebCrawler:
                 )
                 if self.crawl_id:
                     self.db_save_enabled = True
-                    print(f"Database persistence enabled for crawl {self.crawl_id}, client_id={client_id}")
+                    self.log.info(f"Database persistence enabled for crawl {self.crawl_id}, client_id={client_id}")
 
             # Initialize components
             self._initialize_components()
@@ -271,12 +314,12 @@ class WebCrawler:
 
             # Discover sitemaps if enabled
             if self.config.get('discover_sitemaps', True):
-                print(f"Starting sitemap discovery for {url}")
+                self.log.info(f"Starting sitemap discovery for {url}")
                 self._discover_and_add_sitemap_urls(url)
-                print(f"Sitemap discovery completed. Total discovered URLs: {self.stats['discovered']}")
+                self.log.info(f"Sitemap discovery completed. Total discovered URLs: {self.stats['discovered']}")
 
             # Fetch llms.txt
-            print(f"Fetching llms.txt for {self.base_url}")
+            self.log.info(f"Fetching llms.txt for {self.base_url}")
             raw_llms_result = self.llms_parser.fetch_and_parse(self.base_url)
             
             # Structure llms_data with original and ai_generated sections
@@ -295,9 +338,9 @@ class WebCrawler:
                 try:
                     from src.crawl_db import update_crawl_stats
                     update_crawl_stats(self.crawl_id, llms_data=self.llms_data)
-                    print(f"Saved llms_data to database immediately")
+                    self.log.info(f"Saved llms_data to database immediately")
                 except Exception as e:
-                    print(f"Error saving llms_data: {e}")
+                    self.log.error(f"Error saving llms_data: {e}")
 
             # Start auto-save thread if DB enabled
             if self.db_save_enabled:
@@ -317,7 +360,7 @@ class WebCrawler:
         """Initialize all crawler components"""
         # Apply polite mode settings if enabled
         if self.config.get('polite_mode', False):
-            print("🐢 Polite Mode enabled - using slow crawl settings for aggressive sites")
+            self.log.info("🐢 Polite Mode enabled - using slow crawl settings for aggressive sites")
             self.config['delay'] = 7.0  # 7 second base delay (will add random jitter)
             self.config['concurrency'] = 1  # Single worker only
             self.config['retries'] = 5  # More retries with longer wait
@@ -330,14 +373,26 @@ class WebCrawler:
             requests_per_second = 100.0
 
         self.rate_limiter = RateLimiter(requests_per_second)
-        self.link_manager = LinkManager(self.base_domain, trap_threshold=self.config.get('trap_threshold', 100))
+        self.link_manager = LinkManager(
+            self.base_domain,
+            trap_threshold=self.config.get('trap_threshold', 100),
+            frontier_strategy=self.config.get('frontier_strategy', 'priority'),
+            strip_tracking_params=self.config.get('strip_tracking_params', True),
+            trailing_slash=self.config.get('trailing_slash', 'keep'),
+            linked_from_limit=self.config.get('linked_from_limit', 0),
+            stage_timer=self.stage_timer,
+            log=self.log
+        )
         self.sitemap_parser = SitemapParser(self.session, self.base_domain, self.config['timeout'])
         self.llms_parser = LlmsTxtParser(self.session)
-        self.issue_detector = IssueDetector(self.config.get('issue_exclusion_patterns', []))
+        self.issue_detector = IssueDetector(self.config.get('issue_exclusion_patterns', []),
+                                            self.config.get('disabled_issue_rules', []))
+        from src.audit.ai_service import AuditAIService
         self.ai_service = AuditAIService()
 
-        # Initialize JS renderer if needed
+        # Initialize JS renderer if needed (Playwright is only imported for JavaScript crawls)
         if self.config.get('enable_javascript', False):
+            from src.core.js_renderer import JavaScriptRenderer
             self.js_renderer = JavaScriptRenderer(self.config)
 
     def _reset_state(self):
@@ -348,6 +403,10 @@ class WebCrawler:
             self.issue_detector.reset()
 
         self.crawl_results.clear()
+        self.loaded_view = None
+        self._graph_layout = None
+        self.stage_timer.reset()
+        self.data_size.reset()
         self.stats = {
             'discovered': 0,
             'crawled': 0,
@@ -364,7 +423,11 @@ class WebCrawler:
         sitemap_urls = self.sitemap_parser.discover_sitemaps(base_url)
         # Deduplicate sitemap URLs
         self.sitemap_urls = list(set(sitemap_urls))  # Store unique URLs for comparison UI
-        print(f"Sitemap discovery: {len(sitemap_urls)} total, {len(self.sitemap_urls)} unique")
+        self.log.info(f"Sitemap discovery: {len(sitemap_urls)} total, {len(self.sitemap_urls)} unique")
+        self.issue_detector.site_analysis.set_sitemap_urls(self.sitemap_urls)
+
+        # <priority>/<lastmod> feed the frontier's crawl order
+        self.link_manager.set_sitemap_hints(self.sitemap_parser.url_metadata)
 
         added_count = 0
         filtered_count = 0
@@ -377,16 +440,16 @@ class WebCrawler:
                 filtered_count += 1
 
         self.stats['discovered'] = self.link_manager.get_stats()['discovered']
-        print(f"Sitemap processing: {added_count} added, {filtered_count} filtered")
+        self.log.info(f"Sitemap processing: {added_count} added, {filtered_count} filtered")
 
         # Save discovered sitemap URLs to database
         if self.db_save_enabled and self.crawl_id:
             try:
                 from src.crawl_db import update_crawl_stats
                 update_crawl_stats(self.crawl_id, sitemap_urls=self.sitemap_urls)
-                print(f"Saved {len(self.sitemap_urls)} sitemap URLs to database")
+                self.log.info(f"Saved {len(self.sitemap_urls)} sitemap URLs to database")
             except Exception as e:
-                print(f"Error saving sitemap URLs: {e}")
+                self.log.error(f"Error saving sitemap URLs: {e}")
 
     def stop_crawl(self):
         """Stop the current crawl"""
@@ -447,7 +510,8 @@ class WebCrawler:
 
         try:
             from src.crawl_db import get_resume_data, load_crawled_urls, set_crawl_status
-            from collections import deque
+
+            self.loaded_view = None
 
             # Load crawl data
             crawl_data = get_resume_data(crawl_id)
@@ -476,8 +540,13 @@ class WebCrawler:
             # Load already crawled URLs from database
             from src.crawl_db import load_crawl_links, load_crawl_issues
 
-            print(f"Loading crawled data from database...")
+            self.log.info(f"Loading crawled data from database...")
             self.crawl_results = load_crawled_urls(crawl_id)
+            for url_data in self.crawl_results:
+                # Rebuilt from the restored links below, like rows of a live crawl
+                url_data.pop('linked_from', None)
+            self.data_size.reset()
+            self.data_size.add('crawl_results', self.crawl_results)
 
             # Mark all crawled URLs as discovered to prevent re-discovery
             for url_data in self.crawl_results:
@@ -488,18 +557,24 @@ class WebCrawler:
             # Load links and restore to link manager
             loaded_links = load_crawl_links(crawl_id)
             if loaded_links:
-                self.link_manager.all_links = loaded_links
-                # Rebuild links_set for duplicate detection
-                for link in loaded_links:
-                    link_key = f"{link['source_url']}|{link['target_url']}"
-                    self.link_manager.links_set.add(link_key)
+                # Rebuilds links_set (duplicate detection) and the link graph
+                self.link_manager.restore_links(loaded_links)
+                self.data_size.add('links', self.link_manager.all_links)
 
             # Load issues and restore to issue detector
             loaded_issues = load_crawl_issues(crawl_id)
             if loaded_issues:
-                self.issue_detector.detected_issues = loaded_issues
+                self.issue_detector.load_issues(loaded_issues)
+
+            # Rebuild the site-wide analyses from what was already crawled
+            site_analysis = self.issue_detector.site_analysis
+            for url_data in self.crawl_results:
+                site_analysis.add_page(url_data)
+            site_analysis.add_links(loaded_links)
+            self.sitemap_urls = crawl_data.get('sitemap_urls') or []
+            site_analysis.set_sitemap_urls(self.sitemap_urls)
 
-            print(f"Loaded {len(self.crawl_results)} URLs, {len(loaded_links)} links, {len(loaded_issues)} issues from database")
+            self.log.info(f"Loaded {len(self.crawl_results)} URLs, {len(loaded_links)} links, {len(loaded_issues)} issues from database")
 
             # Restore statistics
             self.stats['crawled'] = len(self.crawl_results)
@@ -512,19 +587,18 @@ class WebCrawler:
             if checkpoint:
                 # Restore discovered URLs queue
                 if 'discovered_urls' in checkpoint:
-                    discovered_list = checkpoint['discovered_urls']
-                    self.link_manager.discovered_urls = deque(discovered_list)
+                    self.link_manager.restore_queue(checkpoint['discovered_urls'])
 
                 # Restore visited URLs set
                 if 'visited_urls' in checkpoint:
                     self.link_manager.visited_urls = set(checkpoint['visited_urls'])
 
-                print(f"Restored queue: {len(self.link_manager.discovered_urls)} pending, "
-                      f"{len(self.link_manager.visited_urls)} visited")
+                self.log.info(f"Restored queue: {len(self.link_manager.discovered_urls)} pending, "
+                              f"{len(self.link_manager.visited_urls)} visited")
 
             # If queue is empty (no checkpoint or crawl crashed early), rebuild queue from links
             if not self.link_manager.discovered_urls:
-                print("Queue is empty - rebuilding from discovered links")
+                self.log.info("Queue is empty - rebuilding from discovered links")
 
                 # Get all URLs from loaded links that haven't been crawled yet
                 crawled_urls = set(url_data.get('url') for url_data in self.crawl_results)
@@ -537,11 +611,11 @@ class WebCrawler:
                         self.link_manager.add_url(target_url, link.get('depth', 1))
                         added_count += 1
 
-                print(f"Added {added_count} pending URLs to queue from links")
+                self.log.info(f"Added {added_count} pending URLs to queue from links")
 
                 # If still empty, crawl is complete
                 if not self.link_manager.discovered_urls:
-                    print("No pending URLs found - crawl was already complete")
+                    self.log.info("No pending URLs found - crawl was already complete")
 
                 self.stats['discovered'] = len(self.link_manager.all_discovered_urls)
 
@@ -559,13 +633,13 @@ class WebCrawler:
             return True, f"Resumed crawl from {self.stats['crawled']} URLs"
 
         except Exception as e:
-            print(f"Error resuming crawl: {e}")
+            self.log.error(f"Error resuming crawl: {e}")
             import traceback
             traceback.print_exc()
             return False, f"Error resuming crawl: {str(e)}"
 
-    def get_status(self):
-        """Get current crawl status and results"""
+    def get_status(self, issue_since=None):
+        """Get current crawl status and results (issues after issue_since only, if given)"""
         status = 'completed' if not self.is_running and self.stats['crawled'] > 0 else 'running'
         if not self.is_running and self.stats['crawled'] == 0:
             status = 'idle'
@@ -585,32 +659,22 @@ class WebCrawler:
         # Update memory stats
         self.memory_monitor.update()
 
-        # Get actual data size for accurate estimates
-        from src.core.memory_profiler import MemoryProfiler
-        data_sizes = MemoryProfiler.get_crawler_data_size(
-            self.crawl_results,
-            self.link_manager.all_links if self.link_manager else [],
-            self.issue_detector.detected_issues if self.issue_detector else []
-        )
+        # Data sizes are estimated as rows land - nothing is walked here
+        data_sizes = self.data_size.report(self.issue_detector.detected_issues if self.issue_detector else None)
 
         pending_count = link_stats.get('pending', 0)
-        print(f"get_status called - crawl_results: {len(self.crawl_results)}, status: {status}, crawled: {self.stats['crawled']}, pending: {pending_count}")
+        self.log.debug("get_status called - crawl_results: %d, status: %s, crawled: %d, pending: %d",
+                       len(self.crawl_results), status, self.stats['crawled'], pending_count)
 
-        # Compute sitemap health stats for frontend
+        # Sitemap health and the hreflang matrix are kept up to date as pages land
         sitemap_health = None
-        if self.sitemap_urls and self.crawl_results:
-            sitemap_health = self.issue_detector.detect_sitemap_issues(
-                self.sitemap_urls, 
-                self.crawl_results
-            )
-            # Remove issues from return (already added to issue_detector.detected_issues)
-            if sitemap_health:
-                sitemap_health = {k: v for k, v in sitemap_health.items() if k != 'issues'}
-
-        # Compute hreflang data for frontend matrix
         hreflang_data = None
-        if self.crawl_results:
-            hreflang_data = self.issue_detector.detect_hreflang_issues(self.crawl_results)
+        if self.issue_detector and self.crawl_results:
+            sitemap_health = self.issue_detector.site_analysis.sitemap_health()
+            hreflang_data = self.issue_detector.site_analysis.hreflang_data()
+
+        # Only the issues the caller has not seen yet - no copy of the whole store
+        issues = self.issue_detector.get_issues_since(issue_since or 0) if self.issue_detector else []
 
         return {
             'status': status,
@@ -622,7 +686,8 @@ class WebCrawler:
             },
             'urls': self.crawl_results.copy(),
             'links': self.link_manager.all_links.copy() if self.link_manager else [],
-            'issues': self.issue_detector.get_issues() if self.issue_detector else [],
+            'issues': issues,
+            'issue_seq': (issue_since or 0) + len(issues),
             'traps': self.link_manager.get_traps() if self.link_manager else [],
             'robots_data': self.robots_data,
             'llms_data': self.llms_data,
@@ -635,6 +700,25 @@ class WebCrawler:
             'memory_data': data_sizes
         }
 
+    def get_metrics(self):
+        """Stage timings and live gauges for the /metrics endpoint (cheap - no copies of crawl data)"""
+        link_stats = self.link_manager.get_stats() if self.link_manager else {'discovered': 0, 'pending': 0}
+        renderer = self.js_renderer
+        browser_pages = renderer.pool_size if renderer else 0
+        return {
+            'running': self.is_running,
+            'paused': self.is_paused,
+            'crawled': self.stats['crawled'],
+            'discovered': link_stats['discovered'],
+            'queue_depth': link_stats['pending'],
+            'in_flight': self.in_flight,
+            'unsaved_urls': len(self.unsaved_urls),
+            'issues': len(self.issue_detector.detected_issues) if self.issue_detector else 0,
+            'browser_pages': browser_pages,
+            'browser_pages_in_use': max(0, browser_pages - len(renderer.page_pool)) if renderer else 0,
+            'stages': self.stage_timer.snapshot()
+        }
+
     def _save_batch_to_db(self, force=False):
         """Save batched data to database"""
         if not self.db_save_enabled or not self.crawl_id:
@@ -643,41 +727,48 @@ class WebCrawler:
         from src.crawl_db import save_url_batch, save_links_batch, save_issues_batch, update_crawl_stats
 
         try:
-            # Save URLs
-            if self.unsaved_urls:
-                save_url_batch(self.crawl_id, self.unsaved_urls)
-                self.unsaved_urls.clear()
-
-            # Save links
-            if self.unsaved_links:
-                save_links_batch(self.crawl_id, self.unsaved_links)
-                self.unsaved_links.clear()
-
-            # Save issues
-            if self.unsaved_issues:
-                save_issues_batch(self.crawl_id, self.unsaved_issues)
-                self.unsaved_issues.clear()
-
-            # Update statistics
-            memory_stats = self.memory_monitor.get_stats()
-            update_crawl_stats(
-                self.crawl_id,
-                discovered=self.stats['discovered'],
-                crawled=self.stats['crawled'],
-                max_depth=self.stats['depth'],
-                peak_memory_mb=memory_stats.get('peak_mb', 0),
-                estimated_size_mb=memory_stats.get('estimated_crawl_mb', 0),
-                pagespeed_results=self.stats.get('pagespeed_results'),
-                sitemap_urls=self.sitemap_urls if self.sitemap_urls else None,
-                robots_data=self.robots_data,
-                llms_data=self.llms_data
-            )
+            with self.save_lock:
+                started = self.stage_timer.start()
+                # Swap the buffers first so concurrent savers never write the same rows twice
+                unsaved_urls, self.unsaved_urls = self.unsaved_urls, []
+                unsaved_links, self.unsaved_links = self.unsaved_links, []
+                unsaved_issues, self.unsaved_issues = self.unsaved_issues, []
+
+                # Save URLs
+                if unsaved_urls:
+                    save_url_batch(self.crawl_id, [self.with_linked_from(row) for row in unsaved_urls])
+
+                # Save links
+                if unsaved_links:
+                    save_links_batch(self.crawl_id, unsaved_links)
+
+                # Save issues
+                if unsaved_issues:
+                    save_issues_batch(self.crawl_id, unsaved_issues)
+
+                # Update statistics (discovered comes from the link manager, as in get_status)
+                memory_stats = self.memory_monitor.get_stats()
+                discovered = len(self.link_manager.all_discovered_urls) if self.link_manager else self.stats['discovered']
+                update_crawl_stats(
+                    self.crawl_id,
+                    discovered=discovered,
+                    crawled=self.stats['crawled'],
+                    max_depth=self.stats['depth'],
+                    peak_memory_mb=memory_stats.get('peak_mb', 0),
+                    estimated_size_mb=self.data_size.report(
+                        self.issue_detector.detected_issues if self.issue_detector else None)['total_deep_mb'],
+                    pagespeed_results=self.stats.get('pagespeed_results'),
+                    sitemap_urls=self.sitemap_urls if self.sitemap_urls else None,
+                    robots_data=self.robots_data,
+                    llms_data=self.llms_data
+                )
 
-            self.last_save_time = time.time()
-            print(f"Saved batch to database for crawl {self.crawl_id}")
+                self.last_save_time = time.time()
+                self.stage_timer.stop('persistence', started)
+                self.log.info(f"Saved batch to database for crawl {self.crawl_id}")
 
         except Exception as e:
-            print(f"Error saving batch to database: {e}")
+            self.log.error(f"Error saving batch to database: {e}")
             import traceback
             traceback.print_exc()
 
@@ -706,10 +797,10 @@ class WebCrawler:
             }
 
             save_checkpoint(self.crawl_id, checkpoint)
-            print(f"Saved queue checkpoint for crawl {self.crawl_id}")
+            self.log.info(f"Saved queue checkpoint for crawl {self.crawl_id}")
 
         except Exception as e:
-            print(f"Error saving checkpoint: {e}")
+            self.log.error(f"Error saving checkpoint: {e}")
 
     def _start_auto_save_thread(self):
         """Background thread for periodic saves"""
@@ -722,11 +813,12 @@ class WebCrawler:
 
         self.auto_save_thread = threading.Thread(target=auto_save_worker, daemon=True)
         self.auto_save_thread.start()
-        print("Auto-save thread started")
+        self.log.info("Auto-save thread started")
 
     def update_config(self, new_config):
         """Update crawler configuration"""
         self.config.update(new_config)
+        self.log.set_level(self.config.get('log_level', 'INFO'))
 
         # Update session headers
         self.session.headers.update({
@@ -747,6 +839,13 @@ class WebCrawler:
         else:
             self.session.proxies = {}
 
+        # Record HTTP responses to disk or replay them (see src/core/response_cache.py)
+        self.response_cache = install_response_cache(self.session, self.config.get('response_cache_mode', 'off'),
+                                                     self.config.get('response_cache_dir'))
+        if self.response_cache and self.response_cache.mode == 'replay' and self.config.get('enable_javascript'):
+            self.log.warning("JavaScript rendering is not recorded; replay mode crawls the stored HTTP responses")
+            self.config['enable_javascript'] = False
+
         # Update rate limiter if it exists
         if self.rate_limiter:
             if self.config['delay'] > 0:
@@ -758,11 +857,54 @@ class WebCrawler:
         """Main crawling worker with smooth rate limiting"""
         # Use async approach if JavaScript rendering is enabled
         if self.config.get('enable_javascript', False):
-            print("Initializing JavaScript rendering...")
+            self.log.info("Initializing JavaScript rendering...")
             asyncio.run(self._crawl_async_with_js())
             return
 
-        # Traditional HTTP crawling with smooth rate limiting
+        if self.config.get('distributed_workers', 0) > 0:
+            # Shard the crawl across worker processes (see src/core/distributed.py)
+            self._crawl_distributed()
+        else:
+            self._crawl_with_thread_pool()
+        self.in_flight = 0
+
+        # Run PageSpeed analysis if enabled
+        if self.config.get('enable_pagespeed', False):
+            self.log.info("Running PageSpeed analysis...")
+            self.is_running_pagespeed = True
+            self._run_pagespeed_analysis()
+            self.is_running_pagespeed = False
+
+        self._apply_link_metrics()
+
+        # Run duplication detection on all crawled content
+        issues_before = len(self.issue_detector.detected_issues) if self.issue_detector else 0
+        if self.issue_detector and self.config.get('enable_duplication_check', True):
+            self.log.info("Running duplication detection...")
+            duplication_threshold = self.config.get('duplication_threshold', 0.85)
+            with self.stage_timer.track('duplication'):
+                self.issue_detector.detect_duplication_issues(self.crawl_results, duplication_threshold)
+            self.log.info(f"Duplication detection complete. Total issues: {len(self.issue_detector.detected_issues)}")
+
+        # Sitemap, hreflang, links-to-redirects and broken-link-source issues
+        self._finalize_site_analysis(issues_before)
+
+        # Save final data and mark as complete
+        if self.db_save_enabled and self.crawl_id:
+            self._save_batch_to_db(force=True)
+            from src.crawl_db import set_crawl_status
+            set_crawl_status(self.crawl_id, 'completed')
+
+        # Mark crawl as complete
+        self.is_running = False
+        self.log.info(f"Crawl completed. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
+        if self.response_cache:
+            counts = self.response_cache.counts
+            self.log.info(f"Response cache ({self.response_cache.mode}): {counts['hits']} hits, "
+                          f"{counts['misses']} misses, {counts['stored']} stored")
+
+    def _crawl_with_thread_pool(self):
+        """Crawl loop that fetches pages on a local thread pool"""
         max_workers = self.config.get('concurrency', 5)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -790,9 +932,10 @@ class WebCrawler:
                             continue
 
                         # Submit crawl task immediately - rate limiting happens inside the worker
-                        print(f"Submitting task for: {current_url}")
+                        self.log.debug("Submitting task for: %s", current_url)
                         future = executor.submit(self._crawl_url, current_url, depth)
                         active_futures[future] = current_url
+                    self.in_flight = len(active_futures)
 
                     # Process completed tasks
                     completed_futures = []
@@ -802,43 +945,31 @@ class WebCrawler:
                             try:
                                 result = future.result()
                                 if result:
-                                    with self.results_lock:
-                                        self.crawl_results.append(result)
-                                        self.stats['crawled'] += 1
-                                        self.stats['depth'] = max(self.stats['depth'], result.get('depth', 0))
-                                        print(f"Added URL to results: {result['url']} - Total in results: {len(self.crawl_results)}")
-
-                                    # Detect issues
-                                    issues_before = len(self.issue_detector.detected_issues)
-                                    self.issue_detector.detect_issues(result)
-                                    issues_after = len(self.issue_detector.detected_issues)
-
-                                    # Add newly detected issues to unsaved batch
-                                    if self.db_save_enabled and issues_after > issues_before:
-                                        new_issues = self.issue_detector.detected_issues[issues_before:issues_after]
-                                        self.unsaved_issues.extend(new_issues)
+                                    self._record_result(result)
                             except Exception as e:
-                                print(f"Error in crawl task: {e}")
+                                self.log.error(f"Error in crawl task: {e}")
 
                     # Remove completed futures
                     for future in completed_futures:
                         del active_futures[future]
+                    self.in_flight = len(active_futures)
 
                     # Check for completion
                     if self.stats['crawled'] >= self.config['max_urls']:
-                        print(f"Reached maximum URLs limit ({self.config['max_urls']})")
+                        self.log.info(f"Reached maximum URLs limit ({self.config['max_urls']})")
                         break
 
                     # Check if no more work
                     link_stats = self.link_manager.get_stats()
                     if link_stats['pending'] == 0 and len(active_futures) == 0:
-                        print("No more URLs to crawl")
+                        self.log.info("No more URLs to crawl")
                         break
                     elif link_stats['pending'] > 0 and len(active_futures) == 0:
                         # DEBUG: Loop detected where we have pending but not picking up work
                         # This could happen if get_next_url returns None (filtered, depth, etc)
                         # We need to know if we are stuck here.
-                        print(f"DEBUG: Stall detected? Pending: {link_stats['pending']}, Active: {len(active_futures)}")
+                        self.log.throttled('stall', 10, 'DEBUG', "Stall detected? Pending: %d, Active: %d",
+                                           link_stats['pending'], len(active_futures))
                         
                         # Monitor if this persists
                         # If get_next_url keeps returning None, we might be in an infinite loop
@@ -848,55 +979,132 @@ class WebCrawler:
                     time.sleep(0.1) # Increased from 0.001 to reduce CPU usage and log spam if spinning
 
                 except Exception as e:
-                    print(f"Error in crawl worker: {e}")
+                    self.log.error(f"Error in crawl worker: {e}")
                     time.sleep(1)
 
-        # Run PageSpeed analysis if enabled
-        if self.config.get('enable_pagespeed', False):
-            print("Running PageSpeed analysis...")
-            self.is_running_pagespeed = True
-            self._run_pagespeed_analysis()
-            self.is_running_pagespeed = False
+    def _crawl_distributed(self):
+        """Crawl loop that shards the frontier across worker processes by host"""
+        from src.core.distributed import CrawlCoordinator
+
+        coordinator = CrawlCoordinator(
+            partitions=self.config['distributed_workers'],
+            bind=self.config.get('distributed_bind', '127.0.0.1'),
+            port=self.config.get('distributed_port', 0),
+            authkey=self.config.get('distributed_authkey'),
+            batch_size=self.config.get('distributed_batch_size', 10),
+            host_spread=self.config.get('distributed_host_spread')
+        )
+        coordinator.start(
+            self.config, self.base_url, self.base_domain,
+            spawn_local=self.config.get('distributed_spawn_local', True)
+        )
 
-        # Update all linked_from fields before completing
-        self._update_all_linked_from()
+        try:
+            while self.is_running:
+                try:
+                    if self.is_paused:
+                        time.sleep(1)
+                        continue
 
-        # Run duplication detection on all crawled content
-        if self.issue_detector and self.config.get('enable_duplication_check', True):
-            print("Running duplication detection...")
-            duplication_threshold = self.config.get('duplication_threshold', 0.85)
-            self.issue_detector.detect_duplication_issues(self.crawl_results, duplication_threshold)
-            print(f"Duplication detection complete. Total issues: {len(self.issue_detector.get_issues())}")
+                    # Move URLs from the shared queue into host partitions, within budget
+                    while self.stats['crawled'] + coordinator.outstanding() < self.config['max_urls']:
+                        url_info = self.link_manager.get_next_url()
+                        if not url_info:
+                            break
 
-        # Detect internal links pointing to redirecting URLs
-        if self.issue_detector:
-            print("Detecting internal links to redirects...")
-            all_links = self.link_manager.all_links if self.link_manager else []
-            links_to_redirects_result = self.issue_detector.detect_links_to_redirects(
-                self.crawl_results, 
-                all_links
-            )
-            if links_to_redirects_result.get('total_links_to_redirects', 0) > 0:
-                print(f"Found {links_to_redirects_result['total_links_to_redirects']} internal links to redirects on {links_to_redirects_result['pages_affected']} pages")
-
-            # Detect broken link sources (which pages link to broken URLs)
-            print("Detecting broken link sources...")
-            broken_link_result = self.issue_detector.detect_broken_link_sources(
-                self.crawl_results,
-                all_links
-            )
-            if broken_link_result.get('total_broken_links', 0) > 0:
-                print(f"Found {len(broken_link_result['broken_urls'])} broken URLs linked from pages")
+                        current_url, depth = url_info
+                        if depth > self.config['max_depth']:
+                            continue
+                        coordinator.submit(current_url, depth)
 
-        # Save final data and mark as complete
-        if self.db_save_enabled and self.crawl_id:
-            self._save_batch_to_db(force=True)
-            from src.crawl_db import set_crawl_status
-            set_crawl_status(self.crawl_id, 'completed')
+                    coordinator.dispatch()
+                    self.in_flight = coordinator.fetching()
 
-        # Mark crawl as complete
-        self.is_running = False
-        print(f"Crawl completed. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
+                    for payload in coordinator.poll(timeout=0.5):
+                        self._merge_worker_payload(payload)
+
+                    for lost_url, depth in coordinator.reap_lost_work():
+                        self._record_result(self.seo_extractor.create_empty_result(
+                            lost_url, depth, 0, 'Distributed worker exited before crawling this URL'
+                        ))
+
+                    if not coordinator.has_live_workers():
+                        self.log.info("All distributed workers have exited")
+                        break
+
+                    if self.stats['crawled'] >= self.config['max_urls']:
+                        self.log.info(f"Reached maximum URLs limit ({self.config['max_urls']})")
+                        break
+
+                    if self.link_manager.get_stats()['pending'] == 0 and coordinator.outstanding() == 0:
+                        self.log.info("No more URLs to crawl")
+                        break
+
+                except Exception as e:
+                    self.log.error(f"Error in distributed crawl loop: {e}")
+                    time.sleep(1)
+        finally:
+            coordinator.shutdown()
+
+    def _merge_worker_payload(self, payload):
+        """Fold one batch returned by a distributed worker into this crawl"""
+        for result in payload['results']:
+            if self.db_save_enabled:
+                self.unsaved_urls.append(result)
+            self._record_result(result, label=f"partition {payload.get('partition')}")
+
+        self._record_links(self.link_manager.merge_links(payload['links']))
+        for result in payload['results']:
+            # Workers only see their own batch; the coordinator's index has every linking page
+            result['linked_from_count'] = self.link_manager.get_inlink_count(result['url'])
+
+        self.stage_timer.merge(payload.get('stage_times'))
+        self.link_manager.merge_traps(payload.get('traps', []))
+
+        for url, depth in payload['discovered']:
+            self.link_manager.add_url(url, depth)
+
+        if self.db_save_enabled and len(self.unsaved_urls) >= self.batch_save_size:
+            self._save_batch_to_db()
+
+    def _record_result(self, result, label=None):
+        """Store a finished page result and run per-page issue detection"""
+        with self.results_lock:
+            self.crawl_results.append(result)
+            self.data_size.add('crawl_results', (result,))
+            self.stats['crawled'] += 1
+            self.stats['depth'] = max(self.stats['depth'], result.get('depth', 0))
+            self.log.debug("Added URL to results%s: %s - Total in results: %d",
+                           f" ({label})" if label else "", result['url'], len(self.crawl_results))
+
+        # Detect issues and add this page's to the unsaved batch
+        with self.stage_timer.track('issues'):
+            new_issues = self.issue_detector.detect_issues(result)
+            if self.db_save_enabled and new_issues:
+                self.unsaved_issues.extend(new_issues)
+            self.issue_detector.site_analysis.add_page(result)
+
+    def _record_links(self, new_links):
+        """Queue newly collected links for saving and fold them into the site-wide analyses"""
+        if not new_links:
+            return
+        self.data_size.add('links', new_links)
+        if self.db_save_enabled:
+            self.unsaved_links.extend(new_links)
+        if self.issue_detector:
+            self.issue_detector.site_analysis.add_links(new_links)
+
+    def _finalize_site_analysis(self, issues_before):
+        """
+        Emit the site-wide issues kept up to date during the crawl, and queue every
+        issue added after the per-page ones (duplication included) for saving.
+        """
+        if not self.issue_detector:
+            return
+        site_issues = self.issue_detector.site_analysis.finalize()
+        self.log.info(f"Site-wide analyses: {len(site_issues)} issues {self.issue_detector.site_analysis.summary()}")
+        if self.db_save_enabled:
+            self.unsaved_issues.extend(self.issue_detector.detected_issues.since(issues_before))
 
     def _crawl_url(self, url, depth):
         """Crawl a single URL"""
@@ -908,11 +1116,12 @@ class WebCrawler:
 
     def _crawl_url_with_requests(self, url, depth):
         """Crawl a single URL using traditional HTTP requests"""
-        print(f"Starting crawl of {url}")
+        self.log.debug("Starting crawl of %s", url)
         retries = self.config.get('retries', 3)
         start_time = time.time()
 
         try:
+            started = self.stage_timer.start()
             # Check file size if configured
             if self.config.get('max_file_size', 0) > 0:
                 try:
@@ -941,16 +1150,21 @@ class WebCrawler:
             
             for attempt in range(retries + 1):
                 try:
+                    requested = time.perf_counter()
                     response = self.session.get(
                         url,
                         timeout=self.config['timeout'],
                         allow_redirects=self.config['follow_redirects']
                     )
+                    # elapsed stops at the response headers (DNS and connect included), the rest is the body
+                    ttfb = sum(hop.elapsed.total_seconds() for hop in response.history) + response.elapsed.total_seconds()
+                    self.stage_timer.add('ttfb', ttfb)
+                    self.stage_timer.add('download', max(0.0, time.perf_counter() - requested - ttfb))
                     
                     # Handle 429 Too Many Requests with exponential backoff
                     if response.status_code == 429:
                         if attempt >= retries:
-                            print(f"429 Too Many Requests after {retries + 1} attempts: {url}")
+                            self.log.warning("429 Too Many Requests after %d attempts: %s", retries + 1, url)
                             break  # Return the 429 response so it's recorded as an issue
                         
                         # Get retry-after header if present, otherwise use exponential backoff
@@ -964,16 +1178,19 @@ class WebCrawler:
                             wait_time = base_delay * (2 ** attempt)  # 1s, 2s, 4s, 8s...
                         
                         wait_time = min(wait_time, 30)  # Cap at 30 seconds
-                        print(f"429 Rate limited. Waiting {wait_time}s before retry {attempt + 1}/{retries}...")
+                        self.log.warning("429 Rate limited. Waiting %ss before retry %d/%d...", wait_time, attempt + 1, retries)
                         time.sleep(wait_time)
                         continue
                     
                     break  # Success, exit retry loop
                     
+                except ReplayMiss:
+                    raise  # Not in the response cache - no retry or backoff
                 except Exception as e:
                     if attempt >= retries:
                         raise e
                     time.sleep(base_delay * (attempt + 1))  # Incremental delay on errors
+            self.stage_timer.stop('fetch', started)
 
             # Determine if URL is internal
             is_internal = self.link_manager.is_internal(url)
@@ -1026,7 +1243,6 @@ class WebCrawler:
                 'redirect_chain': [],  # [NEW] Detailed redirect chain
                 'hreflang': [],
                 'schema_org': [],
-                'linked_from': [],
                 'x_robots_tag': response.headers.get('X-Robots-Tag', '')
             }
 
@@ -1053,20 +1269,23 @@ class WebCrawler:
 
             # Only parse HTML content
             if 'text/html' in response.headers.get('content-type', ''):
-                soup = BeautifulSoup(response.content, 'html.parser')
+                with self.stage_timer.track('parse'):
+                    soup = BeautifulSoup(response.content, 'html.parser')
                 
-                # Debug: Check what we received
-                all_links = soup.find_all('a', href=True)
-                html_size = len(response.content)
-                print(f"  [HTML Debug] Size: {html_size} bytes, Links found: {len(all_links)}")
-                if len(all_links) == 0:
+                # Debug: Check what we received (counting every link is only worth it at DEBUG)
+                if self.log.enabled(logging.DEBUG):
+                    self.log.debug("  [HTML Debug] Size: %d bytes, Links found: %d",
+                                   len(response.content), len(soup.find_all('a', href=True)))
+                if soup.find('a', href=True) is None:
                     # Show a snippet of what we got to diagnose JS-rendered pages
-                    text_content = soup.get_text()[:200].replace('\n', ' ').strip()
-                    print(f"  [HTML Debug] Content preview: {text_content}...")
-                    if 'javascript' in response.text.lower() and ('react' in response.text.lower() or 'vue' in response.text.lower() or 'angular' in response.text.lower() or '__next' in response.text.lower()):
-                        print(f"  [HTML Debug] ⚠️  This appears to be a JavaScript-rendered site! Enable JavaScript mode for proper crawling.")
+                    if self.log.enabled(logging.DEBUG):
+                        self.log.debug("  [HTML Debug] Content preview: %s...", soup.get_text()[:200].replace('\n', ' ').strip())
+                    page_text = response.text.lower()
+                    if 'javascript' in page_text and ('react' in page_text or 'vue' in page_text or 'angular' in page_text or '__next' in page_text):
+                        self.log.throttled('js-rendered', 300, 'WARNING', "  [HTML Debug] ⚠️  This appears to be a JavaScript-rendered site! Enable JavaScript mode for proper crawling.")
 
                 # Extract comprehensive data using SEO extractor
+                started = self.stage_timer.start()
                 self.seo_extractor.extract_basic_seo_data(soup, result)
                 self.seo_extractor.extract_meta_tags(soup, result)
                 self.seo_extractor.extract_opengraph_tags(soup, result)
@@ -1078,16 +1297,8 @@ class WebCrawler:
                 self.seo_extractor.extract_hreflang(soup, result)
                 self.seo_extractor.extract_schema_org(soup, result)
 
-                # Collect all links
-                links_before = len(self.link_manager.all_links)
-                # Pass base_domain for scope calculation
-                self.link_manager.collect_all_links(soup, url, self.crawl_results, self.base_domain)
-                links_after = len(self.link_manager.all_links)
-
-                # Add newly discovered links to unsaved batch
-                if self.db_save_enabled and links_after > links_before:
-                    new_links = self.link_manager.all_links[links_before:links_after]
-                    self.unsaved_links.extend(new_links)
+                # Collect all links (base_domain for scope calculation) and queue the new ones
+                self._record_links(self.link_manager.collect_all_links(soup, url, self.crawl_results, self.base_domain))
 
                 # Extract links for further crawling
                 should_extract = (
@@ -1099,12 +1310,15 @@ class WebCrawler:
                     links_before_extract = len(self.link_manager.discovered_urls)
                     self.link_manager.extract_links(soup, url, depth + 1, self._should_crawl_url)
                     links_after_extract = len(self.link_manager.discovered_urls)
-                    print(f"Link extraction from {url}: found {links_after_extract - links_before_extract} new URLs to crawl (pending queue: {links_after_extract})")
+                    self.log.debug("Link extraction from %s: found %d new URLs to crawl (pending queue: %d)",
+                                   url, links_after_extract - links_before_extract, links_after_extract)
                 else:
-                    print(f"Skipping link extraction: is_internal={is_internal}, depth={depth}, max_depth={self.config['max_depth']}")
+                    self.log.debug("Skipping link extraction: is_internal=%s, depth=%d, max_depth=%d",
+                                   is_internal, depth, self.config['max_depth'])
+                self.stage_timer.stop('extract', started)
 
-            # Populate linked_from after all link collection is complete
-            result['linked_from'] = self.link_manager.get_source_pages(url)
+            # Only the count lives on the row; with_linked_from() adds the pages when it is read
+            result['linked_from_count'] = self.link_manager.get_inlink_count(url)
             result['response_time'] = round((time.time() - start_time) * 1000, 2)
 
             # Add to unsaved batch if DB persistence enabled
@@ -1131,7 +1345,9 @@ class WebCrawler:
                 return hashlib.md5(content).hexdigest()
 
             # Render page with JavaScript
+            rendering = time.perf_counter()
             html_content, status_code, headers, error = await self.js_renderer.render_page(url)
+            self.stage_timer.add('render', time.perf_counter() - rendering)
 
             if error:
                 return self.seo_extractor.create_empty_result(url, depth, status_code, error)
@@ -1184,7 +1400,7 @@ class WebCrawler:
                              requires_js = True
 
             except Exception as e:
-                print(f"Error checking raw content for {url}: {e}")
+                self.log.error(f"Error checking raw content for {url}: {e}")
 
             # -----------------------------------------
 
@@ -1242,15 +1458,16 @@ class WebCrawler:
                 'redirects': [],
                 'hreflang': [],
                 'schema_org': [],
-                'linked_from': [],
                 'javascript_rendered': True,
                 'x_robots_tag': headers.get('x-robots-tag', '')  # Headers from Playwright are lower-cased
             }
 
             # Parse HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
+            with self.stage_timer.track('parse'):
+                soup = BeautifulSoup(html_content, 'html.parser')
 
             # Extract comprehensive data
+            started = self.stage_timer.start()
             self.seo_extractor.extract_basic_seo_data(soup, result)
             self.seo_extractor.extract_meta_tags(soup, result)
             self.seo_extractor.extract_opengraph_tags(soup, result)
@@ -1262,15 +1479,8 @@ class WebCrawler:
             self.seo_extractor.extract_hreflang(soup, result)
             self.seo_extractor.extract_schema_org(soup, result)
 
-            # Collect all links
-            links_before = len(self.link_manager.all_links)
-            self.link_manager.collect_all_links(soup, url, self.crawl_results)
-            links_after = len(self.link_manager.all_links)
-
-            # Add newly discovered links to unsaved batch
-            if self.db_save_enabled and links_after > links_before:
-                new_links = self.link_manager.all_links[links_before:links_after]
-                self.unsaved_links.extend(new_links)
+            # Collect all links and queue the new ones
+            self._record_links(self.link_manager.collect_all_links(soup, url, self.crawl_results))
 
             # Extract links for further crawling
             should_extract = (
@@ -1280,9 +1490,10 @@ class WebCrawler:
 
             if should_extract:
                 self.link_manager.extract_links(soup, url, depth + 1, self._should_crawl_url)
+            self.stage_timer.stop('extract', started)
 
-            # Populate linked_from after all link collection is complete
-            result['linked_from'] = self.link_manager.get_source_pages(url)
+            # Only the count lives on the row; with_linked_from() adds the pages when it is read
+            result['linked_from_count'] = self.link_manager.get_inlink_count(url)
             result['response_time'] = round((time.time() - start_time) * 1000, 2)
 
             # Add to unsaved batch if DB persistence enabled
@@ -1328,6 +1539,7 @@ class WebCrawler:
                         # Create task
                         task = asyncio.create_task(self._crawl_url_with_javascript(current_url, depth))
                         active_tasks.add(task)
+                self.in_flight = len(active_tasks)
 
                 # Process completed tasks
                 if active_tasks:
@@ -1337,28 +1549,14 @@ class WebCrawler:
                         try:
                             result = await task
                             if result:
-                                with self.results_lock:
-                                    self.crawl_results.append(result)
-                                    self.stats['crawled'] += 1
-                                    self.stats['depth'] = max(self.stats['depth'], result.get('depth', 0))
-                                    print(f"Added URL to results (JS): {result['url']} - Total in results: {len(self.crawl_results)}")
-
-                                # Detect issues
-                                issues_before = len(self.issue_detector.detected_issues)
-                                self.issue_detector.detect_issues(result)
-                                issues_after = len(self.issue_detector.detected_issues)
-
-                                # Add newly detected issues to unsaved batch
-                                if self.db_save_enabled and issues_after > issues_before:
-                                    new_issues = self.issue_detector.detected_issues[issues_before:issues_after]
-                                    self.unsaved_issues.extend(new_issues)
+                                self._record_result(result, label='JS')
                         except Exception as e:
-                            print(f"Error in async crawl task: {e}")
+                            self.log.error(f"Error in async crawl task: {e}")
 
                 # Check completion
                 link_stats = self.link_manager.get_stats()
                 if link_stats['pending'] == 0 and len(active_tasks) == 0:
-                    print("No more URLs to crawl")
+                    self.log.info("No more URLs to crawl")
                     break
 
                 await asyncio.sleep(0.001)
@@ -1370,18 +1568,23 @@ class WebCrawler:
                 self.is_running_pagespeed = False
 
         finally:
-            # Update all linked_from fields before completing
-            self._update_all_linked_from()
+            self.in_flight = 0
+            self._apply_link_metrics()
 
             # Run duplication detection on all crawled content
             if self.issue_detector and self.config.get('enable_duplication_check', True):
-                print("Running duplication detection...")
+                self.log.info("Running duplication detection...")
                 duplication_threshold = self.config.get('duplication_threshold', 0.85)
             # Duplication detection
+            issues_before = len(self.issue_detector.detected_issues) if self.issue_detector else 0
             if self.issue_detector:
                 duplication_threshold = self.config.get('duplication_threshold', 0.85)
-                self.issue_detector.detect_duplication_issues(self.crawl_results, duplication_threshold)
-                print(f"Duplication detection complete. Total issues: {len(self.issue_detector.get_issues())}")
+                with self.stage_timer.track('duplication'):
+                    self.issue_detector.detect_duplication_issues(self.crawl_results, duplication_threshold)
+                self.log.info(f"Duplication detection complete. Total issues: {len(self.issue_detector.detected_issues)}")
+
+            # Sitemap, hreflang, links-to-redirects and broken-link-source issues
+            self._finalize_site_analysis(issues_before)
 
             # Save final data and mark as complete
             if self.db_save_enabled and self.crawl_id:
@@ -1393,34 +1596,73 @@ class WebCrawler:
                 
                 if self.is_paused:
                     set_crawl_status(self.crawl_id, 'paused')
-                    print(f"Crawl paused. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
+                    self.log.info(f"Crawl paused. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
                 elif not self.is_running:
                      # Stopped manually
                      set_crawl_status(self.crawl_id, 'stopped')
-                     print(f"Crawl stopped. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
+                     self.log.info(f"Crawl stopped. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
                 else:
                     # Completed naturally
                     self.is_running = False
                     set_crawl_status(self.crawl_id, 'completed')
-                    print(f"Crawl completed. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
+                    self.log.info(f"Crawl completed. Discovered: {self.stats['discovered']}, Crawled: {self.stats['crawled']}")
 
             # Clean up
             if self.js_renderer:
                 await self.js_renderer.cleanup()
 
-    def _update_all_linked_from(self):
-        """Update linked_from field for all crawled URLs based on collected source_pages data"""
-        print("Updating linked_from data for all URLs...")
-        updated_count = 0
-
-        for result in self.crawl_results:
-            url = result['url']
-            sources = self.link_manager.get_source_pages(url)
-            if sources:
-                result['linked_from'] = sources
-                updated_count += 1
-
-        print(f"Updated linked_from data for {updated_count} URLs")
+    def with_linked_from(self, row):
+        """Copy of a result row with linked_from (and its count) read from the inlink index"""
+        if not self.link_manager:
+            return row
+        url = row.get('url')
+        return dict(row, linked_from=self.link_manager.get_source_pages(url),
+                    linked_from_count=self.link_manager.get_inlink_count(url))
+
+    def get_url_detail(self, url):
+        """Full result row for one crawled URL, linked_from included (details panel)"""
+        with self.results_lock:
+            row = next((result for result in self.crawl_results if result.get('url') == url), None)
+        return self.with_linked_from(row) if row is not None else None
+
+    def get_link_graph_analysis(self):
+        """Link graph metrics for the current crawl (cached until new links arrive)"""
+        if not self.link_manager:
+            return None
+        home_urls = [self.base_url + '/', self.base_url] if self.base_url else []
+        return self.link_manager.analyze_link_graph(self.crawl_results, home_urls, self.sitemap_urls)
+
+    def get_graph_layout(self):
+        """Server-side visualisation layout (rebuilt at most every few seconds while crawling)"""
+        from src.core.graph_layout import GraphLayout, LAYOUT_REFRESH_SECONDS
+
+        layout = self._graph_layout
+        if layout and self.is_running and time.time() - layout.built_at < LAYOUT_REFRESH_SECONDS:
+            return layout
+
+        analysis = self.get_link_graph_analysis()
+        if analysis is None:
+            return None
+        if layout is None or layout.analysis is not analysis:
+            with self.results_lock:
+                pages = {result['url']: (result.get('status_code'), result.get('title'))
+                         for result in self.crawl_results}
+            layout = GraphLayout(analysis, pages)
+            self._graph_layout = layout
+        return layout
+
+    def _apply_link_metrics(self):
+        """Add inlinks, outlinks, PageRank and click depth to every crawled URL"""
+        try:
+            start = time.time()
+            analysis = self.get_link_graph_analysis()
+            if analysis is None:
+                return
+            analysis.apply_to_results(self.crawl_results)
+            self.log.info(f"Link graph: {analysis.node_count} URLs, {analysis.edge_count} internal links, "
+                  f"{len(analysis.orphans)} orphans, PageRank in {analysis.iterations} iterations ({time.time() - start:.2f}s)")
+        except Exception as e:
+            self.log.error(f"Error computing link graph metrics: {e}")
 
     def _should_crawl_url(self, url):
         """Check if URL should be crawled based on settings"""
@@ -1448,12 +1690,9 @@ class WebCrawler:
         else:
             # It is EXTERNAL
             if not self.config['crawl_external']:
-                # Only log first few rejections to avoid spam
-                if not hasattr(self, '_external_reject_count'):
-                    self._external_reject_count = 0
-                if self._external_reject_count < 3:
-                    print(f"  [Rejected] External URL: {url[:80]}... (base_domain={self.base_domain})")
-                    self._external_reject_count += 1
+                # Rate-limited - a page full of external links would otherwise flood the log
+                self.log.throttled('external-rejected', 10, 'DEBUG', "  [Rejected] External URL: %s... (base_domain=%s)",
+                                   url[:80], self.base_domain)
                 return False
                 
         # --- End Domain Policy ---
@@ -1498,67 +1737,85 @@ class WebCrawler:
             robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
 
             if robots_url not in self._robots_cache:
-                rp = RobotFileParser()
-                # Check if internal (allow subdomains)
-                is_internal = False
-                try:
-                    target_domain = urlparse(url).netloc
-                    base_domain = urlparse(self.base_url).netloc
+                # Only workers needing this same robots.txt wait for the fetch
+                with self._robots_fetch_lock(robots_url):
+                    if robots_url not in self._robots_cache:
+                        rp = RobotFileParser()
+                        # Check if internal (allow subdomains)
+                        is_internal = False
+                        try:
+                            target_domain = urlparse(url).netloc
+                            base_domain = urlparse(self.base_url).netloc
                     
-                    # Log for debugging
-                    # print(f"Comparing {target_domain} with {base_domain}")
+                            # Log for debugging
+                            # print(f"Comparing {target_domain} with {base_domain}")
                     
-                    if target_domain == base_domain:
-                        is_internal = True
-                    else:
-                        # Allow subdomains: endswith comparison
-                        # e.g. sub.example.com ends with example.com
-                        # We remove 'www.' to be safe for base comparison
-                        clean_base = base_domain.replace('www.', '')
-                        if target_domain.endswith(clean_base) or target_domain.endswith('.' + clean_base):
-                            is_internal = True
-                except:
-                    is_internal = False
-
-                # Only fetch robots.txt if the URL is internal or if external crawling is enabled
-                # and the URL is not explicitly disallowed by the internal check
-                if is_internal or self.config['crawl_external']:
-                    rp.set_url(robots_url)
-                    try:
-                        # Manual fetch to get content for validation
-                        try:
-                            resp = self.session.get(robots_url, timeout=10)
-                            if resp.status_code == 200:
-                                raw_content = resp.text
-                                self.robots_data['content'] = raw_content
-                                self.robots_data['issues'] = self._validate_robots_txt(raw_content)
-                                rp.parse(raw_content.splitlines())
+                            if target_domain == base_domain:
+                                is_internal = True
                             else:
-                                self.robots_data['issues'].append({
-                                    'line': 0, 'type': 'fetch_error', 
-                                    'message': f'Failed to fetch robots.txt (Status {resp.status_code})'
-                                })
-                                rp.read() # Fallback to standard read attempt
-                        except Exception as e:
-                             print(f"Manual robots fetch failed: {e}")
-                             rp.read()
-
-                        self._robots_cache[robots_url] = rp
-                    except:
-                        # If robots.txt can't be read, assume allowed
-                        return True
-                else:
-                    # If not internal and external crawling is disabled, treat as disallowed
-                    return False
+                                # Allow subdomains: endswith comparison
+                                # e.g. sub.example.com ends with example.com
+                                # We remove 'www.' to be safe for base comparison
+                                clean_base = base_domain.replace('www.', '')
+                                if target_domain.endswith(clean_base) or target_domain.endswith('.' + clean_base):
+                                    is_internal = True
+                        except:
+                            is_internal = False
+
+                        # Only fetch robots.txt if the URL is internal or if external crawling is enabled
+                        # and the URL is not explicitly disallowed by the internal check
+                        if is_internal or self.config['crawl_external']:
+                            rp.set_url(robots_url)
+                            try:
+                                # Manual fetch to get content for validation
+                                try:
+                                    resp = self.session.get(robots_url, timeout=10)
+                                    if resp.status_code == 200:
+                                        raw_content = resp.text
+                                        self.robots_data['content'] = raw_content
+                                        self.robots_data['issues'] = self._validate_robots_txt(raw_content)
+                                        rp.parse(raw_content.splitlines())
+                                    else:
+                                        self.robots_data['issues'].append({
+                                            'line': 0, 'type': 'fetch_error', 
+                                            'message': f'Failed to fetch robots.txt (Status {resp.status_code})'
+                                        })
+                                        # Same rules RobotFileParser.read() applies, without fetching again
+                                        if resp.status_code in (401, 403):
+                                            rp.disallow_all = True
+                                        elif 400 <= resp.status_code < 500:
+                                            rp.allow_all = True
+                                        else:
+                                            rp.read() # Fallback to standard read attempt
+                                except Exception as e:
+                                     self.log.error(f"Manual robots fetch failed: {e}")
+                                     if self.response_cache and self.response_cache.mode == 'replay':
+                                         raise  # No network in replay mode
+                                     rp.read()
+
+                                self._robots_cache[robots_url] = rp
+                            except:
+                                # If robots.txt can't be read, assume allowed
+                                return True
+                        else:
+                            # If not internal and external crawling is disabled, treat as disallowed
+                            return False
 
             rp = self._robots_cache[robots_url]
             user_agent = self.config.get('user_agent', '*')
             return rp.can_fetch(user_agent, url)
 
         except Exception as e:
-            print(f"Error checking robots.txt: {e}")
+            self.log.error(f"Error checking robots.txt: {e}")
             return True
 
+    def _robots_fetch_lock(self, robots_url):
+        with self._robots_locks_guard:
+            lock = self._robots_locks.get(robots_url)
+            if lock is None:
+                lock = self._robots_locks[robots_url] = threading.Lock()
+            return lock
+
     def _validate_robots_txt(self, content):
         """Validate robots.txt content for syntax errors"""
         issues = []
@@ -1611,93 +1868,59 @@ class WebCrawler:
             selected_pages = self._select_pages_for_pagespeed()
 
             if not selected_pages:
-                print("No suitable pages found for PageSpeed analysis")
+                self.log.info("No suitable pages found for PageSpeed analysis")
                 return
 
-            print(f"Running PageSpeed analysis on {len(selected_pages)} pages...")
-
-            pagespeed_results = []
-            for i, page_url in enumerate(selected_pages):
-                if not self.is_running:
-                    print("PageSpeed analysis cancelled")
-                    return
-
-                print(f"Analyzing page {i+1}/{len(selected_pages)}: {page_url}")
+            self.log.info(f"Running PageSpeed analysis on {len(selected_pages)} pages...")
 
-                # Mobile analysis
-                mobile_result = self._call_pagespeed_api(page_url, 'mobile')
-                time.sleep(2)
-
-                if not self.is_running:
-                    return
-
-                # Desktop analysis
-                desktop_result = self._call_pagespeed_api(page_url, 'desktop')
-
-                pagespeed_results.append({
-                    'url': page_url,
-                    'mobile': mobile_result,
-                    'desktop': desktop_result,
-                    'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S')
-                })
-                if i < len(selected_pages) - 1:
-                    time.sleep(3)
+            # Results replace the previous run's and appear as each page finishes
+            self.stats['pagespeed_results'] = []
+            pagespeed_results = self._pagespeed_runner(lambda: self.is_running).run(selected_pages)
 
-            self.stats['pagespeed_results'] = pagespeed_results
-            print(f"PageSpeed analysis completed for {len(pagespeed_results)} pages")
+            if not self.is_running:
+                self.log.info(f"PageSpeed analysis cancelled after {len(pagespeed_results)} pages")
+                return
+            self.log.info(f"PageSpeed analysis completed for {len(pagespeed_results)} pages")
 
         except Exception as e:
-            print(f"Error running PageSpeed analysis: {e}")
+            self.log.error(f"Error running PageSpeed analysis: {e}")
 
     def analyze_pagespeed(self, urls):
         """
         Public method to run PageSpeed analysis on specific URLs on demand.
         Returns the results list.
         """
-        results = []
-        print(f"Starting on-demand PageSpeed analysis for {len(urls)} URLs")
-
-        for i, url in enumerate(urls):
-            print(f"Analyzing {url}...")
-            
-            # Mobile
-            mobile_res = self._call_pagespeed_api(url, 'mobile')
-            time.sleep(1) # Short delay
-            
-            # Desktop
-            desktop_res = self._call_pagespeed_api(url, 'desktop')
-            
-            result_entry = {
-                'url': url,
-                'mobile': mobile_res,
-                'desktop': desktop_res,
-                'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S')
-            }
-            results.append(result_entry)
-            
-            if i < len(urls) - 1:
-                time.sleep(2)
-
-        # Update stats
-        if 'pagespeed_results' not in self.stats:
-            self.stats['pagespeed_results'] = []
-            
-        # Update or append
-        existing_map = {r['url']: i for i, r in enumerate(self.stats['pagespeed_results'])}
-        
-        for res in results:
-            if res['url'] in existing_map:
-                # Update existing
-                idx = existing_map[res['url']]
-                self.stats['pagespeed_results'][idx] = res
-            else:
-                # Append new
-                self.stats['pagespeed_results'].append(res)
-                
-        return results
+        self.log.info(f"Starting on-demand PageSpeed analysis for {len(urls)} URLs")
+        return self._pagespeed_runner().run(urls)
+
+    def _pagespeed_runner(self, should_continue=None):
+        """PageSpeed runner for this crawler's settings; results are merged into stats by URL as they finish"""
+        from src.core.pagespeed_runner import PageSpeedRunner
+
+        def store(entry):
+            with self._pagespeed_lock:
+                results = self.stats.setdefault('pagespeed_results', [])
+                for index, existing in enumerate(results):
+                    if existing.get('url') == entry['url']:
+                        results[index] = entry
+                        break
+                else:
+                    results.append(entry)
+
+        return PageSpeedRunner(
+            lambda url, strategy: self._call_pagespeed_api(url, strategy, should_continue=should_continue),
+            concurrency=self.config.get('pagespeed_concurrency', 4),
+            cache_ttl=self.config.get('pagespeed_cache_hours', 24) * 3600,
+            should_continue=should_continue,
+            on_result=store,
+            log=self.log
+        )
 
     def _select_pages_for_pagespeed(self):
-        """Select only the homepage for PageSpeed analysis"""
+        """
+        Pages for PageSpeed analysis: the homepage, plus one page per URL
+        template (up to pagespeed_max_pages) when pagespeed_sample_templates is on
+        """
         selected_pages = []
 
         # Find homepage from crawl results
@@ -1734,11 +1957,28 @@ class WebCrawler:
                      selected_pages.append(result['url'])
                      break
 
+        if self.config.get('pagespeed_sample_templates', False):
+            from src.core.pagespeed_runner import sample_by_template
+
+            max_pages = max(1, self.config.get('pagespeed_max_pages', 50))
+            candidates = [
+                result['url'] for result in self.crawl_results
+                if result.get('status_code') == 200 and result.get('is_internal')
+                and 'html' in (result.get('content_type') or 'text/html')
+            ]
+            for url in sample_by_template(candidates):
+                if len(selected_pages) >= max_pages:
+                    break
+                if url not in selected_pages:
+                    selected_pages.append(url)
+
         return selected_pages
 
-    def _call_pagespeed_api(self, url, strategy='mobile', retries=3):
-        """Call Google PageSpeed Insights API"""
-        import random
+    def _call_pagespeed_api(self, url, strategy='mobile', retries=3, should_continue=None):
+        """Call Google PageSpeed Insights API (rate limited per API key, see pagespeed_runner)"""
+        from src.core.pagespeed_runner import get_limiter
+
+        limiter = get_limiter(self.config.get('google_api_key'), self.config.get('pagespeed_requests_per_minute', 60))
 
         try:
             api_url = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
@@ -1752,6 +1992,12 @@ class WebCrawler:
                 params['key'] = self.config['google_api_key']
 
             for attempt in range(retries + 1):
+                if not limiter.acquire(should_continue):
+                    return {
+                        'success': False,
+                        'error': 'Daily PageSpeed API quota exhausted' if limiter.exhausted() else 'Cancelled',
+                        'strategy': strategy
+                    }
                 try:
                     response = requests.get(api_url, params=params, timeout=60)
 
@@ -1829,7 +2075,8 @@ class WebCrawler:
                         if metrics.get('cumulative_layout_shift') is None and metrics.get('field_cls') is not None:
                             metrics['cumulative_layout_shift'] = metrics['field_cls']
 
-                        print(f"Metrics extracted for {url}: FCP={metrics.get('first_contentful_paint')}, Field FCP={metrics.get('field_fcp')}")
+                        self.log.debug("Metrics extracted for %s: FCP=%s, Field FCP=%s",
+                                       url, metrics.get('first_contentful_paint'), metrics.get('field_fcp'))
 
                         return {
                             'success': True,
@@ -1839,10 +2086,11 @@ class WebCrawler:
                         }
 
                     elif response.status_code == 429:
-                        if attempt < retries:
-                            delay = (2 ** attempt) * random.uniform(0.5, 1.5)
-                            print(f"Rate limited, retrying in {delay:.1f} seconds...")
-                            time.sleep(delay)
+                        # Google names the exhausted quota in the error body
+                        daily = 'per day' in response.text.lower()
+                        limiter.backoff(attempt, daily=daily)
+                        if attempt < retries and not daily:
+                            self.log.info(f"PageSpeed API rate limited, pausing requests for this key ({strategy} {url})")
                             continue
 
                     return {
@@ -0,0 +1,258 @@
+"""
+Streaming exports
+Turns crawl rows (from the crawl DB or the live crawler) into CSV / JSON / XML
+one row at a time, so an export never holds the whole file in memory.
+"""
+import csv
+import json
+import time
+import zlib
+from fnmatch import fnmatch
+from io import StringIO
+from urllib.parse import urlparse
+from xml.sax.saxutils import escape, quoteattr
+
+# Text is handed to the WSGI server in chunks of roughly this size
+CHUNK_SIZE = 64 * 1024
+
+LINK_FIELDS = ['source_url', 'target_url', 'anchor_text', 'is_internal', 'target_domain', 'target_status', 'placement']
+ISSUE_FIELDS = ['url', 'type', 'category', 'issue', 'details']
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'json': 'application/json',
+    'xml': 'application/xml'
+}
+
+
+def format_csv_value(field, value):
+    """Flatten complex URL fields into a readable CSV cell"""
+    if field == 'analytics' and isinstance(value, dict):
+        analytics_list = []
+        if value.get('gtag') or value.get('ga4_id'): analytics_list.append('GA4')
+        if value.get('google_analytics'): analytics_list.append('GA')
+        if value.get('gtm_id'): analytics_list.append('GTM')
+        if value.get('facebook_pixel'): analytics_list.append('FB')
+        if value.get('hotjar'): analytics_list.append('HJ')
+        if value.get('mixpanel'): analytics_list.append('MP')
+        return ', '.join(analytics_list)
+    elif field == 'og_tags' and isinstance(value, dict):
+        return f"{len(value)} tags" if value else ''
+    elif field == 'twitter_tags' and isinstance(value, dict):
+        return f"{len(value)} tags" if value else ''
+    elif field == 'json_ld' and isinstance(value, list):
+        return f"{len(value)} scripts" if value else ''
+    elif field == 'images' and isinstance(value, list):
+        return f"{len(value)} images" if value else ''
+    elif field == 'internal_links' and isinstance(value, (int, float)):
+        return f"{int(value)} internal links" if value else '0 internal links'
+    elif field == 'external_links' and isinstance(value, (int, float)):
+        return f"{int(value)} external links" if value else '0 external links'
+    elif field in ('h2', 'h3') and isinstance(value, list):
+        return ', '.join(value[:3]) + ('...' if len(value) > 3 else '')
+    elif isinstance(value, (dict, list)):
+        return str(value)
+    return value
+
+
+def _csv_rows(header, rows):
+    """Yield CSV text line by line through a single reusable buffer"""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(header)
+    yield buffer.getvalue()
+
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def _export_date():
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+# ---------------------------------------------------------------------------
+# Crawled URLs
+# ---------------------------------------------------------------------------
+
+def stream_urls_csv(urls, fields):
+    rows = ([format_csv_value(field, url_data.get(field, '')) for field in fields] for url_data in urls)
+    return _csv_rows(fields, rows)
+
+
+def stream_urls_json(urls, fields):
+    """Same document as the old export; total_urls moves after the data since it is only known at the end"""
+    yield '{"export_date": %s, "fields": %s, "data": [' % (json.dumps(_export_date()), json.dumps(fields))
+    total = 0
+    for url_data in urls:
+        item = json.dumps({field: url_data.get(field, '') for field in fields}, default=str)
+        yield item if total == 0 else ',\n' + item
+        total += 1
+    yield '], "total_urls": %d}' % total
+
+
+def stream_urls_xml(urls, fields):
+    # total_urls is not known up front, it is written as a trailing element
+    yield '<librecrawl_export export_date=%s><urls>' % quoteattr(_export_date())
+    total = 0
+    for url_data in urls:
+        parts = ['<url>']
+        for field in fields:
+            parts.append(f'<{field}>{escape(str(url_data.get(field, "")))}</{field}>')
+        parts.append('</url>')
+        yield ''.join(parts)
+        total += 1
+    yield f'</urls><total_urls>{total}</total_urls></librecrawl_export>'
+
+
+# ---------------------------------------------------------------------------
+# Links
+# ---------------------------------------------------------------------------
+
+def apply_link_statuses(links, status_lookup):
+    """Fill target_status from the crawled URLs (fixes missing status codes in exports)"""
+    for link in links:
+        status = status_lookup.get(link.get('target_url'))
+        if status is not None:
+            link = dict(link, target_status=status)
+        yield link
+
+
+def stream_links_csv(links):
+    rows = ([
+        link.get('source_url', ''),
+        link.get('target_url', ''),
+        link.get('anchor_text', ''),
+        'Yes' if link.get('is_internal') else 'No',
+        link.get('target_domain', ''),
+        link.get('target_status') if link.get('target_status') is not None else 'Not crawled',
+        link.get('placement') or 'body'
+    ] for link in links)
+    return _csv_rows(LINK_FIELDS, rows)
+
+
+def stream_links_json(links):
+    yield '['
+    first = True
+    for link in links:
+        item = json.dumps(link, default=str)
+        yield item if first else ',\n' + item
+        first = False
+    yield ']'
+
+
+# ---------------------------------------------------------------------------
+# Issues
+# ---------------------------------------------------------------------------
+
+def _active_patterns(exclusion_patterns):
+    return [p for p in (exclusion_patterns or []) if p.strip() and not p.strip().startswith('#')]
+
+
+def is_issue_excluded(issue, patterns):
+    """True if the issue's URL path matches one of the exclusion patterns"""
+    path = urlparse(issue.get('url', '')).path
+    for pattern in patterns:
+        if '*' in pattern:
+            if fnmatch(path, pattern):
+                return True
+        elif path == pattern or path.startswith(pattern.rstrip('*')):
+            return True
+    return False
+
+
+def url_excluder(exclusion_patterns):
+    """exclude(url) -> bool for the active patterns, or None when nothing is excluded"""
+    patterns = _active_patterns(exclusion_patterns)
+    if not patterns:
+        return None
+    return lambda url: is_issue_excluded({'url': url}, patterns)
+
+
+def exclude_issues(issues, exclusion_patterns):
+    """Lazily drop issues matching the exclusion patterns (applies current settings to loaded crawls)"""
+    patterns = _active_patterns(exclusion_patterns)
+    if not patterns:
+        return iter(issues)
+    return (issue for issue in issues if not is_issue_excluded(issue, patterns))
+
+
+def stream_issues_csv(issues):
+    rows = ([issue.get(field, '') for field in ISSUE_FIELDS] for issue in issues)
+    return _csv_rows(ISSUE_FIELDS, rows)
+
+
+def stream_issues_json(issues):
+    """
+    Streams all_issues; the issues_by_url grouping is only four short strings
+    per issue, so it is collected on the way and written at the end.
+    """
+    yield '{"export_date": %s, "all_issues": [' % json.dumps(_export_date())
+    issues_by_url = {}
+    total = 0
+    for issue in issues:
+        item = json.dumps(issue, default=str)
+        yield item if total == 0 else ',\n' + item
+        total += 1
+        issues_by_url.setdefault(issue.get('url', ''), []).append({
+            'type': issue.get('type', ''),
+            'category': issue.get('category', ''),
+            'issue': issue.get('issue', ''),
+            'details': issue.get('details', '')
+        })
+    yield '], "total_issues": %d, "total_urls_with_issues": %d, "issues_by_url": ' % (total, len(issues_by_url))
+    yield json.dumps(issues_by_url, default=str)
+    yield '}'
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+STREAMERS = {
+    ('urls', 'csv'): stream_urls_csv,
+    ('urls', 'json'): stream_urls_json,
+    ('urls', 'xml'): stream_urls_xml,
+    ('links', 'csv'): stream_links_csv,
+    ('links', 'json'): stream_links_json,
+    ('issues', 'csv'): stream_issues_csv,
+    ('issues', 'json'): stream_issues_json
+}
+
+
+def stream_export(dataset, export_format, rows, fields=None):
+    """Text chunks for a dataset ('urls', 'links', 'issues') in the given format"""
+    streamer = STREAMERS.get((dataset, export_format))
+    if streamer is None:
+        raise ValueError(f'Unsupported export format for {dataset}: {export_format}')
+    if dataset == 'urls':
+        return streamer(rows, fields)
+    return streamer(rows)
+
+
+def encode_chunks(chunks, compress=False):
+    """Batch text chunks into ~CHUNK_SIZE UTF-8 blocks, optionally gzip-compressed"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending = []
+    pending_size = 0
+
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= CHUNK_SIZE:
+            data = ''.join(pending).encode('utf-8')
+            pending = []
+            pending_size = 0
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                yield data
+
+    data = ''.join(pending).encode('utf-8')
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
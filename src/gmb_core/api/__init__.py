@@ -2,7 +2,20 @@
 GMB Core API Module
 OAuth and GBP API client.
 """
-from .auth import GMBAuthManager
-from .client import GMBClient
+import importlib
+
+# Loaded on first access - the client imports googleapiclient
+_EXPORTS = {
+    'GMBAuthManager': '.auth',
+    'GMBClient': '.client',
+}
 
 __all__ = ['GMBAuthManager', 'GMBClient']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,24 @@
 """
 GMB Core Crawler Module
 Geo-targeted crawling and parsing for Google Maps.
+Exports are imported on first access, so importing the parsers does not
+start Playwright's import chain (geo_driver, grid_engine).
 """
-from .geo_driver import GeoCrawlerDriver
-from .parsers import GoogleMapsParser, LocalPackParser
-from .grid_engine import GridEngine
+import importlib
+
+_EXPORTS = {
+    'GeoCrawlerDriver': '.geo_driver',
+    'GoogleMapsParser': '.parsers',
+    'LocalPackParser': '.parsers',
+    'GridEngine': '.grid_engine',
+}
 
 __all__ = ['GeoCrawlerDriver', 'GoogleMapsParser', 'LocalPackParser', 'GridEngine']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,9 +4,7 @@ REST API endpoints for GMB authentication, locations, reviews, and grid scanning
 """
 from flask import Blueprint, request, jsonify, session, redirect
 from .api.auth import GMBAuthManager
-from .api.client import GMBClient
-from .crawler.geo_driver import GeoCrawlerDriver
-from .crawler.parsers import GoogleMapsParser
+from .crawler.parsers import GoogleMapsParser  # GeoCrawlerDriver (Playwright) is imported where it is used
 from .models import init_gmb_tables, save_location, save_review, get_cached_serp, save_serp_cache
 from .config import config
 from .logger import log
@@ -33,6 +31,7 @@ def get_auth_manager():
 
 def get_client():
     """Get GMBClient for current user."""
+    from .api.client import GMBClient  # googleapiclient is slow to import
     return GMBClient(get_user_id())
 
 
@@ -108,6 +107,7 @@ def search_business():
     
     try:
         # Initialize crawler
+        from .crawler.geo_driver import GeoCrawlerDriver
         driver = GeoCrawlerDriver(
             headless=config.CRAWLER_HEADLESS,
             proxy_url=config.PROXY_URL if config.PROXY_ENABLED else None
@@ -225,6 +225,7 @@ def resolve_business_url():
     
     try:
         # Initialize crawler
+        from .crawler.geo_driver import GeoCrawlerDriver
         driver = GeoCrawlerDriver(
             headless=config.CRAWLER_HEADLESS,
             proxy_url=config.PROXY_URL if config.PROXY_ENABLED else None
@@ -553,6 +554,7 @@ def preview_scan():
 
     # Run scan synchronously for preview (small delay acceptable)
     try:
+        from .crawler.geo_driver import GeoCrawlerDriver
         driver = GeoCrawlerDriver(
             headless=config.CRAWLER_HEADLESS,
             proxy_url=config.PROXY_URL if config.PROXY_ENABLED else None
@@ -1511,6 +1513,7 @@ def add_location_by_crawl():
     
     try:
         # Initialize crawler
+        from .crawler.geo_driver import GeoCrawlerDriver
         driver = GeoCrawlerDriver(
             headless=config.CRAWLER_HEADLESS,
             proxy_url=config.PROXY_URL if config.PROXY_ENABLED else None
@@ -1637,6 +1640,7 @@ def refresh_location_by_crawl(location_id):
         return jsonify({'success': False, 'error': 'Location not found'}), 404
     
     try:
+        from .crawler.geo_driver import GeoCrawlerDriver
         driver = GeoCrawlerDriver(
             headless=config.CRAWLER_HEADLESS,
             proxy_url=config.PROXY_URL if config.PROXY_ENABLED else None
@@ -0,0 +1,136 @@
+"""
+Import-time budget
+Imports the web app in a fresh interpreter under `python -X importtime` and
+fails (exit code 1) when the import takes longer than the budget or pulls in
+a module that should only load on first use:
+
+    python -m src.import_budget
+    python -m src.import_budget --budget-ms 500 --runs 5 --top 20
+
+The import runs in a throwaway directory against SQLite, so the databases
+main.py initialises at import are created there. Timings are the fastest of
+--runs imports; the report lists the heaviest imports made by the module.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded lazily by the features that need them (AI chat, trends, GMB, JavaScript rendering)
+DEFAULT_FORBIDDEN = ('google.generativeai', 'pytrends', 'trendspyg', 'pandas', 'playwright', 'googleapiclient')
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr):
+    """[(module, depth, self_us, cumulative_us)] from -X importtime output, in import order"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append((match.group(4), (len(match.group(3)) - 1) // 2, int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+def measure_import(module='main', argv=()):
+    """Import module in a new interpreter; returns its parsed -X importtime rows"""
+    workdir = tempfile.mkdtemp(prefix='librecrawl-imports-')
+    env = dict(os.environ)
+    env['DB_TYPE'] = 'sqlite'
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    code = f'import sys; sys.argv = {[module + ".py", *argv]!r}; import {module}'
+    try:
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=workdir, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    rows = parse_importtime(completed.stderr)
+    if completed.returncode != 0 or not any(name == module for name, _, _, _ in rows):
+        tail = '\n'.join(line for line in completed.stderr.splitlines() if not line.startswith('import time:'))
+        raise RuntimeError(f'import {module} failed:\n{tail[-2000:]}')
+    return rows
+
+
+def check_budget(module='main', budget_ms=750, forbidden=DEFAULT_FORBIDDEN, runs=3, top=15, argv=()):
+    """Report dict for the fastest of runs imports of module"""
+    best = None
+    for _ in range(max(1, runs)):
+        rows = measure_import(module, argv)
+        total = next(cumulative for name, depth, _, cumulative in rows if name == module and depth == 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+
+    # Imports made while the module body ran are listed (depth 1) just before it
+    index = next(position for position, row in enumerate(rows) if row[0] == module and row[1] == 0)
+    start = index
+    while start > 0 and rows[start - 1][1] > 0:
+        start -= 1
+    direct = [(name, cumulative) for name, depth, _, cumulative in rows[start:index] if depth == 1]
+    direct.sort(key=lambda item: item[1], reverse=True)
+
+    loaded = sorted({name for name, _, _, _ in rows
+                     if any(name == prefix or name.startswith(prefix + '.') for prefix in forbidden)})
+    loaded_roots = sorted({prefix for prefix in forbidden
+                           if any(name == prefix or name.startswith(prefix + '.') for name in loaded)})
+
+    return {
+        'module': module,
+        'total_ms': round(total / 1000, 1),
+        'self_ms': round(rows[index][2] / 1000, 1),
+        'budget_ms': budget_ms,
+        'modules': len(rows),
+        'heaviest': [{'module': name, 'ms': round(cumulative / 1000, 1)} for name, cumulative in direct[:top]],
+        'forbidden_loaded': loaded_roots,
+        'ok': total / 1000 <= budget_ms and not loaded_roots
+    }
+
+
+def format_report(report):
+    lines = [
+        f"import {report['module']}: {report['total_ms']} ms "
+        f"(budget {report['budget_ms']} ms, module body {report['self_ms']} ms, {report['modules']} modules)",
+        '',
+        'Heaviest imports:'
+    ]
+    for item in report['heaviest']:
+        lines.append(f"  {item['ms']:>8.1f} ms  {item['module']}")
+    if report['forbidden_loaded']:
+        lines.append('')
+        lines.append('Loaded at import but should load on first use: ' + ', '.join(report['forbidden_loaded']))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the import time of the LibreCrawl web app')
+    parser.add_argument('--module', default='main', help='Module to import (default: main)')
+    parser.add_argument('--budget-ms', type=float, default=750, help='Maximum cumulative import time')
+    parser.add_argument('--runs', type=int, default=3, help='Imports to run; the fastest counts')
+    parser.add_argument('--top', type=int, default=15, help='Heaviest imports to list')
+    parser.add_argument('--allow', action='append', default=[],
+                        help='Do not fail when this lazily-loaded module is imported (repeatable)')
+    parser.add_argument('--json', help='Write the report to this file')
+    args = parser.parse_args()
+
+    forbidden = tuple(name for name in DEFAULT_FORBIDDEN if name not in args.allow)
+    report = check_budget(args.module, args.budget_ms, forbidden, args.runs, args.top)
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if not report['ok']:
+        print(f"\nImport budget exceeded for {args.module}")
+        sys.exit(1)
+    print(f"\nWithin budget")
+
+
+if __name__ == '__main__':
+    main()
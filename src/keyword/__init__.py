@@ -3,21 +3,27 @@ Keyword Research Module
 Provides AI-enhanced keyword analysis tools.
 """
 
-from .ai_service import GeminiKeywordAI
-from .keyword_analyzer import KeywordDensityAnalyzer
-from .competitor_keywords import CompetitorKeywordResearcher
-from .keyword_data import KeywordDataService
-from .cannibalization import KeywordCannibalizationDetector
-from .content_mapper import ContentMapper
-from .research_workflow import KeywordResearchWorkflow, run_keyword_research
-from .normalizer import (
-    normalize,
-    get_word_count,
-    get_length_category,
-    get_keyword_metadata,
-    deduplicate_keywords,
-    batch_normalize
-)
+import importlib
+
+# name -> submodule. Loaded on first access: importing src.keyword.keyword_db
+# (done at app start) runs this file, and the AI and trends services behind
+# these names are only needed by the keyword tools.
+_EXPORTS = {
+    'GeminiKeywordAI': '.ai_service',
+    'KeywordDensityAnalyzer': '.keyword_analyzer',
+    'CompetitorKeywordResearcher': '.competitor_keywords',
+    'KeywordDataService': '.keyword_data',
+    'KeywordCannibalizationDetector': '.cannibalization',
+    'ContentMapper': '.content_mapper',
+    'KeywordResearchWorkflow': '.research_workflow',
+    'run_keyword_research': '.research_workflow',
+    'normalize': '.normalizer',
+    'get_word_count': '.normalizer',
+    'get_length_category': '.normalizer',
+    'get_keyword_metadata': '.normalizer',
+    'deduplicate_keywords': '.normalizer',
+    'batch_normalize': '.normalizer',
+}
 
 __all__ = [
     'GeminiKeywordAI',
@@ -36,3 +42,11 @@ __all__ = [
     'deduplicate_keywords',
     'batch_normalize'
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
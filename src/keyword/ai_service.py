@@ -4,6 +4,7 @@ Provides AI-powered keyword analysis, expansion, and recommendations.
 Uses the free tier of Google Gemini API (1500 requests/day).
 """
 
+import importlib.util
 import os
 import json
 import re
@@ -14,15 +15,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-# Try to import google.generativeai
-GEMINI_AVAILABLE = False
-genai = None
-
+# Check for google.generativeai without importing it - calls go through the REST API,
+# and importing the SDK (grpc, protobuf types) takes half a second at startup
 try:
-    import google.generativeai as _genai
-    genai = _genai
-    GEMINI_AVAILABLE = True
-except ImportError:
+    GEMINI_AVAILABLE = importlib.util.find_spec('google.generativeai') is not None
+except (ImportError, ValueError):
+    GEMINI_AVAILABLE = False
+if not GEMINI_AVAILABLE:
     logger.warning("google-generativeai not installed. Run: pip install google-generativeai")
 
 
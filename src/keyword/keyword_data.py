@@ -9,42 +9,60 @@ import logging
 import requests
 from typing import Optional, List, Dict
 from urllib.parse import quote_plus
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
-# Try to import trendspyg (modern alternative, primary choice)
+# Trends libraries pull in pandas, so they are imported by the first
+# KeywordDataService rather than when the app starts (see _load_trends_libraries)
 TRENDSPYG_AVAILABLE = False
 download_google_trends_rss = None
 download_google_trends_csv = None
 
-try:
-    from trendspyg import download_google_trends_rss as _download_rss
-    download_google_trends_rss = _download_rss
-    TRENDSPYG_AVAILABLE = True
-    logger.info("trendspyg loaded successfully (primary trends source)")
-except ImportError:
-    logger.warning("trendspyg not installed. Run: pip install trendspyg")
-
-# Try to import trendspyg CSV downloader for more comprehensive data
-try:
-    from trendspyg import download_google_trends_csv as _download_csv
-    download_google_trends_csv = _download_csv
-except ImportError:
-    pass
-
-# Try to import pytrends as fallback
 PYTRENDS_AVAILABLE = False
 TrendReq = None
 
-try:
-    from pytrends.request import TrendReq as _TrendReq
-    TrendReq = _TrendReq
-    PYTRENDS_AVAILABLE = True
-    logger.info("pytrends available as fallback")
-except ImportError:
-    if not TRENDSPYG_AVAILABLE:
-        logger.warning("No trends library available. Install: pip install trendspyg")
+_trends_loaded = False
+_trends_lock = threading.Lock()
+
+
+def _load_trends_libraries():
+    """Import trendspyg (primary) and pytrends (fallback) once, on first use"""
+    global TRENDSPYG_AVAILABLE, download_google_trends_rss, download_google_trends_csv
+    global PYTRENDS_AVAILABLE, TrendReq, _trends_loaded
+
+    with _trends_lock:
+        if _trends_loaded:
+            return
+
+        # Try to import trendspyg (modern alternative, primary choice)
+        try:
+            from trendspyg import download_google_trends_rss as _download_rss
+            download_google_trends_rss = _download_rss
+            TRENDSPYG_AVAILABLE = True
+            logger.info("trendspyg loaded successfully (primary trends source)")
+        except ImportError:
+            logger.warning("trendspyg not installed. Run: pip install trendspyg")
+
+        # Try to import trendspyg CSV downloader for more comprehensive data
+        try:
+            from trendspyg import download_google_trends_csv as _download_csv
+            download_google_trends_csv = _download_csv
+        except ImportError:
+            pass
+
+        # Try to import pytrends as fallback
+        try:
+            from pytrends.request import TrendReq as _TrendReq
+            TrendReq = _TrendReq
+            PYTRENDS_AVAILABLE = True
+            logger.info("pytrends available as fallback")
+        except ImportError:
+            if not TRENDSPYG_AVAILABLE:
+                logger.warning("No trends library available. Install: pip install trendspyg")
+
+        _trends_loaded = True
 
 
 class KeywordDataService:
@@ -66,6 +84,8 @@ class KeywordDataService:
             language: Language code (e.g., 'en', 'hi')
             geo: Geographic location (e.g., 'US', 'IN')
         """
+        _load_trends_libraries()
+
         self.language = language
         self.geo = geo
         self.pytrends = None
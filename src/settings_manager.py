@@ -27,10 +27,11 @@ class SettingsManager:
         user_settings = [
             # Crawler tab
             'maxDepth', 'maxUrls', 'crawlDelay', 'followRedirects', 'crawlExternalLinks', 'crawlSubdomains', 'trapThreshold',
+            'prioritizeFrontier', 'linkedFromLimit',
             # Export tab
             'exportFormat', 'exportFields',
             # Issues tab
-            'issueExclusionPatterns'
+            'issueExclusionPatterns', 'disabledIssueRules'
         ]
 
         # extra: all in user + Filters, Requests, Custom CSS, JavaScript tabs
@@ -39,7 +40,8 @@ class SettingsManager:
         extra_settings = user_settings + [
             # Requests tab
             'userAgent', 'timeout', 'retries', 'acceptLanguage', 'respectRobotsTxt', 'allowCookies',
-            'discoverSitemaps', 'enablePageSpeed', 'googleApiKey',
+            'discoverSitemaps', 'enablePageSpeed', 'googleApiKey', 'pageSpeedConcurrency',
+            'pageSpeedRequestsPerMinute', 'pageSpeedCacheHours', 'pageSpeedSampleTemplates', 'pageSpeedMaxPages',
             # Filters tab
             'includeExtensions', 'excludeExtensions', 'includePatterns', 'excludePatterns', 'maxFileSize',
             # JavaScript tab
@@ -80,6 +82,8 @@ class SettingsManager:
             'crawlExternalLinks': False,
             'crawlSubdomains': True,
             'trapThreshold': 100,  # URL pattern repetition limit
+            'prioritizeFrontier': True,  # Crawl important pages first (inlinks, depth, sitemap)
+            'linkedFromLimit': 0,  # Linking pages stored per URL (0 = all; counts stay exact)
 
             # Request settings
             'userAgent': 'LibreCrawl/1.0 (Web Crawler)',
@@ -91,6 +95,11 @@ class SettingsManager:
             'discoverSitemaps': True,
             'enablePageSpeed': False,
             'googleApiKey': '',
+            'pageSpeedConcurrency': 4,  # Parallel PageSpeed API calls
+            'pageSpeedRequestsPerMinute': 60,  # Per API key, shared by all crawls in the process
+            'pageSpeedCacheHours': 24,  # Reuse results for the same URL and strategy (0 = off)
+            'pageSpeedSampleTemplates': False,  # Also analyse one page per URL template
+            'pageSpeedMaxPages': 50,
 
             # Filter settings
             'includeExtensions': 'html,htm,php,asp,aspx,jsp',
@@ -111,10 +120,12 @@ class SettingsManager:
             'concurrency': 5,
             'memoryLimit': 512,
             'logLevel': 'INFO',
+            'responseCacheMode': 'off',  # off, record, cache or replay (stored HTTP responses)
             'saveSession': False,
             'enableProxy': False,
             'proxyUrl': '',
             'customHeaders': '',
+            'distributedWorkers': 0,  # Worker processes for sharded crawls (0 = off)
 
             # JavaScript rendering settings
             'enableJavaScript': False,
@@ -130,6 +141,9 @@ class SettingsManager:
             # Custom CSS styling
             'customCSS': '',
 
+            # Issue rules to skip (comma or newline separated ids, see /api/issues/rules)
+            'disabledIssueRules': '',
+
             # Issue exclusion patterns
             'issueExclusionPatterns': '''# WordPress admin & system paths
 /wp-admin/*
@@ -409,6 +423,13 @@ class SettingsManager:
             return self.save_settings(self.current_settings)
         return False, f"Unknown setting key: {key}"
 
+    def reload(self):
+        """Re-read saved settings (another server process may have changed them)"""
+        # Without a user the settings live in this process only; main.py runs local
+        # mode (the one tier that can change them) as a single process
+        if self.user_id:
+            self.current_settings = self.load_settings()
+
     def reset_settings(self):
         """Reset settings to defaults"""
         # Get fresh defaults from the method to ensure latest patterns are used
@@ -432,7 +453,13 @@ class SettingsManager:
                 'retries': (0, 10),
                 'maxFileSize': (1, 1000),
                 'concurrency': (1, 50),
+                'distributedWorkers': (0, 64),
                 'trapThreshold': (10, 1000),
+                'linkedFromLimit': (0, 1000000),
+                'pageSpeedConcurrency': (1, 16),
+                'pageSpeedRequestsPerMinute': (1, 240),
+                'pageSpeedCacheHours': (0, 168),
+                'pageSpeedMaxPages': (1, 500),
                 'memoryLimit': (64, 4096),
                 'jsWaitTime': (0, 30),
                 'jsTimeout': (5, 120),
@@ -454,6 +481,13 @@ class SettingsManager:
                 if key in settings and not settings[key].strip():
                     return False
 
+            rules = settings.get('disabledIssueRules', '')
+            if not isinstance(rules, str) and not (isinstance(rules, list) and all(isinstance(r, str) for r in rules)):
+                return False
+
+            if settings.get('responseCacheMode', 'off') not in ('off', 'record', 'cache', 'replay'):
+                return False
+
             # Validate export fields is a list
             if 'exportFields' in settings and not isinstance(settings['exportFields'], list):
                 return False
@@ -485,6 +519,8 @@ class SettingsManager:
             'crawl_external': settings['crawlExternalLinks'],
             'crawl_subdomains': settings['crawlSubdomains'],
             'trap_threshold': settings.get('trapThreshold', 100),
+            'frontier_strategy': 'priority' if settings.get('prioritizeFrontier', True) else 'fifo',
+            'linked_from_limit': settings.get('linkedFromLimit', 0),
             'user_agent': settings['userAgent'],
             'timeout': settings['timeout'],
             'retries': settings['retries'],
@@ -497,14 +533,21 @@ class SettingsManager:
             'exclude_patterns': [p.strip() for p in settings['excludePatterns'].split('\n') if p.strip()],
             'max_file_size': settings['maxFileSize'] * 1024 * 1024,  # Convert MB to bytes
             'concurrency': settings['concurrency'],
+            'distributed_workers': settings.get('distributedWorkers', 0),
             'memory_limit': settings['memoryLimit'] * 1024 * 1024,  # Convert MB to bytes
             'log_level': settings['logLevel'],
+            'response_cache_mode': settings.get('responseCacheMode', 'off'),
             'enable_proxy': settings['enableProxy'],
             'proxy_url': settings['proxyUrl'] if settings['enableProxy'] else None,
             'custom_headers': self._parse_custom_headers(settings['customHeaders']),
             'discover_sitemaps': settings['discoverSitemaps'],
             'enable_pagespeed': settings['enablePageSpeed'],
             'google_api_key': settings['googleApiKey'],
+            'pagespeed_concurrency': settings.get('pageSpeedConcurrency', 4),
+            'pagespeed_requests_per_minute': settings.get('pageSpeedRequestsPerMinute', 60),
+            'pagespeed_cache_hours': settings.get('pageSpeedCacheHours', 24),
+            'pagespeed_sample_templates': settings.get('pageSpeedSampleTemplates', False),
+            'pagespeed_max_pages': settings.get('pageSpeedMaxPages', 50),
             'enable_javascript': settings['enableJavaScript'],
             'js_wait_time': settings['jsWaitTime'],
             'js_timeout': settings['jsTimeout'],
@@ -515,10 +558,19 @@ class SettingsManager:
             'js_viewport_height': settings['jsViewportHeight'],
             'js_max_concurrent_pages': settings['jsMaxConcurrentPages'],
             'issue_exclusion_patterns': [p.strip() for p in settings['issueExclusionPatterns'].split('\n') if p.strip()],
+            'disabled_issue_rules': self._parse_rule_ids(settings.get('disabledIssueRules', '')),
             'enable_duplication_check': settings['enableDuplicationCheck'],
             'duplication_threshold': settings['duplicationThreshold']
         }
 
+    def _parse_rule_ids(self, value):
+        """Issue rule ids from a comma/newline separated string or a list"""
+        if isinstance(value, (list, tuple)):
+            items = [str(item) for item in value]
+        else:
+            items = str(value or '').replace(',', '\n').split('\n')
+        return [item.strip() for item in items if item.strip()]
+
     def _parse_custom_headers(self, headers_text):
         """Parse custom headers from text format"""
         headers = {}
@@ -0,0 +1,88 @@
+"""
+Web server process pool
+Serves the app from several processes that share one listening socket:
+
+    python main.py --processes 4 --threads 8
+
+The supervisor binds the socket and starts N copies of main.py, each running
+Waitress on the inherited socket. The kernel spreads connections between them
+and processes that exit are restarted. No request has to reach a particular
+process: sessions are signed cookies, crawls run in the job queue (forced on
+with --processes > 1), settings are re-read from the database, and a crawl
+loaded into a session is reopened by whichever process serves it.
+"""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+# Seconds between liveness checks of the server processes
+CHECK_INTERVAL = 2
+# Seconds a process gets to finish its requests on shutdown
+SHUTDOWN_TIMEOUT = 10
+
+
+def bind_socket(host, port, backlog=1024):
+    """Listening socket the server processes inherit"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _start_process(script, argv, fd):
+    return subprocess.Popen([sys.executable, script, *argv, '--listen-fd', str(fd)], pass_fds=(fd,))
+
+
+def run_pool(script, argv, host, port, processes):
+    """Bind host:port and keep processes copies of script serving it until SIGINT/SIGTERM"""
+    if os.name == 'nt':
+        raise RuntimeError('--processes needs socket inheritance (Linux/macOS); run one process per port instead')
+
+    sock = bind_socket(host, port)
+    fd = sock.fileno()
+
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    workers = {index: _start_process(script, argv, fd) for index in range(processes)}
+    print(f"Web server pool running with {processes} processes on http://{host}:{port}")
+
+    try:
+        while not stopping:
+            time.sleep(CHECK_INTERVAL)
+            for index, process in list(workers.items()):
+                if process.poll() is not None and not stopping:
+                    print(f"Web server process {index} exited with code {process.returncode}, restarting")
+                    workers[index] = _start_process(script, argv, fd)
+    finally:
+        print("Stopping web server pool...")
+        for process in workers.values():
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+        deadline = time.time() + SHUTDOWN_TIMEOUT
+        for process in workers.values():
+            try:
+                process.wait(timeout=max(0.1, deadline - time.time()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+        sock.close()
+
+
+def serve_inherited(app, fd, threads):
+    """Run Waitress on the socket passed down by run_pool"""
+    from waitress import serve
+
+    sock = socket.socket(fileno=fd)
+    print(f"Web server process {os.getpid()} serving with {threads} threads")
+    serve(app, sockets=[sock], threads=threads)
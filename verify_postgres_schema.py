@@ -57,6 +57,12 @@ EXPECTED_SCHEMA = {
         'severity', 'created_at'
     ],
     'audit_insights': ['id', 'crawl_id', 'insights_json', 'created_at', 'updated_at'],
+    'audit_summaries': ['id', 'crawl_id', 'summary_json', 'created_at', 'updated_at'],
+    'crawl_jobs': [
+        'id', 'job_id', 'crawl_id', 'user_id', 'session_id', 'client_id', 'start_url',
+        'config_snapshot', 'status', 'control', 'worker_id', 'heartbeat_at', 'rule_stats',
+        'retry_count', 'max_retries', 'error_message', 'created_at', 'started_at', 'completed_at'
+    ],
     
     # From keyword_db.py
     'keyword_history': [
@@ -7,6 +7,8 @@ let crawlState = {
     urls: [],
     links: [],
     issues: [],
+    lazyCrawlId: null, // crawl whose tables page in from the database
+    urlFacets: null,
     stats: {
         discovered: 0,
         crawled: 0,
@@ -38,6 +40,11 @@ let virtualScrollers = {
     issues: null
 };
 
+// Database pagers of a loaded crawl's tables, keyed like virtualScrollers
+let lazyTables = {};
+// URLs opened in the details panel that no loaded page holds
+let lazyUrlDetails = new Map();
+
 // Initialize application
 document.addEventListener('DOMContentLoaded', async function() {
     await initializeApp();
@@ -68,8 +75,8 @@ async function initializeApp() {
         sessionStorage.removeItem('force_ui_refresh');
 
         try {
-            // Fetch the loaded data immediately with FULL refresh (no incremental)
-            const response = await fetch('/api/crawl_status');
+            // Stats and counts only - a loaded crawl's tables page in from the database
+            const response = await fetch('/api/crawl_status?rows=0');
             const data = await response.json();
 
             // DEBUG: Log the full response
@@ -91,36 +98,38 @@ async function initializeApp() {
                 document.getElementById('urlInput').value = crawlState.baseUrl;
             }
 
-            // Add each URL to tables
-            if (data.urls && data.urls.length > 0) {
-                data.urls.forEach(url => addUrlToTable(url));
-            }
+            if (data.lazy) {
+                // Saved crawl - bind the tables to the database instead of downloading it
+                await bindLoadedCrawlTables(data.crawl_id);
+            } else {
+                // Add each URL to tables
+                if (data.urls && data.urls.length > 0) {
+                    data.urls.forEach(url => addUrlToTable(url));
+                }
 
-            // Load links if present
-            if (data.links && data.links.length > 0) {
-                crawlState.pendingLinks = data.links;
-                // If links tab is active, load them immediately
-                if (isLinksTabActive()) {
-                    updateLinksTable(data.links);
+                // Load links if present
+                if (data.links && data.links.length > 0) {
+                    crawlState.pendingLinks = data.links;
+                    // If links tab is active, load them immediately
+                    if (isLinksTabActive()) {
+                        updateLinksTable(data.links);
+                    }
                 }
-            }
 
-            // Load issues if present
-            if (data.issues && data.issues.length > 0) {
-                crawlState.pendingIssues = data.issues;
-                // If issues tab is active, load them immediately
-                if (isIssuesTabActive()) {
-                    updateIssuesTable(data.issues);
-                } else {
-                    // Update badge count even if tab not active
-                    const issuesTabButton = Array.from(document.querySelectorAll('.tab-btn')).find(btn => btn.textContent.includes('Issues'));
-                    if (issuesTabButton && data.issues.length > 0) {
-                        const errorCount = data.issues.filter(i => i.type === 'error').length;
-                        const warningCount = data.issues.filter(i => i.type === 'warning').length;
-                        let badgeColor = '#3b82f6';
-                        if (errorCount > 0) badgeColor = '#ef4444';
-                        else if (warningCount > 0) badgeColor = '#f59e0b';
-                        issuesTabButton.innerHTML = `Issues <span style="background: ${badgeColor}; color: white; padding: 2px 6px; border-radius: 12px; font-size: 12px;">${data.issues.length}</span>`;
+                // Load issues if present
+                if (data.issues && data.issues.length > 0) {
+                    crawlState.pendingIssues = data.issues;
+                    // If issues tab is active, load them immediately
+                    if (isIssuesTabActive()) {
+                        updateIssuesTable(data.issues);
+                    } else {
+                        // Update badge count even if tab not active
+                        setIssueCounts(
+                            data.issues.length,
+                            data.issues.filter(i => i.type === 'error').length,
+                            data.issues.filter(i => i.type === 'warning').length,
+                            data.issues.filter(i => i.type === 'info').length
+                        );
                     }
                 }
             }
@@ -149,13 +158,14 @@ async function initializeApp() {
                 pollCrawlProgress();
             } else {
                 // Crawl is not running, just loaded data
-                updateStatus(`Loaded crawl: ${data.stats.crawled} URLs, ${data.links?.length || 0} links, ${data.issues?.length || 0} issues`);
+                const counts = data.counts || { links: data.links?.length || 0, issues: data.issues?.length || 0 };
+                updateStatus(`Loaded crawl: ${data.stats.crawled} URLs, ${counts.links} links, ${counts.issues} issues`);
             }
 
             console.log('Loaded crawl from database:', {
-                urls: data.urls?.length || 0,
-                links: data.links?.length || 0,
-                issues: data.issues?.length || 0,
+                urls: data.counts?.urls ?? data.urls?.length ?? 0,
+                links: data.counts?.links ?? data.links?.length ?? 0,
+                issues: data.counts?.issues ?? data.issues?.length ?? 0,
                 stats: data.stats,
                 status: data.status,
                 isRunning: crawlState.isRunning
@@ -172,6 +182,199 @@ async function initializeApp() {
     console.log('LibreCrawl initialized');
 }
 
+// Rows per request when a loaded crawl's table pages in
+const LAZY_PAGE_SIZE = 200;
+
+// Dataset each results table pages through
+const LAZY_TABLE_DATASETS = {
+    overview: 'urls',
+    internal: 'urls',
+    external: 'urls',
+    internalLinks: 'links',
+    externalLinks: 'links',
+    issues: 'issues'
+};
+
+// One results table of a loaded crawl, filled from /api/crawls/<id>/<dataset>
+// a page at a time as it scrolls; load() restarts it with new filters
+class CrawlTablePager {
+    constructor(crawlId, scrollerName, dataset) {
+        this.crawlId = crawlId;
+        this.scrollerName = scrollerName;
+        this.dataset = dataset;
+        this.params = null;
+        this.cursor = null;
+        this.hasMore = false;
+        this.loading = false;
+        this.generation = 0; // bumped on every reload so stale responses are dropped
+    }
+
+    get scroller() {
+        return virtualScrollers[this.scrollerName];
+    }
+
+    // params: query filters, or null for a table that cannot match anything
+    load(params) {
+        this.generation++;
+        this.params = params;
+        this.cursor = null;
+        this.hasMore = params !== null;
+        this.loading = false;
+        this.scroller.setData([]);
+        return this.loadMore();
+    }
+
+    close() {
+        this.generation++;
+        this.hasMore = false;
+    }
+
+    async loadMore() {
+        if (this.loading || !this.hasMore) return;
+        this.loading = true;
+        const generation = this.generation;
+
+        try {
+            let rows = [];
+            // Issue pages can come back empty (exclusion patterns) with more to follow
+            while (!rows.length && this.hasMore) {
+                const query = new URLSearchParams({ ...this.params, limit: LAZY_PAGE_SIZE });
+                if (this.cursor) query.set('cursor', this.cursor);
+
+                const response = await fetch(`/api/crawls/${this.crawlId}/${this.dataset}?${query}`);
+                const page = await response.json();
+                if (generation !== this.generation) return;
+                if (!page.success) throw new Error(page.error || `HTTP ${response.status}`);
+
+                rows = page.rows || [];
+                this.cursor = page.next_cursor;
+                this.hasMore = page.has_more;
+            }
+            this.loading = false;
+            if (rows.length) {
+                this.scroller.appendData(rows);
+            }
+        } catch (error) {
+            if (generation !== this.generation) return;
+            this.hasMore = false;
+            console.error(`Error loading ${this.dataset}:`, error);
+            showNotification(`Could not load ${this.dataset}: ${error.message}`, 'error');
+        } finally {
+            if (generation === this.generation) this.loading = false;
+        }
+    }
+}
+
+// A crawl loaded from the database is not pulled into the browser: its tables
+// page in as they scroll or filter, filter counts come from the URL facets and
+// issue counts from the issue summary
+async function bindLoadedCrawlTables(crawlId) {
+    crawlState.lazyCrawlId = crawlId;
+    Object.entries(LAZY_TABLE_DATASETS).forEach(([scrollerName, dataset]) => {
+        const scroller = virtualScrollers[scrollerName];
+        if (!scroller) return;
+        const pager = new CrawlTablePager(crawlId, scrollerName, dataset);
+        lazyTables[scrollerName] = pager;
+        scroller.onNearEnd = () => pager.loadMore();
+    });
+
+    try {
+        const [facets, summary] = await Promise.all([
+            fetch(`/api/crawls/${crawlId}/url_facets`).then(response => response.json()),
+            fetch('/api/issues/summary').then(response => response.json())
+        ]);
+        crawlState.urlFacets = facets.success ? facets.facets : [];
+
+        if (summary.success) {
+            const byType = summary.summary.by_type;
+            setIssueCounts(summary.summary.total, byType.error || 0, byType.warning || 0, byType.info || 0);
+
+            const emptyState = document.getElementById('issuesEmptyState');
+            const issuesTable = document.getElementById('issuesTable');
+            if (emptyState) emptyState.style.display = summary.summary.total ? 'none' : 'block';
+            if (issuesTable) issuesTable.style.display = summary.summary.total ? 'table' : 'none';
+        }
+    } catch (error) {
+        console.error('Error loading crawl counts:', error);
+        crawlState.urlFacets = [];
+    }
+
+    reloadLazyUrlTables();
+    reloadLazyLinkTables();
+    reloadLazyIssueTable();
+}
+
+function unbindLoadedCrawlTables() {
+    Object.values(lazyTables).forEach(pager => pager.close());
+    Object.keys(LAZY_TABLE_DATASETS).forEach(scrollerName => {
+        if (virtualScrollers[scrollerName]) virtualScrollers[scrollerName].onNearEnd = null;
+    });
+    lazyTables = {};
+    lazyUrlDetails = new Map();
+    crawlState.lazyCrawlId = null;
+    crawlState.urlFacets = null;
+}
+
+// Query filters of a URL table under the active sidebar filter (null: nothing can match)
+function lazyUrlParams(scrollerName, filterType) {
+    const params = {};
+    if (scrollerName !== 'overview') {
+        params.is_internal = scrollerName === 'internal' ? 1 : 0;
+    }
+
+    if (filterType === 'internal' || filterType === 'external') {
+        const internal = filterType === 'internal' ? 1 : 0;
+        if (params.is_internal !== undefined && params.is_internal !== internal) return null;
+        params.is_internal = internal;
+    } else if (/^[2-5]xx$/.test(filterType || '')) {
+        params.status_class = filterType[0];
+    } else if (filterType) {
+        params.content_class = filterType;
+    }
+    return params;
+}
+
+function reloadLazyUrlTables() {
+    ['overview', 'internal', 'external'].forEach(scrollerName => {
+        const pager = lazyTables[scrollerName];
+        if (pager) pager.load(lazyUrlParams(scrollerName, crawlState.filters.active));
+    });
+}
+
+function reloadLazyLinkTables() {
+    const linksFilter = crawlState.filters.linksFilter;
+    [
+        ['internalLinks', 1, linksFilter.internalStatusCode, linksFilter.internalSearch],
+        ['externalLinks', 0, linksFilter.externalStatusCode, linksFilter.externalSearch]
+    ].forEach(([scrollerName, internal, statusFilter, search]) => {
+        const pager = lazyTables[scrollerName];
+        if (!pager) return;
+        const params = { is_internal: internal };
+        if (statusFilter && statusFilter !== 'all') params.status_class = statusFilter[0];
+        if (search) params.q = search;
+        pager.load(params);
+    });
+}
+
+function reloadLazyIssueTable() {
+    const pager = lazyTables.issues;
+    if (!pager) return;
+    const filterType = crawlState.filters.issueFilter;
+    pager.load(filterType && filterType !== 'all' ? { type: filterType } : {});
+}
+
+// URL facets of a loaded crawl that a sidebar filter keeps
+function facetMatchesFilter(facet, filterType) {
+    if (!filterType) return true;
+    if (filterType === 'internal') return facet.is_internal;
+    if (filterType === 'external') return !facet.is_internal;
+    if (/^[2-5]xx$/.test(filterType)) {
+        const low = parseInt(filterType[0]) * 100;
+        return facet.status_code >= low && (filterType === '5xx' || facet.status_code < low + 100);
+    }
+    return facet.content_class === filterType;
+}
+
 function setupEventListeners() {
     // URL input enter key
     document.getElementById('urlInput').addEventListener('keypress', handleUrlKeypress);
@@ -767,6 +970,10 @@ function updateLinksTable(links) {
 }
 
 function applyLinksFilter() {
+    if (crawlState.lazyCrawlId) {
+        reloadLazyLinkTables();
+        return;
+    }
     if (!crawlState.links || crawlState.links.length === 0) return;
 
     // Separate internal and external links
@@ -877,11 +1084,7 @@ function updateIssuesTable(issues) {
         else if (issue.type === 'info') infoCount++;
     });
 
-    // Update filter counts
-    document.getElementById('issues-all-count').textContent = `(${issues.length})`;
-    document.getElementById('issues-error-count').textContent = `(${errorCount})`;
-    document.getElementById('issues-warning-count').textContent = `(${warningCount})`;
-    document.getElementById('issues-info-count').textContent = `(${infoCount})`;
+    setIssueCounts(issues.length, errorCount, warningCount, infoCount);
 
     // Show/hide empty state
     if (issues.length === 0) {
@@ -896,11 +1099,18 @@ function updateIssuesTable(issues) {
             virtualScrollers.issues.setData(issues);
         }
     }
+}
+
+// Issue filter counts and the count badge on the Issues tab button
+function setIssueCounts(totalIssues, errorCount, warningCount, infoCount) {
+    document.getElementById('issues-all-count').textContent = `(${totalIssues})`;
+    document.getElementById('issues-error-count').textContent = `(${errorCount})`;
+    document.getElementById('issues-warning-count').textContent = `(${warningCount})`;
+    document.getElementById('issues-info-count').textContent = `(${infoCount})`;
 
     // Update issue count in tab button (find the button, not the tab content)
     const issuesTabButton = Array.from(document.querySelectorAll('.tab-btn')).find(btn => btn.textContent.includes('Issues'));
     if (issuesTabButton) {
-        const totalIssues = issues.length;
         if (totalIssues > 0) {
             let badgeColor = '#3b82f6';
             if (errorCount > 0) badgeColor = '#ef4444';
@@ -914,6 +1124,8 @@ function updateIssuesTable(issues) {
 }
 
 function clearAllTables() {
+    unbindLoadedCrawlTables();
+
     // Clear virtual scrollers if they exist
     if (virtualScrollers.overview) {
         virtualScrollers.overview.clear();
@@ -1102,7 +1314,9 @@ function filterIssues(filterType) {
     });
 
     // Filter issues data and update virtual scroller
-    if (window.currentIssues && virtualScrollers.issues) {
+    if (crawlState.lazyCrawlId) {
+        reloadLazyIssueTable();
+    } else if (window.currentIssues && virtualScrollers.issues) {
         let filteredIssues = window.currentIssues;
 
         if (filterType !== 'all') {
@@ -1130,9 +1344,13 @@ function applyFilter(filterType) {
     crawlState.filters.active = filterType;
 
     // Filter the data arrays and update virtual scrollers
-    filterVirtualScrollerData('overview', filterType);
-    filterVirtualScrollerData('internal', filterType);
-    filterVirtualScrollerData('external', filterType);
+    if (crawlState.lazyCrawlId) {
+        reloadLazyUrlTables();
+    } else {
+        filterVirtualScrollerData('overview', filterType);
+        filterVirtualScrollerData('internal', filterType);
+        filterVirtualScrollerData('external', filterType);
+    }
 
     // Update Status Codes table with filtered data
     updateStatusCodesTable(filterType);
@@ -1144,16 +1362,20 @@ function clearActiveFilters() {
     crawlState.filters.active = null;
 
     // Reset all virtual scrollers to show full data
-    if (virtualScrollers.overview) {
-        virtualScrollers.overview.setData(crawlState.urls);
-    }
-    if (virtualScrollers.internal) {
-        const internalUrls = crawlState.urls.filter(url => url.is_internal);
-        virtualScrollers.internal.setData(internalUrls);
-    }
-    if (virtualScrollers.external) {
-        const externalUrls = crawlState.urls.filter(url => !url.is_internal);
-        virtualScrollers.external.setData(externalUrls);
+    if (crawlState.lazyCrawlId) {
+        reloadLazyUrlTables();
+    } else {
+        if (virtualScrollers.overview) {
+            virtualScrollers.overview.setData(crawlState.urls);
+        }
+        if (virtualScrollers.internal) {
+            const internalUrls = crawlState.urls.filter(url => url.is_internal);
+            virtualScrollers.internal.setData(internalUrls);
+        }
+        if (virtualScrollers.external) {
+            const externalUrls = crawlState.urls.filter(url => !url.is_internal);
+            virtualScrollers.external.setData(externalUrls);
+        }
     }
 
     // Reset Status Codes table to show all data
@@ -1253,6 +1475,17 @@ function updateFilterCounts() {
         images: 0
     };
 
+    if (crawlState.lazyCrawlId) {
+        // Loaded crawl - counts come from the URL facets
+        (crawlState.urlFacets || []).forEach(facet => {
+            counts[facet.is_internal ? 'internal' : 'external'] += facet.count;
+            ['2xx', '3xx', '4xx', '5xx'].forEach(statusClass => {
+                if (facetMatchesFilter(facet, statusClass)) counts[statusClass] += facet.count;
+            });
+            if (facet.content_class in counts) counts[facet.content_class] += facet.count;
+        });
+    }
+
     crawlState.urls.forEach(url => {
         // Count by internal/external using corrected logic
         if (isInternalURL(url.url)) counts.internal++;
@@ -1288,8 +1521,17 @@ function updateStatusCodesTable(filterType = null) {
 
     // Count status codes, respecting current filter
     const statusCounts = {};
+    let totalUrls = 0;
     let filteredUrls = crawlState.urls;
 
+    if (crawlState.lazyCrawlId) {
+        // Loaded crawl - sum the URL facets the filter keeps
+        (crawlState.urlFacets || []).filter(facet => facetMatchesFilter(facet, filterType)).forEach(facet => {
+            statusCounts[facet.status_code] = (statusCounts[facet.status_code] || 0) + facet.count;
+            totalUrls += facet.count;
+        });
+    }
+
     // Apply filter if specified
     if (filterType === 'internal') {
         filteredUrls = crawlState.urls.filter(url => isInternalURL(url.url));
@@ -1325,7 +1567,7 @@ function updateStatusCodesTable(filterType = null) {
         filteredUrls = crawlState.urls.filter(url => (url.content_type || '').includes('image'));
     }
 
-    let totalUrls = filteredUrls.length;
+    totalUrls += filteredUrls.length;
 
     filteredUrls.forEach(url => {
         const statusCode = url.status_code;
@@ -1480,38 +1722,27 @@ async function exportData() {
         const exportFormat = settings.exportFormat || 'csv';
         const exportFields = settings.exportFields || ['url', 'status_code', 'title', 'meta_description', 'h1'];
 
-        // Check if there's data to export - always fetch fresh data from backend
-        let hasData = false;
-        let exportUrls = [];
-        let exportLinks = [];
-        let exportIssues = [];
-
-        // Always fetch from backend to ensure we have the latest data including links
-        const status = await fetch('/api/crawl_status');
-        const statusData = await status.json();
-
-        if (statusData.urls && statusData.urls.length > 0) {
-            hasData = true;
-            exportUrls = statusData.urls;
-            exportLinks = statusData.links || [];
-            exportIssues = statusData.issues || [];
-        } else if (crawlState.urls && crawlState.urls.length > 0) {
-            // Fallback to local state if backend has no data (e.g., loaded crawl)
-            hasData = true;
-            exportUrls = crawlState.urls;
-            // Get links and issues from stored state
-            exportLinks = crawlState.links || [];
-            exportIssues = crawlState.issues || window.currentIssues || [];
+        // The backend holds the crawl (live, loaded or saved) - stream the files straight from it.
+        // A HEAD on the URL export answers that without sending any crawl data to the browser.
+        const serverHasCrawl = crawlState.lazyCrawlId ||
+            (await fetch('/api/export/urls?format=csv', { method: 'HEAD' })).ok;
+        if (serverHasCrawl) {
+            await downloadStreamedExport(exportFormat, exportFields);
+            return;
         }
 
-        if (!hasData) {
+        // Otherwise the crawl only lives in the browser (opened from a file) - send it to be formatted
+        if (!crawlState.urls || crawlState.urls.length === 0) {
             showNotification('No crawl data to export', 'error');
             return;
         }
+        const exportUrls = crawlState.urls;
+        const exportLinks = crawlState.links || [];
+        const exportIssues = crawlState.issues || window.currentIssues || [];
 
         showNotification('Preparing export...', 'info');
 
-        // Request export from backend, including local data if available
+        // Request export from backend with the local data
         const exportResponse = await fetch('/api/export_data', {
             method: 'POST',
             headers: {
@@ -1520,7 +1751,6 @@ async function exportData() {
             body: JSON.stringify({
                 format: exportFormat,
                 fields: exportFields,
-                // Send local data if we have it (for loaded crawls)
                 localData: {
                     urls: exportUrls,
                     links: exportLinks,
@@ -1577,6 +1807,57 @@ async function exportData() {
     }
 }
 
+async function downloadStreamedExport(exportFormat, exportFields) {
+    // Special fields become their own files, like /api/export_data
+    const regularFields = exportFields.filter(f => f !== 'issues_detected' && f !== 'links_detailed');
+    const downloads = [];
+
+    if (exportFields.includes('issues_detected')) {
+        downloads.push(`/api/export/issues?format=${encodeURIComponent(exportFormat)}`);
+    }
+    if (exportFields.includes('links_detailed')) {
+        downloads.push(`/api/export/links?format=${encodeURIComponent(exportFormat)}`);
+    }
+    if (regularFields.length > 0) {
+        downloads.push(`/api/export/urls?format=${encodeURIComponent(exportFormat)}&fields=${encodeURIComponent(regularFields.join(','))}`);
+    }
+
+    if (downloads.length === 0) {
+        showNotification('No export fields selected', 'error');
+        return;
+    }
+
+    // Check every file before downloading any: a failed link would replace the page with the error JSON.
+    // HEAD runs the same checks without streaming the body; the error message comes from a GET.
+    for (const href of downloads) {
+        const check = await fetch(href, { method: 'HEAD' });
+        if (!check.ok) {
+            let error = 'Export failed';
+            try {
+                error = (await (await fetch(href)).json()).error || error;
+            } catch (e) {
+                // Keep the generic message
+            }
+            showNotification(error, 'error');
+            return;
+        }
+    }
+
+    downloads.forEach((href, index) => {
+        setTimeout(() => {
+            const a = document.createElement('a');
+            a.style.display = 'none';
+            a.href = href;
+            a.download = '';
+            document.body.appendChild(a);
+            a.click();
+            document.body.removeChild(a);
+        }, index * 500); // Delay between downloads to avoid browser blocking
+    });
+
+    showNotification(downloads.length > 1 ? `Exporting ${downloads.length} files...` : 'Export started', 'success');
+}
+
 // Helper function to escape HTML for safe display
 function escapeHtml(text) {
     if (!text) return text;
@@ -1587,12 +1868,43 @@ function escapeHtml(text) {
 
 function showUrlDetails(url) {
     // Find the URL data
-    const urlData = crawlState.urls.find(u => u.url === url);
+    let urlData = crawlState.urls.find(u => u.url === url);
+    if (!urlData && crawlState.lazyCrawlId) {
+        // Loaded crawls only hold the pages scrolled so far - the detail request fills the rest
+        urlData = findLoadedUrlRow(url);
+        if (!urlData) {
+            urlData = { url, crawl_id: crawlState.lazyCrawlId, details_loaded: false };
+            lazyUrlDetails.set(url, urlData);
+        }
+    }
     if (!urlData) {
         showNotification('URL data not found', 'error');
         return;
     }
 
+    // Rows of a loaded crawl only hold the table columns, and live rows leave out
+    // the linking pages - fetch the rest once
+    const loadedRow = urlData.details_loaded === false && urlData.crawl_id;
+    if (loadedRow || urlData.linked_from === undefined) {
+        const detailUrl = loadedRow
+            ? `/api/crawls/${urlData.crawl_id}/url_detail?url=${encodeURIComponent(url)}`
+            : `/api/url_detail?url=${encodeURIComponent(url)}`;
+        fetch(detailUrl)
+            .then(response => response.json())
+            .then(result => {
+                if (!result.success) {
+                    showNotification(result.error || 'Could not load URL details', 'error');
+                    return;
+                }
+                Object.assign(urlData, result.url);
+                urlData.details_loaded = true;
+                urlData.linked_from = urlData.linked_from || [];
+                showUrlDetails(url);
+            })
+            .catch(() => showNotification('Could not load URL details', 'error'));
+        return;
+    }
+
     // Escape all user-controlled text fields to prevent HTML injection
     const safeUrl = escapeHtml(url);
     const safeTitle = escapeHtml(urlData.title) || 'N/A';
@@ -1731,6 +2043,15 @@ function showUrlDetails(url) {
     document.body.insertAdjacentHTML('beforeend', modalContent);
 }
 
+function findLoadedUrlRow(url) {
+    if (lazyUrlDetails.has(url)) return lazyUrlDetails.get(url);
+    for (const scrollerName of ['overview', 'internal', 'external']) {
+        const row = virtualScrollers[scrollerName]?.data.find(u => u.url === url);
+        if (row) return row;
+    }
+    return null;
+}
+
 function closeUrlDetails() {
     const modal = document.querySelector('.details-modal-overlay');
     if (modal) {
@@ -2087,9 +2408,10 @@ function loadCrawl() {
 function renderOverviewRow(row, urlData, index) {
     const analyticsInfo = formatAnalyticsInfo(urlData.analytics || {});
     const ogTagsCount = Object.keys(urlData.og_tags || {}).length;
-    const jsonLdCount = (urlData.json_ld || []).length;
+    // Rows of a loaded crawl carry counts instead of the full arrays
+    const jsonLdCount = urlData.json_ld ? urlData.json_ld.length : (urlData.json_ld_count || 0);
     const linksInfo = `${urlData.internal_links || 0}/${urlData.external_links || 0}`;
-    const imagesCount = (urlData.images || []).length;
+    const imagesCount = urlData.images ? urlData.images.length : (urlData.images_count || 0);
     const jsRendered = urlData.javascript_rendered ? '✅ JS' : '';
 
     const cells = [
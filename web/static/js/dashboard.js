@@ -97,8 +97,8 @@ async function loadCrawlFromDashboard(crawlId) {
         // Close dashboard
         closeDashboard();
 
-        // Fetch the loaded data
-        const statusResponse = await fetch('/api/crawl_status');
+        // Fetch stats and counts - the tables page in from the database
+        const statusResponse = await fetch('/api/crawl_status?rows=0');
         const statusData = await statusResponse.json();
 
         // Clear UI
@@ -117,19 +117,23 @@ async function loadCrawlFromDashboard(crawlId) {
             document.getElementById('urlInput').value = crawlState.baseUrl;
         }
 
-        // Add URLs to tables
-        if (statusData.urls && statusData.urls.length > 0) {
-            statusData.urls.forEach(url => addUrlToTable(url));
-        }
-
-        // Load links
-        if (statusData.links && statusData.links.length > 0) {
-            crawlState.pendingLinks = statusData.links;
-        }
-
-        // Load issues
-        if (statusData.issues && statusData.issues.length > 0) {
-            crawlState.pendingIssues = statusData.issues;
+        if (statusData.lazy) {
+            await bindLoadedCrawlTables(statusData.crawl_id);
+        } else {
+            // Add URLs to tables
+            if (statusData.urls && statusData.urls.length > 0) {
+                statusData.urls.forEach(url => addUrlToTable(url));
+            }
+
+            // Load links
+            if (statusData.links && statusData.links.length > 0) {
+                crawlState.pendingLinks = statusData.links;
+            }
+
+            // Load issues
+            if (statusData.issues && statusData.issues.length > 0) {
+                crawlState.pendingIssues = statusData.issues;
+            }
         }
 
         // Update displays
@@ -137,7 +141,7 @@ async function loadCrawlFromDashboard(crawlId) {
         updateFilterCounts();
         updateStatusCodesTable();
         updateCrawlButtons();
-        updateStatus(`Loaded: ${statusData.urls?.length || 0} URLs`);
+        updateStatus(`Loaded: ${statusData.counts?.urls ?? statusData.urls?.length ?? 0} URLs`);
 
         showNotification('Crawl loaded successfully', 'success');
 
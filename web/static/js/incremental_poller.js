@@ -80,6 +80,11 @@ class IncrementalPoller {
 
             if (data.issues && data.issues.length > 0) {
                 this.allIssues.push(...data.issues);
+            }
+            // The server's issue sequence, which excluded issues still advance
+            if (typeof data.issue_seq === 'number') {
+                this.lastIssueCount = data.issue_seq;
+            } else if (data.issues && data.issues.length > 0) {
                 this.lastIssueCount = this.allIssues.length;
             }
 
@@ -7,6 +7,8 @@ let defaultSettings = {
     crawlDelay: 1,
     followRedirects: true,
     crawlExternalLinks: false,
+    prioritizeFrontier: true,
+    linkedFromLimit: 0,
 
     // Request settings
     userAgent: 'GrowthOS-Crawler/1.0',
@@ -18,6 +20,11 @@ let defaultSettings = {
     discoverSitemaps: true,
     enablePageSpeed: false,
     googleApiKey: '',
+    pageSpeedConcurrency: 4,
+    pageSpeedRequestsPerMinute: 60,
+    pageSpeedCacheHours: 24,
+    pageSpeedSampleTemplates: false,
+    pageSpeedMaxPages: 50,
 
     // Filter settings
     includeExtensions: 'html,htm,php,asp,aspx,jsp',
@@ -36,8 +43,10 @@ let defaultSettings = {
 
     // Advanced settings
     concurrency: 5,
+    distributedWorkers: 0,
     memoryLimit: 512,
     logLevel: 'INFO',
+    responseCacheMode: 'off',
     saveSession: false,
     enableProxy: false,
     proxyUrl: '',
@@ -262,7 +271,10 @@ let defaultSettings = {
 *.swp
 *.map
 *.min.js
-*.min.css`
+*.min.css`,
+
+    // Issue rules skipped during detection
+    disabledIssueRules: ''
 };
 
 // Initialize settings when page loads
@@ -457,14 +469,15 @@ function collectSettingsFromForm() {
 
     // Collect regular form fields
     const formFields = [
-        'maxDepth', 'maxUrls', 'crawlDelay', 'followRedirects', 'crawlExternalLinks',
+        'maxDepth', 'maxUrls', 'crawlDelay', 'followRedirects', 'crawlExternalLinks', 'prioritizeFrontier', 'linkedFromLimit',
         'userAgent', 'timeout', 'retries', 'acceptLanguage', 'respectRobotsTxt', 'allowCookies', 'discoverSitemaps', 'enablePageSpeed', 'googleApiKey',
+        'pageSpeedConcurrency', 'pageSpeedRequestsPerMinute', 'pageSpeedCacheHours', 'pageSpeedSampleTemplates', 'pageSpeedMaxPages',
         'includeExtensions', 'excludeExtensions', 'includePatterns', 'excludePatterns', 'maxFileSize',
         'enableDuplicationCheck', 'duplicationThreshold',
-        'exportFormat', 'concurrency', 'memoryLimit', 'logLevel', 'saveSession',
+        'exportFormat', 'concurrency', 'distributedWorkers', 'memoryLimit', 'logLevel', 'responseCacheMode', 'saveSession',
         'enableProxy', 'proxyUrl', 'customHeaders',
         'enableJavaScript', 'jsWaitTime', 'jsTimeout', 'jsBrowser', 'jsHeadless', 'jsUserAgent', 'jsViewportWidth', 'jsViewportHeight', 'jsMaxConcurrentPages',
-        'customCSS', 'issueExclusionPatterns'
+        'customCSS', 'issueExclusionPatterns', 'disabledIssueRules'
     ];
 
     formFields.forEach(fieldId => {
@@ -598,6 +611,30 @@ function validateSettings(settings) {
         errors.push('Memory limit must be between 64 and 4096 MB');
     }
 
+    if (settings.distributedWorkers < 0 || settings.distributedWorkers > 64) {
+        errors.push('Distributed worker processes must be between 0 and 64');
+    }
+
+    if (settings.linkedFromLimit < 0 || settings.linkedFromLimit > 1000000) {
+        errors.push('Linking pages per URL must be between 0 and 1,000,000');
+    }
+
+    if (settings.pageSpeedConcurrency < 1 || settings.pageSpeedConcurrency > 16) {
+        errors.push('PageSpeed parallel requests must be between 1 and 16');
+    }
+
+    if (settings.pageSpeedRequestsPerMinute < 1 || settings.pageSpeedRequestsPerMinute > 240) {
+        errors.push('PageSpeed requests per minute must be between 1 and 240');
+    }
+
+    if (settings.pageSpeedCacheHours < 0 || settings.pageSpeedCacheHours > 168) {
+        errors.push('PageSpeed cache must be between 0 and 168 hours');
+    }
+
+    if (settings.pageSpeedMaxPages < 1 || settings.pageSpeedMaxPages > 500) {
+        errors.push('PageSpeed pages must be between 1 and 500');
+    }
+
     // Validate duplication detection settings
     if (settings.duplicationThreshold < 0 || settings.duplicationThreshold > 1) {
         errors.push('Duplication threshold must be between 0.0 and 1.0');
@@ -14,6 +14,7 @@ class VirtualScroller {
         this.buffer = options.buffer || 10; // extra rows to render above/below viewport
         this.columnCount = options.columnCount || 1;
         this.renderRow = options.renderRow || this.defaultRenderRow.bind(this);
+        this.onNearEnd = options.onNearEnd || null; // called when the last rows come into view
 
         // State
         this.scrollTop = 0;
@@ -133,6 +134,11 @@ class VirtualScroller {
 
         const { start, end } = this.getVisibleRange();
 
+        // Ask for more rows before the end of the data scrolls into view
+        if (this.onNearEnd && end >= this.data.length - this.buffer) {
+            this.onNearEnd();
+        }
+
         // Only re-render if range changed by at least 1 row to reduce flickering
         // Reduced threshold from 3 to 1 to fix fast scrolling issue
         const threshold = 1;
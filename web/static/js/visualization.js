@@ -5,8 +5,12 @@
 
 let cy = null;  // Cytoscape instance
 let graphData = { nodes: [], edges: [] };  // Current graph data
-let currentLayout = 'cose';  // Current layout algorithm
+let currentLayout = 'preset';  // Current layout algorithm ('preset' = positions computed by the server)
 let currentFilter = 'all';  // Current filter
+let vizView = { mode: null, cluster: null, viewport: null, breadcrumb: [] };  // What the backend is showing
+let viewportTimer = null;
+let ignoreViewportUntil = 0;  // Camera moves caused by our own fit() are not user zooms
+const VIEWPORT_EXTENT = 1600;  // Show individual pages once less than this many layout units are visible
 
 /**
  * Initialize the visualization when tab is opened
@@ -52,6 +56,16 @@ function initVisualization() {
                     'border-color': '#374151'
                 }
             },
+            {
+                selector: 'node[?is_cluster]',
+                style: {
+                    'font-size': 'data(font_size)',
+                    'text-valign': 'center',
+                    'text-margin-y': 0,
+                    'background-opacity': 0.35,
+                    'border-width': 4
+                }
+            },
             {
                 selector: 'node:selected',
                 style: {
@@ -72,6 +86,12 @@ function initVisualization() {
                     'opacity': 0.6
                 }
             },
+            {
+                selector: 'edge[weight]',
+                style: {
+                    'width': 'mapData(weight, 1, 200, 2, 40)'
+                }
+            },
             {
                 selector: 'edge:selected',
                 style: {
@@ -86,7 +106,7 @@ function initVisualization() {
             name: 'preset'  // Use preset (no auto-layout on init)
         },
         wheelSensitivity: 0.2,
-        minZoom: 0.1,
+        minZoom: 0.005,
         maxZoom: 3
     });
 
@@ -124,6 +144,17 @@ function setupInteractions() {
 
         // Build tooltip content
         const statusClass = getStatusClass(data.status_code);
+        if (data.is_cluster) {
+            tooltip.innerHTML = `
+                <div class="tooltip-url">${truncateUrl(data.cluster)}</div>
+                <div class="tooltip-info">
+                    <div><strong>Pages:</strong> ${data.page_count}</div>
+                    <div>Double-click to expand</div>
+                </div>
+            `;
+            tooltip.style.display = 'block';
+            return;
+        }
         tooltip.innerHTML = `
             <div class="tooltip-url">${truncateUrl(data.url)}</div>
             <div class="tooltip-info">
@@ -148,9 +179,13 @@ function setupInteractions() {
         tooltip.style.display = 'none';
     });
 
-    // Double-click to open URL in new tab
+    // Double-click to expand a directory, or open a page in a new tab
     cy.on('dblclick', 'node', function(event) {
         const node = event.target;
+        if (node.data('is_cluster')) {
+            loadVisualizationData({ cluster: node.data('cluster') });
+            return;
+        }
         const url = node.data('url');
         if (url) {
             window.open(url, '_blank');
@@ -178,14 +213,82 @@ function setupInteractions() {
             cy.elements().removeClass('highlighted').removeClass('dimmed');
         }
     });
+
+    // Level of detail: swap directory super-nodes for the pages in view when zoomed in
+    cy.on('viewport', scheduleViewportLoad);
+}
+
+/**
+ * After zooming/panning settles, load the pages inside the visible area
+ * (or go back to the directory view when zoomed out again)
+ */
+function scheduleViewportLoad() {
+    if (currentLayout !== 'preset' || !graphData.positioned || Date.now() < ignoreViewportUntil) return;
+
+    clearTimeout(viewportTimer);
+    viewportTimer = setTimeout(() => {
+        const extent = cy.extent();
+        const visible = Math.max(extent.w, extent.h);
+        const viewport = [extent.x1, extent.y1, extent.x2, extent.y2].map(Math.round).join(',');
+
+        if (vizView.mode === 'cluster' && visible < VIEWPORT_EXTENT &&
+            graphData.nodes.some(node => node.data.is_cluster)) {
+            loadVisualizationData({ viewport });
+        } else if (vizView.mode === 'viewport') {
+            if (visible > 2 * VIEWPORT_EXTENT) {
+                loadVisualizationData(vizView.cluster ? { cluster: vizView.cluster } : {});
+            } else if (viewport !== vizView.viewport) {
+                loadVisualizationData({ viewport });
+            }
+        }
+    }, 400);
+}
+
+/**
+ * Breadcrumb of the directory being shown
+ */
+function renderVisualizationBreadcrumb() {
+    const container = document.getElementById('vizBreadcrumb');
+    if (!container) return;
+
+    container.innerHTML = '';
+    const crumbs = vizView.breadcrumb || [];
+    crumbs.forEach((crumb, index) => {
+        if (index > 0) {
+            container.appendChild(document.createTextNode(' › '));
+        }
+        const link = document.createElement('a');
+        link.href = '#';
+        link.textContent = crumb.label;
+        link.onclick = (event) => {
+            event.preventDefault();
+            loadVisualizationData(crumb.key ? { cluster: crumb.key } : {});
+        };
+        container.appendChild(link);
+    });
+    if (vizView.mode === 'viewport') {
+        container.appendChild(document.createTextNode(crumbs.length ? ' › pages in view' : 'Pages in view'));
+    }
 }
 
 /**
  * Load visualization data from backend
+ * params: {} for the overview, { cluster } for one directory, { viewport: 'x1,y1,x2,y2' } for pages in view.
+ * Without params (polling during a crawl) the current view is refreshed in place.
  */
-async function loadVisualizationData() {
+async function loadVisualizationData(params) {
+    const refresh = !params;
+    if (refresh) {
+        if (vizView.mode === 'viewport') {
+            params = { viewport: vizView.viewport };
+        } else {
+            params = vizView.cluster ? { cluster: vizView.cluster } : {};
+        }
+    }
+
     try {
-        const response = await fetch('/api/visualization_data');
+        const query = new URLSearchParams(params).toString();
+        const response = await fetch('/api/visualization_data' + (query ? '?' + query : ''));
         const data = await response.json();
 
         if (!data.success) {
@@ -195,16 +298,26 @@ async function loadVisualizationData() {
 
         graphData = {
             nodes: data.nodes || [],
-            edges: data.edges || []
+            edges: data.edges || [],
+            positioned: data.layout === 'preset'
+        };
+
+        // A viewport keeps the directory it was zoomed into, to zoom back out to
+        vizView = {
+            mode: data.mode || null,
+            cluster: params.viewport ? vizView.cluster : (data.cluster || null),
+            viewport: params.viewport || null,
+            breadcrumb: params.viewport ? vizView.breadcrumb : (data.breadcrumb || [])
         };
+        renderVisualizationBreadcrumb();
 
         // Show warning if data was truncated
         if (data.truncated) {
-            console.warn(`Showing ${data.visualized_pages} of ${data.total_pages} pages for performance`);
+            console.warn(`Showing ${data.visualized_pages} of ${data.scope_pages || data.total_pages} pages for performance`);
         }
 
-        // Update the graph
-        updateGraph();
+        // Update the graph - refreshes and viewport tiles keep the camera where it is
+        updateGraph(refresh || Boolean(params.viewport));
 
     } catch (error) {
         console.error('Error loading visualization data:', error);
@@ -214,7 +327,7 @@ async function loadVisualizationData() {
 /**
  * Update the graph with current data and filters
  */
-function updateGraph() {
+function updateGraph(keepCamera = false) {
     if (!cy) {
         initVisualization();
         return;
@@ -259,15 +372,27 @@ function updateGraph() {
     cy.add([...filteredNodes, ...filteredEdges]);
 
     // Apply layout
-    applyLayout(currentLayout);
+    applyLayout(currentLayout, keepCamera);
 }
 
 /**
  * Apply a layout algorithm to the graph
  */
-function applyLayout(layoutName) {
+function applyLayout(layoutName, keepCamera = false) {
     if (!cy) return;
 
+    // Server positions when we have them, otherwise fall back to a force layout
+    if (layoutName === 'preset') {
+        if (graphData.positioned) {
+            if (!keepCamera) {
+                ignoreViewportUntil = Date.now() + 800;
+            }
+            cy.layout({ name: 'preset', fit: !keepCamera, padding: 50 }).run();
+            return;
+        }
+        layoutName = 'cose';
+    }
+
     const layoutConfig = {
         name: layoutName,
         animate: 'end',  // Animate to end result, not during iterations
@@ -332,6 +457,12 @@ function filterVisualization(filter) {
 function resetVisualization() {
     if (!cy) return;
 
+    // Back to the top-level view if a directory or viewport is open
+    if (vizView.cluster || vizView.mode === 'viewport') {
+        loadVisualizationData({});
+        return;
+    }
+
     cy.elements().removeClass('highlighted').removeClass('dimmed');
     cy.fit(50);
     cy.zoom(1);
@@ -383,6 +514,8 @@ function truncateUrl(url, maxLength = 60) {
 function clearVisualization() {
     // Clear graph data
     graphData = { nodes: [], edges: [] };
+    vizView = { mode: null, cluster: null, viewport: null, breadcrumb: [] };
+    renderVisualizationBreadcrumb();
 
     // Clear the cytoscape graph if it exists
     if (cy) {